@@ -0,0 +1,109 @@
+"""
+Admission control for the HTTP API. Every request is classified from its
+method and path and must get a slot of its class before it reaches a route:
+
+- `read`: flight lookups, listings, summaries and tracks (highest priority)
+- `write`: single flight writes and deletes
+- `heavy`: analytics, area queries, track analysis and position batches/uploads
+
+Live position streams, the health check, the metrics, the stored profiles
+and the docs are not limited. Shed requests get a 503 with `Retry-After`.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.utils.admission import AdmissionClass, AdmissionController, OverloadedError
+from api.utils.env_manager import get_settings
+from api.utils.profiling import phase
+
+EXEMPT_PATH = re.compile(
+    r"^/(health-check|metrics|debug|docs|redoc|openapi\.json)(/.*)?$|/positions/stream$"
+)
+HEAVY_PATH = re.compile(
+    r"^/analytics/|^/flights/crossing$|/track$|/positions(/upload)?$"
+)
+
+
+def classify_request(method: str, path: str) -> Optional[str]:
+    """
+    Admission class of a request, or None when it is not limited.
+    """
+    path = path.rstrip("/") or "/"
+    if EXEMPT_PATH.search(path):
+        return None
+    heavy = HEAVY_PATH.search(path) is not None
+    if method in ("GET", "HEAD"):
+        # Reading a flight's positions is a plain read; writing them is a batch.
+        return "heavy" if heavy and not path.endswith("/positions") else "read"
+    if method == "OPTIONS":
+        return None
+    return "heavy" if heavy and method != "DELETE" else "write"
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> Optional[AdmissionController]:
+    """
+    Returns the worker's AdmissionController, or None when admission control is disabled.
+    """
+    settings = get_settings()
+    if not settings.admission_enabled:
+        return None
+    timeout = settings.admission_queue_timeout_seconds
+    queue_size = settings.admission_queue_size
+    return AdmissionController(
+        max_concurrency=settings.admission_max_concurrency,
+        classes=[
+            AdmissionClass(
+                "read", 0, settings.admission_read_limit, queue_size, timeout
+            ),
+            AdmissionClass(
+                "write", 1, settings.admission_write_limit, queue_size, timeout
+            ),
+            AdmissionClass(
+                "heavy", 2, settings.admission_heavy_limit, queue_size, timeout
+            ),
+        ],
+    )
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that holds a slot of the request's class from the moment
+    it is admitted until its response has been sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        controller = get_admission_controller()
+        name = classify_request(scope["method"], scope["path"]) if controller else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            with phase("admission"):
+                await controller.acquire(name)
+        except OverloadedError as e:
+            response = JSONResponse(
+                {"detail": "The server is busy, retry later.", "reason": e.reason},
+                status_code=503,
+                headers={
+                    "Retry-After": str(get_settings().admission_retry_after_seconds)
+                },
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(name)
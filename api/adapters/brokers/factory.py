@@ -0,0 +1,17 @@
+from api.core.ports.position_broker_port import PositionBrokerPort
+from api.utils.env_manager import Settings
+
+
+def build_position_broker(settings: Settings) -> PositionBrokerPort:
+    """
+    Builds the position broker for the configured backend. The in-process
+    broker only reaches the clients of the worker that stored the positions.
+    """
+    if settings.position_broker == "redis":
+        from api.adapters.brokers.redis_broker import RedisPositionBroker
+
+        return RedisPositionBroker(settings.redis_url)
+
+    from api.adapters.brokers.memory_broker import InMemoryPositionBroker
+
+    return InMemoryPositionBroker()
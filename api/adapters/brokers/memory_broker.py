@@ -0,0 +1,83 @@
+import threading
+from typing import Dict, List, Optional, Set
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.position_stream import PositionEvent, PositionSubscription
+from api.core.ports.position_broker_port import PositionBrokerPort
+
+
+class InMemoryPositionBroker(PositionBrokerPort):
+    """
+    In-process adapter for the PositionBrokerPort interface.
+    Subscriptions are indexed by flight, so a publish only visits the
+    subscribers of that flight, and each position is serialized once for all
+    of them. It only reaches clients of the same worker: it backs tests,
+    single-worker deployments and the local fan-out of other brokers.
+    """
+
+    def __init__(self):
+        """
+        Initializes a broker without subscribers.
+        """
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[int, Set[PositionSubscription]] = {}
+
+    def publish(self, flight_id: int, positions: List[FlightPosition]) -> None:
+        """
+        Delivers the positions to the flight's subscribers in this process.
+        """
+        if flight_id in self._subscriptions:
+            self.dispatch(
+                flight_id, [PositionEvent.from_position(p) for p in positions]
+            )
+
+    def dispatch(self, flight_id: int, events: List[PositionEvent]) -> None:
+        """
+        Pushes already serialized events to the flight's subscribers.
+        """
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(flight_id, ()))
+        for subscription in subscriptions:
+            subscription.push(events)
+
+    def subscribe(self, flight_id: int, buffer_size: int) -> PositionSubscription:
+        """
+        Opens a subscription to the flight's positions.
+        """
+        subscription = PositionSubscription(flight_id, buffer_size)
+        with self._lock:
+            self._subscriptions.setdefault(flight_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: PositionSubscription) -> None:
+        """
+        Closes the subscription and forgets it.
+        """
+        subscription.close()
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.flight_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.flight_id]
+
+    def subscriber_count(self, flight_id: Optional[int] = None) -> int:
+        """
+        Number of open subscriptions, for one flight or in total.
+        """
+        with self._lock:
+            if flight_id is not None:
+                return len(self._subscriptions.get(flight_id, ()))
+            return sum(
+                len(subscriptions) for subscriptions in self._subscriptions.values()
+            )
+
+    def close(self) -> None:
+        """
+        Closes every open subscription.
+        """
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+            self._subscriptions.clear()
+        for subscription in subscriptions:
+            subscription.close()
@@ -0,0 +1,96 @@
+import json
+import threading
+from typing import List
+
+from api.adapters.brokers.memory_broker import InMemoryPositionBroker
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.position_stream import PositionEvent, PositionSubscription
+from api.core.ports.position_broker_port import PositionBrokerPort
+
+CHANNEL_PREFIX = "flight_positions:"
+
+
+class RedisPositionBroker(PositionBrokerPort):
+    """
+    Redis pub/sub adapter for the PositionBrokerPort interface, for
+    deployments with several workers. Each publish is one message on the
+    flight's channel; each worker holds a single pattern subscription and fans
+    the messages out to its own clients through an InMemoryPositionBroker.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, channel_prefix: str = CHANNEL_PREFIX):
+        """
+        Connects to Redis at `url` and starts the listener thread.
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis position broker requires the 'redis' package."
+            ) from e
+
+        self.channel_prefix = channel_prefix
+        self.client = redis.Redis.from_url(url)
+        self.local = InMemoryPositionBroker()
+        self._stop = threading.Event()
+        self._listener = threading.Thread(
+            target=self._listen, name="position-broker", daemon=True
+        )
+        self._listener.start()
+
+    def publish(self, flight_id: int, positions: List[FlightPosition]) -> None:
+        """
+        Publishes the positions on the flight's channel; every worker,
+        this one included, delivers them to its subscribers.
+        """
+        message = json.dumps([position.to_dict() for position in positions])
+        try:
+            self.client.publish(f"{self.channel_prefix}{flight_id}", message)
+        except Exception as e:
+            print(f"Error publishing positions for flight ID '{flight_id}': {e}")
+
+    def subscribe(self, flight_id: int, buffer_size: int) -> PositionSubscription:
+        return self.local.subscribe(flight_id, buffer_size)
+
+    def unsubscribe(self, subscription: PositionSubscription) -> None:
+        self.local.unsubscribe(subscription)
+
+    def close(self) -> None:
+        """
+        Stops the listener and closes every local subscription.
+        """
+        self._stop.set()
+        self._listener.join(timeout=5)
+        self.local.close()
+        self.client.close()
+
+    def _listen(self) -> None:
+        """
+        Forwards the messages of every flight channel to the local subscribers,
+        reconnecting after errors until the broker is closed.
+        """
+        while not self._stop.is_set():
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(f"{self.channel_prefix}*")
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._forward(message)
+            except Exception as e:
+                print(f"Position broker connection lost, reconnecting: {e}")
+                self._stop.wait(1.0)
+            finally:
+                pubsub.close()
+
+    def _forward(self, message: dict) -> None:
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        flight_id = int(channel[len(self.channel_prefix) :])
+        if self.local.subscriber_count(flight_id):
+            events = [
+                PositionEvent.from_dict(data) for data in json.loads(message["data"])
+            ]
+            self.local.dispatch(flight_id, events)
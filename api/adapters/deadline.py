@@ -0,0 +1,39 @@
+"""
+Per-request time budget. Every HTTP request runs inside a deadline scope
+of `REQUEST_TIMEOUT_SECONDS`, which includes the time it waits for
+admission; backend calls made while handling it get what is left.
+"""
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.utils.env_manager import get_settings
+from api.utils.resilience import deadline_scope
+
+
+class RequestDeadlineMiddleware:
+    """
+    ASGI middleware that opens the request's deadline scope.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline_scope(get_settings().request_timeout_seconds):
+            await self.app(scope, receive, send)
+
+
+def backend_unavailable_response(error: BackendUnavailableError) -> JSONResponse:
+    """
+    The 503 answered when the backend fails, times out or is short-circuited.
+    """
+    return JSONResponse(
+        {"detail": f"The storage backend is unavailable, retry later. ({error})"},
+        status_code=503,
+        headers={"Retry-After": str(get_settings().admission_retry_after_seconds)},
+    )
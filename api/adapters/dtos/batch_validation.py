@@ -0,0 +1,173 @@
+"""
+Batch validation of flight and position payloads.
+
+A whole batch is validated and coerced by a single pydantic `TypeAdapter`
+call over a list of TypedDicts (the nested flight objects validate straight
+into the domain dataclasses), and the domain objects are then built from the
+validated rows. This skips the per-item model instances and `model_dump`
+copies of the DTO path. The accepted fields and their constraints match
+`FlightPostRequest` and `FlightPositionPostRequest`.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Union
+
+from pydantic import Field, TypeAdapter, ValidationError
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+from api.core.domain.flight import (
+    DetailedCalculation,
+    EmissionComparison,
+    Flight,
+    PhaseDurations,
+    StatisticalSimulation,
+)
+from api.core.domain.flight_position import FlightPosition
+
+# Row errors reported by a failed batch, at most.
+MAX_REPORTED_ERRORS = 100
+
+
+class PositionRow(TypedDict):
+    timestamp: datetime
+    latitude: Annotated[float, Field(ge=-90, le=90)]
+    longitude: Annotated[float, Field(ge=-180, le=180)]
+    altitude: NotRequired[Optional[int]]
+    ground_speed: NotRequired[Optional[int]]
+    vertical_rate: NotRequired[Optional[int]]
+
+
+class EmissionComparisonRow(TypedDict):
+    detailed_calculation: DetailedCalculation
+    statistical_simulation: StatisticalSimulation
+
+
+class FlightRow(TypedDict):
+    fr24_id: str
+    flight: NotRequired[Optional[str]]
+    callsign: NotRequired[Optional[str]]
+    aircraft_model: NotRequired[Optional[str]]
+    aircraft_reg: NotRequired[Optional[str]]
+    departure_icao: NotRequired[Optional[str]]
+    arrival_icao: NotRequired[Optional[str]]
+    distance_calculated_km: NotRequired[Optional[float]]
+    great_circle_distance_km: NotRequired[Optional[float]]
+    departure_time_utc: NotRequired[Optional[datetime]]
+    arrival_time_utc: NotRequired[Optional[datetime]]
+    flight_duration_s: NotRequired[Optional[int]]
+    phase_durations_s: NotRequired[Optional[PhaseDurations]]
+    emission_comparison: NotRequired[Optional[EmissionComparisonRow]]
+
+
+POSITION_ROWS = TypeAdapter(List[PositionRow])
+FLIGHT_ROWS = TypeAdapter(List[FlightRow])
+
+
+@dataclass
+class RowError:
+    """A validation error in one row of the batch."""
+
+    row: int
+    field: str
+    message: str
+    type: str
+
+    def to_dict(self) -> dict:
+        return {
+            "row": self.row,
+            "field": self.field,
+            "message": self.message,
+            "type": self.type,
+        }
+
+
+class BatchValidationError(ValueError):
+    """
+    A batch with invalid rows. `errors` lists them by row index (at most
+    MAX_REPORTED_ERRORS) and `error_count` counts all of them.
+    """
+
+    def __init__(self, errors: List[RowError], error_count: int):
+        first = errors[0] if errors else None
+        summary = (
+            f"row {first.row}, {first.field}: {first.message}"
+            if first
+            else "invalid batch"
+        )
+        super().__init__(
+            f"{error_count} invalid value(s) in the batch; first at {summary}"
+        )
+        self.errors = errors
+        self.error_count = error_count
+
+    @staticmethod
+    def from_validation_error(error: ValidationError) -> "BatchValidationError":
+        details = error.errors(include_url=False)
+        errors = []
+        for detail in details[:MAX_REPORTED_ERRORS]:
+            location = detail["loc"]
+            row = location[0] if location and isinstance(location[0], int) else -1
+            errors.append(
+                RowError(
+                    row=row,
+                    field=".".join(str(part) for part in location[1:]),
+                    message=detail["msg"],
+                    type=detail["type"],
+                )
+            )
+        return BatchValidationError(errors, len(details))
+
+
+def validate_positions(
+    flight_id: int, rows: Union[bytes, str, Sequence[Any]]
+) -> List[FlightPosition]:
+    """
+    Validates a batch of positions, given as a JSON array (parsed and
+    validated in one pass) or as a list of dicts, and builds the
+    FlightPositions of `flight_id`. Raises BatchValidationError.
+    """
+    try:
+        if isinstance(rows, (bytes, str)):
+            validated = POSITION_ROWS.validate_json(rows)
+        else:
+            validated = POSITION_ROWS.validate_python(rows)
+    except ValidationError as e:
+        raise BatchValidationError.from_validation_error(e) from None
+
+    return [
+        FlightPosition(
+            flight_id,
+            row["timestamp"],
+            row["latitude"],
+            row["longitude"],
+            row.get("altitude"),
+            row.get("ground_speed"),
+            row.get("vertical_rate"),
+        )
+        for row in validated
+    ]
+
+
+def validate_flights(rows: Union[bytes, str, Sequence[Any]]) -> List[Flight]:
+    """
+    Validates a batch of flights, given as a JSON array or as a list of
+    dicts, and builds the Flights. Raises BatchValidationError.
+    """
+    try:
+        if isinstance(rows, (bytes, str)):
+            validated = FLIGHT_ROWS.validate_json(rows)
+        else:
+            validated = FLIGHT_ROWS.validate_python(rows)
+    except ValidationError as e:
+        raise BatchValidationError.from_validation_error(e) from None
+
+    flights = []
+    for row in validated:
+        comparison = row.get("emission_comparison")
+        if comparison is not None:
+            row["emission_comparison"] = EmissionComparison(
+                comparison["detailed_calculation"], comparison["statistical_simulation"]
+            )
+        flights.append(Flight(**row))
+    return flights
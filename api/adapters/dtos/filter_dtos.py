@@ -1,8 +1,10 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from api.core.domain.geo import Area, BoundingBox, Circle
+
 
 class FlightQueryFilters(BaseModel):
     search: Optional[str] = Field(
@@ -19,3 +21,93 @@ class FlightQueryFilters(BaseModel):
     offset: int = Field(
         0, ge=0, description="Number of records to skip for pagination."
     )
+
+
+class EmissionsAnalyticsFilters(BaseModel):
+    bucket: Literal["day", "week", "month"] = Field(
+        "day", description="Time bucket of the departure date."
+    )
+    group_by: Optional[
+        Literal["departure_airport", "arrival_airport", "aircraft_model", "route"]
+    ] = Field(None, description="Optional grouping within each time bucket.")
+    source: Literal["detailed", "statistical"] = Field(
+        "detailed", description="Emission calculation to aggregate."
+    )
+    start_date: Optional[date] = Field(
+        None, description="First departure date included (YYYY-MM-DD)."
+    )
+    end_date: Optional[date] = Field(
+        None, description="Last departure date included (YYYY-MM-DD)."
+    )
+
+
+class LeaderboardFilters(BaseModel):
+    metric: Literal["efficiency", "efficiency_saving"] = Field(
+        "efficiency",
+        description="Mean detailed efficiency (kg/pax/km), or its saving vs. the simulation.",
+    )
+    order: Literal["best", "worst"] = Field(
+        "best", description="Most or least efficient first."
+    )
+    limit: int = Field(10, ge=1, le=100, description="Number of entries to return.")
+    min_samples: int = Field(
+        1, ge=1, description="Minimum number of flights reporting the metric."
+    )
+    start_date: Optional[date] = Field(
+        None, description="First departure date included (YYYY-MM-DD)."
+    )
+    end_date: Optional[date] = Field(
+        None, description="Last departure date included (YYYY-MM-DD)."
+    )
+
+
+class AreaQueryFilters(BaseModel):
+    min_lat: Optional[float] = Field(
+        None, ge=-90, le=90, description="Bounding box south edge."
+    )
+    min_lon: Optional[float] = Field(
+        None, ge=-180, le=180, description="Bounding box west edge."
+    )
+    max_lat: Optional[float] = Field(
+        None, ge=-90, le=90, description="Bounding box north edge."
+    )
+    max_lon: Optional[float] = Field(
+        None,
+        ge=-180,
+        le=180,
+        description="Bounding box east edge; below min_lon the box crosses the antimeridian.",
+    )
+    lat: Optional[float] = Field(
+        None, ge=-90, le=90, description="Circle centre latitude."
+    )
+    lon: Optional[float] = Field(
+        None, ge=-180, le=180, description="Circle centre longitude."
+    )
+    radius_km: Optional[float] = Field(
+        None, gt=0, description="Circle radius in kilometres."
+    )
+    start: Optional[datetime] = Field(
+        None, description="Earliest position time included."
+    )
+    end: Optional[datetime] = Field(
+        None, description="Position times before this one are included."
+    )
+
+    def to_area(self) -> Area:
+        """
+        Builds the queried area: either the full bounding box or the full circle.
+        Raises ValueError when neither (or both) is given.
+        """
+        box = (self.min_lat, self.min_lon, self.max_lat, self.max_lon)
+        circle = (self.lat, self.lon, self.radius_km)
+        has_box = all(value is not None for value in box)
+        has_circle = all(value is not None for value in circle)
+        if has_box == has_circle:
+            raise ValueError(
+                "Give either min_lat, min_lon, max_lat and max_lon, or lat, lon and radius_km."
+            )
+        if has_box:
+            if self.min_lat > self.max_lat:
+                raise ValueError("min_lat must not be greater than max_lat.")
+            return BoundingBox(*box)
+        return Circle(*circle)
@@ -10,12 +10,12 @@ class FlightPositionPostRequest(BaseModel):
     """DTO for creating flight position records."""
 
     timestamp: datetime = Field(..., description="Timestamp of the position.")
-    latitude: float = Field(..., description="Latitude coordinate.")
-    longitude: float = Field(..., description="Longitude coordinate.")
+    latitude: float = Field(..., ge=-90, le=90, description="Latitude coordinate.")
+    longitude: float = Field(..., ge=-180, le=180, description="Longitude coordinate.")
     altitude: Optional[int] = Field(None, description="Altitude in meters.")
     ground_speed: Optional[int] = Field(None, description="Ground speed in km/h.")
     vertical_rate: Optional[int] = Field(None, description="Vertical rate in m/s.")
 
-    def to_domain_model(self) -> FlightPosition:
-        """Converts the DTO to a core domain model."""
-        return FlightPosition(**self.model_dump())
+    def to_domain_model(self, flight_id: int) -> FlightPosition:
+        """Converts the DTO to a core domain model owned by `flight_id`."""
+        return FlightPosition(flight_id=flight_id, **self.model_dump())
@@ -0,0 +1,109 @@
+import csv
+import json
+from typing import List, Optional, Sequence, Tuple
+
+from api.adapters.dtos.batch_validation import BatchValidationError, validate_positions
+from api.core.domain.flight_position import FlightPosition
+
+# Media types accepted by the streaming upload and the row format they carry.
+UPLOAD_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+class PositionUploadError(ValueError):
+    """A line of a position upload that cannot be parsed or validated."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+
+class LineSplitter:
+    """
+    Splits a body that arrives in arbitrary byte chunks into complete lines,
+    keeping the trailing partial line until the next chunk completes it.
+    """
+
+    def __init__(self):
+        self._partial = b""
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Returns the lines completed by `data`."""
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        return lines
+
+    def finish(self) -> List[bytes]:
+        """Returns the last line of a body that does not end with a newline."""
+        rest, self._partial = self._partial, b""
+        return [rest] if rest.strip() else []
+
+
+def parse_csv_header(line: bytes) -> List[str]:
+    """Column names of a CSV upload, from its first line."""
+    return [
+        name.strip()
+        for name in next(csv.reader([line.decode("utf-8-sig").rstrip("\r")]))
+    ]
+
+
+def positions_from_lines(
+    flight_id: int,
+    lines: Sequence[bytes],
+    first_line: int,
+    upload_format: str,
+    header: Optional[List[str]] = None,
+) -> List[FlightPosition]:
+    """
+    Validates a chunk of NDJSON objects or CSV rows (with the columns of
+    `header`; empty cells are null) as positions of `flight_id`, in one batch.
+    Blank lines are skipped. Raises PositionUploadError with the body line
+    number of the first invalid row.
+    """
+    numbered = [
+        (first_line + offset, line) for offset, line in enumerate(lines) if line.strip()
+    ]
+    if not numbered:
+        return []
+
+    if upload_format == "ndjson":
+        batch = b"[" + b",".join(line for _, line in numbered) + b"]"
+    else:
+        batch = []
+        for number, line in numbered:
+            try:
+                values = next(csv.reader([line.decode("utf-8").rstrip("\r")]))
+            except ValueError as e:
+                raise PositionUploadError(number, str(e)) from e
+            if len(values) != len(header):
+                raise PositionUploadError(
+                    number, f"expected {len(header)} columns, got {len(values)}"
+                )
+            batch.append({name: value or None for name, value in zip(header, values)})
+
+    try:
+        positions = validate_positions(flight_id, batch)
+    except BatchValidationError as e:
+        first = e.errors[0]
+        if first.row < 0:
+            _raise_malformed_line(numbered)
+            raise PositionUploadError(numbered[0][0], first.message) from e
+        raise PositionUploadError(
+            numbered[first.row][0], f"{first.field}: {first.message}"
+        ) from e
+    if len(positions) != len(numbered):
+        # A line held more than one JSON value.
+        _raise_malformed_line(numbered)
+    return positions
+
+
+def _raise_malformed_line(numbered: Sequence[Tuple[int, bytes]]) -> None:
+    """Raises PositionUploadError for the first line that is not a single JSON value."""
+    for number, line in numbered:
+        try:
+            json.loads(line)
+        except ValueError as e:
+            raise PositionUploadError(number, str(e)) from e
@@ -0,0 +1,201 @@
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import FastAPI
+
+from api.adapters.dtos.filter_dtos import FlightQueryFilters
+from api.adapters.dtos.flight_dtos import FlightPostRequest
+from api.adapters.dtos.flight_position_dtos import FlightPositionPostRequest
+from api.adapters.routes.dependencies import (
+    build_analytics_service,
+    build_flight_service,
+    build_position_service,
+    build_rollup_service,
+    build_summary_service,
+    get_position_broker,
+    get_repositories,
+)
+from api.core.domain.flight_rollups import FlightRollups
+from api.utils.env_manager import Settings, get_settings
+
+SAMPLE_FLIGHT = {
+    "fr24_id": "warmup",
+    "departure_time_utc": "2025-01-01T00:00:00+00:00",
+    "phase_durations_s": {"takeoff": 60, "climb": 600, "cruise": 3600},
+    "emission_comparison": {
+        "detailed_calculation": {"total_fuel_kg": 1.0, "co2_per_passenger_kg": 1.0},
+        "statistical_simulation": {"total_fuel_kg": 1.0, "co2_per_passenger_kg": 1.0},
+    },
+}
+SAMPLE_POSITION = {
+    "timestamp": "2025-01-01T00:00:00+00:00",
+    "latitude": 0.0,
+    "longitude": 0.0,
+    "altitude": 0,
+}
+
+
+@dataclass
+class WarmupState:
+    """
+    Progress of the startup warm-up, reported by the readiness check.
+    """
+
+    finished: bool = False
+    shutting_down: bool = False
+    duration_s: Optional[float] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        return self.finished and not self.shutting_down
+
+
+warmup_state = WarmupState()
+
+
+def warm_up(app: FastAPI, settings: Settings) -> None:
+    """
+    Prepares a fresh worker before it reports ready:
+        1. builds the repositories, opening the backend connection (TLS
+           handshake, connection pool, SQLite file);
+        2. prefetches the summary metrics, the default flight listing and the
+           first page of today's and yesterday's departures into the read cache
+           and, with rollups enabled, builds them and the analytics snapshot in
+           one full scan (otherwise the first analytics request builds the
+           snapshot, so a cold start never scans the flights table);
+        3. runs the request validators and serializers once and builds the
+           OpenAPI schema, so the first real request does not pay for them.
+    Failures are recorded and do not stop the remaining steps.
+    """
+    started = time.perf_counter()
+
+    def step(name: str, action) -> None:
+        try:
+            action()
+        except Exception as e:
+            print(f"Warm-up step '{name}' failed: {e}")
+            warmup_state.errors.append(f"{name}: {e}")
+
+    step("connections", lambda: (build_flight_service(), build_position_service()))
+    step("summary", lambda: build_summary_service().execute())
+    step(
+        "listing",
+        lambda: build_flight_service().get_all_flights(
+            **FlightQueryFilters().model_dump()
+        ),
+    )
+
+    today = datetime.now(timezone.utc).date()
+    for day in (today, today - timedelta(days=1)):
+        filters = FlightQueryFilters(
+            flight_date=day, limit=settings.warmup_recent_flights
+        )
+        step(
+            f"departures {day}",
+            lambda f=filters: build_flight_service().get_all_flights(**f.model_dump()),
+        )
+
+    if settings.rollups_enabled:
+        step("full scan", _build_from_full_scan)
+    step("serializers", lambda: _warm_serializers(app))
+
+    warmup_state.duration_s = time.perf_counter() - started
+    warmup_state.finished = True
+
+
+def _build_from_full_scan() -> None:
+    """
+    Builds the analytics snapshot and the rollups from a single scan of the flights.
+    """
+    rollup_service = build_rollup_service()
+    fresh_rollups = FlightRollups()
+
+    def flights():
+        for batch in get_repositories()[0].iter_flights():
+            for flight in batch:
+                fresh_rollups.record(flight)
+                yield flight
+
+    build_analytics_service().refresh(flights())
+    if rollup_service is not None:
+        rollup_service.rollups.replace_with(fresh_rollups)
+
+
+def reconcile_rollups_periodically(interval_s: float, stop: threading.Event) -> None:
+    """
+    Reconciles the rollups against the full aggregate every `interval_s`
+    seconds until `stop` is set.
+    """
+    while not stop.wait(interval_s):
+        rollup_service = build_rollup_service()
+        if rollup_service is None:
+            return
+        try:
+            rollup_service.reconcile()
+        except Exception as e:
+            print(f"Rollup reconciliation failed: {e}")
+
+
+def _warm_serializers(app: FastAPI) -> None:
+    flight = FlightPostRequest.model_validate(SAMPLE_FLIGHT).to_domain_model()
+    position = FlightPositionPostRequest.model_validate(
+        SAMPLE_POSITION
+    ).to_domain_model(0)
+    json.dumps(flight.to_dict())
+    json.dumps(position.to_dict())
+    app.openapi()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the warm-up in a background thread, so the worker is live at once
+    and ready (see `/health-check?ready=true`) when the warm-up finishes.
+    On shutdown the worker stops reporting ready so it is drained first,
+    the position broker, if one was built, is closed, and the write-behind
+    buffer, if enabled, is drained.
+    """
+    settings = get_settings()
+    warmup_state.finished = False
+    warmup_state.shutting_down = False
+    warmup_state.errors.clear()
+
+    if settings.warmup_enabled:
+        threading.Thread(
+            target=warm_up, args=(app, settings), name="warm-up", daemon=True
+        ).start()
+    else:
+        warmup_state.finished = True
+
+    stop = threading.Event()
+    if settings.rollups_enabled and settings.rollups_reconcile_interval_seconds > 0:
+        threading.Thread(
+            target=reconcile_rollups_periodically,
+            args=(settings.rollups_reconcile_interval_seconds, stop),
+            name="rollup-reconciliation",
+            daemon=True,
+        ).start()
+
+    yield
+
+    warmup_state.shutting_down = True
+    stop.set()
+    if get_position_broker.cache_info().currsize:
+        get_position_broker().close()
+    if settings.write_behind_enabled and get_repositories.cache_info().currsize:
+        from api.adapters.repositories.buffered.flight_position_repository import (
+            BufferedFlightPositionRepository,
+        )
+
+        position_repository = get_repositories()[1]
+        while not isinstance(position_repository, BufferedFlightPositionRepository):
+            position_repository = getattr(position_repository, "inner", None)
+            if position_repository is None:
+                return
+        position_repository.close()
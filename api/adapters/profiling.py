@@ -0,0 +1,219 @@
+"""
+On-demand request profiling for the HTTP API.
+
+A request is profiled when it carries `X-Profile: <PROFILING_TOKEN>`, or at
+random with probability `PROFILING_SAMPLE_RATE`. Profiled requests are run
+under the stack sampler and kept in the worker's ProfileStore (and written to
+`PROFILING_DIR` as folded stacks); the response of a request profiled on
+demand carries `X-Profile-Id` and its phase timings in `Server-Timing`. With
+`SERVER_TIMING_ENABLED`, every response carries the phase timings, without
+stack samples. Requests that are not profiled only pay a settings lookup.
+
+The phases are `admission` (waiting for a slot), `validate` (FastAPI parsing
+and validating the request), `backend` (waiting for the storage backend),
+`decode` (building domain objects from backend rows) and `serialize`
+(building the response body).
+"""
+
+import functools
+import hmac
+import inspect
+import os
+import random
+import secrets
+import time
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.utils.env_manager import get_settings
+from api.utils.metrics import metrics
+from api.utils.profiling import (
+    ProfileStore,
+    RequestProfile,
+    StackSampler,
+    activate,
+    current_profile,
+    deactivate,
+)
+
+PROFILE_HEADER = "x-profile"
+PROFILED = metrics.counter(
+    "profiled_requests_total", "Requests profiled, by trigger (header or sampled)."
+)
+
+
+@lru_cache(maxsize=1)
+def get_profile_store() -> ProfileStore:
+    """
+    Returns the worker's store of finished profiles.
+    """
+    return ProfileStore(get_settings().profiling_max_stored)
+
+
+@lru_cache(maxsize=1)
+def get_stack_sampler() -> StackSampler:
+    """
+    Returns the worker's stack sampler.
+    """
+    return StackSampler(get_settings().profiling_interval_ms / 1000)
+
+
+def authorized(token: Optional[str]) -> bool:
+    """
+    Whether `token` is the configured profiling token; always False without one.
+    """
+    expected = get_settings().profiling_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode(), expected.encode())
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def store_profile(profile: RequestProfile) -> None:
+    """
+    Keeps a finished profile in the store and, with PROFILING_DIR, on disk.
+    """
+    get_profile_store().add(profile)
+    directory = get_settings().profiling_dir
+    if not directory:
+        return
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(
+            os.path.join(directory, f"{profile.profile_id}.folded"), "w"
+        ) as handle:
+            handle.write(profile.folded())
+    except OSError as e:
+        print(f"Error writing profile {profile.profile_id}: {e}")
+
+
+class RequestProfilingMiddleware:
+    """
+    ASGI middleware that decides whether a request is profiled and, if so,
+    profiles it from start to end.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith("/debug/"):
+            await self.app(scope, receive, send)
+            return
+        settings = get_settings()
+        on_demand = settings.profiling_token is not None and authorized(
+            _header(scope, PROFILE_HEADER.encode())
+        )
+        sampled = not on_demand and random.random() < settings.profiling_sample_rate
+        if not (on_demand or sampled or settings.server_timing_enabled):
+            await self.app(scope, receive, send)
+            return
+
+        sample = on_demand or sampled
+        profile = RequestProfile(
+            secrets.token_hex(8), scope["method"], scope["path"], sample
+        )
+        expose = on_demand or settings.server_timing_enabled
+
+        async def send_with_timings(message: Message) -> None:
+            if message["type"] == "http.response.start" and expose:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing())
+                if sample:
+                    headers.append("X-Profile-Id", profile.profile_id)
+            await send(message)
+
+        token = activate(profile)
+        profile.enter_thread()
+        if sample:
+            PROFILED.inc(trigger="header" if on_demand else "sampled")
+            get_stack_sampler().attach(profile)
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            profile.duration_s = time.perf_counter() - profile.started
+            profile.exit_thread()
+            deactivate(token)
+            if sample:
+                get_stack_sampler().detach(profile)
+                store_profile(profile)
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps a route's endpoint so its thread is sampled and the time FastAPI
+    spent before calling it (validation) and after it (serialization) can be
+    told apart from the endpoint's own time.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def timed_async(*args: Any, **kwargs: Any) -> Any:
+            profile = current_profile()
+            if profile is None:
+                return await endpoint(*args, **kwargs)
+            _endpoint_started(profile)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profile.endpoint_finished = time.perf_counter()
+
+        return timed_async
+
+    @functools.wraps(endpoint)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        profile = current_profile()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        _endpoint_started(profile)
+        profile.enter_thread()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profile.exit_thread()
+            profile.endpoint_finished = time.perf_counter()
+
+    return timed
+
+
+def _endpoint_started(profile: RequestProfile) -> None:
+    if profile.handler_started is not None:
+        profile.add("validate", time.perf_counter() - profile.handler_started)
+
+
+class ProfiledRoute(APIRoute):
+    """
+    APIRoute that reports FastAPI's request validation and response
+    serialization as the `validate` and `serialize` phases of profiled requests.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[..., Any]:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Any) -> Any:
+            profile = current_profile()
+            if profile is None:
+                return await handler(request)
+            profile.handler_started = time.perf_counter()
+            profile.endpoint_finished = None
+            response = await handler(request)
+            if profile.endpoint_finished is not None:
+                profile.add(
+                    "serialize", time.perf_counter() - profile.endpoint_finished
+                )
+            return response
+
+        return profiled_handler
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing
+from api.core.domain.track_archive import merge_tracks
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.core.ports.track_archive_port import TrackArchivePort
+from api.utils.time_utils import to_utc_naive
+
+
+class ArchivedFlightPositionRepository(FlightPositionPort):
+    """
+    Tiered-storage decorator for any FlightPositionPort.
+    Track reads return the flight's archived positions merged with the ones
+    still in the wrapped (hot) port, so archival is invisible to callers.
+    Flights with nothing archived cost one existence check. Area queries and
+    the retention methods only see the hot positions.
+    """
+
+    def __init__(self, inner: FlightPositionPort, archive: TrackArchivePort):
+        """
+        Wraps `inner`, reading archived tracks from `archive`.
+        """
+        self.inner = inner
+        self.archive = archive
+
+    def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        return self.inner.add_positions(flight_id, positions)
+
+    def add_position_batches(self, batches: Dict[int, List[FlightPosition]]) -> bool:
+        return self.inner.add_position_batches(batches)
+
+    def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
+        """
+        Retrieves a flight's whole track, archived and hot.
+        """
+        hot = self.inner.get_positions_by_flight_id(flight_id)
+        if not self.archive.has_track(flight_id):
+            return hot
+        return merge_tracks(self.archive.get_track(flight_id), hot)
+
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        """
+        Retrieves the positions of a flight with `start <= timestamp < end`,
+        archived and hot.
+        """
+        hot = self.inner.get_positions_between(flight_id, start, end)
+        if not self.archive.has_track(flight_id):
+            return hot
+        low = to_utc_naive(start) if start else None
+        high = to_utc_naive(end) if end else None
+        archived = [
+            position
+            for position in self.archive.get_track(flight_id)
+            if (low is None or to_utc_naive(position.timestamp) >= low)
+            and (high is None or to_utc_naive(position.timestamp) < high)
+        ]
+        return merge_tracks(archived, hot)
+
+    def delete_positions_by_flight_id(self, flight_id: int) -> bool:
+        """
+        Deletes a flight's hot and archived positions.
+        """
+        success = self.inner.delete_positions_by_flight_id(flight_id)
+        return self.archive.delete_track(flight_id) and success
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        return self.inner.flight_ids_with_positions_before(before, after_id, limit)
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        return self.inner.delete_positions_before(flight_id, before, limit)
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        return self.inner.find_flights_in_area(area, start, end)
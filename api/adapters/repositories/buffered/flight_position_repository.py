@@ -0,0 +1,270 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api.adapters.repositories.buffered.spool import PositionSpool
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing
+from api.core.domain.track_archive import merge_tracks
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.metrics import metrics
+from api.utils.time_utils import to_utc_naive
+
+BUFFER_DEPTH = metrics.gauge(
+    "position_buffer_depth",
+    "Positions accepted by the write-behind buffer and not yet stored.",
+)
+FLUSH_SECONDS = metrics.histogram(
+    "position_buffer_flush_seconds",
+    "Duration of the write-behind bulk inserts, by outcome.",
+)
+FLUSH_DELAY_SECONDS = metrics.histogram(
+    "position_buffer_delay_seconds",
+    "Time from accepting the oldest position of a flush to storing it.",
+)
+FLUSHED = metrics.counter(
+    "position_buffer_flushed_total",
+    "Positions written by write-behind flushes, by outcome.",
+)
+
+
+class BufferedFlightPositionRepository(FlightPositionPort):
+    """
+    Write-behind decorator for any FlightPositionPort.
+    `add_positions` logs the positions to a local PositionSpool and returns
+    (the spool write happens inside the buffer lock, its fsync outside it);
+    a background thread stores everything pending, across flights, with one
+    `add_position_batches` call once `max_batch` positions are waiting or the
+    oldest has waited `flush_interval_s`. Track reads include the pending
+    positions; area queries see them once stored. A failed flush keeps the
+    positions pending and is retried; records left in the spool by a crash
+    are replayed at startup, so delivery is at least once. Past
+    `max_pending` positions (a backend down for long), writes are refused
+    with BackendUnavailableError. `close` drains the buffer.
+    """
+
+    def __init__(
+        self,
+        inner: FlightPositionPort,
+        spool: PositionSpool,
+        max_batch: int = 5000,
+        flush_interval_s: float = 1.0,
+        max_pending: int = 100_000,
+        start: bool = True,
+    ):
+        """
+        Wraps `inner`, replaying the records left in `spool` and starting the
+        flusher thread unless `start` is False.
+        """
+        self.inner = inner
+        self.spool = spool
+        self.max_batch = max_batch
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self.pending: Dict[int, List[FlightPosition]] = {}
+        self.inflight: Dict[int, List[FlightPosition]] = {}
+        self.depth = 0
+        self._oldest: Optional[float] = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+
+        for record in spool.records():
+            if "d" in record:
+                self._drop_pending(record["d"])
+            else:
+                self._enqueue(
+                    record["f"],
+                    [
+                        FlightPosition.from_dict({**p, "flight_id": record["f"]})
+                        for p in record["p"]
+                    ],
+                )
+        self._thread = threading.Thread(
+            target=self._run, name="position-write-behind", daemon=True
+        )
+        if start:
+            self._thread.start()
+
+    def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        """
+        Accepts positions for a later bulk insert, once they are in the spool.
+        """
+        if not positions:
+            return False
+        with self._condition:
+            if self._closed:
+                return self.inner.add_positions(flight_id, positions)
+            if self.depth >= self.max_pending:
+                raise BackendUnavailableError(
+                    "The position write-behind buffer is full."
+                )
+            ticket = self.spool.append(
+                {"f": flight_id, "p": [position.to_dict() for position in positions]}
+            )
+            self._enqueue(flight_id, positions)
+            if self.depth == len(positions) or self.depth >= self.max_batch:
+                self._condition.notify()
+        self.spool.sync(ticket)
+        return True
+
+    def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
+        """
+        Retrieves a flight's stored positions together with its pending ones.
+        """
+        buffered = self._buffered(flight_id)
+        stored = self.inner.get_positions_by_flight_id(flight_id)
+        return merge_tracks(stored, buffered) if buffered else stored
+
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        low = to_utc_naive(start) if start else None
+        high = to_utc_naive(end) if end else None
+        buffered = [
+            position
+            for position in self._buffered(flight_id)
+            if (low is None or to_utc_naive(position.timestamp) >= low)
+            and (high is None or to_utc_naive(position.timestamp) < high)
+        ]
+        stored = self.inner.get_positions_between(flight_id, start, end)
+        return merge_tracks(stored, buffered) if buffered else stored
+
+    def delete_positions_by_flight_id(self, flight_id: int) -> bool:
+        """
+        Drops a flight's pending positions and deletes its stored ones. Waits
+        for a flush in progress, so it cannot store them again afterwards.
+        """
+        with self._flush_lock:
+            with self._condition:
+                if self._drop_pending(flight_id):
+                    self.spool.sync(self.spool.append({"d": flight_id}))
+            return self.inner.delete_positions_by_flight_id(flight_id)
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        return self.inner.flight_ids_with_positions_before(before, after_id, limit)
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        return self.inner.delete_positions_before(flight_id, before, limit)
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        return self.inner.find_flights_in_area(area, start, end)
+
+    def flush(self) -> bool:
+        """
+        Stores every pending position with one bulk insert. Returns False if
+        it failed, in which case the positions stay pending.
+        """
+        with self._flush_lock:
+            with self._condition:
+                if not self.pending:
+                    return True
+                batch, self.pending = self.pending, {}
+                self.inflight = batch
+                count, oldest = self.depth, self._oldest
+                self.depth, self._oldest = 0, None
+                sealed = self.spool.seal()
+
+            started = time.monotonic()
+            try:
+                stored = self.inner.add_position_batches(batch)
+            except Exception as e:
+                print(f"Error flushing {count} buffered positions: {e}")
+                stored = False
+            finished = time.monotonic()
+            outcome = "ok" if stored else "failed"
+            FLUSH_SECONDS.observe(finished - started, outcome=outcome)
+            FLUSHED.inc(count, outcome=outcome)
+
+            with self._condition:
+                self.inflight = {}
+                if stored:
+                    self.spool.discard_through(sealed)
+                    FLUSH_DELAY_SECONDS.observe(finished - oldest)
+                else:
+                    for flight_id, positions in batch.items():
+                        self.pending[flight_id] = positions + self.pending.get(
+                            flight_id, []
+                        )
+                    self.depth += count
+                    self._oldest = finished
+                BUFFER_DEPTH.set(self.depth)
+            return stored
+
+    def close(self, timeout_s: float = 10.0) -> bool:
+        """
+        Stops the flusher and drains the buffer; later writes go straight to
+        the wrapped port. Returns False if positions could not be stored (they
+        stay in the spool and are replayed at the next start).
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread.is_alive():
+            self._thread.join(timeout_s)
+        drained = self.flush()
+        if not drained:
+            print(
+                f"{self.depth} buffered positions were left in the spool at {self.spool.directory}."
+            )
+        self.spool.close()
+        return drained
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and not self._due():
+                    wait = None
+                    if self._oldest is not None:
+                        wait = self._oldest + self.flush_interval_s - time.monotonic()
+                    self._condition.wait(wait)
+                if self._closed:
+                    return
+            if not self.flush():
+                with self._condition:
+                    if not self._closed:
+                        self._condition.wait(self.flush_interval_s)
+
+    def _due(self) -> bool:
+        if self.depth >= self.max_batch:
+            return True
+        return (
+            self._oldest is not None
+            and time.monotonic() - self._oldest >= self.flush_interval_s
+        )
+
+    def _enqueue(self, flight_id: int, positions: List[FlightPosition]) -> None:
+        for position in positions:
+            position.flight_id = flight_id
+        self.pending.setdefault(flight_id, []).extend(positions)
+        self.depth += len(positions)
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        BUFFER_DEPTH.set(self.depth)
+
+    def _drop_pending(self, flight_id: int) -> bool:
+        dropped = self.pending.pop(flight_id, None)
+        if dropped:
+            self.depth -= len(dropped)
+            if not self.pending:
+                self._oldest = None
+            BUFFER_DEPTH.set(self.depth)
+        return bool(dropped)
+
+    def _buffered(self, flight_id: int) -> List[FlightPosition]:
+        with self._condition:
+            return self.inflight.get(flight_id, []) + self.pending.get(flight_id, [])
@@ -0,0 +1,172 @@
+import fcntl
+import json
+import os
+import threading
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+SEGMENT_SUFFIX = ".ndjson"
+LOCK_FILE = ".lock"
+
+
+class PositionSpool:
+    """
+    Append-only local log of the position writes accepted by the write-behind
+    buffer, so a crash loses nothing that was acknowledged.
+
+    Records are JSON lines in numbered segment files. `seal` closes the
+    active segment when its records are handed to a flush, and
+    `discard_through` deletes the segments whose records were stored. Each
+    process claims a `slot-N` directory under `root` with an exclusive lock,
+    so several workers can share `root`; slots left by processes that died
+    are adopted (their segments moved into the claimed slot) and replayed.
+    With `fsync`, appends return once the data is on disk, and concurrent
+    appends share one fsync.
+    """
+
+    def __init__(self, root: str, fsync: bool = True):
+        """
+        Claims a slot under `root`, adopting the segments of abandoned slots.
+        """
+        self.root = root
+        self.fsync = fsync
+        os.makedirs(root, exist_ok=True)
+        self.directory, self._slot_lock = self._claim_slot()
+        self._write_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._handle: Optional[IO[str]] = None
+        self._written = 0
+        self._synced = 0
+        self._adopt_abandoned_slots()
+        sequences = self._sequences()
+        self._sequence = (sequences[-1] + 1) if sequences else 1
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Appends a record to the active segment (written to the OS, so it
+        survives the process) and returns a ticket for `sync`.
+        """
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._write_lock:
+            if self._handle is None:
+                self._handle = open(
+                    self._segment_path(self._sequence), "a", encoding="utf-8"
+                )
+            self._handle.write(line)
+            self._handle.flush()
+            self._written += 1
+            return self._written
+
+    def sync(self, ticket: int) -> None:
+        """
+        With `fsync`, returns once the record of `ticket` is on disk. Callers
+        waiting at the same time share one fsync.
+        """
+        if not self.fsync:
+            return
+        with self._sync_lock:
+            if self._synced >= ticket:
+                return
+            with self._write_lock:
+                handle, written = self._handle, self._written
+            if handle is not None:
+                os.fsync(handle.fileno())
+            self._synced = written
+
+    def seal(self) -> int:
+        """
+        Closes the active segment, so later appends go to a new one. Returns
+        the sequence number of the last sealed segment.
+        """
+        with self._sync_lock, self._write_lock:
+            if self._handle is not None:
+                if self.fsync:
+                    os.fsync(self._handle.fileno())
+                self._synced = self._written
+                self._handle.close()
+                self._handle = None
+                self._sequence += 1
+            return self._sequence - 1
+
+    def discard_through(self, sequence: int) -> None:
+        """
+        Deletes the sealed segments up to `sequence`, once their records are stored.
+        """
+        for number in self._sequences():
+            if number <= sequence and number < self._sequence:
+                os.remove(self._segment_path(number))
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Reads back the records of every segment in order, for recovery. A
+        torn last line left by a crash is skipped.
+        """
+        for number in self._sequences():
+            with open(self._segment_path(number), "r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        print(f"Skipping a torn record in spool segment {number}.")
+
+    def close(self) -> None:
+        """
+        Closes the active segment and releases the slot.
+        """
+        self.seal()
+        self._slot_lock.close()
+
+    def _claim_slot(self) -> Tuple[str, IO[str]]:
+        slot = 0
+        while True:
+            directory = os.path.join(self.root, f"slot-{slot}")
+            lock = self._try_lock(directory)
+            if lock is not None:
+                return directory, lock
+            slot += 1
+
+    def _adopt_abandoned_slots(self) -> None:
+        for name in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, name)
+            if not name.startswith("slot-") or directory == self.directory:
+                continue
+            lock = self._try_lock(directory)
+            if lock is None:
+                continue
+            try:
+                first = (self._sequences()[-1] + 1) if self._sequences() else 1
+                for offset, number in enumerate(_segment_numbers(directory)):
+                    os.replace(
+                        os.path.join(directory, _segment_name(number)),
+                        self._segment_path(first + offset),
+                    )
+            finally:
+                lock.close()
+
+    @staticmethod
+    def _try_lock(directory: str) -> Optional[IO[str]]:
+        os.makedirs(directory, exist_ok=True)
+        handle = open(os.path.join(directory, LOCK_FILE), "a")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return handle
+        except OSError:
+            handle.close()
+            return None
+
+    def _sequences(self) -> List[int]:
+        return _segment_numbers(self.directory)
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, _segment_name(number))
+
+
+def _segment_name(number: int) -> str:
+    return f"{number:012d}{SEGMENT_SUFFIX}"
+
+
+def _segment_numbers(directory: str) -> List[int]:
+    return sorted(
+        int(name[: -len(SEGMENT_SUFFIX)])
+        for name in os.listdir(directory)
+        if name.endswith(SEGMENT_SUFFIX) and name[: -len(SEGMENT_SUFFIX)].isdigit()
+    )
@@ -0,0 +1,106 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.cache import TTLCache
+from api.utils.shared_cache import SharedCache, build_cache
+
+STALE_ON = (BackendUnavailableError,)
+
+
+class CachedFlightPositionRepository(FlightPositionPort):
+    """
+    Read-through caching decorator for any FlightPositionPort.
+    Whole tracks are cached per flight for a short TTL and dropped whenever
+    that flight's positions are written or deleted. While the wrapped port
+    raises BackendUnavailableError, tracks expired less than
+    `stale_ttl_seconds` ago are served. With a SharedCache, tracks are shared
+    by the workers of a host.
+    """
+
+    def __init__(
+        self,
+        inner: FlightPositionPort,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 256,
+        stale_ttl_seconds: float = 0.0,
+        shared: Optional[SharedCache] = None,
+        local_ttl_seconds: float = 1.0,
+    ):
+        """
+        Wraps `inner`, caching tracks for `ttl_seconds` (locally for at most
+        `local_ttl_seconds` when `shared` is given).
+        """
+        self.inner = inner
+        self.tracks: TTLCache[List[FlightPosition]] = build_cache(
+            ttl_seconds,
+            max_entries,
+            stale_ttl_seconds,
+            shared,
+            "tracks",
+            local_ttl_seconds,
+        )
+
+    def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        """
+        Adds positions through the wrapped port and drops the cached track.
+        """
+        success = self.inner.add_positions(flight_id, positions)
+        self.tracks.delete(flight_id)
+        return success
+
+    def add_position_batches(self, batches: Dict[int, List[FlightPosition]]) -> bool:
+        """
+        Adds several flights' positions through the wrapped port and drops their cached tracks.
+        """
+        success = self.inner.add_position_batches(batches)
+        for flight_id in batches:
+            self.tracks.delete(flight_id)
+        return success
+
+    def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
+        """
+        Retrieves a flight's track, from the cache when possible.
+        """
+        return self.tracks.get_or_load(
+            flight_id,
+            lambda: self.inner.get_positions_by_flight_id(flight_id),
+            STALE_ON,
+        )
+
+    def delete_positions_by_flight_id(self, flight_id: int) -> bool:
+        """
+        Deletes a flight's positions through the wrapped port and drops the cached track.
+        """
+        success = self.inner.delete_positions_by_flight_id(flight_id)
+        self.tracks.delete(flight_id)
+        return success
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        return self.inner.flight_ids_with_positions_before(before, after_id, limit)
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        """
+        Deletes old positions through the wrapped port and drops the cached track.
+        """
+        deleted = self.inner.delete_positions_before(flight_id, before, limit)
+        self.tracks.delete(flight_id)
+        return deleted
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        """
+        Area queries bypass the cache.
+        """
+        return self.inner.find_flights_in_area(area, start, end)
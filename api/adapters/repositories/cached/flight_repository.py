@@ -0,0 +1,200 @@
+from datetime import date
+from typing import Iterator, List, Optional, Sequence
+
+from api.core.domain.flight import Flight
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.core.ports.flight_port import CountMode, FlightPort
+from api.utils.cache import TTLCache
+from api.utils.shared_cache import SharedCache, build_cache
+
+STALE_ON = (BackendUnavailableError,)
+
+
+class CachedFlightRepository(FlightPort):
+    """
+    Read-through caching decorator for any FlightPort.
+    Single flights, filtered listings and the summary metrics are kept for a
+    short TTL. Writes go straight to the wrapped port and drop the listings
+    and the summary, which a new flight can change. While the wrapped port
+    raises BackendUnavailableError, reads are answered with entries expired
+    less than `stale_ttl_seconds` ago. Counts are cached for `count_ttl_seconds`
+    per normalised filter set and count mode. With a SharedCache, every
+    cache is tiered over it, so the workers of a host share their reads.
+    """
+
+    def __init__(
+        self,
+        inner: FlightPort,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 1024,
+        stale_ttl_seconds: float = 0.0,
+        count_ttl_seconds: Optional[float] = None,
+        shared: Optional[SharedCache] = None,
+        local_ttl_seconds: float = 1.0,
+    ):
+        """
+        Wraps `inner`, caching its reads for `ttl_seconds` (locally for at
+        most `local_ttl_seconds` when `shared` is given).
+        """
+        self.inner = inner
+
+        def cache(namespace: str, ttl: float, entries: int) -> TTLCache:
+            return build_cache(
+                ttl, entries, stale_ttl_seconds, shared, namespace, local_ttl_seconds
+            )
+
+        self.flights: TTLCache[Flight] = cache("flights", ttl_seconds, max_entries)
+        self.listings: TTLCache[List[Flight]] = cache(
+            "listings", ttl_seconds, max_entries
+        )
+        self.summary: TTLCache[dict] = cache("summary", ttl_seconds, 1)
+        self.counts: TTLCache[int] = cache(
+            "counts",
+            ttl_seconds if count_ttl_seconds is None else count_ttl_seconds,
+            max_entries,
+        )
+
+    def add(self, new_flight: Flight) -> Optional[Flight]:
+        """
+        Adds the flight through the wrapped port and invalidates derived reads.
+        """
+        flight = self.inner.add(new_flight)
+        if flight is not None:
+            self._forget_derived()
+            self._remember(flight)
+        return flight
+
+    def upsert(self, flight: Flight) -> Optional[Flight]:
+        """
+        Upserts the flight through the wrapped port and invalidates derived reads.
+        """
+        stored = self.inner.upsert(flight)
+        if stored is not None:
+            self._forget_derived()
+            self._remember(stored)
+        return stored
+
+    def upsert_many(self, flights: Sequence[Flight]) -> int:
+        """
+        Upserts the batch through the wrapped port and invalidates the cached
+        reads, including the single flights of the batch.
+        """
+        stored = self.inner.upsert_many(flights)
+        self._forget_derived()
+        self.flights.clear()
+        return stored
+
+    def get_by_id(self, flight_id: int) -> Optional[Flight]:
+        """
+        Retrieves a flight by ID, from the cache when possible.
+        """
+        return self.flights.get_or_load(
+            ("id", flight_id), lambda: self.inner.get_by_id(flight_id), STALE_ON
+        )
+
+    def get_by_fr24_id(self, fr24_id: str) -> Optional[Flight]:
+        """
+        Retrieves a flight by FR24 ID, from the cache when possible.
+        """
+        return self.flights.get_or_load(
+            ("fr24", fr24_id), lambda: self.inner.get_by_fr24_id(fr24_id), STALE_ON
+        )
+
+    def get_current_by_fr24_id(self, fr24_id: str) -> Optional[Flight]:
+        """
+        Retrieves a flight by FR24 ID from the wrapped port, past the cache.
+        """
+        return self.inner.get_current_by_fr24_id(fr24_id)
+
+    def find_all(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Flight]:
+        """
+        Retrieves a filtered page of flights, cached per filter combination.
+        Every flight in the page is also cached for lookups by ID.
+        """
+        key = (search, airport, aircraft_model, flight_date, limit, offset)
+        cached = self.listings.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            flights = self.inner.find_all(
+                search=search,
+                airport=airport,
+                aircraft_model=aircraft_model,
+                flight_date=flight_date,
+                limit=limit,
+                offset=offset,
+            )
+        except STALE_ON:
+            stale = self.listings.get_stale(key)
+            if stale is None:
+                raise
+            return stale
+        self.listings.set(key, flights)
+        for flight in flights:
+            self._remember(flight)
+        return flights
+
+    def count(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        """
+        Counts the matching flights, from the cache when possible. The filters
+        match case-insensitively, so they are normalised to lower case.
+        """
+        key = (
+            search.lower() if search else None,
+            airport.lower() if airport else None,
+            aircraft_model.lower() if aircraft_model else None,
+            flight_date,
+            mode,
+        )
+        return self.counts.get_or_load(
+            key,
+            lambda: self.inner.count(
+                search, airport, aircraft_model, flight_date, mode
+            ),
+            STALE_ON,
+        )
+
+    def iter_flights(
+        self, batch_size: int = 1000, after_id: int = 0
+    ) -> Iterator[List[Flight]]:
+        """
+        Full scans bypass the cache.
+        """
+        return self.inner.iter_flights(batch_size, after_id)
+
+    def get_summary_metrics(self) -> Optional[dict]:
+        """
+        Retrieves the summary metrics, from the cache when possible.
+        """
+        return self.summary.get_or_load(
+            "summary", self.inner.get_summary_metrics, STALE_ON
+        )
+
+    def _forget_derived(self) -> None:
+        """
+        Drops the reads a new or changed flight can invalidate.
+        """
+        self.listings.clear()
+        self.summary.clear()
+        self.counts.clear()
+
+    def _remember(self, flight: Flight) -> None:
+        if flight.flight_id is not None:
+            self.flights.set(("id", flight.flight_id), flight)
+        self.flights.set(("fr24", flight.fr24_id), flight)
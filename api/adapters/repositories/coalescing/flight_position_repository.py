@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.single_flight import SingleFlight
+from api.utils.time_utils import to_utc_naive
+
+
+class CoalescingFlightPositionRepository(FlightPositionPort):
+    """
+    Request-coalescing decorator for any FlightPositionPort.
+    Identical concurrent track, time-range and area reads share a single call
+    to the wrapped port. Writes detach the reads in flight.
+    """
+
+    def __init__(self, inner: FlightPositionPort):
+        """
+        Wraps `inner`, coalescing its reads.
+        """
+        self.inner = inner
+        self.calls = SingleFlight("positions")
+
+    def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        """
+        Adds positions through the wrapped port.
+        """
+        success = self.inner.add_positions(flight_id, positions)
+        self.calls.forget_all()
+        return success
+
+    def add_position_batches(self, batches: Dict[int, List[FlightPosition]]) -> bool:
+        """
+        Adds several flights' positions through the wrapped port.
+        """
+        success = self.inner.add_position_batches(batches)
+        self.calls.forget_all()
+        return success
+
+    def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
+        return self.calls.do(
+            ("track", flight_id),
+            lambda: self.inner.get_positions_by_flight_id(flight_id),
+        )
+
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        key = (
+            "between",
+            flight_id,
+            to_utc_naive(start) if start else None,
+            to_utc_naive(end) if end else None,
+        )
+        return self.calls.do(
+            key, lambda: self.inner.get_positions_between(flight_id, start, end)
+        )
+
+    def delete_positions_by_flight_id(self, flight_id: int) -> bool:
+        """
+        Deletes a flight's positions through the wrapped port.
+        """
+        success = self.inner.delete_positions_by_flight_id(flight_id)
+        self.calls.forget_all()
+        return success
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        return self.inner.flight_ids_with_positions_before(before, after_id, limit)
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        """
+        Deletes old positions through the wrapped port.
+        """
+        deleted = self.inner.delete_positions_before(flight_id, before, limit)
+        self.calls.forget_all()
+        return deleted
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        key = (
+            "area",
+            area,
+            to_utc_naive(start) if start else None,
+            to_utc_naive(end) if end else None,
+        )
+        return self.calls.do(
+            key, lambda: self.inner.find_flights_in_area(area, start, end)
+        )
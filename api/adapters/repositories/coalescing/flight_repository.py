@@ -0,0 +1,123 @@
+from datetime import date
+from typing import Iterator, List, Optional, Sequence
+
+from api.core.domain.flight import Flight
+from api.core.ports.flight_port import CountMode, FlightPort
+from api.utils.single_flight import SingleFlight
+
+
+class CoalescingFlightRepository(FlightPort):
+    """
+    Request-coalescing decorator for any FlightPort.
+    Identical concurrent reads (same lookup, or same normalised filters and
+    page) share a single call to the wrapped port and its result. Nothing is
+    kept after the call returns. Writes go straight through and detach the
+    reads in flight, so a read started after a write never gets older data.
+    """
+
+    def __init__(self, inner: FlightPort):
+        """
+        Wraps `inner`, coalescing its reads.
+        """
+        self.inner = inner
+        self.calls = SingleFlight("flights")
+
+    def add(self, new_flight: Flight) -> Optional[Flight]:
+        """
+        Adds the flight through the wrapped port.
+        """
+        flight = self.inner.add(new_flight)
+        self.calls.forget_all()
+        return flight
+
+    def upsert(self, flight: Flight) -> Optional[Flight]:
+        """
+        Upserts the flight through the wrapped port.
+        """
+        stored = self.inner.upsert(flight)
+        self.calls.forget_all()
+        return stored
+
+    def upsert_many(self, flights: Sequence[Flight]) -> int:
+        """
+        Upserts the batch through the wrapped port.
+        """
+        stored = self.inner.upsert_many(flights)
+        self.calls.forget_all()
+        return stored
+
+    def get_by_id(self, flight_id: int) -> Optional[Flight]:
+        return self.calls.do(("id", flight_id), lambda: self.inner.get_by_id(flight_id))
+
+    def get_by_fr24_id(self, fr24_id: str) -> Optional[Flight]:
+        return self.calls.do(
+            ("fr24", fr24_id), lambda: self.inner.get_by_fr24_id(fr24_id)
+        )
+
+    def find_all(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Flight]:
+        """
+        Retrieves a filtered page of flights. The filters are matched
+        case-insensitively by every backend, so they are compared in lower case.
+        """
+        key = (
+            "find_all",
+            search.lower() if search else None,
+            airport.lower() if airport else None,
+            aircraft_model.lower() if aircraft_model else None,
+            flight_date,
+            limit,
+            offset,
+        )
+        return self.calls.do(
+            key,
+            lambda: self.inner.find_all(
+                search=search,
+                airport=airport,
+                aircraft_model=aircraft_model,
+                flight_date=flight_date,
+                limit=limit,
+                offset=offset,
+            ),
+        )
+
+    def count(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        key = (
+            "count",
+            search.lower() if search else None,
+            airport.lower() if airport else None,
+            aircraft_model.lower() if aircraft_model else None,
+            flight_date,
+            mode,
+        )
+        return self.calls.do(
+            key,
+            lambda: self.inner.count(
+                search, airport, aircraft_model, flight_date, mode
+            ),
+        )
+
+    def iter_flights(
+        self, batch_size: int = 1000, after_id: int = 0
+    ) -> Iterator[List[Flight]]:
+        """
+        Full scans are not coalesced.
+        """
+        return self.inner.iter_flights(batch_size, after_id)
+
+    def get_summary_metrics(self) -> Optional[dict]:
+        return self.calls.do(("summary",), self.inner.get_summary_metrics)
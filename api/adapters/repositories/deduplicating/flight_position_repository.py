@@ -0,0 +1,143 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.metrics import metrics
+from api.utils.time_utils import to_epoch
+from api.utils.watermarks import TimestampWatermarks
+
+INGESTED = metrics.counter(
+    "position_ingest_total",
+    "Posted positions, by outcome: forwarded to the backend or dropped as duplicates.",
+)
+
+
+def _epoch_us(position: FlightPosition) -> int:
+    return round(to_epoch(position.timestamp) * 1_000_000)
+
+
+class DeduplicatingFlightPositionRepository(FlightPositionPort):
+    """
+    Duplicate-dropping decorator for any FlightPositionPort.
+    Remembers, per flight, the timestamps stored in the last `window_s`
+    seconds below its newest one, and drops posted positions with a timestamp
+    it has already stored (retries, overlapping uploads, write-behind
+    replays) before they reach the wrapped port. Older points and flights it
+    has not seen are forwarded: the adapters skip positions whose
+    (flight_id, timestamp) is already stored, which keeps ingestion
+    idempotent after a restart too.
+    """
+
+    def __init__(
+        self,
+        inner: FlightPositionPort,
+        window_s: float = 300.0,
+        max_flights: int = 10_000,
+    ):
+        """
+        Wraps `inner`, remembering the recent timestamps of up to `max_flights` flights.
+        """
+        self.inner = inner
+        self.seen = TimestampWatermarks(round(window_s * 1_000_000), max_flights)
+
+    def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        """
+        Adds the positions not stored yet. Returns True, with no backend call,
+        when all of them are duplicates.
+        """
+        if not positions:
+            return self.inner.add_positions(flight_id, positions)
+        timestamps = [_epoch_us(position) for position in positions]
+        fresh = self._unseen(flight_id, timestamps)
+        if not fresh:
+            return True
+        success = self.inner.add_positions(
+            flight_id, [positions[index] for index in fresh]
+        )
+        if success:
+            self.seen.add(flight_id, [timestamps[index] for index in fresh])
+        return success
+
+    def add_new_positions(
+        self, flight_id: int, positions: List[FlightPosition]
+    ) -> Optional[List[FlightPosition]]:
+        """
+        Adds the positions not stored yet and returns those the wrapped port
+        stored; an empty list, with no backend call, when all are duplicates.
+        """
+        if not positions:
+            return self.inner.add_new_positions(flight_id, positions)
+        timestamps = [_epoch_us(position) for position in positions]
+        fresh = self._unseen(flight_id, timestamps)
+        if not fresh:
+            return []
+        stored = self.inner.add_new_positions(
+            flight_id, [positions[index] for index in fresh]
+        )
+        if stored is not None:
+            self.seen.add(flight_id, [timestamps[index] for index in fresh])
+        return stored
+
+    def add_position_batches(self, batches: Dict[int, List[FlightPosition]]) -> bool:
+        """
+        Adds the positions of several flights that are not stored yet.
+        """
+        fresh_batches: Dict[int, List[FlightPosition]] = {}
+        fresh_timestamps: Dict[int, List[int]] = {}
+        for flight_id, positions in batches.items():
+            timestamps = [_epoch_us(position) for position in positions]
+            fresh = self._unseen(flight_id, timestamps)
+            if fresh:
+                fresh_batches[flight_id] = [positions[index] for index in fresh]
+                fresh_timestamps[flight_id] = [timestamps[index] for index in fresh]
+        if not fresh_batches:
+            return True
+        success = self.inner.add_position_batches(fresh_batches)
+        if success:
+            for flight_id, timestamps in fresh_timestamps.items():
+                self.seen.add(flight_id, timestamps)
+        return success
+
+    def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
+        return self.inner.get_positions_by_flight_id(flight_id)
+
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        return self.inner.get_positions_between(flight_id, start, end)
+
+    def delete_positions_by_flight_id(self, flight_id: int) -> bool:
+        """
+        Deletes a flight's positions and forgets its timestamps, so they can be posted again.
+        """
+        self.seen.forget(flight_id)
+        return self.inner.delete_positions_by_flight_id(flight_id)
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        return self.inner.flight_ids_with_positions_before(before, after_id, limit)
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        return self.inner.delete_positions_before(flight_id, before, limit)
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        return self.inner.find_flights_in_area(area, start, end)
+
+    def _unseen(self, flight_id: int, timestamps: List[int]) -> List[int]:
+        fresh = self.seen.unseen(flight_id, timestamps)
+        INGESTED.inc(len(fresh), outcome="forwarded")
+        INGESTED.inc(len(timestamps) - len(fresh), outcome="duplicate")
+        return fresh
@@ -0,0 +1,228 @@
+from typing import Optional, Tuple
+
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.core.ports.track_archive_port import TrackArchivePort
+from api.utils.env_manager import Settings
+from api.utils.resilience import CircuitBreaker, ResiliencePolicy
+from api.utils.shared_cache import SharedCache
+
+
+def build_repositories(settings: Settings) -> Tuple[FlightPort, FlightPositionPort]:
+    """
+    Builds the flight and position repositories for the configured backend.
+    Supabase calls get deadlines, hedging and a circuit breaker. With a
+    track archive, track reads also return the archived positions. Unless the
+    backend is already in memory, identical concurrent reads are coalesced
+    into one backend call and results are kept in a short-lived read cache
+    (so concurrent cache misses are coalesced too, and stale entries can be
+    served while the backend is unavailable), shared by the workers of the
+    host when a shared cache is configured. With write-behind, position
+    posts are spooled locally and stored with periodic bulk inserts.
+    Posted positions that were already stored are dropped up front.
+    """
+    flight_repository, position_repository = _build_backend_repositories(settings)
+
+    if (
+        settings.backend_resilience_enabled
+        and settings.repository_backend == "supabase"
+    ):
+        from api.adapters.repositories.resilient.flight_position_repository import (
+            ResilientFlightPositionRepository,
+        )
+        from api.adapters.repositories.resilient.flight_repository import (
+            ResilientFlightRepository,
+        )
+
+        policy = build_resilience_policy(settings)
+        flight_repository = ResilientFlightRepository(flight_repository, policy)
+        position_repository = ResilientFlightPositionRepository(
+            position_repository, policy
+        )
+
+    archive = build_track_archive(settings)
+    if archive is not None:
+        from api.adapters.repositories.archived.flight_position_repository import (
+            ArchivedFlightPositionRepository,
+        )
+
+        position_repository = ArchivedFlightPositionRepository(
+            position_repository, archive
+        )
+
+    if settings.coalesce_reads and settings.repository_backend != "memory":
+        from api.adapters.repositories.coalescing.flight_position_repository import (
+            CoalescingFlightPositionRepository,
+        )
+        from api.adapters.repositories.coalescing.flight_repository import (
+            CoalescingFlightRepository,
+        )
+
+        flight_repository = CoalescingFlightRepository(flight_repository)
+        position_repository = CoalescingFlightPositionRepository(position_repository)
+
+    if settings.cache_ttl_seconds > 0 and settings.repository_backend != "memory":
+        from api.adapters.repositories.cached.flight_position_repository import (
+            CachedFlightPositionRepository,
+        )
+        from api.adapters.repositories.cached.flight_repository import (
+            CachedFlightRepository,
+        )
+
+        shared = build_shared_cache(settings)
+        flight_repository = CachedFlightRepository(
+            flight_repository,
+            settings.cache_ttl_seconds,
+            settings.cache_max_entries,
+            settings.cache_stale_ttl_seconds,
+            settings.count_cache_ttl_seconds,
+            shared=shared,
+            local_ttl_seconds=settings.shared_cache_local_ttl_seconds,
+        )
+        position_repository = CachedFlightPositionRepository(
+            position_repository,
+            settings.cache_ttl_seconds,
+            stale_ttl_seconds=settings.cache_stale_ttl_seconds,
+            shared=shared,
+            local_ttl_seconds=settings.shared_cache_local_ttl_seconds,
+        )
+
+    if settings.write_behind_enabled:
+        from api.adapters.repositories.buffered.flight_position_repository import (
+            BufferedFlightPositionRepository,
+        )
+        from api.adapters.repositories.buffered.spool import PositionSpool
+
+        position_repository = BufferedFlightPositionRepository(
+            position_repository,
+            PositionSpool(
+                settings.write_behind_spool_path, fsync=settings.write_behind_fsync
+            ),
+            max_batch=settings.write_behind_max_batch,
+            flush_interval_s=settings.write_behind_flush_interval_seconds,
+            max_pending=settings.write_behind_max_pending,
+        )
+
+    if settings.position_dedup_enabled:
+        from api.adapters.repositories.deduplicating.flight_position_repository import (
+            DeduplicatingFlightPositionRepository,
+        )
+
+        position_repository = DeduplicatingFlightPositionRepository(
+            position_repository,
+            window_s=settings.position_dedup_window_seconds,
+            max_flights=settings.position_dedup_max_flights,
+        )
+
+    return flight_repository, position_repository
+
+
+def build_track_archive(settings: Settings) -> Optional[TrackArchivePort]:
+    """
+    Builds the archive of old tracks, or returns None when archival is not configured.
+    """
+    if not settings.track_archive_path:
+        return None
+    from api.adapters.repositories.filesystem.track_archive import (
+        FilesystemTrackArchive,
+    )
+
+    return FilesystemTrackArchive(settings.track_archive_path)
+
+
+def build_shared_cache(settings: Settings) -> Optional[SharedCache]:
+    """
+    Builds the cache tier shared by the workers of a host, or returns None
+    when the caches stay per process.
+    """
+    if not settings.shared_cache_path:
+        return None
+    return SharedCache(settings.shared_cache_path, settings.shared_cache_max_entries)
+
+
+def build_resilience_policy(settings: Settings) -> ResiliencePolicy:
+    """
+    Builds the deadline, hedging and circuit-breaker policy shared by both
+    repositories of a remote backend.
+    """
+    return ResiliencePolicy(
+        settings.repository_backend,
+        timeout_s=settings.backend_timeout_seconds,
+        hedge_quantile=0.95 if settings.backend_hedging_enabled else None,
+        hedge_min_delay_s=settings.backend_hedge_min_delay_seconds,
+        breaker=CircuitBreaker(
+            settings.repository_backend,
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            reset_timeout_s=settings.circuit_breaker_reset_seconds,
+        ),
+        max_workers=settings.backend_max_workers,
+    )
+
+
+def _build_backend_repositories(
+    settings: Settings,
+) -> Tuple[FlightPort, FlightPositionPort]:
+    """
+    Builds the repositories of the configured backend. Backend modules are
+    imported here, on demand, so a cold start only pays for the backend it
+    uses (the `supabase` package alone is a large import).
+    """
+    if settings.repository_backend == "memory":
+        from api.adapters.repositories.memory.flight_position_repository import (
+            InMemoryFlightPositionRepository,
+        )
+        from api.adapters.repositories.memory.flight_repository import (
+            InMemoryFlightRepository,
+        )
+
+        flight_repository = InMemoryFlightRepository()
+        if settings.memory_hydrate_from_supabase:
+            flight_repository.hydrate_from(_build_supabase_repositories(settings)[0])
+        return flight_repository, InMemoryFlightPositionRepository()
+
+    if settings.repository_backend == "sqlite":
+        from api.adapters.repositories.sqlite.database import SQLiteDatabase
+        from api.adapters.repositories.sqlite.flight_position_repository import (
+            SQLiteFlightPositionRepository,
+        )
+        from api.adapters.repositories.sqlite.flight_repository import (
+            SQLiteFlightRepository,
+        )
+
+        database = SQLiteDatabase(settings.sqlite_path)
+        return SQLiteFlightRepository(database), SQLiteFlightPositionRepository(
+            database
+        )
+
+    return _build_supabase_repositories(
+        settings, raise_errors=settings.backend_resilience_enabled
+    )
+
+
+def _build_supabase_repositories(
+    settings: Settings, raise_errors: bool = False
+) -> Tuple[FlightPort, FlightPositionPort]:
+    """
+    Builds both Supabase repositories on a single shared client, whose HTTP
+    timeout is the backend call timeout.
+    """
+    from supabase import ClientOptions, create_client
+
+    from api.adapters.repositories.supabase.flight_position_repository import (
+        SupabaseFlightPositionRepository,
+    )
+    from api.adapters.repositories.supabase.flight_repository import (
+        SupabaseFlightRepository,
+    )
+
+    client = create_client(
+        settings.supabase_url,
+        settings.supabase_key,
+        options=ClientOptions(
+            postgrest_client_timeout=settings.backend_timeout_seconds
+        ),
+    )
+    return (
+        SupabaseFlightRepository(client, raise_errors=raise_errors),
+        SupabaseFlightPositionRepository(client, raise_errors=raise_errors),
+    )
@@ -0,0 +1,119 @@
+import os
+from typing import Iterator, List
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.track_archive import (
+    ArchivedTrack,
+    decode_track,
+    encode_track,
+    read_track_header,
+)
+from api.core.ports.track_archive_port import TrackArchivePort
+
+TRACK_SUFFIX = ".trk"
+# Flights per directory, so no directory grows past a few thousand files.
+SHARD_SIZE = 1000
+
+
+class FilesystemTrackArchive(TrackArchivePort):
+    """
+    Filesystem adapter for the TrackArchivePort interface.
+    Each flight's track is one `encode_track` blob at
+    `<root>/<flight_id // 1000>/<flight_id>.trk`, written atomically, so the
+    directory can live on any local or mounted volume and be synced to
+    object storage as is.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initializes the archive under `root`, creating it if needed.
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def save_track(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        """
+        Stores a flight's archived track, replacing the previous one.
+        """
+        path = self._path(flight_id)
+        temporary = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temporary, "wb") as handle:
+                handle.write(encode_track(positions))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, path)
+            return True
+        except OSError as e:
+            print(f"Error archiving the track of flight ID '{flight_id}': {e}")
+            return False
+
+    def get_track(self, flight_id: int) -> List[FlightPosition]:
+        """
+        Retrieves a flight's archived track ordered by timestamp.
+        """
+        try:
+            with open(self._path(flight_id), "rb") as handle:
+                return decode_track(flight_id, handle.read())
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            print(f"Error reading the archived track of flight ID '{flight_id}': {e}")
+            return []
+
+    def has_track(self, flight_id: int) -> bool:
+        return os.path.exists(self._path(flight_id))
+
+    def delete_track(self, flight_id: int) -> bool:
+        """
+        Deletes a flight's archived track.
+        """
+        try:
+            os.remove(self._path(flight_id))
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            print(f"Error deleting the archived track of flight ID '{flight_id}': {e}")
+            return False
+
+    def list_tracks(self, after_id: int = 0, limit: int = 1000) -> List[ArchivedTrack]:
+        """
+        Summaries of archived tracks after `after_id`, read from the blob
+        headers only.
+        """
+        tracks: List[ArchivedTrack] = []
+        for flight_id in self._flight_ids(after_id):
+            if len(tracks) >= limit:
+                break
+            path = self._path(flight_id)
+            try:
+                with open(path, "rb") as handle:
+                    count, first, last = read_track_header(handle.read(64))
+                tracks.append(
+                    ArchivedTrack(flight_id, count, first, last, os.path.getsize(path))
+                )
+            except (OSError, ValueError) as e:
+                print(
+                    f"Error reading the archived track of flight ID '{flight_id}': {e}"
+                )
+        return tracks
+
+    def _flight_ids(self, after_id: int) -> Iterator[int]:
+        shards = sorted(int(name) for name in os.listdir(self.root) if name.isdigit())
+        for shard in shards:
+            if (shard + 1) * SHARD_SIZE <= after_id + 1:
+                continue
+            names = os.listdir(os.path.join(self.root, str(shard)))
+            flight_ids = sorted(
+                int(name[: -len(TRACK_SUFFIX)])
+                for name in names
+                if name.endswith(TRACK_SUFFIX) and name[: -len(TRACK_SUFFIX)].isdigit()
+            )
+            yield from (flight_id for flight_id in flight_ids if flight_id > after_id)
+
+    def _path(self, flight_id: int) -> str:
+        return os.path.join(
+            self.root, str(flight_id // SHARD_SIZE), f"{flight_id}{TRACK_SUFFIX}"
+        )
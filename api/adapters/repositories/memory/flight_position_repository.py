@@ -0,0 +1,222 @@
+import bisect
+import itertools
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from api.adapters.repositories.memory.spatial_index import GridIndex
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing, crossing_from_points
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.time_utils import from_epoch, to_epoch, to_utc_naive
+
+
+class InMemoryFlightPositionRepository(FlightPositionPort):
+    """
+    In-process adapter for the FlightPositionPort interface.
+    Each flight owns an array of positions ordered by timestamp, with a parallel
+    array of normalized timestamps for range lookups. A GridIndex over
+    (time bucket, latitude/longitude cell) answers area queries.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty store.
+        """
+        self._lock = threading.RLock()
+        self._tracks: Dict[int, List[FlightPosition]] = {}
+        self._timestamps: Dict[int, List[datetime]] = {}
+        self._ids = itertools.count(1)
+        self._grid = GridIndex()
+
+    def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        """
+        Adds positions to a flight's track, keeping it ordered by timestamp.
+        Appending points newer than the last stored one is O(k). Points whose
+        timestamp the flight already has are skipped, so replays are harmless.
+        """
+        return self.add_new_positions(flight_id, positions) is not None
+
+    def add_new_positions(
+        self, flight_id: int, positions: List[FlightPosition]
+    ) -> Optional[List[FlightPosition]]:
+        """
+        Adds positions like `add_positions` and returns the ones stored.
+        """
+        if not positions:
+            return None
+
+        with self._lock:
+            track = self._tracks.setdefault(flight_id, [])
+            timestamps = self._timestamps.setdefault(flight_id, [])
+
+            incoming = []
+            seen = set()
+            for position in positions:
+                key = to_utc_naive(position.timestamp)
+                index = bisect.bisect_left(timestamps, key)
+                if key in seen or (
+                    index < len(timestamps) and timestamps[index] == key
+                ):
+                    continue
+                seen.add(key)
+                position.flight_id = flight_id
+                if position.position_id is None:
+                    position.position_id = next(self._ids)
+                incoming.append((key, position))
+            if not incoming:
+                return []
+
+            in_order = all(
+                incoming[i][0] <= incoming[i + 1][0] for i in range(len(incoming) - 1)
+            )
+            if in_order and (not timestamps or timestamps[-1] <= incoming[0][0]):
+                timestamps.extend(key for key, _ in incoming)
+                track.extend(position for _, position in incoming)
+            else:
+                merged = sorted(
+                    itertools.chain(zip(timestamps, track), incoming),
+                    key=lambda item: item[0],
+                )
+                self._timestamps[flight_id] = [key for key, _ in merged]
+                self._tracks[flight_id] = [position for _, position in merged]
+            self._grid.add(
+                flight_id,
+                (
+                    (to_epoch(key), position.latitude, position.longitude)
+                    for key, position in incoming
+                ),
+            )
+            return [position for _, position in incoming]
+
+    def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
+        """
+        Retrieves all positions of a flight ordered by timestamp.
+        """
+        with self._lock:
+            return list(self._tracks.get(flight_id, []))
+
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        """
+        Retrieves the positions of a flight with `start <= timestamp < end`
+        using binary search over the ordered track.
+        """
+        with self._lock:
+            timestamps = self._timestamps.get(flight_id, [])
+            low = bisect.bisect_left(timestamps, to_utc_naive(start)) if start else 0
+            high = (
+                bisect.bisect_left(timestamps, to_utc_naive(end))
+                if end
+                else len(timestamps)
+            )
+            return self._tracks.get(flight_id, [])[low:high]
+
+    def delete_positions_by_flight_id(self, flight_id: int) -> bool:
+        """
+        Deletes all positions of a flight.
+        """
+        with self._lock:
+            self._tracks.pop(flight_id, None)
+            self._timestamps.pop(flight_id, None)
+            self._grid.remove(flight_id)
+            return True
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        """
+        IDs of the flights whose first position is older than `before`.
+        """
+        cutoff = to_utc_naive(before)
+        with self._lock:
+            flight_ids = sorted(
+                flight_id
+                for flight_id, timestamps in self._timestamps.items()
+                if flight_id > after_id and timestamps and timestamps[0] < cutoff
+            )
+        return flight_ids[:limit]
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        """
+        Drops the oldest positions of a flight and re-indexes what is left of it.
+        """
+        with self._lock:
+            timestamps = self._timestamps.get(flight_id, [])
+            count = bisect.bisect_left(timestamps, to_utc_naive(before))
+            if limit is not None:
+                count = min(count, limit)
+            if count == 0:
+                return 0
+            if count == len(timestamps):
+                self.delete_positions_by_flight_id(flight_id)
+                return count
+            del timestamps[:count]
+            del self._tracks[flight_id][:count]
+            self._grid.remove(flight_id)
+            self._grid.add(
+                flight_id,
+                (
+                    (to_epoch(key), position.latitude, position.longitude)
+                    for key, position in zip(timestamps, self._tracks[flight_id])
+                ),
+            )
+            return count
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        """
+        Finds the flights with positions inside `area` with `start <= timestamp < end`.
+        The grid narrows the search to the flights seen in the overlapping
+        cells, whose positions in that time span are then checked exactly.
+        """
+        start_epoch, end_epoch = to_epoch(start), to_epoch(end)
+        crossings = []
+        with self._lock:
+            candidates = self._grid.candidates(
+                area.bounding_box(), start_epoch, end_epoch
+            )
+            for flight_id, (first, last) in candidates.items():
+                window_start = first if start_epoch is None else max(first, start_epoch)
+                window_end = (
+                    last + 1e-3 if end_epoch is None else min(last + 1e-3, end_epoch)
+                )
+                positions = self.get_positions_between(
+                    flight_id, from_epoch(window_start), from_epoch(window_end)
+                )
+                crossing = crossing_from_points(
+                    flight_id,
+                    ((p.timestamp, p.latitude, p.longitude) for p in positions),
+                    area,
+                )
+                if crossing is not None:
+                    crossings.append(crossing)
+        crossings.sort(key=lambda crossing: to_utc_naive(crossing.entry_time))
+        return crossings
+
+    def hydrate_from(
+        self, source: FlightPositionPort, flight_ids: Iterable[int]
+    ) -> int:
+        """
+        Copies the tracks of `flight_ids` from another FlightPositionPort into
+        this store, replacing any existing track. Returns the number of positions loaded.
+        """
+        loaded = 0
+        for flight_id in flight_ids:
+            positions = source.get_positions_by_flight_id(flight_id)
+            with self._lock:
+                self.delete_positions_by_flight_id(flight_id)
+                if positions:
+                    self.add_positions(flight_id, positions)
+            loaded += len(positions)
+        return loaded
@@ -0,0 +1,321 @@
+import bisect
+import itertools
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from api.core.domain.flight import Flight
+from api.core.ports.flight_port import CountMode, FlightPort
+from api.utils.time_utils import to_utc_naive
+
+
+class InMemoryFlightRepository(FlightPort):
+    """
+    In-process adapter for the FlightPort interface.
+    Flights are kept as domain objects with secondary indexes, so lookups and
+    filtered listings never decode rows. Used as a local development backend,
+    as the benchmark baseline and as a read replica hydrated from Supabase.
+
+    Indexes:
+        - hash indexes on `flight_id` and `fr24_id`
+        - a sorted (departure_time_utc, flight_id) index for date filters
+        - per-airport (departure and arrival) and per-aircraft-model id sets
+    Summary metrics are maintained incrementally as flights are added.
+    """
+
+    def __init__(self, flights: Optional[Iterable[Flight]] = None):
+        """
+        Initializes an empty store, optionally seeded with `flights`.
+        """
+        self._lock = threading.RLock()
+        self._flights: Dict[int, Flight] = {}
+        self._by_fr24_id: Dict[str, int] = {}
+        self._ordered_ids: List[int] = []
+        self._departures: List[Tuple[datetime, int]] = []
+        self._by_airport: Dict[str, Set[int]] = {}
+        self._by_model: Dict[str, Set[int]] = {}
+        self._ids = itertools.count(1)
+
+        self._distance_sum = 0.0
+        self._distance_count = 0
+        self._fuel_saving = 0.0
+        self._co2_saving = 0.0
+
+        self._store_many(flights or [])
+
+    def add(self, new_flight: Flight) -> Optional[Flight]:
+        """
+        Adds a new flight, assigning a `flight_id` when it has none.
+        Returns None if the id or FR24 ID is already taken, like the unique
+        constraints of the database would.
+        """
+        with self._lock:
+            if new_flight.fr24_id in self._by_fr24_id:
+                return None
+            if (
+                new_flight.flight_id is not None
+                and new_flight.flight_id in self._flights
+            ):
+                return None
+            return self._store(new_flight)
+
+    def upsert(self, flight: Flight) -> Optional[Flight]:
+        """
+        Adds the flight, or replaces the stored flight with the same FR24 ID
+        (the new flight takes over its `flight_id`).
+        """
+        with self._lock:
+            existing_id = self._by_fr24_id.get(flight.fr24_id)
+            if existing_id is not None:
+                self._unstore(self._flights[existing_id])
+                flight.flight_id = existing_id
+            elif flight.flight_id is not None and flight.flight_id in self._flights:
+                return None
+            return self._store(flight)
+
+    def upsert_many(self, flights: Sequence[Flight]) -> int:
+        """
+        Upserts a batch of flights under a single lock acquisition.
+        """
+        with self._lock:
+            return sum(1 for flight in flights if self.upsert(flight) is not None)
+
+    def get_by_id(self, flight_id: int) -> Optional[Flight]:
+        """
+        Retrieves a single flight by its internal ID.
+        """
+        return self._flights.get(flight_id)
+
+    def get_by_fr24_id(self, fr24_id: str) -> Optional[Flight]:
+        """
+        Retrieves a single flight by its FlightRadar24 unique ID.
+        """
+        flight_id = self._by_fr24_id.get(fr24_id)
+        return self._flights.get(flight_id) if flight_id is not None else None
+
+    def find_all(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Flight]:
+        """
+        Retrieves a filtered and paginated list of flights ordered by `flight_id`,
+        with the same semantics as the Supabase adapter: `search`, `airport` and
+        `aircraft_model` are case-insensitive substring matches and `flight_date`
+        selects departures within that UTC day.
+        """
+        with self._lock:
+            ordered = self._matching_ids(search, airport, aircraft_model, flight_date)
+            return [
+                self._flights[flight_id]
+                for flight_id in ordered[offset : offset + limit]
+            ]
+
+    def count(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        """
+        Counts the matching flights from the indexes; always exact.
+        """
+        with self._lock:
+            return len(self._matching_ids(search, airport, aircraft_model, flight_date))
+
+    def _matching_ids(
+        self,
+        search: Optional[str],
+        airport: Optional[str],
+        aircraft_model: Optional[str],
+        flight_date: Optional[date],
+    ) -> List[int]:
+        """
+        IDs of the flights matching the filters, in order (called with the lock held).
+        """
+        candidates: List[Set[int]] = []
+
+        if airport:
+            term = airport.upper()
+            candidates.append(self._union_matching(self._by_airport, term))
+
+        if aircraft_model:
+            term = aircraft_model.lower()
+            candidates.append(self._union_matching(self._by_model, term))
+
+        if flight_date:
+            start = datetime.combine(flight_date, datetime.min.time())
+            end = start + timedelta(days=1)
+            low = bisect.bisect_left(self._departures, (start, -1))
+            high = bisect.bisect_left(self._departures, (end, -1))
+            candidates.append(
+                {flight_id for _, flight_id in self._departures[low:high]}
+            )
+
+        if candidates:
+            candidates.sort(key=len)
+            matched = set.intersection(*candidates)
+            ordered = sorted(matched)
+        else:
+            ordered = self._ordered_ids
+
+        if search:
+            term = search.lower()
+            ordered = [
+                flight_id
+                for flight_id in ordered
+                if self._matches_search(self._flights[flight_id], term)
+            ]
+        return ordered
+
+    def iter_flights(
+        self, batch_size: int = 1000, after_id: int = 0
+    ) -> Iterator[List[Flight]]:
+        """
+        Yields the flights stored at call time in batches, ordered by ID.
+        """
+        with self._lock:
+            start = bisect.bisect_right(self._ordered_ids, after_id)
+            flights = [
+                self._flights[flight_id] for flight_id in self._ordered_ids[start:]
+            ]
+        for start in range(0, len(flights), batch_size):
+            yield flights[start : start + batch_size]
+
+    def get_summary_metrics(self) -> Optional[dict]:
+        """
+        Returns the running summary metrics in the shape of the
+        `get_flight_summary_metrics` database function, or None when empty.
+        """
+        with self._lock:
+            if not self._flights:
+                return None
+            return {
+                "total_flights": len(self._flights),
+                "avg_distance": (
+                    self._distance_sum / self._distance_count
+                    if self._distance_count
+                    else 0.0
+                ),
+                "total_fuel_saving": self._fuel_saving,
+                "total_co2_saving": self._co2_saving,
+            }
+
+    def hydrate_from(self, source: FlightPort, page_size: int = 1000) -> int:
+        """
+        Copies every flight from another FlightPort (e.g. Supabase) into this
+        store, paging through `find_all`. Flights already present are replaced.
+        Returns the number of flights loaded.
+        """
+        loaded = 0
+        for offset in itertools.count(0, page_size):
+            page = source.find_all(limit=page_size, offset=offset)
+            with self._lock:
+                for flight in page:
+                    if flight.flight_id in self._flights:
+                        self._unstore(self._flights[flight.flight_id])
+                self._store_many(page)
+            loaded += len(page)
+            if len(page) < page_size:
+                break
+        return loaded
+
+    def _store_many(self, flights: Iterable[Flight]) -> None:
+        """Bulk variant of `_store` that sorts the ordered indexes once at the end."""
+        for flight in flights:
+            self._store(flight, keep_sorted=False)
+        self._ordered_ids.sort()
+        self._departures.sort()
+
+    def _store(self, flight: Flight, keep_sorted: bool = True) -> Flight:
+        if flight.flight_id is None:
+            flight.flight_id = next(self._ids)
+            while flight.flight_id in self._flights:
+                flight.flight_id = next(self._ids)
+
+        flight_id = flight.flight_id
+        self._flights[flight_id] = flight
+        self._by_fr24_id[flight.fr24_id] = flight_id
+        departure = (
+            (to_utc_naive(flight.departure_time_utc), flight_id)
+            if flight.departure_time_utc
+            else None
+        )
+        if keep_sorted:
+            bisect.insort(self._ordered_ids, flight_id)
+            if departure:
+                bisect.insort(self._departures, departure)
+        else:
+            self._ordered_ids.append(flight_id)
+            if departure:
+                self._departures.append(departure)
+        for code in {flight.departure_icao, flight.arrival_icao}:
+            if code:
+                self._by_airport.setdefault(code.upper(), set()).add(flight_id)
+        if flight.aircraft_model:
+            self._by_model.setdefault(flight.aircraft_model.lower(), set()).add(
+                flight_id
+            )
+
+        self._apply_to_summary(flight, 1)
+        return flight
+
+    def _unstore(self, flight: Flight) -> None:
+        flight_id = flight.flight_id
+        del self._flights[flight_id]
+        self._by_fr24_id.pop(flight.fr24_id, None)
+        self._ordered_ids.pop(bisect.bisect_left(self._ordered_ids, flight_id))
+
+        if flight.departure_time_utc:
+            key = (to_utc_naive(flight.departure_time_utc), flight_id)
+            self._departures.pop(bisect.bisect_left(self._departures, key))
+        for code in {flight.departure_icao, flight.arrival_icao}:
+            if code:
+                self._discard(self._by_airport, code.upper(), flight_id)
+        if flight.aircraft_model:
+            self._discard(self._by_model, flight.aircraft_model.lower(), flight_id)
+
+        self._apply_to_summary(flight, -1)
+
+    def _apply_to_summary(self, flight: Flight, sign: int) -> None:
+        if flight.distance_calculated_km is not None:
+            self._distance_sum += sign * flight.distance_calculated_km
+            self._distance_count += sign
+        if flight.emission_comparison:
+            fuel_saving = flight.emission_comparison.fuel_saving_kg()
+            co2_saving = flight.emission_comparison.co2_per_passenger_saving_kg()
+            if fuel_saving is not None:
+                self._fuel_saving += sign * fuel_saving
+            if co2_saving is not None:
+                self._co2_saving += sign * co2_saving
+
+    @staticmethod
+    def _union_matching(index: Dict[str, Set[int]], term: str) -> Set[int]:
+        """Union of the id sets whose key contains `term` (an ILIKE '%term%')."""
+        exact = index.get(term)
+        matched = set(exact) if exact else set()
+        for key, ids in index.items():
+            if key != term and term in key:
+                matched |= ids
+        return matched
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[int]], key: str, flight_id: int) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(flight_id)
+            if not ids:
+                del index[key]
+
+    @staticmethod
+    def _matches_search(flight: Flight, term: str) -> bool:
+        return any(
+            value and term in value.lower()
+            for value in (flight.flight, flight.fr24_id, flight.callsign)
+        )
@@ -0,0 +1,145 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from api.core.domain.geo import (
+    BUCKET_SECONDS,
+    CELL_DEGREES,
+    BoundingBox,
+    cell_count,
+    cell_of,
+    cells_in_box,
+    track_boxes,
+)
+
+Cell = Tuple[int, int]
+
+
+class GridIndex:
+    """
+    Spatio-temporal grid over the position tracks: for every time bucket and
+    grid cell, the flights with positions in it and the first/last epoch they
+    were seen there. Tracks are added incrementally as positions arrive; a
+    query only visits the buckets of its time window and the cells of its box.
+    """
+
+    def __init__(
+        self, cell_degrees: float = CELL_DEGREES, bucket_seconds: int = BUCKET_SECONDS
+    ):
+        """
+        Initializes an empty index.
+        """
+        self.cell_degrees = cell_degrees
+        self.bucket_seconds = bucket_seconds
+        self._buckets: Dict[int, Dict[Cell, Dict[int, List[float]]]] = {}
+        self._keys_by_flight: Dict[int, Set[Tuple[int, int, int]]] = {}
+
+    def add(self, flight_id: int, points: Iterable[Tuple[float, float, float]]) -> None:
+        """
+        Indexes (epoch, latitude, longitude) points of a flight.
+        """
+        keys = self._keys_by_flight.setdefault(flight_id, set())
+        for key, box in track_boxes(
+            points, self.cell_degrees, self.bucket_seconds
+        ).items():
+            bucket, row, column = key
+            flights = self._buckets.setdefault(bucket, {}).setdefault((row, column), {})
+            seen = flights.get(flight_id)
+            if seen is None:
+                flights[flight_id] = [box[4], box[5]]
+            else:
+                seen[0] = min(seen[0], box[4])
+                seen[1] = max(seen[1], box[5])
+            keys.add(key)
+
+    def remove(self, flight_id: int) -> None:
+        """
+        Drops every entry of a flight.
+        """
+        for bucket, row, column in self._keys_by_flight.pop(flight_id, ()):
+            cells = self._buckets.get(bucket)
+            if cells is None:
+                continue
+            flights = cells.get((row, column))
+            if flights is not None:
+                flights.pop(flight_id, None)
+                if not flights:
+                    del cells[(row, column)]
+            if not cells:
+                del self._buckets[bucket]
+
+    def candidates(
+        self,
+        box: BoundingBox,
+        start_epoch: Optional[float] = None,
+        end_epoch: Optional[float] = None,
+    ) -> Dict[int, Tuple[float, float]]:
+        """
+        Flights with indexed cells overlapping `box` and the time window, with
+        the first and last epoch of their positions in those cells.
+        """
+        first_bucket = (
+            int(start_epoch // self.bucket_seconds) if start_epoch is not None else None
+        )
+        last_bucket = (
+            int(end_epoch // self.bucket_seconds) if end_epoch is not None else None
+        )
+        if (
+            first_bucket is not None
+            and last_bucket is not None
+            and last_bucket - first_bucket < len(self._buckets)
+        ):
+            buckets = range(first_bucket, last_bucket + 1)
+        else:
+            buckets = [
+                bucket
+                for bucket in self._buckets
+                if (first_bucket is None or bucket >= first_bucket)
+                and (last_bucket is None or bucket <= last_bucket)
+            ]
+
+        wanted = cell_count(box, self.cell_degrees)
+        box_cells: Optional[List[Cell]] = None
+        first_row, last_row, column_ranges = self._cell_ranges(box)
+        result: Dict[int, Tuple[float, float]] = {}
+        for bucket in buckets:
+            cells = self._buckets.get(bucket)
+            if not cells:
+                continue
+            if wanted <= len(cells):
+                if box_cells is None:
+                    box_cells = list(cells_in_box(box, self.cell_degrees))
+                matches = (cells.get(cell) for cell in box_cells)
+            else:
+                matches = (
+                    flights
+                    for (row, column), flights in cells.items()
+                    if first_row <= row <= last_row
+                    and any(low <= column <= high for low, high in column_ranges)
+                )
+            for flights in matches:
+                if not flights:
+                    continue
+                for flight_id, (first, last) in flights.items():
+                    if start_epoch is not None and last < start_epoch:
+                        continue
+                    if end_epoch is not None and first >= end_epoch:
+                        continue
+                    seen = result.get(flight_id)
+                    result[flight_id] = (
+                        (first, last)
+                        if seen is None
+                        else (min(seen[0], first), max(seen[1], last))
+                    )
+        return result
+
+    def _cell_ranges(self, box: BoundingBox) -> Tuple[int, int, List[Tuple[int, int]]]:
+        """First and last cell row of a box and its (first, last) column ranges."""
+        first_row, _ = cell_of(box.min_lat, 0.0, self.cell_degrees)
+        last_row, _ = cell_of(box.max_lat, 0.0, self.cell_degrees)
+        column_ranges = [
+            (
+                cell_of(0.0, min_lon, self.cell_degrees)[1],
+                cell_of(0.0, min(max_lon, 180.0 - 1e-9), self.cell_degrees)[1],
+            )
+            for min_lon, max_lon in box.lon_ranges()
+        ]
+        return first_row, last_row, column_ranges
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.resilience import ResiliencePolicy
+
+
+class ResilientFlightPositionRepository(FlightPositionPort):
+    """
+    Fault-tolerance decorator for a remote FlightPositionPort.
+    Calls get a deadline and go through the backend's circuit breaker; whole
+    track reads are hedged.
+    """
+
+    def __init__(self, inner: FlightPositionPort, policy: ResiliencePolicy):
+        """
+        Wraps `inner`, running its calls under `policy`.
+        """
+        self.inner = inner
+        self.policy = policy
+
+    def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        return self.policy.call(
+            "positions.add", lambda: self.inner.add_positions(flight_id, positions)
+        )
+
+    def add_position_batches(self, batches: Dict[int, List[FlightPosition]]) -> bool:
+        return self.policy.call(
+            "positions.add_batches", lambda: self.inner.add_position_batches(batches)
+        )
+
+    def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
+        return self.policy.call(
+            "positions.track",
+            lambda: self.inner.get_positions_by_flight_id(flight_id),
+            hedge=True,
+        )
+
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        return self.policy.call(
+            "positions.between",
+            lambda: self.inner.get_positions_between(flight_id, start, end),
+            hedge=True,
+        )
+
+    def delete_positions_by_flight_id(self, flight_id: int) -> bool:
+        return self.policy.call(
+            "positions.delete",
+            lambda: self.inner.delete_positions_by_flight_id(flight_id),
+        )
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        return self.policy.call(
+            "positions.ids_before",
+            lambda: self.inner.flight_ids_with_positions_before(
+                before, after_id, limit
+            ),
+        )
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        return self.policy.call(
+            "positions.delete_before",
+            lambda: self.inner.delete_positions_before(flight_id, before, limit),
+        )
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        return self.policy.call(
+            "positions.area", lambda: self.inner.find_flights_in_area(area, start, end)
+        )
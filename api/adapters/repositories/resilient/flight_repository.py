@@ -0,0 +1,93 @@
+from datetime import date
+from typing import Iterator, List, Optional, Sequence
+
+from api.core.domain.flight import Flight
+from api.core.ports.flight_port import CountMode, FlightPort
+from api.utils.resilience import ResiliencePolicy
+
+
+class ResilientFlightRepository(FlightPort):
+    """
+    Fault-tolerance decorator for a remote FlightPort.
+    Every call gets a deadline from the request budget and goes through the
+    backend's circuit breaker; lookups by ID are hedged. Failures surface as
+    BackendUnavailableError instead of empty results, so the read cache can
+    answer with stale data and the API with a 503.
+    """
+
+    def __init__(self, inner: FlightPort, policy: ResiliencePolicy):
+        """
+        Wraps `inner`, running its calls under `policy`.
+        """
+        self.inner = inner
+        self.policy = policy
+
+    def add(self, new_flight: Flight) -> Optional[Flight]:
+        return self.policy.call("flights.add", lambda: self.inner.add(new_flight))
+
+    def upsert(self, flight: Flight) -> Optional[Flight]:
+        return self.policy.call("flights.upsert", lambda: self.inner.upsert(flight))
+
+    def upsert_many(self, flights: Sequence[Flight]) -> int:
+        return self.policy.call(
+            "flights.upsert_many", lambda: self.inner.upsert_many(flights)
+        )
+
+    def get_by_id(self, flight_id: int) -> Optional[Flight]:
+        return self.policy.call(
+            "flights.get_by_id", lambda: self.inner.get_by_id(flight_id), hedge=True
+        )
+
+    def get_by_fr24_id(self, fr24_id: str) -> Optional[Flight]:
+        return self.policy.call(
+            "flights.get_by_fr24_id",
+            lambda: self.inner.get_by_fr24_id(fr24_id),
+            hedge=True,
+        )
+
+    def find_all(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Flight]:
+        return self.policy.call(
+            "flights.find_all",
+            lambda: self.inner.find_all(
+                search=search,
+                airport=airport,
+                aircraft_model=aircraft_model,
+                flight_date=flight_date,
+                limit=limit,
+                offset=offset,
+            ),
+        )
+
+    def count(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        return self.policy.call(
+            f"flights.count.{mode}",
+            lambda: self.inner.count(
+                search, airport, aircraft_model, flight_date, mode
+            ),
+        )
+
+    def iter_flights(
+        self, batch_size: int = 1000, after_id: int = 0
+    ) -> Iterator[List[Flight]]:
+        """
+        Full scans are long-running batch work; they bypass the deadlines and the breaker.
+        """
+        return self.inner.iter_flights(batch_size, after_id)
+
+    def get_summary_metrics(self) -> Optional[dict]:
+        return self.policy.call("flights.summary", self.inner.get_summary_metrics)
@@ -0,0 +1,164 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from api.utils.profiling import phase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    flight_id INTEGER PRIMARY KEY,
+    fr24_id TEXT NOT NULL UNIQUE,
+    flight TEXT,
+    callsign TEXT,
+    aircraft_model TEXT,
+    aircraft_reg TEXT,
+    departure_icao TEXT,
+    arrival_icao TEXT,
+    distance_calculated_km REAL,
+    great_circle_distance_km REAL,
+    departure_time_utc REAL,
+    arrival_time_utc REAL,
+    flight_duration_s INTEGER,
+    phase_durations_s TEXT,
+    emission_comparison TEXT,
+    fuel_saving_kg REAL,
+    co2_saving_kg REAL,
+    created_at REAL,
+    last_updated REAL
+);
+CREATE INDEX IF NOT EXISTS flights_departure_time_idx ON flights (departure_time_utc);
+CREATE INDEX IF NOT EXISTS flights_departure_icao_idx ON flights (departure_icao COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS flights_arrival_icao_idx ON flights (arrival_icao COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS flights_aircraft_model_idx ON flights (aircraft_model COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS flight_positions (
+    position_id INTEGER PRIMARY KEY,
+    flight_id INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    altitude INTEGER,
+    ground_speed INTEGER,
+    vertical_rate INTEGER
+);
+
+-- One box per (flight, hour, 0.5 degree cell) of its track, for area queries.
+-- The id packs the flight id and a per-flight sequence: (flight_id << 24) + seq.
+CREATE VIRTUAL TABLE IF NOT EXISTS position_cells USING rtree(
+    id, min_lat, max_lat, min_lon, max_lon, min_t, max_t
+);
+CREATE TABLE IF NOT EXISTS position_cell_counts (
+    flight_id INTEGER PRIMARY KEY,
+    boxes INTEGER NOT NULL
+);
+"""
+
+# Unique, so a flight has one position per timestamp and replayed points are skipped.
+POSITIONS_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS flight_positions_flight_time_idx "
+    "ON flight_positions (flight_id, timestamp)"
+)
+DEDUPLICATE_POSITIONS_SQL = (
+    "DELETE FROM flight_positions WHERE position_id NOT IN "
+    "(SELECT MIN(position_id) FROM flight_positions GROUP BY flight_id, timestamp)"
+)
+
+
+class SQLiteDatabase:
+    """
+    A file-backed (or ':memory:') SQLite database shared by the SQLite repositories.
+    A single connection is serialized through a lock; WAL journaling keeps
+    readers of the file from other processes unblocked.
+    """
+
+    def __init__(self, path: str = "flights.db"):
+        """
+        Opens the database at `path` and creates the schema if needed.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA temp_store=MEMORY")
+        self.connection.execute("PRAGMA cache_size=-65536")
+        self.connection.executescript(SCHEMA)
+        self._migrate_positions_index()
+        self.connection.execute(POSITIONS_INDEX)
+
+    @contextmanager
+    def cursor(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Yields a cursor while holding the connection lock. The time spent
+        inside, lock wait included, is the request's `backend` phase.
+        """
+        with phase("backend"), self._lock:
+            cursor = self.connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Yields a cursor inside an IMMEDIATE transaction, committed on success
+        and rolled back on error.
+        """
+        with self.cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    @contextmanager
+    def bulk_load(self, drop_position_index: bool = False) -> Iterator[sqlite3.Cursor]:
+        """
+        Transaction tuned for large imports: relaxed durability for its duration and,
+        optionally, the (flight_id, timestamp) index dropped and rebuilt once at the end
+        (after dropping the duplicate positions the load brought in).
+        """
+        with self._lock:
+            self.connection.execute("PRAGMA synchronous=OFF")
+            if drop_position_index:
+                self.connection.execute(
+                    "DROP INDEX IF EXISTS flight_positions_flight_time_idx"
+                )
+            try:
+                with self.transaction() as cursor:
+                    yield cursor
+                    if drop_position_index:
+                        cursor.execute(DEDUPLICATE_POSITIONS_SQL)
+            finally:
+                if drop_position_index:
+                    self.connection.execute(POSITIONS_INDEX)
+                self.connection.execute("PRAGMA synchronous=NORMAL")
+                self.connection.execute("ANALYZE")
+
+    def _migrate_positions_index(self) -> None:
+        """
+        Databases created before the (flight_id, timestamp) index was unique
+        may hold duplicate positions: keeps the first of each and drops the old index.
+        """
+        row = self.connection.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' "
+            "AND name = 'flight_positions_flight_time_idx'"
+        ).fetchone()
+        if row is None or row[0].upper().startswith("CREATE UNIQUE"):
+            return
+        with self.transaction() as cursor:
+            cursor.execute(DEDUPLICATE_POSITIONS_SQL)
+            cursor.execute("DROP INDEX flight_positions_flight_time_idx")
+
+    def close(self) -> None:
+        """
+        Closes the underlying connection.
+        """
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,384 @@
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.adapters.repositories.sqlite.database import SQLiteDatabase
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import (
+    BUCKET_SECONDS,
+    CELL_DEGREES,
+    Area,
+    AreaCrossing,
+    crossing_from_points,
+    track_boxes,
+)
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.profiling import phase
+from api.utils.time_utils import from_epoch, to_epoch
+
+INSERT_SQL = (
+    "INSERT INTO flight_positions (flight_id, timestamp, latitude, longitude, "
+    "altitude, ground_speed, vertical_rate) VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (flight_id, timestamp) DO NOTHING"
+)
+SELECT_SQL = (
+    "SELECT position_id, flight_id, timestamp, latitude, longitude, altitude, "
+    "ground_speed, vertical_rate FROM flight_positions"
+)
+# Boxes per flight are numbered within the id as (flight_id << CELL_ID_BITS) + seq.
+CELL_ID_BITS = 24
+CELL_INSERT_SQL = (
+    "INSERT INTO position_cells (id, min_lat, max_lat, min_lon, max_lon, min_t, max_t) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+CELL_CANDIDATES_SQL = (
+    f"SELECT id >> {CELL_ID_BITS}, MIN(min_t), MAX(max_t) FROM position_cells "
+    "WHERE max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ? "
+    "AND max_t >= ? AND min_t < ? GROUP BY 1"
+)
+REBUILD_CELLS_SQL = f"""
+INSERT INTO position_cells (id, min_lat, max_lat, min_lon, max_lon, min_t, max_t)
+SELECT (flight_id << {CELL_ID_BITS}) + ROW_NUMBER() OVER (PARTITION BY flight_id) - 1,
+       MIN(latitude), MAX(latitude), MIN(longitude), MAX(longitude),
+       MIN(timestamp), MAX(timestamp)
+FROM flight_positions
+GROUP BY flight_id,
+         CAST(timestamp / {BUCKET_SECONDS} AS INTEGER),
+         CAST((latitude + 90.0) / {CELL_DEGREES} AS INTEGER),
+         CAST((longitude + 180.0) / {CELL_DEGREES} AS INTEGER)
+"""
+
+
+def position_to_params(flight_id: int, position: FlightPosition) -> Tuple[Any, ...]:
+    """
+    Flattens a FlightPosition into the column values of 'flight_positions'.
+    """
+    return (
+        flight_id,
+        to_epoch(position.timestamp),
+        position.latitude,
+        position.longitude,
+        position.altitude,
+        position.ground_speed,
+        position.vertical_rate,
+    )
+
+
+def row_to_position(row: Tuple[Any, ...]) -> FlightPosition:
+    """
+    Builds a FlightPosition from a row selected with SELECT_SQL.
+    """
+    (
+        position_id,
+        flight_id,
+        timestamp,
+        latitude,
+        longitude,
+        altitude,
+        ground_speed,
+        vertical_rate,
+    ) = row
+    return FlightPosition(
+        flight_id=flight_id,
+        timestamp=from_epoch(timestamp),
+        latitude=latitude,
+        longitude=longitude,
+        altitude=altitude,
+        ground_speed=ground_speed,
+        vertical_rate=vertical_rate,
+        position_id=position_id,
+    )
+
+
+def new_position_params(
+    cursor: sqlite3.Cursor, flight_id: int, positions: List[FlightPosition]
+) -> List[Tuple[Any, ...]]:
+    """
+    Column values of the positions whose timestamp the flight does not have
+    yet (stored or earlier in `positions`), found with one index range scan.
+    """
+    params = {}
+    for position in positions:
+        row = position_to_params(flight_id, position)
+        params.setdefault(row[1], row)
+    if not params:
+        return []
+    stored = cursor.execute(
+        "SELECT timestamp FROM flight_positions "
+        "WHERE flight_id = ? AND timestamp BETWEEN ? AND ?",
+        (flight_id, min(params), max(params)),
+    )
+    for (timestamp,) in stored:
+        params.pop(timestamp, None)
+    return list(params.values())
+
+
+def index_track(
+    cursor: sqlite3.Cursor, flight_id: int, params: List[Tuple[Any, ...]]
+) -> None:
+    """
+    Adds the boxes of newly inserted position rows (as built by
+    `position_to_params`) to the 'position_cells' R-tree.
+    """
+    boxes = track_boxes((row[1], row[2], row[3]) for row in params)
+    count = cursor.execute(
+        "SELECT boxes FROM position_cell_counts WHERE flight_id = ?", (flight_id,)
+    ).fetchone()
+    first = count[0] if count else 0
+    base = flight_id << CELL_ID_BITS
+    cursor.executemany(
+        CELL_INSERT_SQL,
+        (
+            (base + first + seq, box[0], box[1], box[2], box[3], box[4], box[5])
+            for seq, box in enumerate(boxes.values())
+        ),
+    )
+    cursor.execute(
+        "INSERT INTO position_cell_counts (flight_id, boxes) VALUES (?, ?) "
+        "ON CONFLICT (flight_id) DO UPDATE SET boxes = excluded.boxes",
+        (flight_id, first + len(boxes)),
+    )
+
+
+def rebuild_spatial_index(cursor: sqlite3.Cursor) -> None:
+    """
+    Rebuilds the 'position_cells' R-tree from every stored position with a
+    single aggregation, for use after bulk loads that bypass `add_positions`.
+    """
+    cursor.execute("DELETE FROM position_cells")
+    cursor.execute("DELETE FROM position_cell_counts")
+    cursor.execute(REBUILD_CELLS_SQL)
+    cursor.execute(
+        "INSERT INTO position_cell_counts (flight_id, boxes) "
+        f"SELECT id >> {CELL_ID_BITS}, COUNT(*) FROM position_cells GROUP BY 1"
+    )
+
+
+class SQLiteFlightPositionRepository(FlightPositionPort):
+    """
+    SQLite adapter for the FlightPositionPort interface.
+    Positions are clustered for reads by a (flight_id, timestamp) index, so a
+    track or a time window of it is a single index range scan. Area queries
+    use the 'position_cells' R-tree, which holds one box per flight, hour and
+    grid cell of its track and is kept up to date by `add_positions`.
+    """
+
+    def __init__(self, database: SQLiteDatabase):
+        """
+        Initializes the repository on a shared SQLiteDatabase.
+        """
+        self.database = database
+
+    def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        """
+        Adds a list of flight positions associated with a given flight ID.
+        Positions whose timestamp the flight already has are skipped.
+        """
+        if not positions:
+            return False
+        try:
+            with self.database.transaction() as cursor:
+                params = new_position_params(cursor, flight_id, positions)
+                cursor.executemany(INSERT_SQL, params)
+                if params:
+                    index_track(cursor, flight_id, params)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error adding flight positions for flight ID '{flight_id}': {e}")
+            return False
+
+    def add_position_batches(self, batches: Dict[int, List[FlightPosition]]) -> bool:
+        """
+        Adds the positions of several flights in a single transaction.
+        """
+        try:
+            with self.database.transaction() as cursor:
+                for flight_id, positions in batches.items():
+                    params = new_position_params(cursor, flight_id, positions)
+                    if params:
+                        cursor.executemany(INSERT_SQL, params)
+                        index_track(cursor, flight_id, params)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error adding positions for {len(batches)} flights: {e}")
+            return False
+
+    def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
+        """
+        Retrieves all flight positions for a specific flight ID, ordered by timestamp.
+        """
+        return self.get_positions_between(flight_id)
+
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        """
+        Retrieves the positions of a flight with `start <= timestamp < end`.
+        """
+        sql = f"{SELECT_SQL} WHERE flight_id = ?"
+        params: List[Any] = [flight_id]
+        if start:
+            sql += " AND timestamp >= ?"
+            params.append(to_epoch(start))
+        if end:
+            sql += " AND timestamp < ?"
+            params.append(to_epoch(end))
+        sql += " ORDER BY timestamp"
+        try:
+            with self.database.cursor() as cursor:
+                rows = cursor.execute(sql, params).fetchall()
+            with phase("decode"):
+                return [row_to_position(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error retrieving flight positions for flight ID '{flight_id}': {e}")
+            return []
+
+    def delete_positions_by_flight_id(self, flight_id: int) -> bool:
+        """
+        Deletes all flight positions for a specific flight ID.
+        """
+        try:
+            with self.database.transaction() as cursor:
+                cursor.execute(
+                    "DELETE FROM flight_positions WHERE flight_id = ?", (flight_id,)
+                )
+                count = cursor.execute(
+                    "SELECT boxes FROM position_cell_counts WHERE flight_id = ?",
+                    (flight_id,),
+                ).fetchone()
+                if count:
+                    base = flight_id << CELL_ID_BITS
+                    cursor.executemany(
+                        "DELETE FROM position_cells WHERE id = ?",
+                        ((base + seq,) for seq in range(count[0])),
+                    )
+                    cursor.execute(
+                        "DELETE FROM position_cell_counts WHERE flight_id = ?",
+                        (flight_id,),
+                    )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error deleting flight positions for flight ID '{flight_id}': {e}")
+            return False
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        """
+        IDs of the flights with positions older than `before`, walking the
+        (flight_id, timestamp) index.
+        """
+        try:
+            with self.database.cursor() as cursor:
+                rows = cursor.execute(
+                    "SELECT DISTINCT flight_id FROM flight_positions "
+                    "WHERE flight_id > ? AND timestamp < ? ORDER BY flight_id LIMIT ?",
+                    (after_id, to_epoch(before), limit),
+                ).fetchall()
+            return [row[0] for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error searching flights with positions before {before}: {e}")
+            return []
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        """
+        Deletes the oldest positions of a flight in one bounded statement, and
+        the R-tree boxes that only covered deleted positions.
+        """
+        try:
+            with self.database.transaction() as cursor:
+                deleted = cursor.execute(
+                    "DELETE FROM flight_positions WHERE position_id IN ("
+                    "SELECT position_id FROM flight_positions "
+                    "WHERE flight_id = ? AND timestamp < ? ORDER BY timestamp LIMIT ?)",
+                    (flight_id, to_epoch(before), -1 if limit is None else limit),
+                ).rowcount
+                if deleted:
+                    oldest = cursor.execute(
+                        "SELECT MIN(timestamp) FROM flight_positions WHERE flight_id = ?",
+                        (flight_id,),
+                    ).fetchone()[0]
+                    base = flight_id << CELL_ID_BITS
+                    cursor.execute(
+                        "DELETE FROM position_cells WHERE id >= ? AND id < ? AND max_t < ?",
+                        (
+                            base,
+                            base + (1 << CELL_ID_BITS),
+                            float("inf") if oldest is None else oldest,
+                        ),
+                    )
+                    if oldest is None:
+                        cursor.execute(
+                            "DELETE FROM position_cell_counts WHERE flight_id = ?",
+                            (flight_id,),
+                        )
+            return deleted
+        except sqlite3.Error as e:
+            print(
+                f"Error deleting old flight positions for flight ID '{flight_id}': {e}"
+            )
+            return 0
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        """
+        Finds the flights with positions inside `area` with `start <= timestamp < end`.
+        The R-tree yields the candidate flights and the time span of their
+        boxes overlapping the area; only those positions are then read and
+        checked exactly.
+        """
+        box = area.bounding_box()
+        start_epoch = to_epoch(start) if start else float("-inf")
+        end_epoch = to_epoch(end) if end else float("inf")
+        try:
+            candidates: Dict[int, Tuple[float, float]] = {}
+            with self.database.cursor() as cursor:
+                for min_lon, max_lon in box.lon_ranges():
+                    rows = cursor.execute(
+                        CELL_CANDIDATES_SQL,
+                        (
+                            box.min_lat,
+                            box.max_lat,
+                            min_lon,
+                            max_lon,
+                            start_epoch,
+                            end_epoch,
+                        ),
+                    ).fetchall()
+                    for flight_id, first, last in rows:
+                        seen = candidates.get(flight_id)
+                        candidates[flight_id] = (
+                            (first, last)
+                            if seen is None
+                            else (min(seen[0], first), max(seen[1], last))
+                        )
+
+                crossings = []
+                for flight_id, (first, last) in candidates.items():
+                    rows = cursor.execute(
+                        "SELECT timestamp, latitude, longitude FROM flight_positions "
+                        "WHERE flight_id = ? AND timestamp >= ? AND timestamp <= ? "
+                        "AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+                        (flight_id, first, last, start_epoch, end_epoch),
+                    ).fetchall()
+                    crossing = crossing_from_points(
+                        flight_id,
+                        ((from_epoch(ts), lat, lon) for ts, lat, lon in rows),
+                        area,
+                    )
+                    if crossing is not None:
+                        crossings.append(crossing)
+            crossings.sort(key=lambda crossing: crossing.entry_time)
+            return crossings
+        except sqlite3.Error as e:
+            print(f"Error searching flight positions in area {area}: {e}")
+            return []
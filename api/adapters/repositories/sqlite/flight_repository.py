@@ -0,0 +1,304 @@
+import json
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from api.adapters.repositories.sqlite.database import SQLiteDatabase
+from api.core.domain.flight import Flight
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.core.ports.flight_port import CountMode, FlightPort
+from api.utils.profiling import phase
+from api.utils.time_utils import from_epoch, to_epoch
+
+COLUMNS = (
+    "flight_id",
+    "fr24_id",
+    "flight",
+    "callsign",
+    "aircraft_model",
+    "aircraft_reg",
+    "departure_icao",
+    "arrival_icao",
+    "distance_calculated_km",
+    "great_circle_distance_km",
+    "departure_time_utc",
+    "arrival_time_utc",
+    "flight_duration_s",
+    "phase_durations_s",
+    "emission_comparison",
+    "fuel_saving_kg",
+    "co2_saving_kg",
+    "created_at",
+    "last_updated",
+)
+SELECT_COLUMNS = ", ".join(COLUMNS[:15] + COLUMNS[17:])
+INSERT_SQL = (
+    f"INSERT INTO flights ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+)
+UPSERT_SQL = (
+    INSERT_SQL
+    + " ON CONFLICT (fr24_id) DO UPDATE SET "
+    + ", ".join(
+        f"{column} = excluded.{column}"
+        for column in COLUMNS
+        if column not in ("flight_id", "fr24_id", "created_at")
+    )
+)
+TIME_COLUMNS = ("departure_time_utc", "arrival_time_utc", "created_at", "last_updated")
+
+
+def flight_to_params(flight: Flight) -> Tuple[Any, ...]:
+    """
+    Flattens a Flight into the column values of the 'flights' table.
+    JSONB columns are stored as JSON text; savings are precomputed for the summary.
+    """
+    comparison = flight.emission_comparison
+    return (
+        flight.flight_id,
+        flight.fr24_id,
+        flight.flight,
+        flight.callsign,
+        flight.aircraft_model,
+        flight.aircraft_reg,
+        flight.departure_icao,
+        flight.arrival_icao,
+        flight.distance_calculated_km,
+        flight.great_circle_distance_km,
+        to_epoch(flight.departure_time_utc),
+        to_epoch(flight.arrival_time_utc),
+        flight.flight_duration_s,
+        (
+            json.dumps(flight.phase_durations_s.to_dict())
+            if flight.phase_durations_s
+            else None
+        ),
+        json.dumps(comparison.to_dict()) if comparison else None,
+        comparison.fuel_saving_kg() if comparison else None,
+        comparison.co2_per_passenger_saving_kg() if comparison else None,
+        to_epoch(flight.created_at),
+        to_epoch(flight.last_updated),
+    )
+
+
+def row_to_flight(row: sqlite3.Row) -> Flight:
+    """
+    Builds a Flight from a 'flights' row selected with SELECT_COLUMNS.
+    """
+    data: Dict[str, Any] = dict(row)
+    for key in TIME_COLUMNS:
+        data[key] = from_epoch(data[key])
+    for key in ("phase_durations_s", "emission_comparison"):
+        if data[key]:
+            data[key] = json.loads(data[key])
+    return Flight.from_db_row(data)
+
+
+class SQLiteFlightRepository(FlightPort):
+    """
+    SQLite adapter for the FlightPort interface.
+    A file-backed backend for offline analysis and CI, with indexes on the
+    departure time, airports and aircraft model.
+    """
+
+    def __init__(self, database: SQLiteDatabase):
+        """
+        Initializes the repository on a shared SQLiteDatabase.
+        """
+        self.database = database
+
+    def add(self, new_flight: Flight) -> Optional[Flight]:
+        """
+        Adds a new flight record. Returns the created Flight with its new ID,
+        or None on failure (e.g. a duplicated FR24 ID).
+        """
+        try:
+            with self.database.transaction() as cursor:
+                cursor.execute(INSERT_SQL, flight_to_params(new_flight))
+                flight_id = cursor.lastrowid
+            return self.get_by_id(flight_id)
+        except sqlite3.Error as e:
+            print(f"Error adding flight to SQLite: {e}")
+            return None
+
+    def upsert(self, flight: Flight) -> Optional[Flight]:
+        """
+        Inserts the flight or updates the row with the same FR24 ID in place.
+        Returns the stored Flight, or None on failure.
+        """
+        try:
+            with self.database.transaction() as cursor:
+                cursor.execute(UPSERT_SQL, flight_to_params(flight))
+            return self.get_by_fr24_id(flight.fr24_id)
+        except sqlite3.Error as e:
+            print(f"Error upserting flight '{flight.fr24_id}' to SQLite: {e}")
+            return None
+
+    def upsert_many(self, flights: Sequence[Flight]) -> int:
+        """
+        Upserts a batch of flights with one executemany in a single transaction.
+        Returns the number of flights stored, or 0 on failure.
+        """
+        try:
+            with self.database.transaction() as cursor:
+                cursor.executemany(
+                    UPSERT_SQL, [flight_to_params(flight) for flight in flights]
+                )
+            return len(flights)
+        except sqlite3.Error as e:
+            print(f"Error upserting {len(flights)} flights to SQLite: {e}")
+            return 0
+
+    def get_by_id(self, flight_id: int) -> Optional[Flight]:
+        """
+        Retrieves a single flight by its internal database ID.
+        """
+        return self._fetch_one("flight_id = ?", (flight_id,))
+
+    def get_by_fr24_id(self, fr24_id: str) -> Optional[Flight]:
+        """
+        Retrieves a single flight record by its FlightRadar24 unique ID.
+        """
+        return self._fetch_one("fr24_id = ?", (fr24_id,))
+
+    def find_all(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Flight]:
+        """
+        Retrieves a filtered and paginated list of flight records ordered by ID.
+        LIKE is case-insensitive in SQLite, matching the ILIKE filters of Supabase.
+        """
+        where, params = self._where(search, airport, aircraft_model, flight_date)
+        sql = f"SELECT {SELECT_COLUMNS} FROM flights {where} ORDER BY flight_id LIMIT ? OFFSET ?"
+        try:
+            with self.database.cursor() as cursor:
+                cursor.row_factory = sqlite3.Row
+                rows = cursor.execute(sql, (*params, limit, offset)).fetchall()
+            with phase("decode"):
+                return [row_to_flight(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error retrieving all flights with filters: {e}")
+            return []
+
+    def count(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        """
+        Counts the matching flights with COUNT(*). SQLite has no planner
+        estimates, so every mode is exact (and cheap on a local file).
+        """
+        where, params = self._where(search, airport, aircraft_model, flight_date)
+        try:
+            with self.database.cursor() as cursor:
+                return cursor.execute(
+                    f"SELECT COUNT(*) FROM flights {where}", params
+                ).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error counting flights with filters: {e}")
+            return None
+
+    @staticmethod
+    def _where(
+        search: Optional[str],
+        airport: Optional[str],
+        aircraft_model: Optional[str],
+        flight_date: Optional[date],
+    ) -> Tuple[str, List[Any]]:
+        """
+        The WHERE clause and its parameters for the `find_all` filters.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if search:
+            term = f"%{search}%"
+            clauses.append("(flight LIKE ? OR fr24_id LIKE ? OR callsign LIKE ?)")
+            params += [term, term, term]
+
+        if airport:
+            term = f"%{airport.upper()}%"
+            clauses.append("(departure_icao LIKE ? OR arrival_icao LIKE ?)")
+            params += [term, term]
+
+        if aircraft_model:
+            clauses.append("aircraft_model LIKE ?")
+            params.append(f"%{aircraft_model}%")
+
+        if flight_date:
+            start_of_day = datetime.combine(flight_date, datetime.min.time())
+            end_of_day = start_of_day + timedelta(days=1)
+            clauses.append("departure_time_utc >= ? AND departure_time_utc < ?")
+            params += [to_epoch(start_of_day), to_epoch(end_of_day)]
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def iter_flights(
+        self, batch_size: int = 1000, after_id: int = 0
+    ) -> Iterator[List[Flight]]:
+        """
+        Yields every flight in batches using keyset pagination on the primary key.
+        Raises BackendUnavailableError if a batch cannot be read.
+        """
+        sql = f"SELECT {SELECT_COLUMNS} FROM flights WHERE flight_id > ? ORDER BY flight_id LIMIT ?"
+        last_id = after_id
+        while True:
+            try:
+                with self.database.cursor() as cursor:
+                    cursor.row_factory = sqlite3.Row
+                    rows = cursor.execute(sql, (last_id, batch_size)).fetchall()
+            except sqlite3.Error as e:
+                raise BackendUnavailableError(
+                    f"Error scanning flights after ID {last_id}: {e}"
+                ) from e
+
+            if rows:
+                yield [row_to_flight(row) for row in rows]
+                last_id = rows[-1]["flight_id"]
+            if len(rows) < batch_size:
+                return
+
+    def get_summary_metrics(self) -> Optional[dict]:
+        """
+        Aggregates the summary metrics with a single scan of the precomputed columns.
+        """
+        sql = (
+            "SELECT COUNT(*) AS total_flights, "
+            "COALESCE(AVG(distance_calculated_km), 0.0) AS avg_distance, "
+            "TOTAL(fuel_saving_kg) AS total_fuel_saving, "
+            "TOTAL(co2_saving_kg) AS total_co2_saving FROM flights"
+        )
+        try:
+            with self.database.cursor() as cursor:
+                cursor.row_factory = sqlite3.Row
+                row = cursor.execute(sql).fetchone()
+            if row and row["total_flights"]:
+                return dict(row)
+            return None
+        except sqlite3.Error as e:
+            print(f"Error retrieving summary metrics: {e}")
+            return None
+
+    def _fetch_one(self, where: str, params: Tuple[Any, ...]) -> Optional[Flight]:
+        try:
+            with self.database.cursor() as cursor:
+                cursor.row_factory = sqlite3.Row
+                row = cursor.execute(
+                    f"SELECT {SELECT_COLUMNS} FROM flights WHERE {where}", params
+                ).fetchone()
+            with phase("decode"):
+                return row_to_flight(row) if row else None
+        except sqlite3.Error as e:
+            print(f"Error retrieving flight ({where} {params}): {e}")
+            return None
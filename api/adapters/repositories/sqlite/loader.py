@@ -0,0 +1,167 @@
+"""
+Bulk loading of Supabase exports (NDJSON or Parquet) into the SQLite backend.
+
+    python -m api.adapters.repositories.sqlite.loader --db flights.db \
+        --flights flights.ndjson --positions flight_positions.parquet
+"""
+
+import argparse
+import itertools
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from api.adapters.repositories.sqlite.database import SQLiteDatabase
+from api.adapters.repositories.sqlite.flight_position_repository import (
+    rebuild_spatial_index,
+)
+from api.adapters.repositories.sqlite.flight_repository import (
+    INSERT_SQL as FLIGHT_INSERT_SQL,
+)
+from api.adapters.repositories.sqlite.flight_repository import flight_to_params
+from api.core.domain.flight import Flight
+from api.utils.time_utils import to_epoch
+
+POSITION_COPY_SQL = (
+    "INSERT OR IGNORE INTO flight_positions (position_id, flight_id, timestamp, latitude, longitude, "
+    "altitude, ground_speed, vertical_rate) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one dict per non-empty line of a newline-delimited JSON file.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_parquet(path: str, batch_size: int = 65_536) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one dict per row of a Parquet file, reading it in record batches.
+    Requires the optional `pyarrow` package.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(
+            "Loading Parquet exports requires the 'pyarrow' package."
+        ) from e
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def iter_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Picks the reader from the file extension (.parquet, otherwise NDJSON).
+    """
+    return iter_parquet(path) if path.endswith(".parquet") else iter_ndjson(path)
+
+
+def _epoch(value: Any) -> Any:
+    if isinstance(value, str):
+        return to_epoch(datetime.fromisoformat(value))
+    if isinstance(value, datetime):
+        return to_epoch(value)
+    return value
+
+
+def _position_params(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        row.get("position_id"),
+        row["flight_id"],
+        _epoch(row["timestamp"]),
+        row["latitude"],
+        row["longitude"],
+        row.get("altitude"),
+        row.get("ground_speed"),
+        row.get("vertical_rate"),
+    )
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def load_flights(
+    database: SQLiteDatabase, rows: Iterable[Dict[str, Any]], chunk_size: int = 50_000
+) -> int:
+    """
+    Inserts exported 'flights' rows in chunks inside one bulk transaction.
+    Returns the number of rows loaded.
+    """
+    loaded = 0
+    with database.bulk_load() as cursor:
+        for chunk in _chunks(rows, chunk_size):
+            cursor.executemany(
+                FLIGHT_INSERT_SQL,
+                [flight_to_params(Flight.from_db_row(row)) for row in chunk],
+            )
+            loaded += len(chunk)
+    return loaded
+
+
+def load_positions(
+    database: SQLiteDatabase, rows: Iterable[Dict[str, Any]], chunk_size: int = 100_000
+) -> int:
+    """
+    Inserts exported 'flight_positions' rows in chunks without building domain
+    objects. When the table starts empty the (flight_id, timestamp) index is
+    dropped for the load and rebuilt once at the end, which is much faster
+    than maintaining it row by row. The spatial index is rebuilt with one
+    aggregation at the end. Rows whose position ID or (flight_id, timestamp)
+    is already stored are skipped. Returns the number of rows read.
+    """
+    with database.cursor() as cursor:
+        table_is_empty = (
+            cursor.execute("SELECT 1 FROM flight_positions LIMIT 1").fetchone() is None
+        )
+
+    loaded = 0
+    with database.bulk_load(drop_position_index=table_is_empty) as cursor:
+        for chunk in _chunks(rows, chunk_size):
+            cursor.executemany(
+                POSITION_COPY_SQL, [_position_params(row) for row in chunk]
+            )
+            loaded += len(chunk)
+        rebuild_spatial_index(cursor)
+    return loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bulk load Supabase exports into SQLite."
+    )
+    parser.add_argument("--db", default="flights.db", help="SQLite database file.")
+    parser.add_argument(
+        "--flights", help="NDJSON or Parquet export of the 'flights' table."
+    )
+    parser.add_argument(
+        "--positions", help="NDJSON or Parquet export of 'flight_positions'."
+    )
+    args = parser.parse_args()
+
+    database = SQLiteDatabase(args.db)
+    for label, path, loader in (
+        ("flights", args.flights, load_flights),
+        ("positions", args.positions, load_positions),
+    ):
+        if not path:
+            continue
+        started = time.perf_counter()
+        count = loader(database, iter_rows(path))
+        elapsed = time.perf_counter() - started
+        print(
+            f"Loaded {count} {label} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)"
+        )
+    database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from postgrest.exceptions import APIError
+
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+
+# PostgREST codes for a database it cannot reach or whose pool is exhausted.
+UNAVAILABLE_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003"}
+
+
+def is_backend_failure(error: Exception) -> bool:
+    """
+    Whether `error` means the backend is unavailable (network errors,
+    timeouts, 5xx answers), rather than a rejected or empty query.
+    """
+    if not isinstance(error, APIError):
+        return True
+    if isinstance(error.code, int):
+        # Answers without a JSON body carry the HTTP status as their code.
+        return error.code >= 500
+    return error.code in UNAVAILABLE_CODES
+
+
+def report_error(message: str, error: Exception, raise_failures: bool) -> None:
+    """
+    Logs a failed call, or raises BackendUnavailableError for backend
+    failures when the repository is wrapped by a resilience policy.
+    """
+    if raise_failures and is_backend_failure(error):
+        raise BackendUnavailableError(f"{message}: {error}") from error
+    print(f"{message}: {error}")
@@ -1,25 +1,51 @@
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional
 
+from postgrest import ReturnMethod
+from postgrest.exceptions import APIError
 from supabase import Client, PostgrestAPIResponse, create_client
 
+from api.adapters.repositories.supabase.errors import report_error
 from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing, Circle
 from api.core.ports.flight_position_port import FlightPositionPort
-from api.utils.env_manager import settings
+from api.utils.env_manager import get_settings
+from api.utils.profiling import phase
 
 
 class SupabaseFlightPositionRepository(FlightPositionPort):
     """
     Supabase adapter for the FlightPositionPort interface.
     This class handles database interactions for the 'flight_positions' table.
+    Area queries run in the `find_flights_in_area` database function, backed
+    by a GiST index over `point(longitude, latitude)` and a BRIN index on
+    `timestamp` (migrations/0001_find_flights_in_area.sql). Positions are inserted with
+    `ON CONFLICT (flight_id, timestamp) DO NOTHING`, so replayed points are
+    skipped, once the unique constraint of
+    migrations/0002_flight_positions_unique_timestamp.sql exists; until then
+    they are inserted as they come.
     """
 
-    def __init__(self):
+    # Rows per request of the paged reads and deletes (PostgREST caps responses at 1000).
+    PAGE_SIZE = 1000
+    # Positions are unique per (flight_id, timestamp), with the constraint of migration 0002.
+    POSITION_KEY = "flight_id,timestamp"
+    # Postgres error for an ON CONFLICT target without a matching unique constraint.
+    MISSING_CONSTRAINT = "42P10"
+
+    def __init__(self, client: Optional[Client] = None, raise_errors: bool = False):
         """
-        Initializes the Supabase client using environment variables.
+        Initializes the repository with a shared Supabase client, or creates
+        one from the environment variables when none is given. With
+        `raise_errors`, backend failures raise BackendUnavailableError instead
+        of being logged and answered with an empty result.
         """
-        self.supabase: Client = create_client(
-            settings.supabase_url, settings.supabase_key
-        )
+        if client is None:
+            settings = get_settings()
+            client = create_client(settings.supabase_url, settings.supabase_key)
+        self.supabase: Client = client
+        self.raise_errors = raise_errors
+        self.skips_duplicates = True
 
     def add_positions(self, flight_id: int, positions: List[FlightPosition]) -> bool:
         """
@@ -29,16 +55,66 @@ class SupabaseFlightPositionRepository(FlightPositionPort):
             data_to_insert = [
                 {**pos.to_dict(), "flight_id": flight_id} for pos in positions
             ]
-
-            response: PostgrestAPIResponse = (
-                self.supabase.table("flight_positions").insert(data_to_insert).execute()
+            self._insert_new(data_to_insert)
+            return True
+        except Exception as e:
+            report_error(
+                f"Error adding flight positions for flight ID '{flight_id}'",
+                e,
+                self.raise_errors,
             )
+            return False
 
-            return bool(response.data)
+    def add_position_batches(self, batches: Dict[int, List[FlightPosition]]) -> bool:
+        """
+        Adds the positions of several flights with a single insert request.
+        """
+        rows = [
+            {**pos.to_dict(), "flight_id": flight_id}
+            for flight_id, positions in batches.items()
+            for pos in positions
+        ]
+        if not rows:
+            return True
+        try:
+            self._insert_new(rows)
+            return True
         except Exception as e:
-            print(f"Error adding flight positions for flight ID '{flight_id}': {e}")
+            report_error(
+                f"Error adding positions for {len(batches)} flights",
+                e,
+                self.raise_errors,
+            )
             return False
 
+    def _insert_new(self, rows: List[dict]) -> None:
+        """
+        Inserts position rows, skipping those whose (flight_id, timestamp) is
+        already stored. Without the unique constraint the database rejects
+        that upsert, so the rows are inserted as they come from then on.
+        """
+        if self.skips_duplicates:
+            try:
+                self.supabase.table("flight_positions").upsert(
+                    rows,
+                    on_conflict=self.POSITION_KEY,
+                    ignore_duplicates=True,
+                    returning=ReturnMethod.minimal,
+                ).execute()
+                return
+            except APIError as e:
+                if e.code != self.MISSING_CONSTRAINT:
+                    raise
+                print(
+                    "flight_positions has no unique (flight_id, timestamp) constraint, "
+                    "duplicate positions will be stored; apply "
+                    "migrations/0002_flight_positions_unique_timestamp.sql"
+                )
+                self.skips_duplicates = False
+        self.supabase.table("flight_positions").insert(
+            rows, returning=ReturnMethod.minimal
+        ).execute()
+
     def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
         """
         Retrieves all flight positions for a specific flight ID.
@@ -52,12 +128,60 @@ class SupabaseFlightPositionRepository(FlightPositionPort):
             )
 
             if response.data:
-                return [FlightPosition.from_dict(data) for data in response.data]
+                with phase("decode"):
+                    return [FlightPosition.from_dict(data) for data in response.data]
             return []
         except Exception as e:
-            print(f"Error retrieving flight positions for flight ID '{flight_id}': {e}")
+            report_error(
+                f"Error retrieving flight positions for flight ID '{flight_id}'",
+                e,
+                self.raise_errors,
+            )
             return []
 
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        """
+        Retrieves the positions of a flight in a time range, ordered by
+        timestamp and read one page at a time, since PostgREST caps every
+        response. A failed page fails the whole read.
+        """
+        positions: List[FlightPosition] = []
+        while True:
+            try:
+                query = (
+                    self.supabase.table("flight_positions")
+                    .select("*")
+                    .eq("flight_id", flight_id)
+                )
+                if start is not None:
+                    query = query.gte("timestamp", start.isoformat())
+                if end is not None:
+                    query = query.lt("timestamp", end.isoformat())
+                response: PostgrestAPIResponse = (
+                    query.order("timestamp")
+                    .order("position_id")
+                    .range(len(positions), len(positions) + self.PAGE_SIZE - 1)
+                    .execute()
+                )
+            except Exception as e:
+                report_error(
+                    f"Error retrieving flight positions for flight ID '{flight_id}'",
+                    e,
+                    self.raise_errors,
+                )
+                return []
+
+            rows = response.data or []
+            with phase("decode"):
+                positions.extend(FlightPosition.from_dict(data) for data in rows)
+            if len(rows) < self.PAGE_SIZE:
+                return positions
+
     def delete_positions_by_flight_id(self, flight_id: int) -> bool:
         """
         Deletes all flight positions for a specific flight ID.
@@ -68,5 +192,136 @@ class SupabaseFlightPositionRepository(FlightPositionPort):
             ).execute()
             return True
         except Exception as e:
-            print(f"Error deleting flight positions for flight ID '{flight_id}': {e}")
+            report_error(
+                f"Error deleting flight positions for flight ID '{flight_id}'",
+                e,
+                self.raise_errors,
+            )
             return False
+
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        """
+        IDs of the flights with positions older than `before`. PostgREST has
+        no DISTINCT, so the matching rows are paged by flight ID and each page
+        starts after the last flight seen.
+        """
+        flight_ids: List[int] = []
+        last_id = after_id
+        while len(flight_ids) < limit:
+            try:
+                response: PostgrestAPIResponse = (
+                    self.supabase.table("flight_positions")
+                    .select("flight_id")
+                    .lt("timestamp", before.isoformat())
+                    .gt("flight_id", last_id)
+                    .order("flight_id")
+                    .limit(self.PAGE_SIZE)
+                    .execute()
+                )
+            except Exception as e:
+                report_error(
+                    f"Error searching flights with positions before {before}",
+                    e,
+                    self.raise_errors,
+                )
+                break
+
+            rows = response.data or []
+            for row in rows:
+                if row["flight_id"] != last_id:
+                    last_id = row["flight_id"]
+                    flight_ids.append(last_id)
+            if len(rows) < self.PAGE_SIZE:
+                break
+        return flight_ids[:limit]
+
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        """
+        Deletes the oldest positions of a flight by primary key, at most one
+        page per request, so no single statement is unbounded.
+        """
+        deleted = 0
+        while limit is None or deleted < limit:
+            page = (
+                self.PAGE_SIZE
+                if limit is None
+                else min(self.PAGE_SIZE, limit - deleted)
+            )
+            try:
+                response: PostgrestAPIResponse = (
+                    self.supabase.table("flight_positions")
+                    .select("position_id")
+                    .eq("flight_id", flight_id)
+                    .lt("timestamp", before.isoformat())
+                    .order("timestamp")
+                    .limit(page)
+                    .execute()
+                )
+                position_ids = [row["position_id"] for row in response.data or []]
+                if position_ids:
+                    self.supabase.table("flight_positions").delete().in_(
+                        "position_id", position_ids
+                    ).execute()
+            except Exception as e:
+                report_error(
+                    f"Error deleting old flight positions for flight ID '{flight_id}'",
+                    e,
+                    self.raise_errors,
+                )
+                break
+            deleted += len(position_ids)
+            if len(position_ids) < page:
+                break
+        return deleted
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        """
+        Finds the flights with positions inside `area` with `start <= timestamp < end`.
+        The `find_flights_in_area` database function filters the positions and
+        groups them by flight, so only one row per crossing is transferred;
+        see the README for its definition and indexes.
+        """
+        box = area.bounding_box()
+        circle = area if isinstance(area, Circle) else None
+        params = {
+            "min_lat": box.min_lat,
+            "max_lat": box.max_lat,
+            "min_lon": box.min_lon,
+            "max_lon": box.max_lon,
+            "center_lat": circle.latitude if circle else None,
+            "center_lon": circle.longitude if circle else None,
+            "radius_km": circle.radius_km if circle else None,
+            "start_time": start.isoformat() if start else None,
+            "end_time": end.isoformat() if end else None,
+        }
+        try:
+            response: PostgrestAPIResponse = self.supabase.rpc(
+                "find_flights_in_area", params
+            ).execute()
+        except Exception as e:
+            report_error(
+                f"Error searching flight positions in area {area}", e, self.raise_errors
+            )
+            return []
+
+        with phase("decode"):
+            crossings = [
+                AreaCrossing(
+                    flight_id=row["flight_id"],
+                    entry_time=datetime.fromisoformat(row["entry_time"]),
+                    exit_time=datetime.fromisoformat(row["exit_time"]),
+                    points=row["points"],
+                )
+                for row in response.data or []
+            ]
+        crossings.sort(key=lambda crossing: crossing.entry_time)
+        return crossings
@@ -1,11 +1,15 @@
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence
 
+from postgrest.types import CountMethod
 from supabase import Client, PostgrestAPIResponse, create_client
 
+from api.adapters.repositories.supabase.errors import report_error
 from api.core.domain.flight import Flight
-from api.core.ports.flight_port import FlightPort
-from api.utils.env_manager import settings
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.core.ports.flight_port import CountMode, FlightPort
+from api.utils.env_manager import get_settings
+from api.utils.profiling import phase
 
 
 class SupabaseFlightRepository(FlightPort):
@@ -14,13 +18,18 @@ class SupabaseFlightRepository(FlightPort):
     This class is responsible for all low-level Supabase interactions related to the 'flights' table.
     """
 
-    def __init__(self):
+    def __init__(self, client: Optional[Client] = None, raise_errors: bool = False):
         """
-        Initializes the Supabase client using environment variables.
+        Initializes the repository with a shared Supabase client, or creates
+        one from the environment variables when none is given. With
+        `raise_errors`, backend failures raise BackendUnavailableError instead
+        of being logged and answered with an empty result.
         """
-        self.supabase: Client = create_client(
-            settings.supabase_url, settings.supabase_key
-        )
+        if client is None:
+            settings = get_settings()
+            client = create_client(settings.supabase_url, settings.supabase_key)
+        self.supabase: Client = client
+        self.raise_errors = raise_errors
 
     def add(self, new_flight: Flight) -> Optional[Flight]:
         """
@@ -37,9 +46,55 @@ class SupabaseFlightRepository(FlightPort):
             return None
 
         except Exception as e:
-            print(f"Error adding flight to Supabase: {e}")
+            report_error("Error adding flight to Supabase", e, self.raise_errors)
             return None
 
+    def upsert(self, flight: Flight) -> Optional[Flight]:
+        """
+        Inserts the flight or updates the row with the same `fr24_id`.
+        Returns the stored Flight object, or None on failure.
+        """
+        try:
+            response: PostgrestAPIResponse = (
+                self.supabase.table("flights")
+                .upsert(flight.to_dict(), on_conflict="fr24_id")
+                .execute()
+            )
+
+            if response.data:
+                return Flight.from_db_row(response.data[0])
+            return None
+
+        except Exception as e:
+            report_error(
+                f"Error upserting flight '{flight.fr24_id}' to Supabase",
+                e,
+                self.raise_errors,
+            )
+            return None
+
+    def upsert_many(self, flights: Sequence[Flight]) -> int:
+        """
+        Upserts a batch of flights by `fr24_id` in a single request.
+        Returns the number of flights stored, or 0 on failure.
+        """
+        if not flights:
+            return 0
+        try:
+            response: PostgrestAPIResponse = (
+                self.supabase.table("flights")
+                .upsert([flight.to_dict() for flight in flights], on_conflict="fr24_id")
+                .execute()
+            )
+            return len(response.data or [])
+        except Exception as e:
+            report_error(
+                f"Error upserting {len(flights)} flights to Supabase",
+                e,
+                self.raise_errors,
+            )
+            return 0
+
     def get_by_id(self, flight_id: int) -> Optional[Flight]:
         """
         Retrieves a single flight by its internal database ID.
@@ -54,10 +109,13 @@ class SupabaseFlightRepository(FlightPort):
             )
 
             if response.data:
-                return Flight.from_db_row(response.data)
+                with phase("decode"):
+                    return Flight.from_db_row(response.data)
             return None
         except Exception as e:
-            print(f"Error retrieving flight by ID '{flight_id}': {e}")
+            report_error(
+                f"Error retrieving flight by ID '{flight_id}'", e, self.raise_errors
+            )
             return None
 
     def get_by_fr24_id(self, fr24_id: str) -> Optional[Flight]:
@@ -74,10 +132,13 @@ class SupabaseFlightRepository(FlightPort):
             )
 
             if response.data:
-                return Flight.from_db_row(response.data)
+                with phase("decode"):
+                    return Flight.from_db_row(response.data)
             return None
         except Exception as e:
-            print(f"Error retrieving flight by FR24 ID '{fr24_id}': {e}")
+            report_error(
+                f"Error retrieving flight by FR24 ID '{fr24_id}'", e, self.raise_errors
+            )
             return None
 
     def find_all(
@@ -93,39 +154,124 @@ class SupabaseFlightRepository(FlightPort):
         Retrieves a filtered and paginated list of flight records by dynamically building the query.
         """
         try:
-            query = self.supabase.table("flights").select("*")
-
-            if search:
-                search_term = f"%{search}%"
-                or_query = f"flight.ilike.{search_term},fr24_id.ilike.{search_term},callsign.ilike.{search_term}"
-                query = query.or_(or_query)
-
-            if airport:
-                airport_term = f"%{airport.upper()}%"
-                or_query = f"departure_icao.ilike.{airport_term},arrival_icao.ilike.{airport_term}"
-                query = query.or_(or_query)
-
-            if aircraft_model:
-                query = query.ilike("aircraft_model", f"%{aircraft_model}%")
-
-            if flight_date:
-                start_of_day = datetime.combine(flight_date, datetime.min.time())
-                end_of_day = start_of_day + timedelta(days=1)
-                query = query.gte("departure_time_utc", start_of_day.isoformat())
-                query = query.lt("departure_time_utc", end_of_day.isoformat())
-
+            query = self._filtered(
+                self.supabase.table("flights").select("*"),
+                search,
+                airport,
+                aircraft_model,
+                flight_date,
+            )
             response: PostgrestAPIResponse = query.range(
                 offset, offset + limit - 1
             ).execute()
 
             if response.data:
-                return [Flight.from_db_row(data) for data in response.data]
+                with phase("decode"):
+                    return [Flight.from_db_row(data) for data in response.data]
             return []
 
         except Exception as e:
-            print(f"Error retrieving all flights with filters: {e}")
+            report_error(
+                "Error retrieving all flights with filters", e, self.raise_errors
+            )
             return []
 
+    def count(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        """
+        Counts the matching flights with a HEAD request, using PostgREST's
+        count modes: `exact` runs count(*), `planned` reads the planner's row
+        estimate, and `estimated` is exact up to the server's
+        `db-max-rows` and planned above it.
+        """
+        try:
+            query = self._filtered(
+                self.supabase.table("flights").select(
+                    "flight_id", count=CountMethod(mode), head=True
+                ),
+                search,
+                airport,
+                aircraft_model,
+                flight_date,
+            )
+            response: PostgrestAPIResponse = query.execute()
+            return response.count
+        except Exception as e:
+            report_error("Error counting flights with filters", e, self.raise_errors)
+            return None
+
+    @staticmethod
+    def _filtered(
+        query,
+        search: Optional[str],
+        airport: Optional[str],
+        aircraft_model: Optional[str],
+        flight_date: Optional[date],
+    ):
+        """
+        Adds the `find_all` filters to a flights query.
+        """
+        if search:
+            search_term = f"%{search}%"
+            or_query = f"flight.ilike.{search_term},fr24_id.ilike.{search_term},callsign.ilike.{search_term}"
+            query = query.or_(or_query)
+
+        if airport:
+            airport_term = f"%{airport.upper()}%"
+            or_query = (
+                f"departure_icao.ilike.{airport_term},arrival_icao.ilike.{airport_term}"
+            )
+            query = query.or_(or_query)
+
+        if aircraft_model:
+            query = query.ilike("aircraft_model", f"%{aircraft_model}%")
+
+        if flight_date:
+            start_of_day = datetime.combine(flight_date, datetime.min.time())
+            end_of_day = start_of_day + timedelta(days=1)
+            query = query.gte("departure_time_utc", start_of_day.isoformat())
+            query = query.lt("departure_time_utc", end_of_day.isoformat())
+
+        return query
+
+    def iter_flights(
+        self, batch_size: int = 1000, after_id: int = 0
+    ) -> Iterator[List[Flight]]:
+        """
+        Yields every flight in batches using keyset pagination on `flight_id`,
+        so each request is an index range scan instead of a growing OFFSET.
+        Raises BackendUnavailableError if a batch cannot be retrieved, so a
+        partial scan is never taken for a complete one.
+        """
+        last_id = after_id
+        while True:
+            try:
+                response: PostgrestAPIResponse = (
+                    self.supabase.table("flights")
+                    .select("*")
+                    .gt("flight_id", last_id)
+                    .order("flight_id")
+                    .limit(batch_size)
+                    .execute()
+                )
+            except Exception as e:
+                raise BackendUnavailableError(
+                    f"Error scanning flights after ID {last_id}: {e}"
+                ) from e
+
+            batch = [Flight.from_db_row(data) for data in response.data or []]
+            if batch:
+                yield batch
+                last_id = batch[-1].flight_id
+            if len(batch) < batch_size:
+                return
+
     def get_summary_metrics(self) -> Optional[dict]:
         """
         Llama a la función de la base de datos para obtener las métricas de resumen.
@@ -139,5 +285,5 @@ class SupabaseFlightRepository(FlightPort):
                 return response.data[0]
             return None
         except Exception as e:
-            print(f"Error retrieving summary metrics: {e}")
+            report_error("Error retrieving summary metrics", e, self.raise_errors)
             return None
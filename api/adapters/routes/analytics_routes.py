@@ -0,0 +1,95 @@
+import json
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from api.adapters.dtos.filter_dtos import EmissionsAnalyticsFilters, LeaderboardFilters
+from api.adapters.profiling import ProfiledRoute
+from api.adapters.routes.dependencies import (
+    get_analytics_service,
+    get_leaderboard_service,
+)
+from api.core.exceptions.flights_exceptions import (
+    BackendUnavailableError,
+    RollupsNotReadyError,
+)
+from api.core.use_cases.emissions_analytics_use_cases import EmissionsAnalyticsUseCase
+from api.core.use_cases.flight_leaderboard_use_cases import FlightLeaderboardUseCase
+
+analytics_router = APIRouter(
+    prefix="/analytics", tags=["Analytics"], route_class=ProfiledRoute
+)
+
+
+@analytics_router.get("/emissions", summary="Get Grouped Emission Aggregates")
+def get_emissions_analytics(
+    filters: EmissionsAnalyticsFilters = Depends(),
+    analytics_service: EmissionsAnalyticsUseCase = Depends(get_analytics_service),
+) -> Response:
+    """
+    Aggregates fuel, CO2 and efficiency (`emission_comparison`) by day, week
+    or month of departure, optionally grouped by airport, aircraft model or
+    route. Each row holds the bucket start date, the group label, the number
+    of flights, fuel and CO2 totals, average CO2 per passenger, average
+    efficiency and the total fuel saving of the detailed calculation.
+    """
+    if (
+        filters.start_date
+        and filters.end_date
+        and filters.start_date > filters.end_date
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date.",
+        )
+    try:
+        rows = analytics_service.get_emissions(**filters.model_dump())
+    except BackendUnavailableError:
+        raise
+    except Exception as e:
+        print(f"Error computing emissions analytics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An internal error occurred while computing analytics.",
+        )
+    return Response(content=json.dumps(rows), media_type="application/json")
+
+
+@analytics_router.get("/leaderboards/{dimension}", summary="Get Efficiency Leaderboard")
+def get_leaderboard(
+    dimension: Literal["route", "aircraft_model"],
+    filters: LeaderboardFilters = Depends(),
+    leaderboard_service: FlightLeaderboardUseCase = Depends(get_leaderboard_service),
+) -> Response:
+    """
+    Ranks routes ("DEP-ARR") or aircraft models by mean detailed efficiency
+    (kg/pax/km) or by how much the detailed calculation beats the statistical
+    simulation, optionally within a departure date range and requiring a
+    minimum number of flights per entry.
+    """
+    if (
+        filters.start_date
+        and filters.end_date
+        and filters.start_date > filters.end_date
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date.",
+        )
+    try:
+        entries = leaderboard_service.get_leaderboard(dimension, **filters.model_dump())
+    except RollupsNotReadyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"},
+        )
+    except BackendUnavailableError:
+        raise
+    except Exception as e:
+        print(f"Error computing leaderboard: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An internal error occurred while computing the leaderboard.",
+        )
+    return Response(content=json.dumps(entries), media_type="application/json")
@@ -0,0 +1,192 @@
+"""
+FastAPI dependencies that wire the use cases to their repositories.
+Nothing is built at import time: the settings, the backend modules and the
+backend clients are created on the first request that needs them and then
+reused for the lifetime of the process. Tests and benchmarks can replace any
+of them through `app.dependency_overrides`.
+
+The dependencies are `async def` on purpose: FastAPI runs sync dependencies
+in the threadpool, which would add a thread hop to every request just to
+return an already built object.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from api.core.domain.flight_rollups import FlightRollups
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.core.ports.position_broker_port import PositionBrokerPort
+from api.core.use_cases.emissions_analytics_use_cases import EmissionsAnalyticsUseCase
+from api.core.use_cases.flight_detail_use_cases import FlightDetailUseCase
+from api.core.use_cases.flight_leaderboard_use_cases import FlightLeaderboardUseCase
+from api.core.use_cases.flight_position_use_cases import FlightPositionUseCase
+from api.core.use_cases.flight_rollup_use_cases import (
+    FlightRollupUseCase,
+    RollupSnapshot,
+)
+from api.core.use_cases.flight_summary_use_cases import GetFlightSummaryUseCase
+from api.core.use_cases.flight_use_cases import FlightUseCase
+from api.core.use_cases.track_analytics_use_cases import TrackAnalyticsUseCase
+from api.utils.env_manager import get_settings
+
+
+@lru_cache(maxsize=1)
+def get_repositories() -> Tuple[FlightPort, FlightPositionPort]:
+    """
+    Returns the (flight, position) repositories for the configured backend.
+    """
+    from api.adapters.repositories.factory import build_repositories
+
+    return build_repositories(get_settings())
+
+
+@lru_cache(maxsize=1)
+def get_rollups() -> Optional[FlightRollups]:
+    """
+    Returns the shared flight rollups, or None when they are disabled.
+    """
+    return FlightRollups() if get_settings().rollups_enabled else None
+
+
+@lru_cache(maxsize=1)
+def get_rollup_snapshot() -> RollupSnapshot:
+    """
+    Returns the shared source of rollups for breakdowns and leaderboards.
+    """
+    return RollupSnapshot(
+        flight_port=get_repositories()[0],
+        rollups=get_rollups(),
+        ttl_seconds=get_settings().analytics_snapshot_ttl_seconds,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_position_broker() -> PositionBrokerPort:
+    """
+    Returns the broker that delivers new positions to stream subscribers.
+    """
+    from api.adapters.brokers.factory import build_position_broker
+
+    return build_position_broker(get_settings())
+
+
+@lru_cache(maxsize=1)
+def build_flight_service() -> FlightUseCase:
+    """
+    Returns the shared FlightUseCase.
+    """
+    return FlightUseCase(flight_port=get_repositories()[0], rollups=get_rollups())
+
+
+@lru_cache(maxsize=1)
+def build_position_service() -> FlightPositionUseCase:
+    """
+    Returns the shared FlightPositionUseCase.
+    """
+    settings = get_settings()
+    return FlightPositionUseCase(
+        position_port=get_repositories()[1],
+        broker=get_position_broker(),
+        stream_buffer_size=settings.stream_buffer_size,
+    )
+
+
+@lru_cache(maxsize=1)
+def build_summary_service() -> GetFlightSummaryUseCase:
+    """
+    Returns the shared GetFlightSummaryUseCase.
+    """
+    return GetFlightSummaryUseCase(
+        flight_port=get_repositories()[0],
+        rollups=get_rollups(),
+        snapshot=get_rollup_snapshot(),
+    )
+
+
+@lru_cache(maxsize=1)
+def build_rollup_service() -> Optional[FlightRollupUseCase]:
+    """
+    Returns the shared FlightRollupUseCase, or None when rollups are disabled.
+    """
+    rollups = get_rollups()
+    if rollups is None:
+        return None
+    return FlightRollupUseCase(flight_port=get_repositories()[0], rollups=rollups)
+
+
+@lru_cache(maxsize=1)
+def build_analytics_service() -> EmissionsAnalyticsUseCase:
+    """
+    Returns the shared EmissionsAnalyticsUseCase, which owns the analytics snapshot.
+    """
+    return EmissionsAnalyticsUseCase(
+        flight_port=get_repositories()[0],
+        snapshot_ttl_seconds=get_settings().analytics_snapshot_ttl_seconds,
+    )
+
+
+@lru_cache(maxsize=1)
+def build_leaderboard_service() -> FlightLeaderboardUseCase:
+    """
+    Returns the shared FlightLeaderboardUseCase.
+    """
+    return FlightLeaderboardUseCase(
+        rollups=get_rollups(), snapshot=get_rollup_snapshot()
+    )
+
+
+@lru_cache(maxsize=1)
+def build_track_service() -> TrackAnalyticsUseCase:
+    """
+    Returns the shared TrackAnalyticsUseCase.
+    """
+    flight_port, position_port = get_repositories()
+    return TrackAnalyticsUseCase(
+        flight_port=flight_port, position_port=position_port, rollups=get_rollups()
+    )
+
+
+@lru_cache(maxsize=1)
+def build_detail_service() -> FlightDetailUseCase:
+    """
+    Returns the shared FlightDetailUseCase.
+    """
+    flight_port, position_port = get_repositories()
+    return FlightDetailUseCase(
+        flight_port=flight_port,
+        position_port=position_port,
+        executor=ThreadPoolExecutor(
+            max_workers=get_settings().backend_max_workers,
+            thread_name_prefix="flight-detail",
+        ),
+    )
+
+
+async def get_flight_service() -> FlightUseCase:
+    return build_flight_service()
+
+
+async def get_position_service() -> FlightPositionUseCase:
+    return build_position_service()
+
+
+async def get_summary_service() -> GetFlightSummaryUseCase:
+    return build_summary_service()
+
+
+async def get_analytics_service() -> EmissionsAnalyticsUseCase:
+    return build_analytics_service()
+
+
+async def get_leaderboard_service() -> FlightLeaderboardUseCase:
+    return build_leaderboard_service()
+
+
+async def get_track_service() -> TrackAnalyticsUseCase:
+    return build_track_service()
+
+
+async def get_detail_service() -> FlightDetailUseCase:
+    return build_detail_service()
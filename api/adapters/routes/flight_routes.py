@@ -1,31 +1,68 @@
+import asyncio
 import json
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from datetime import datetime
+from typing import AsyncIterator, List, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 
-from api.adapters.dtos.filter_dtos import FlightQueryFilters
+from api.adapters.dtos.batch_validation import BatchValidationError, validate_positions
+from api.adapters.dtos.filter_dtos import AreaQueryFilters, FlightQueryFilters
 from api.adapters.dtos.flight_dtos import FlightPostRequest
 from api.adapters.dtos.flight_position_dtos import FlightPositionPostRequest
-from api.adapters.repositories.supabase.flight_position_repository import \
-    SupabaseFlightPositionRepository
-from api.adapters.repositories.supabase.flight_repository import \
-    SupabaseFlightRepository
-from api.core.exceptions.flights_exceptions import FlightNotFoundError
+from api.adapters.dtos.position_upload_dtos import (
+    UPLOAD_FORMATS,
+    LineSplitter,
+    PositionUploadError,
+    parse_csv_header,
+    positions_from_lines,
+)
+from api.adapters.profiling import ProfiledRoute
+from api.adapters.routes.dependencies import (
+    get_detail_service,
+    get_flight_service,
+    get_position_service,
+    get_summary_service,
+    get_track_service,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.position_stream import PositionEvent, PositionStream
+from api.core.domain.track_encoding import TrackFormat
+from api.core.exceptions.flights_exceptions import (
+    BackendUnavailableError,
+    FlightNotFoundError,
+    TrackNotAvailableError,
+)
+from api.core.ports.flight_port import CountMode
+from api.core.use_cases.flight_detail_use_cases import FlightDetailUseCase
 from api.core.use_cases.flight_position_use_cases import FlightPositionUseCase
 from api.core.use_cases.flight_summary_use_cases import GetFlightSummaryUseCase
 from api.core.use_cases.flight_use_cases import FlightUseCase
+from api.core.use_cases.track_analytics_use_cases import TrackAnalyticsUseCase
+from api.utils.env_manager import get_settings
+from api.utils.profiling import phase
 
-flight_repository = SupabaseFlightRepository()
-flight_service = FlightUseCase(flight_port=flight_repository)
-
-position_repository = SupabaseFlightPositionRepository()
-position_service = FlightPositionUseCase(position_port=position_repository)
-
-flights_router = APIRouter(prefix="/flights", tags=["Flights"])
+flights_router = APIRouter(
+    prefix="/flights", tags=["Flights"], route_class=ProfiledRoute
+)
 
 
 @flights_router.post("", status_code=status.HTTP_201_CREATED)
-def create_flight(new_flight_data: FlightPostRequest) -> Response:
+def create_flight(
+    new_flight_data: FlightPostRequest,
+    flight_service: FlightUseCase = Depends(get_flight_service),
+) -> Response:
     """
     Creates a new flight record.
     """
@@ -46,6 +83,34 @@ def create_flight(new_flight_data: FlightPostRequest) -> Response:
             ),
             status_code=status.HTTP_201_CREATED,
         )
+    except BackendUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@flights_router.put("", status_code=status.HTTP_200_OK)
+def upsert_flight(
+    flight_data: FlightPostRequest,
+    flight_service: FlightUseCase = Depends(get_flight_service),
+) -> Response:
+    """
+    Creates a flight record, or replaces the record with the same FR24 ID.
+    """
+    try:
+        stored_flight = flight_service.upsert_flight(flight_data.to_domain_model())
+
+        return Response(
+            content=json.dumps(
+                {
+                    "message": f"Flight with ID {stored_flight.flight_id} stored successfully!"
+                }
+            ),
+            media_type="application/json",
+            status_code=status.HTTP_200_OK,
+        )
+    except BackendUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -53,16 +118,39 @@ def create_flight(new_flight_data: FlightPostRequest) -> Response:
 
 @flights_router.get("", response_model=List[dict])
 def get_all_flights(
+    response: Response,
     filters: FlightQueryFilters = Depends(),
+    count: Optional[CountMode] = Query(
+        None,
+        description=(
+            "Also return the number of matching flights in `X-Total-Count` and "
+            "`Content-Range`: `exact`, or the cheaper approximate `planned` or "
+            "`estimated` counts."
+        ),
+    ),
+    flight_service: FlightUseCase = Depends(get_flight_service),
 ):
     """
-    Retrieves a paginated and filtered list of flight records.
+    Retrieves a paginated and filtered list of flight records. With `count`,
+    the total is returned in headers; counts are cached briefly per filter set.
     """
     try:
         flights_dicts = flight_service.get_all_flights(**filters.model_dump())
 
+        if count is not None:
+            total = flight_service.count_flights(
+                **filters.model_dump(exclude={"limit", "offset"}), mode=count
+            )
+            if total is not None:
+                end = filters.offset + len(flights_dicts) - 1
+                span = f"{filters.offset}-{end}" if flights_dicts else "*"
+                response.headers["X-Total-Count"] = str(total)
+                response.headers["Content-Range"] = f"{span}/{total}"
+
         return flights_dicts
 
+    except BackendUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -75,39 +163,105 @@ def get_all_flights(
     summary="Get Global Flight Summary Metrics",
     tags=["Flights"],
 )
-def get_flight_summary():
+def get_flight_summary(
+    summary_service: GetFlightSummaryUseCase = Depends(get_summary_service),
+):
     """
     Retrieves aggregated summary metrics for all flights in the database.
     Ideal for displaying initial dashboard stats.
     """
-    repo = SupabaseFlightRepository()
-    use_case = GetFlightSummaryUseCase(flight_port=repo)
-    summary = use_case.execute()
+    summary = summary_service.execute()
 
     if not summary:
         raise HTTPException(
             status_code=404, detail="No flight data found to generate a summary."
         )
 
-    return summary.to_dict(),
+    return summary.to_dict()
+
+
+@flights_router.get(
+    "/summary/{dimension}",
+    summary="Get Flight Summary Metrics per Airport, Aircraft Model or Route",
+    tags=["Flights"],
+)
+def get_flight_summary_breakdown(
+    dimension: Literal["airport", "aircraft_model", "route"],
+    summary_service: GetFlightSummaryUseCase = Depends(get_summary_service),
+):
+    """
+    Retrieves the summary metrics of every airport, aircraft model or route,
+    keyed by its ICAO code, model or "DEP-ARR" route.
+    """
+    breakdown = summary_service.execute_breakdown(dimension)
+
+    return {key: summary.to_dict() for key, summary in breakdown.items()}
+
+
+@flights_router.get("/crossing", response_model=List[dict])
+def get_flights_in_area(
+    filters: AreaQueryFilters = Depends(),
+    position_service: FlightPositionUseCase = Depends(get_position_service),
+):
+    """
+    Retrieves the flights whose tracks crossed a bounding box or came within
+    a radius of a point, with the time of their first and last position
+    inside it, ordered by entry time.
+    """
+    try:
+        area = filters.to_area()
+        crossings = position_service.find_flights_in_area(
+            area, filters.start, filters.end
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return [crossing.to_dict() for crossing in crossings]
 
 
 @flights_router.get("/{flight_id}")
-def get_flight_by_id(flight_id: int) -> Response:
+def get_flight_by_id(
+    flight_id: int,
+    include: Optional[Literal["positions"]] = Query(
+        None,
+        description="Also return the flight's track, read concurrently with the flight.",
+    ),
+    track: TrackFormat = Query(
+        "full",
+        description=(
+            "Track variant with `include=positions`: every position, a simplified "
+            "subset, or a simplified encoded polyline."
+        ),
+    ),
+    tolerance_m: float = Query(
+        50.0, gt=0, le=10_000, description="Simplification tolerance in meters."
+    ),
+    detail_service: FlightDetailUseCase = Depends(get_detail_service),
+) -> Response:
     """
-    Retrieves a single flight record by its internal database ID.
+    Retrieves a single flight record by its internal database ID. With
+    `include=positions` the page's flight and track come in one request.
     """
     try:
-        flight = flight_service.get_flight_by_id(flight_id)
+        detail = detail_service.get_flight_detail(
+            flight_id,
+            include_positions=include == "positions",
+            track=track,
+            tolerance_m=tolerance_m,
+        )
+        with phase("serialize"):
+            content = json.dumps(detail)
 
         return Response(
-            content=json.dumps(flight.to_dict()),
+            content=content,
             media_type="application/json",
             status_code=status.HTTP_200_OK,
         )
     except FlightNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BackendUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -115,39 +269,91 @@ def get_flight_by_id(flight_id: int) -> Response:
 
 
 @flights_router.get("/{fr24_id}/fr24")
-def get_flight_by_fr24_id(fr24_id: str) -> Response:
+def get_flight_by_fr24_id(
+    fr24_id: str,
+    flight_service: FlightUseCase = Depends(get_flight_service),
+) -> Response:
     """
     Retrieves a single flight record by its FlightRadar24 ID.
     """
     try:
         flight = flight_service.get_flight_by_fr24_id(fr24_id)
+        with phase("serialize"):
+            content = json.dumps(flight.to_dict())
 
         return Response(
-            content=json.dumps(flight.to_dict()),
+            content=content,
             media_type="application/json",
             status_code=status.HTTP_200_OK,
         )
     except FlightNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BackendUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
 
 
-@flights_router.post("/{flight_id}/positions", status_code=status.HTTP_201_CREATED)
+async def position_batch(flight_id: int, request: Request) -> List[FlightPosition]:
+    """
+    Parses and validates the JSON list of positions in the request body in a
+    single batch. Invalid rows answer 422 with FastAPI's error layout.
+    """
+    try:
+        return validate_positions(flight_id, await request.body())
+    except BatchValidationError as e:
+        errors = []
+        for error in e.errors:
+            location = (
+                ("body",)
+                if error.row < 0
+                else ("body", error.row, *error.field.split("."))
+            )
+            errors.append({"type": error.type, "loc": location, "msg": error.message})
+        raise RequestValidationError(errors)
+
+
+POSITION_BATCH_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "array",
+                    "items": FlightPositionPostRequest.model_json_schema(),
+                }
+            }
+        },
+    }
+}
+
+
+@flights_router.post(
+    "/{flight_id}/positions",
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=POSITION_BATCH_BODY,
+)
 def add_flight_positions(
-    flight_id: int, positions: List[FlightPositionPostRequest]
+    flight_id: int,
+    new_positions: List[FlightPosition] = Depends(position_batch),
+    analyze: bool = Query(
+        False,
+        description="Derive the flight's distance, times and phases from its track.",
+    ),
+    flight_service: FlightUseCase = Depends(get_flight_service),
+    position_service: FlightPositionUseCase = Depends(get_position_service),
+    track_service: TrackAnalyticsUseCase = Depends(get_track_service),
 ) -> Response:
     """
-    Adds a list of flight position records to a specific flight.
+    Adds a list of flight position records to a specific flight. With
+    `analyze=true` the flight record is then updated from its whole track.
     """
     try:
         flight_service.get_flight_by_id(flight_id)
 
-        new_positions = [pos.to_domain_model() for pos in positions]
-
         success = position_service.add_positions_to_flight(
             flight_id, new_positions)
         if not success:
@@ -156,45 +362,322 @@ def add_flight_positions(
                 detail="Failed to add flight positions.",
             )
 
+        content = {"message": "Flight positions added successfully."}
+        if analyze:
+            content["flight"] = _apply_track(track_service, flight_id)
         return Response(
-            content=json.dumps(
-                {"message": "Flight positions added successfully."}),
+            content=json.dumps(content),
             status_code=status.HTTP_201_CREATED,
         )
     except FlightNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except HTTPException:
+        raise
+    except BackendUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@flights_router.post(
+    "/{flight_id}/positions/upload", status_code=status.HTTP_201_CREATED
+)
+async def upload_flight_positions(
+    flight_id: int,
+    request: Request,
+    analyze: bool = Query(
+        False,
+        description="Derive the flight's distance, times and phases from its track.",
+    ),
+    flight_service: FlightUseCase = Depends(get_flight_service),
+    position_service: FlightPositionUseCase = Depends(get_position_service),
+    track_service: TrackAnalyticsUseCase = Depends(get_track_service),
+) -> Response:
+    """
+    Adds positions to a flight from an NDJSON (`application/x-ndjson`) or CSV
+    (`text/csv`, with a header row) body, read as it arrives. Rows are
+    validated and stored in chunks, so memory stays constant whatever the
+    upload size and writing starts before the body is complete. The upload
+    is not atomic: on an invalid row the chunks before it are already stored
+    and the error reports how many rows were. With `analyze=true` the flight
+    record is updated from its whole track once the upload is stored.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    upload_format = UPLOAD_FORMATS.get(media_type)
+    if upload_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected one of {sorted(UPLOAD_FORMATS)}.",
+        )
+    try:
+        await run_in_threadpool(flight_service.get_flight_by_id, flight_id)
+    except FlightNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    chunk_rows = get_settings().upload_chunk_rows
+    header: Optional[List[str]] = None
+    stored = 0
+    writing: Optional[asyncio.Future] = None
+
+    def store(lines: List[bytes], first_line: int) -> int:
+        positions = positions_from_lines(
+            flight_id, lines, first_line, upload_format, header
+        )
+        if positions and not position_service.add_positions_to_flight(
+            flight_id, positions
+        ):
+            raise RuntimeError("Failed to add flight positions.")
+        return len(positions)
+
+    async def flush(lines: List[bytes], first_line: int) -> None:
+        # Keeps one chunk in flight: the next one is read while this one is written.
+        nonlocal writing, stored
+        if writing is not None:
+            previous, writing = writing, None
+            stored += await previous
+        writing = asyncio.ensure_future(run_in_threadpool(store, lines, first_line))
+
+    async def settle() -> None:
+        # A chunk handed to the threadpool cannot be cancelled: wait for it so
+        # that `stored_rows` counts it if it gets stored.
+        nonlocal writing, stored
+        if writing is None:
+            return
+        previous, writing = writing, None
+        try:
+            stored += await asyncio.shield(previous)
+        except Exception:
+            pass
+
+    splitter = LineSplitter()
+    pending: List[bytes] = []
+    next_line = 1
+    try:
+        async for data in _with_end(request.stream()):
+            lines = splitter.feed(data) if data is not None else splitter.finish()
+            if upload_format == "csv" and header is None and lines:
+                header = parse_csv_header(lines.pop(0))
+                next_line += 1
+            pending.extend(lines)
+            while len(pending) >= chunk_rows or (data is None and pending):
+                chunk, pending = pending[:chunk_rows], pending[chunk_rows:]
+                await flush(chunk, next_line)
+                next_line += len(chunk)
+        if writing is not None:
+            previous, writing = writing, None
+            stored += await previous
+    except PositionUploadError as e:
+        await settle()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": str(e), "line": e.line, "stored_rows": stored},
+        )
+    except BackendUnavailableError:
+        raise
+    except Exception as e:
+        await settle()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": str(e), "stored_rows": stored},
+        )
+    finally:
+        await settle()
+
+    content = {"message": "Flight positions added successfully.", "rows": stored}
+    if analyze:
+        content["flight"] = await run_in_threadpool(
+            _apply_track, track_service, flight_id
+        )
+    return Response(
+        content=json.dumps(content),
+        media_type="application/json",
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+async def _with_end(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[bytes]]:
+    """Yields the body chunks followed by None once the body is complete."""
+    async for chunk in chunks:
+        if chunk:
+            yield chunk
+    yield None
+
+
+@flights_router.get("/{flight_id}/track")
+def get_flight_track_analysis(
+    flight_id: int,
+    track_service: TrackAnalyticsUseCase = Depends(get_track_service),
+) -> Response:
+    """
+    Derives the along-track and great-circle distances, the departure and
+    arrival times, the duration and the time spent in each flight phase
+    (takeoff, climb, cruise, descent, landing) from the flight's positions.
+    The flight record is not modified.
+    """
+    try:
+        analysis = track_service.analyze_flight(flight_id)
+        return Response(
+            content=json.dumps(analysis.to_dict()),
+            media_type="application/json",
+            status_code=status.HTTP_200_OK,
+        )
+    except FlightNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except TrackNotAvailableError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except BackendUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@flights_router.post("/{flight_id}/track")
+def apply_flight_track_analysis(
+    flight_id: int,
+    track_service: TrackAnalyticsUseCase = Depends(get_track_service),
+) -> Response:
+    """
+    Derives the flight's distances, times and phase durations from its
+    positions and stores them in the flight record. Returns the updated flight.
+    """
+    try:
+        return Response(
+            content=json.dumps(_apply_track(track_service, flight_id)),
+            media_type="application/json",
+            status_code=status.HTTP_200_OK,
+        )
+    except FlightNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except HTTPException:
+        raise
+    except BackendUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+def _apply_track(track_service: TrackAnalyticsUseCase, flight_id: int) -> dict:
+    """Updates a flight from its track; 422 if it has too few positions."""
+    try:
+        return track_service.apply_to_flight(flight_id).to_dict()
+    except TrackNotAvailableError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
 @flights_router.get("/{flight_id}/positions")
-def get_flight_positions(flight_id: int) -> Response:
+def get_flight_positions(
+    flight_id: int,
+    detail_service: FlightDetailUseCase = Depends(get_detail_service),
+) -> Response:
     """
-    Retrieves all position data for a specific flight.
+    Retrieves all position data for a specific flight, ordered by timestamp.
+    The flight's existence is checked concurrently with the track read.
     """
     try:
-        flight_service.get_flight_by_id(flight_id)
-        positions = position_service.get_positions_for_flight(flight_id)
-        positions_dicts = [position.to_dict() for position in positions]
+        _, positions = detail_service.get_flight_with_track(flight_id)
+        with phase("serialize"):
+            content = json.dumps([position.to_dict() for position in positions])
 
         return Response(
-            content=json.dumps(positions_dicts),
+            content=content,
             media_type="application/json",
             status_code=status.HTTP_200_OK,
         )
     except FlightNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BackendUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@flights_router.get("/{flight_id}/positions/stream")
+async def stream_flight_positions(
+    flight_id: int,
+    since: Optional[datetime] = Query(
+        None, description="Replay the stored positions after this timestamp first."
+    ),
+    last_event_id: Optional[str] = Header(None),
+    flight_service: FlightUseCase = Depends(get_flight_service),
+    position_service: FlightPositionUseCase = Depends(get_position_service),
+) -> StreamingResponse:
+    """
+    Streams the new positions of a flight as Server-Sent Events, as they are
+    added. Each `position` event carries one position and its timestamp as
+    event id, so a reconnecting client resumes from its `Last-Event-ID` (or
+    `since`). A `dropped` event reports positions discarded because the
+    client fell behind; it can resume from its last event to recover them.
+    """
+    if since is None and last_event_id:
+        try:
+            since = datetime.fromisoformat(last_event_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Last-Event-ID must be an ISO timestamp.",
+            )
+    try:
+        await run_in_threadpool(flight_service.get_flight_by_id, flight_id)
+        stream = await run_in_threadpool(position_service.open_stream, flight_id, since)
+    except FlightNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BackendUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
 
+    return StreamingResponse(
+        _position_events(
+            stream, position_service, get_settings().stream_heartbeat_seconds
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _position_events(
+    stream: PositionStream, position_service: FlightPositionUseCase, heartbeat_s: float
+) -> AsyncIterator[str]:
+    """
+    Formats a PositionStream as Server-Sent Events until the client leaves.
+    """
+
+    def event(position: PositionEvent) -> str:
+        return f"id: {position.timestamp.isoformat()}\nevent: position\ndata: {position.data}\n\n"
+
+    try:
+        if stream.backfill:
+            yield "".join(event(position) for position in stream.backfill)
+        while not stream.subscription.closed:
+            positions, dropped = await stream.next_batch(heartbeat_s)
+            chunk = "".join(event(position) for position in positions)
+            if dropped:
+                chunk = (
+                    f"event: dropped\ndata: {json.dumps({'dropped': dropped})}\n\n"
+                    + chunk
+                )
+            yield chunk or ": keep-alive\n\n"
+    finally:
+        position_service.close_stream(stream)
+
 
 @flights_router.delete("/{flight_id}/positions", status_code=status.HTTP_200_OK)
-def delete_flight_positions(flight_id: int) -> Response:
+def delete_flight_positions(
+    flight_id: int,
+    flight_service: FlightUseCase = Depends(get_flight_service),
+    position_service: FlightPositionUseCase = Depends(get_position_service),
+) -> Response:
     """
     Deletes all position data associated with a specific flight.
     """
@@ -46,6 +46,36 @@ class EmissionComparison(BaseSchema):
     detailed_calculation: Optional[DetailedCalculation] = None
     statistical_simulation: Optional[StatisticalSimulation] = None
 
+    def fuel_saving_kg(self) -> Optional[float]:
+        """Combustible ahorrado (kg) por el cálculo detallado frente a la simulación."""
+        if not self.detailed_calculation or not self.statistical_simulation:
+            return None
+        detailed = self.detailed_calculation.total_fuel_kg
+        simulated = self.statistical_simulation.total_fuel_kg
+        if detailed is None or simulated is None:
+            return None
+        return simulated - detailed
+
+    def co2_per_passenger_saving_kg(self) -> Optional[float]:
+        """CO2 por pasajero ahorrado (kg) por el cálculo detallado frente a la simulación."""
+        if not self.detailed_calculation or not self.statistical_simulation:
+            return None
+        detailed = self.detailed_calculation.co2_per_passenger_kg
+        simulated = self.statistical_simulation.co2_per_passenger_kg
+        if detailed is None or simulated is None:
+            return None
+        return simulated - detailed
+
+    def efficiency_saving_kg_pax_km(self) -> Optional[float]:
+        """Eficiencia (kg/pax/km) ganada por el cálculo detallado frente a la simulación."""
+        if not self.detailed_calculation or not self.statistical_simulation:
+            return None
+        detailed = self.detailed_calculation.efficiency_kg_pax_km
+        simulated = self.statistical_simulation.efficiency_kg_pax_km
+        if detailed is None or simulated is None:
+            return None
+        return simulated - detailed
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "EmissionComparison":
         """Crea una instancia anidada a partir de un diccionario."""
@@ -0,0 +1,252 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from api.core.domain.flight import Flight
+from api.utils.time_utils import to_utc_naive
+
+BUCKETS = ("day", "week", "month")
+GROUPS = ("departure_airport", "arrival_airport", "aircraft_model", "route")
+SOURCES = ("detailed", "statistical")
+METRICS = ("fuel_kg", "co2_kg", "co2_per_passenger_kg", "efficiency_kg_pax_km")
+ROW_FIELDS = (
+    "bucket_start",
+    "group",
+    "flights",
+    "total_fuel_kg",
+    "total_co2_kg",
+    "avg_co2_per_passenger_kg",
+    "avg_efficiency_kg_pax_km",
+    "total_fuel_saving_kg",
+)
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Bucket keys larger than this are compacted with np.unique instead of a dense bincount.
+MAX_DENSE_KEYS = 1 << 24
+
+
+class FlightColumns:
+    """
+    Columnar (NumPy) snapshot of the flights for emissions analytics. It keeps
+    only the columns it needs: departure day, airport codes, model and route
+    (encoded as integers with their label tables) and the `emission_comparison`
+    metrics of both calculations (NaN when missing).
+    Flights without `departure_time_utc` are left out.
+    """
+
+    def __init__(
+        self,
+        departure_day: np.ndarray,
+        groups: Dict[str, Tuple[np.ndarray, List[str]]],
+        metrics: Dict[Tuple[str, str], np.ndarray],
+    ):
+        self.departure_day = departure_day
+        self.groups = groups
+        self.metrics = metrics
+        self.buckets = {
+            "day": departure_day,
+            "week": (departure_day + 3) // 7,
+            "month": departure_day.astype("datetime64[D]")
+            .astype("datetime64[M]")
+            .astype(np.int64),
+        }
+
+    def __len__(self) -> int:
+        return len(self.departure_day)
+
+    @staticmethod
+    def from_flights(flights: Iterable[Flight]) -> "FlightColumns":
+        """
+        Builds the snapshot in a single pass over the flights.
+        """
+        days: List[int] = []
+        labels: Dict[str, Dict[str, int]] = {group: {} for group in GROUPS}
+        codes: Dict[str, List[int]] = {group: [] for group in GROUPS}
+        values: Dict[Tuple[str, str], List[float]] = {
+            (source, metric): [] for source in SOURCES for metric in METRICS
+        }
+
+        def encode(group: str, label: Optional[str]) -> None:
+            table = labels[group]
+            codes[group].append(table.setdefault(label, len(table)) if label else -1)
+
+        nan = float("nan")
+        for flight in flights:
+            if flight.departure_time_utc is None:
+                continue
+            days.append(
+                to_utc_naive(flight.departure_time_utc).toordinal() - EPOCH_ORDINAL
+            )
+
+            departure = flight.departure_icao.upper() if flight.departure_icao else None
+            arrival = flight.arrival_icao.upper() if flight.arrival_icao else None
+            encode("departure_airport", departure)
+            encode("arrival_airport", arrival)
+            encode("aircraft_model", flight.aircraft_model)
+            encode("route", f"{departure}-{arrival}" if departure and arrival else None)
+
+            comparison = flight.emission_comparison
+            detailed = comparison.detailed_calculation if comparison else None
+            simulated = comparison.statistical_simulation if comparison else None
+            for source, calculation in (
+                ("detailed", detailed),
+                ("statistical", simulated),
+            ):
+                for metric in METRICS:
+                    value = _metric(calculation, metric)
+                    values[(source, metric)].append(nan if value is None else value)
+
+        groups = {
+            group: _sorted_codes(np.array(codes[group], dtype=np.int64), labels[group])
+            for group in GROUPS
+        }
+        return FlightColumns(
+            departure_day=np.array(days, dtype=np.int64),
+            groups=groups,
+            metrics={
+                key: np.array(column, dtype=np.float64)
+                for key, column in values.items()
+            },
+        )
+
+    def aggregate(
+        self,
+        bucket: str = "day",
+        group_by: Optional[str] = None,
+        source: str = "detailed",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[dict]:
+        """
+        Aggregates the metrics by time interval (`bucket`) and, optionally, by
+        airport, model or route (`group_by`), between `start_date` and
+        `end_date` (both included). Returns one row per non-empty group,
+        ordered by interval and label.
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket '{bucket}', expected one of {BUCKETS}.")
+        if group_by is not None and group_by not in GROUPS:
+            raise ValueError(f"Unknown group '{group_by}', expected one of {GROUPS}.")
+        if source not in SOURCES:
+            raise ValueError(f"Unknown source '{source}', expected one of {SOURCES}.")
+
+        mask = None
+        if start_date is not None:
+            mask = self.departure_day >= start_date.toordinal() - EPOCH_ORDINAL
+        if end_date is not None:
+            upper = self.departure_day <= end_date.toordinal() - EPOCH_ORDINAL
+            mask = upper if mask is None else mask & upper
+
+        def column(array: np.ndarray) -> np.ndarray:
+            return array if mask is None else array[mask]
+
+        buckets = column(self.buckets[bucket])
+        if len(buckets) == 0:
+            return []
+
+        # One integer key per (bucket, group); slot 0 of each bucket is the "no label" group.
+        if group_by is None:
+            group_codes, group_labels = np.zeros(len(buckets), dtype=np.int64), []
+            slots = 1
+        else:
+            codes, group_labels = self.groups[group_by]
+            group_codes = column(codes) + 1
+            slots = len(group_labels) + 1
+        first_bucket = int(buckets.min())
+        keys = (buckets - first_bucket) * slots + group_codes
+
+        if (int(buckets.max()) - first_bucket + 1) * slots <= MAX_DENSE_KEYS:
+            dense_counts = np.bincount(keys)
+            present = np.flatnonzero(dense_counts)
+            counts = dense_counts[present]
+            if len(present) < len(dense_counts):
+                remap = np.empty(len(dense_counts), dtype=np.int64)
+                remap[present] = np.arange(len(present))
+                keys = remap[keys]
+        else:
+            present, keys, counts = np.unique(
+                keys, return_inverse=True, return_counts=True
+            )
+        size = len(present)
+
+        def sums_by_key(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            """Per-key sums of the non-NaN `values` and how many there were."""
+            valid = ~np.isnan(values)
+            if valid.all():
+                return np.bincount(keys, weights=values, minlength=size), counts
+            sums = np.bincount(
+                keys, weights=np.where(valid, values, 0.0), minlength=size
+            )
+            return sums, np.bincount(keys[valid], minlength=size)
+
+        def sum_by_key(values: np.ndarray) -> np.ndarray:
+            sums, valid_counts = sums_by_key(values)
+            return _with_missing(sums, valid_counts)
+
+        def mean_by_key(values: np.ndarray) -> np.ndarray:
+            sums, valid_counts = sums_by_key(values)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return _with_missing(sums / valid_counts, valid_counts)
+
+        fuel = column(self.metrics[(source, "fuel_kg")])
+        saving = column(self.metrics[("statistical", "fuel_kg")]) - column(
+            self.metrics[("detailed", "fuel_kg")]
+        )
+        labels = np.array(group_labels + [None], dtype=object)[present % slots - 1]
+        columns = (
+            _bucket_starts(bucket, present // slots + first_bucket),
+            labels.tolist(),
+            counts.tolist(),
+            sum_by_key(fuel).tolist(),
+            sum_by_key(column(self.metrics[(source, "co2_kg")])).tolist(),
+            mean_by_key(
+                column(self.metrics[(source, "co2_per_passenger_kg")])
+            ).tolist(),
+            mean_by_key(
+                column(self.metrics[(source, "efficiency_kg_pax_km")])
+            ).tolist(),
+            sum_by_key(saving).tolist(),
+        )
+        return [dict(zip(ROW_FIELDS, row)) for row in zip(*columns)]
+
+
+def _with_missing(values: np.ndarray, valid_counts: np.ndarray) -> np.ndarray:
+    """Object array of `values` with None where `valid_counts` is zero."""
+    result = values.astype(object)
+    result[valid_counts == 0] = None
+    return result
+
+
+def _metric(calculation, metric: str) -> Optional[float]:
+    if calculation is None:
+        return None
+    if metric == "fuel_kg":
+        return calculation.total_fuel_kg
+    if metric == "co2_kg":
+        return getattr(calculation, "co2_total_kg", None)
+    if metric == "co2_per_passenger_kg":
+        return calculation.co2_per_passenger_kg
+    return calculation.efficiency_kg_pax_km
+
+
+def _sorted_codes(
+    codes: np.ndarray, table: Dict[str, int]
+) -> Tuple[np.ndarray, List[str]]:
+    """Re-numbers the codes so they follow the alphabetical order of the labels."""
+    labels = sorted(table)
+    rank = np.empty(len(labels) + 1, dtype=np.int64)
+    rank[[table[label] for label in labels]] = np.arange(len(labels))
+    rank[-1] = -1
+    return rank[codes], labels
+
+
+def _bucket_starts(bucket: str, indexes: np.ndarray) -> List[str]:
+    """ISO dates of the first day of each bucket index."""
+    if bucket == "day":
+        days = indexes.astype("datetime64[D]")
+    elif bucket == "week":
+        days = (indexes * 7 - 3).astype("datetime64[D]")
+    else:
+        days = indexes.astype("datetime64[M]").astype("datetime64[D]")
+    return days.astype(str).tolist()
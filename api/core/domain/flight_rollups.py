@@ -0,0 +1,214 @@
+import threading
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from api.core.domain.flight import Flight
+from api.utils.time_utils import to_utc_naive
+
+DIMENSIONS = ("airport", "aircraft_model", "route")
+# Dimensions that also keep per-day totals, for leaderboards over a date range.
+DAILY_DIMENSIONS = ("aircraft_model", "route")
+
+
+@dataclass
+class RollupTotals:
+    """Running totals of a group of flights, in the shape of the global summary."""
+
+    flights: int = 0
+    distance_sum: float = 0.0
+    distance_count: int = 0
+    fuel_saving: float = 0.0
+    co2_saving: float = 0.0
+    efficiency_sum: float = 0.0
+    efficiency_count: int = 0
+    efficiency_saving_sum: float = 0.0
+    efficiency_saving_count: int = 0
+
+    def apply(self, flight: Flight, sign: int) -> None:
+        """Adds (sign=1) or subtracts (sign=-1) the contribution of a flight."""
+        self.flights += sign
+        if flight.distance_calculated_km is not None:
+            self.distance_sum += sign * flight.distance_calculated_km
+            self.distance_count += sign
+        if flight.emission_comparison:
+            fuel_saving = flight.emission_comparison.fuel_saving_kg()
+            co2_saving = flight.emission_comparison.co2_per_passenger_saving_kg()
+            if fuel_saving is not None:
+                self.fuel_saving += sign * fuel_saving
+            if co2_saving is not None:
+                self.co2_saving += sign * co2_saving
+
+            detailed = flight.emission_comparison.detailed_calculation
+            efficiency = detailed.efficiency_kg_pax_km if detailed else None
+            efficiency_saving = flight.emission_comparison.efficiency_saving_kg_pax_km()
+            if efficiency is not None:
+                self.efficiency_sum += sign * efficiency
+                self.efficiency_count += sign
+            if efficiency_saving is not None:
+                self.efficiency_saving_sum += sign * efficiency_saving
+                self.efficiency_saving_count += sign
+
+    def merge(self, other: "RollupTotals") -> None:
+        """Adds the totals of another group."""
+        self.flights += other.flights
+        self.distance_sum += other.distance_sum
+        self.distance_count += other.distance_count
+        self.fuel_saving += other.fuel_saving
+        self.co2_saving += other.co2_saving
+        self.efficiency_sum += other.efficiency_sum
+        self.efficiency_count += other.efficiency_count
+        self.efficiency_saving_sum += other.efficiency_saving_sum
+        self.efficiency_saving_count += other.efficiency_saving_count
+
+    def to_summary(self) -> dict:
+        """Returns the totals with the keys of `get_flight_summary_metrics`."""
+        return {
+            "total_flights": self.flights,
+            "avg_distance": (
+                self.distance_sum / self.distance_count if self.distance_count else 0.0
+            ),
+            "total_fuel_saving": self.fuel_saving,
+            "total_co2_saving": self.co2_saving,
+        }
+
+
+def rollup_keys(flight: Flight) -> List[Tuple[str, str]]:
+    """
+    Returns the (dimension, key) groups a flight contributes to. A flight
+    counts once for each distinct airport (departure or arrival).
+    """
+    departure = flight.departure_icao.upper() if flight.departure_icao else None
+    arrival = flight.arrival_icao.upper() if flight.arrival_icao else None
+    keys = [("airport", code) for code in sorted({departure, arrival} - {None})]
+    if flight.aircraft_model:
+        keys.append(("aircraft_model", flight.aircraft_model))
+    if departure and arrival:
+        keys.append(("route", f"{departure}-{arrival}"))
+    return keys
+
+
+class FlightRollups:
+    """
+    Flight aggregates kept up to date incrementally: global totals and totals
+    by airport, aircraft model and route (the last two also by departure day).
+    Each insert or update applies only the difference, so reads never scan
+    the flights.
+    `ready` tells whether the aggregates were built from every flight.
+    """
+
+    def __init__(self, flights: Optional[Iterable[Flight]] = None):
+        self._lock = threading.Lock()
+        self.overall = RollupTotals()
+        self.groups: Dict[str, Dict[str, RollupTotals]] = {
+            dimension: {} for dimension in DIMENSIONS
+        }
+        self.daily: Dict[str, Dict[int, Dict[str, RollupTotals]]] = {
+            dimension: {} for dimension in DAILY_DIMENSIONS
+        }
+        self.version = 0
+        self.ready = False
+        for flight in flights or []:
+            self.record(flight)
+
+    def record(self, flight: Flight, previous: Optional[Flight] = None) -> None:
+        """
+        Applies a new flight or, given `previous`, replaces the contribution
+        of the previous version of the flight with that of the new one.
+        """
+        with self._lock:
+            if previous is not None:
+                self._apply(previous, -1)
+            self._apply(flight, 1)
+            self.version += 1
+
+    def summary(self) -> Optional[dict]:
+        """Global summary, or None without flights."""
+        with self._lock:
+            return self.overall.to_summary() if self.overall.flights else None
+
+    def breakdown(self, dimension: str) -> Dict[str, dict]:
+        """Summary of every group of a dimension."""
+        if dimension not in DIMENSIONS:
+            raise ValueError(
+                f"Unknown dimension '{dimension}', expected one of {DIMENSIONS}."
+            )
+        with self._lock:
+            return {
+                key: totals.to_summary()
+                for key, totals in self.groups[dimension].items()
+            }
+
+    def group(self, dimension: str, key: str) -> Optional[dict]:
+        """Summary of one group, or None if it has no flights."""
+        with self._lock:
+            totals = self.groups.get(dimension, {}).get(key)
+            return totals.to_summary() if totals else None
+
+    def totals_between(
+        self,
+        dimension: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[str, RollupTotals]:
+        """
+        Totals of every group of a dimension for departures between
+        `start_date` and `end_date` (both included). Without dates, returns the
+        all-time totals; with dates, only the days with flights are combined.
+        """
+        if start_date is None and end_date is None:
+            with self._lock:
+                groups = self.groups.get(dimension)
+                if groups is None:
+                    raise ValueError(
+                        f"Unknown dimension '{dimension}', expected one of {DIMENSIONS}."
+                    )
+                return {key: replace(totals) for key, totals in groups.items()}
+
+        if dimension not in DAILY_DIMENSIONS:
+            raise ValueError(f"Date ranges are only kept for {DAILY_DIMENSIONS}.")
+        first = start_date.toordinal() if start_date else 0
+        last = end_date.toordinal() if end_date else date.max.toordinal()
+        merged: Dict[str, RollupTotals] = {}
+        with self._lock:
+            for day, groups in self.daily[dimension].items():
+                if first <= day <= last:
+                    for key, totals in groups.items():
+                        merged.setdefault(key, RollupTotals()).merge(totals)
+        return merged
+
+    def replace_with(self, other: "FlightRollups") -> None:
+        """Replaces every aggregate with those of `other` and marks them as ready."""
+        with self._lock:
+            self.overall = other.overall
+            self.groups = other.groups
+            self.daily = other.daily
+            self.version += 1
+            self.ready = True
+
+    def _apply(self, flight: Flight, sign: int) -> None:
+        self.overall.apply(flight, sign)
+        day = (
+            to_utc_naive(flight.departure_time_utc).toordinal()
+            if flight.departure_time_utc
+            else None
+        )
+        for dimension, key in rollup_keys(flight):
+            _apply_to_group(self.groups[dimension], key, flight, sign)
+            if day is not None and dimension in DAILY_DIMENSIONS:
+                days = self.daily[dimension]
+                groups = days.setdefault(day, {})
+                _apply_to_group(groups, key, flight, sign)
+                if not groups:
+                    del days[day]
+
+
+def _apply_to_group(
+    groups: Dict[str, RollupTotals], key: str, flight: Flight, sign: int
+) -> None:
+    totals = groups.get(key)
+    if totals is None:
+        totals = groups[key] = RollupTotals()
+    totals.apply(flight, sign)
+    if totals.flights <= 0:
+        del groups[key]
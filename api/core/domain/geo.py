@@ -0,0 +1,215 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+EARTH_RADIUS_KM = 6371.0088
+# Default resolution of the spatial indexes: grid cells of 0.5° and one-hour time buckets.
+CELL_DEGREES = 0.5
+BUCKET_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """
+    Rectangular area in degrees. When `min_lon > max_lon` the box crosses the
+    antimeridian (e.g. 170 to -170).
+    """
+
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        if not self.min_lat <= latitude <= self.max_lat:
+            return False
+        if self.min_lon <= self.max_lon:
+            return self.min_lon <= longitude <= self.max_lon
+        return longitude >= self.min_lon or longitude <= self.max_lon
+
+    def bounding_box(self) -> "BoundingBox":
+        return self
+
+    def lon_ranges(self) -> List[Tuple[float, float]]:
+        """Longitude intervals covered by the box (two if it crosses the antimeridian)."""
+        if self.min_lon <= self.max_lon:
+            return [(self.min_lon, self.max_lon)]
+        return [(self.min_lon, 180.0), (-180.0, self.max_lon)]
+
+
+@dataclass(frozen=True)
+class Circle:
+    """
+    Area within `radius_km` (great-circle distance) of a point.
+    """
+
+    latitude: float
+    longitude: float
+    radius_km: float
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        return (
+            haversine_km(self.latitude, self.longitude, latitude, longitude)
+            <= self.radius_km
+        )
+
+    def bounding_box(self) -> BoundingBox:
+        """Smallest latitude/longitude box containing the circle."""
+        angular = self.radius_km / EARTH_RADIUS_KM
+        delta_lat = math.degrees(angular)
+        min_lat = max(self.latitude - delta_lat, -90.0)
+        max_lat = min(self.latitude + delta_lat, 90.0)
+        if min_lat <= -90.0 or max_lat >= 90.0 or angular >= math.pi / 2:
+            return BoundingBox(min_lat, -180.0, max_lat, 180.0)
+
+        ratio = math.sin(angular) / math.cos(math.radians(self.latitude))
+        if ratio >= 1.0:
+            return BoundingBox(min_lat, -180.0, max_lat, 180.0)
+        delta_lon = math.degrees(math.asin(ratio))
+        return BoundingBox(
+            min_lat,
+            _wrap_longitude(self.longitude - delta_lon),
+            max_lat,
+            _wrap_longitude(self.longitude + delta_lon),
+        )
+
+
+Area = Union[BoundingBox, Circle]
+
+
+@dataclass
+class AreaCrossing:
+    """
+    A flight whose track has positions inside a queried area: the time of its
+    first and last position inside the area and how many positions fell in it.
+    """
+
+    flight_id: int
+    entry_time: datetime
+    exit_time: datetime
+    points: int
+
+    def to_dict(self) -> dict:
+        return {
+            "flight_id": self.flight_id,
+            "entry_time": self.entry_time.isoformat(),
+            "exit_time": self.exit_time.isoformat(),
+            "points": self.points,
+        }
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres between two points given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def cell_of(
+    latitude: float, longitude: float, cell_degrees: float = CELL_DEGREES
+) -> Tuple[int, int]:
+    """Grid cell (row, column) of a point."""
+    rows = int(round(180.0 / cell_degrees))
+    columns = int(round(360.0 / cell_degrees))
+    row = min(int((latitude + 90.0) // cell_degrees), rows - 1)
+    column = int((longitude + 180.0) // cell_degrees) % columns
+    return row, column
+
+
+def cells_in_box(
+    box: BoundingBox, cell_degrees: float = CELL_DEGREES
+) -> Iterator[Tuple[int, int]]:
+    """Grid cells overlapping a bounding box."""
+    first_row, _ = cell_of(box.min_lat, 0.0, cell_degrees)
+    last_row, _ = cell_of(box.max_lat, 0.0, cell_degrees)
+    for min_lon, max_lon in box.lon_ranges():
+        _, first_column = cell_of(0.0, min_lon, cell_degrees)
+        _, last_column = cell_of(0.0, min(max_lon, 180.0 - 1e-9), cell_degrees)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                yield row, column
+
+
+def cell_count(box: BoundingBox, cell_degrees: float = CELL_DEGREES) -> int:
+    """Number of grid cells overlapping a bounding box."""
+    rows = (
+        cell_of(box.max_lat, 0.0, cell_degrees)[0]
+        - cell_of(box.min_lat, 0.0, cell_degrees)[0]
+        + 1
+    )
+    columns = 0
+    for min_lon, max_lon in box.lon_ranges():
+        columns += (
+            cell_of(0.0, min(max_lon, 180.0 - 1e-9), cell_degrees)[1]
+            - cell_of(0.0, min_lon, cell_degrees)[1]
+            + 1
+        )
+    return rows * columns
+
+
+def track_boxes(
+    points: Iterable[Tuple[float, float, float]],
+    cell_degrees: float = CELL_DEGREES,
+    bucket_seconds: int = BUCKET_SECONDS,
+) -> Dict[Tuple[int, int, int], List[float]]:
+    """
+    Summarizes (epoch, latitude, longitude) points of one flight into one box
+    per (time bucket, cell row, cell column):
+    [min_lat, max_lat, min_lon, max_lon, first_epoch, last_epoch].
+    """
+    boxes: Dict[Tuple[int, int, int], List[float]] = {}
+    for epoch, latitude, longitude in points:
+        row, column = cell_of(latitude, longitude, cell_degrees)
+        key = (int(epoch // bucket_seconds), row, column)
+        box = boxes.get(key)
+        if box is None:
+            boxes[key] = [latitude, latitude, longitude, longitude, epoch, epoch]
+            continue
+        if latitude < box[0]:
+            box[0] = latitude
+        elif latitude > box[1]:
+            box[1] = latitude
+        if longitude < box[2]:
+            box[2] = longitude
+        elif longitude > box[3]:
+            box[3] = longitude
+        if epoch < box[4]:
+            box[4] = epoch
+        elif epoch > box[5]:
+            box[5] = epoch
+    return boxes
+
+
+def crossing_from_points(
+    flight_id: int,
+    points: Iterable[Tuple[datetime, float, float]],
+    area: Area,
+) -> Optional[AreaCrossing]:
+    """
+    Builds the crossing of one flight from its (timestamp, latitude, longitude)
+    points of the queried time window, ordered by time, or None if none of
+    them is inside the area.
+    """
+    entry = exit_ = None
+    inside = 0
+    for timestamp, latitude, longitude in points:
+        if area.contains(latitude, longitude):
+            inside += 1
+            if entry is None:
+                entry = timestamp
+            exit_ = timestamp
+    if entry is None:
+        return None
+    return AreaCrossing(
+        flight_id=flight_id, entry_time=entry, exit_time=exit_, points=inside
+    )
+
+
+def _wrap_longitude(longitude: float) -> float:
+    return (longitude + 180.0) % 360.0 - 180.0
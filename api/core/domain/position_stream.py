@@ -0,0 +1,159 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from api.core.domain.flight_position import FlightPosition
+from api.utils.time_utils import to_utc_naive
+
+
+@dataclass(frozen=True)
+class PositionEvent:
+    """
+    A position published to the subscribers of a flight. It is serialized
+    once when published, however many subscribers there are.
+    `timestamp` is naive UTC, for ordering and resuming.
+    """
+
+    flight_id: int
+    timestamp: datetime
+    data: str
+
+    @staticmethod
+    def from_position(position: FlightPosition) -> "PositionEvent":
+        return PositionEvent(
+            flight_id=position.flight_id,
+            timestamp=to_utc_naive(position.timestamp),
+            data=json.dumps(position.to_dict()),
+        )
+
+    @staticmethod
+    def from_dict(data: dict) -> "PositionEvent":
+        """Builds the event of a position serialized with `FlightPosition.to_dict`."""
+        return PositionEvent(
+            flight_id=data["flight_id"],
+            timestamp=to_utc_naive(datetime.fromisoformat(data["timestamp"])),
+            data=json.dumps(data),
+        )
+
+
+class PositionSubscription:
+    """
+    A client's subscription to the new positions of a flight.
+    Events are kept in a bounded buffer: when the client does not consume
+    them in time the oldest are dropped and counted in `dropped`, so a slow
+    client never holds up the publisher or the other clients.
+    `push` can be called from any thread; `next_batch` is awaited from the
+    client's event loop.
+    """
+
+    def __init__(self, flight_id: int, buffer_size: int):
+        self.flight_id = flight_id
+        self.buffer_size = buffer_size
+        self.closed = False
+        self._events: Deque[PositionEvent] = deque()
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def push(self, events: Iterable[PositionEvent]) -> None:
+        """
+        Adds events to the buffer, dropping the oldest ones beyond `buffer_size`,
+        and wakes up the waiting client.
+        """
+        with self._lock:
+            if self.closed:
+                return
+            for event in events:
+                if len(self._events) >= self.buffer_size:
+                    self._events.popleft()
+                    self._dropped += 1
+                self._events.append(event)
+            loop, wakeup = self._loop, self._wakeup
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # The client's event loop is gone; it will never read again.
+                self.close()
+
+    async def next_batch(self, timeout: float) -> Tuple[List[PositionEvent], int]:
+        """
+        Waits up to `timeout` seconds for events and returns every buffered
+        event with the number of events dropped since the previous batch.
+        Returns ([], 0) on timeout or once the subscription is closed.
+        """
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+                self._wakeup = asyncio.Event()
+            self._wakeup.clear()
+            pending = bool(self._events or self._dropped)
+        if not pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        with self._lock:
+            events, dropped = list(self._events), self._dropped
+            self._events.clear()
+            self._dropped = 0
+        return events, dropped
+
+    def close(self) -> None:
+        """
+        Stops buffering events and wakes up the waiting client.
+        """
+        with self._lock:
+            self.closed = True
+            self._events.clear()
+            loop, wakeup = self._loop, self._wakeup
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass
+
+
+class PositionStream:
+    """
+    A flight's position stream for one client: first the stored positions
+    after the last one it saw (`backfill`), then the ones published from then
+    on. The subscription is opened before the stored positions are read, so
+    none is lost; published positions the client already saw or that came in
+    the `backfill` (timestamp not after `since` or the last one sent) are
+    skipped.
+    """
+
+    def __init__(
+        self,
+        subscription: PositionSubscription,
+        backfill: List[PositionEvent],
+        since: Optional[datetime] = None,
+    ):
+        self.subscription = subscription
+        self.backfill = backfill
+        self._replayed_until = backfill[-1].timestamp if backfill else None
+        if since is not None:
+            since = to_utc_naive(since)
+            if self._replayed_until is None or since > self._replayed_until:
+                self._replayed_until = since
+
+    @property
+    def flight_id(self) -> int:
+        return self.subscription.flight_id
+
+    async def next_batch(self, timeout: float) -> Tuple[List[PositionEvent], int]:
+        """
+        Waits for the next live events, see `PositionSubscription.next_batch`.
+        """
+        events, dropped = await self.subscription.next_batch(timeout)
+        if self._replayed_until is not None and events:
+            events = [
+                event for event in events if event.timestamp > self._replayed_until
+            ]
+        return events, dropped
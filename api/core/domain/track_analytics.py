@@ -0,0 +1,246 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.core.domain.flight import Flight, PhaseDurations
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import EARTH_RADIUS_KM
+from api.utils.time_utils import from_epoch, to_epoch
+
+PHASES = ("takeoff", "climb", "cruise", "descent", "landing")
+TAKEOFF, CLIMB, CRUISE, DESCENT, LANDING = range(len(PHASES))
+GROUND = -1
+
+# Positions at or below this altitude (m) are on the ground.
+GROUND_ALTITUDE_M = 30
+# Height (m) above the first/last airborne altitude that ends takeoff and starts landing.
+TERMINAL_HEIGHT_M = 450
+# Cruise starts and ends at this fraction of the highest altitude of the flight.
+CRUISE_ALTITUDE_RATIO = 0.8
+# Vertical rate (m/s) that marks a step climb or descent during cruise.
+LEVEL_RATE_M_S = 2.5
+# Samples of the centered moving average applied to the vertical rate.
+RATE_SMOOTHING_SAMPLES = 5
+
+
+@dataclass
+class TrackAnalysis:
+    """
+    Metrics of a flight derived from its positions: the distance flown (sum
+    of the legs between positions), the great-circle distance between the
+    first and the last one, the departure and arrival times (first airborne
+    position and the one after the last), the duration and the time spent in
+    each phase.
+    """
+
+    flight_id: int
+    points: int
+    distance_calculated_km: float
+    great_circle_distance_km: float
+    departure_time_utc: Optional[datetime]
+    arrival_time_utc: Optional[datetime]
+    flight_duration_s: int
+    phase_durations_s: PhaseDurations
+
+    def to_dict(self) -> dict:
+        return {
+            "flight_id": self.flight_id,
+            "points": self.points,
+            "distance_calculated_km": self.distance_calculated_km,
+            "great_circle_distance_km": self.great_circle_distance_km,
+            "departure_time_utc": (
+                self.departure_time_utc.isoformat() if self.departure_time_utc else None
+            ),
+            "arrival_time_utc": (
+                self.arrival_time_utc.isoformat() if self.arrival_time_utc else None
+            ),
+            "flight_duration_s": self.flight_duration_s,
+            "phase_durations_s": self.phase_durations_s.to_dict(),
+        }
+
+    def apply_to(self, flight: Flight) -> Flight:
+        """Returns a copy of the flight with the fields derived from the track."""
+        return replace(
+            flight,
+            distance_calculated_km=self.distance_calculated_km,
+            great_circle_distance_km=self.great_circle_distance_km,
+            departure_time_utc=self.departure_time_utc or flight.departure_time_utc,
+            arrival_time_utc=self.arrival_time_utc or flight.arrival_time_utc,
+            flight_duration_s=self.flight_duration_s,
+            phase_durations_s=self.phase_durations_s,
+        )
+
+
+def analyze_track(
+    flight_id: int, positions: Sequence[FlightPosition]
+) -> Optional[TrackAnalysis]:
+    """
+    Analyzes the positions of a flight, in any order, with array operations
+    over the whole track. Returns None with fewer than two positions.
+    """
+    if len(positions) < 2:
+        return None
+    epochs, latitudes, longitudes, altitudes, rates = track_arrays(positions)
+    order = np.argsort(epochs, kind="stable")
+    epochs, latitudes, longitudes = epochs[order], latitudes[order], longitudes[order]
+    altitudes, rates = altitudes[order], rates[order]
+
+    distance = float(segment_distances_km(latitudes, longitudes).sum())
+    great_circle = float(
+        haversine_km(latitudes[0], longitudes[0], latitudes[-1], longitudes[-1])
+    )
+
+    altitudes = _fill_missing(epochs, altitudes)
+    rates = _vertical_rates(epochs, altitudes, rates)
+    phases = classify_phases(altitudes, rates)
+
+    # Each interval between two positions is spent in the phase of its first one.
+    intervals = np.diff(epochs)
+    airborne_intervals = phases[:-1] != GROUND
+    durations = np.bincount(
+        phases[:-1][airborne_intervals],
+        weights=intervals[airborne_intervals],
+        minlength=len(PHASES),
+    )
+
+    # Airborne from the first airborne position to the position after the last one (touchdown).
+    airborne = np.flatnonzero(phases != GROUND)
+    if len(airborne):
+        departure = epochs[airborne[0]]
+        arrival = epochs[min(airborne[-1] + 1, len(epochs) - 1)]
+    else:
+        departure = arrival = None
+
+    return TrackAnalysis(
+        flight_id=flight_id,
+        points=len(positions),
+        distance_calculated_km=round(distance, 3),
+        great_circle_distance_km=round(great_circle, 3),
+        departure_time_utc=from_epoch(departure) if departure is not None else None,
+        arrival_time_utc=from_epoch(arrival) if arrival is not None else None,
+        flight_duration_s=(
+            int(round(arrival - departure)) if departure is not None else 0
+        ),
+        phase_durations_s=PhaseDurations(
+            **{phase: int(round(seconds)) for phase, seconds in zip(PHASES, durations)}
+        ),
+    )
+
+
+def track_arrays(
+    positions: Sequence[FlightPosition],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Columns of a track as float arrays: epoch, latitude, longitude, altitude
+    (m) and vertical rate (m/s), with NaN where a value is missing.
+    """
+    nan = float("nan")
+    epochs = np.fromiter(
+        (to_epoch(p.timestamp) for p in positions), float, len(positions)
+    )
+    latitudes = np.fromiter((p.latitude for p in positions), float, len(positions))
+    longitudes = np.fromiter((p.longitude for p in positions), float, len(positions))
+    altitudes = np.fromiter(
+        (nan if p.altitude is None else p.altitude for p in positions),
+        float,
+        len(positions),
+    )
+    rates = np.fromiter(
+        (nan if p.vertical_rate is None else p.vertical_rate for p in positions),
+        float,
+        len(positions),
+    )
+    return epochs, latitudes, longitudes, altitudes, rates
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometres, element-wise over arrays of degrees."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def segment_distances_km(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Distance of every leg between consecutive positions."""
+    return haversine_km(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:])
+
+
+def classify_phases(altitudes: np.ndarray, rates: np.ndarray) -> np.ndarray:
+    """
+    Phase of every position (an index of PHASES, or GROUND) from its altitude
+    (m) and vertical rate (m/s), ordered by time.
+
+    Cruise spans from the first to the last position at CRUISE_ALTITUDE_RATIO
+    of the highest altitude; before it the flight is climbing and after it
+    descending, so level-offs on the way up or down are not taken as cruise.
+    Step climbs and descents during cruise count as climb or descent. The
+    first TERMINAL_HEIGHT_M above the departure and arrival altitudes are
+    takeoff and landing.
+    """
+    phases = np.full(len(altitudes), GROUND, dtype=np.int64)
+    airborne = altitudes > GROUND_ALTITUDE_M
+    if not airborne.any():
+        return phases
+
+    indexes = np.flatnonzero(airborne)
+    first, last = indexes[0], indexes[-1]
+    high = np.flatnonzero(
+        airborne & (altitudes >= CRUISE_ALTITUDE_RATIO * altitudes[airborne].max())
+    )
+    top_of_climb, top_of_descent = high[0], high[-1]
+
+    position = np.arange(len(altitudes))
+    before_cruise = position < top_of_climb
+    after_cruise = position > top_of_descent
+    in_cruise = ~before_cruise & ~after_cruise
+    phases = np.select(
+        [
+            ~airborne,
+            before_cruise & (altitudes < altitudes[first] + TERMINAL_HEIGHT_M),
+            before_cruise,
+            after_cruise & (altitudes < altitudes[last] + TERMINAL_HEIGHT_M),
+            after_cruise,
+            in_cruise & (rates > LEVEL_RATE_M_S),
+            in_cruise & (rates < -LEVEL_RATE_M_S),
+        ],
+        [GROUND, TAKEOFF, CLIMB, LANDING, DESCENT, CLIMB, DESCENT],
+        default=CRUISE,
+    )
+    return phases
+
+
+def _fill_missing(epochs: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Interpolates the NaN values in time; all-NaN columns become zeros."""
+    known = ~np.isnan(values)
+    if known.all():
+        return values
+    if not known.any():
+        return np.zeros_like(values)
+    return np.interp(epochs, epochs[known], values[known])
+
+
+def _vertical_rates(
+    epochs: np.ndarray, altitudes: np.ndarray, rates: np.ndarray
+) -> np.ndarray:
+    """
+    Reported vertical rates (m/s), completed with the altitude gradient over
+    time where missing and smoothed with a centered moving average.
+    """
+    missing = np.isnan(rates)
+    if missing.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gradient = np.gradient(altitudes, epochs) if len(epochs) > 1 else rates
+        rates = np.where(
+            missing, np.nan_to_num(gradient, posinf=0.0, neginf=0.0), rates
+        )
+    window = min(RATE_SMOOTHING_SAMPLES, len(rates))
+    if window < 2:
+        return rates
+    kernel = np.ones(window) / window
+    # Edge padding keeps the average of the first and last samples unbiased.
+    padded = np.pad(rates, (window // 2, window - 1 - window // 2), mode="edge")
+    return np.convolve(padded, kernel, mode="valid")
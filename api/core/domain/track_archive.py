@@ -0,0 +1,162 @@
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from api.core.domain.flight_position import FlightPosition
+from api.utils.time_utils import to_utc_naive
+
+TRACK_MAGIC = b"FTRK"
+TRACK_FORMAT_VERSION = 1
+# Coordinates are stored as integers of 1e-7 degrees (about 1 cm).
+COORDINATE_SCALE = 10_000_000
+# magic, version, positions, first and last timestamp (epoch microseconds)
+_HEADER = struct.Struct("<4sBIqq")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_OPTIONAL_COLUMNS = ("altitude", "ground_speed", "vertical_rate")
+
+
+@dataclass(frozen=True)
+class ArchivedTrack:
+    """
+    Summary of a flight's track in the archive, read from the blob header.
+    """
+
+    flight_id: int
+    positions: int
+    first_timestamp: datetime
+    last_timestamp: datetime
+    size_bytes: int
+
+
+def encode_track(positions: Sequence[FlightPosition]) -> bytes:
+    """
+    Compacts a track into one blob. Positions are ordered by timestamp and
+    stored column by column as deltas from the previous position (timestamps
+    in microseconds, coordinates in 1e-7 degrees), byte-shuffled and
+    compressed with zlib; missing altitudes, speeds and rates are kept in a
+    bitmap. Position IDs are not kept.
+    """
+    ordered = sorted(positions, key=lambda position: to_utc_naive(position.timestamp))
+    timestamps = np.array([_to_micros(p.timestamp) for p in ordered], dtype=np.int64)
+    columns = [
+        timestamps,
+        np.round(
+            np.array([p.latitude for p in ordered], dtype=float) * COORDINATE_SCALE
+        ),
+        np.round(
+            np.array([p.longitude for p in ordered], dtype=float) * COORDINATE_SCALE
+        ),
+    ]
+    masks = []
+    for name in _OPTIONAL_COLUMNS:
+        values = [getattr(p, name) for p in ordered]
+        masks.append(np.array([value is not None for value in values], dtype=bool))
+        columns.append(np.array([value or 0 for value in values], dtype=np.int64))
+
+    deltas = np.diff(
+        np.array(columns, dtype=np.int64).reshape(len(columns), -1), axis=1, prepend=0
+    )
+    shuffled = deltas.astype("<i8").view(np.uint8).reshape(-1, 8).T.tobytes()
+    payload = shuffled + np.packbits(np.array(masks).ravel()).tobytes()
+
+    header = _HEADER.pack(
+        TRACK_MAGIC,
+        TRACK_FORMAT_VERSION,
+        len(ordered),
+        int(timestamps[0]) if len(ordered) else 0,
+        int(timestamps[-1]) if len(ordered) else 0,
+    )
+    return header + zlib.compress(payload, 6)
+
+
+def decode_track(flight_id: int, blob: bytes) -> List[FlightPosition]:
+    """
+    Restores the positions of a blob written by `encode_track`, ordered by
+    timestamp, with aware UTC timestamps.
+    """
+    count, _, _ = read_track_header(blob)
+    if count == 0:
+        return []
+    payload = zlib.decompress(blob[_HEADER.size :])
+    rows = 3 + len(_OPTIONAL_COLUMNS)
+    size = rows * count * 8
+    deltas = (
+        np.frombuffer(payload[:size], dtype=np.uint8)
+        .reshape(8, -1)
+        .T.copy()
+        .view("<i8")
+        .reshape(rows, count)
+    )
+    columns = np.cumsum(deltas, axis=1)
+    masks = np.unpackbits(np.frombuffer(payload[size:], dtype=np.uint8))
+    masks = (
+        masks[: len(_OPTIONAL_COLUMNS) * count]
+        .reshape(len(_OPTIONAL_COLUMNS), count)
+        .astype(bool)
+    )
+
+    timestamps, latitudes, longitudes = (
+        columns[0],
+        columns[1] / COORDINATE_SCALE,
+        columns[2] / COORDINATE_SCALE,
+    )
+    optional = [
+        [
+            int(value) if present else None
+            for value, present in zip(columns[3 + index], masks[index])
+        ]
+        for index in range(len(_OPTIONAL_COLUMNS))
+    ]
+    return [
+        FlightPosition(
+            flight_id=flight_id,
+            timestamp=_from_micros(int(timestamps[i])),
+            latitude=float(latitudes[i]),
+            longitude=float(longitudes[i]),
+            altitude=optional[0][i],
+            ground_speed=optional[1][i],
+            vertical_rate=optional[2][i],
+        )
+        for i in range(count)
+    ]
+
+
+def read_track_header(blob: bytes) -> Tuple[int, datetime, datetime]:
+    """
+    The number of positions and the first and last timestamps of a blob,
+    without decompressing it. Raises ValueError if it is not a track blob.
+    """
+    if len(blob) < _HEADER.size:
+        raise ValueError("Truncated track blob.")
+    magic, version, count, first, last = _HEADER.unpack_from(blob)
+    if magic != TRACK_MAGIC or version != TRACK_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported track blob (magic {magic!r}, version {version})."
+        )
+    return count, _from_micros(first), _from_micros(last)
+
+
+def merge_tracks(*tracks: Iterable[FlightPosition]) -> List[FlightPosition]:
+    """
+    Merges tracks into one ordered by timestamp. Positions with the same
+    timestamp are duplicates; the one from the later track is kept, so
+    archiving the same positions twice is harmless.
+    """
+    merged = {}
+    for track in tracks:
+        for position in track:
+            merged[to_utc_naive(position.timestamp)] = position
+    return [merged[key] for key in sorted(merged)]
+
+
+def _to_micros(value: datetime) -> int:
+    return (to_utc_naive(value) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    return (_EPOCH + value * _MICROSECOND).replace(tzinfo=timezone.utc)
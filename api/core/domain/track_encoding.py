@@ -0,0 +1,101 @@
+from typing import List, Literal, Sequence
+
+import numpy as np
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.track_analytics import track_arrays
+from api.utils.time_utils import to_utc_naive
+
+TrackFormat = Literal["full", "simplified", "polyline"]
+
+EARTH_RADIUS_M = 6_371_000.0
+FEET_TO_M = 0.3048
+POLYLINE_PRECISION = 5
+
+
+def sort_track(positions: Sequence[FlightPosition]) -> List[FlightPosition]:
+    """
+    The positions of a track ordered by timestamp.
+    """
+    return sorted(positions, key=lambda position: to_utc_naive(position.timestamp))
+
+
+def simplify_track(
+    positions: Sequence[FlightPosition], tolerance_m: float
+) -> List[FlightPosition]:
+    """
+    Ramer-Douglas-Peucker simplification of a time-ordered track: keeps the
+    fewest positions such that no dropped one lies farther than
+    `tolerance_m` from the simplified path. Distances are measured in 3D
+    (altitude included, when known) on a local equirectangular projection,
+    so climbs and descents keep their shape.
+    """
+    if len(positions) <= 2 or tolerance_m <= 0:
+        return list(positions)
+
+    _, latitudes, longitudes, altitudes, _ = track_arrays(positions)
+    mean_lat = np.radians(np.nanmean(latitudes))
+    points = np.column_stack(
+        (
+            np.radians(longitudes) * np.cos(mean_lat) * EARTH_RADIUS_M,
+            np.radians(latitudes) * EARTH_RADIUS_M,
+            np.nan_to_num(altitudes * FEET_TO_M),
+        )
+    )
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = _distances_to_segment(
+            points[first + 1 : last], points[first], points[last]
+        )
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance_m:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return [position for position, kept in zip(positions, keep) if kept]
+
+
+def encode_polyline(
+    positions: Sequence[FlightPosition], precision: int = POLYLINE_PRECISION
+) -> str:
+    """
+    Encodes the latitude/longitude path of a track with Google's encoded
+    polyline algorithm, which most map libraries decode directly.
+    """
+    factor = 10**precision
+    coordinates = np.round(
+        np.array([(p.latitude, p.longitude) for p in positions], dtype=float).reshape(
+            -1, 2
+        )
+        * factor
+    ).astype(np.int64)
+    deltas = np.diff(coordinates, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    return "".join(_encode_value(int(value)) for value in deltas.ravel())
+
+
+def _distances_to_segment(
+    points: np.ndarray, start: np.ndarray, end: np.ndarray
+) -> np.ndarray:
+    segment = end - start
+    length_sq = float(segment @ segment)
+    if length_sq == 0.0:
+        return np.linalg.norm(points - start, axis=1)
+    t = np.clip((points - start) @ segment / length_sq, 0.0, 1.0)
+    return np.linalg.norm(points - (start + t[:, None] * segment), axis=1)
+
+
+def _encode_value(value: int) -> str:
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return "".join(chunks)
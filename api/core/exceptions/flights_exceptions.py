@@ -8,3 +8,27 @@ class FlightCannotBeAddedError(Exception):
     """Raised when a flight cannot be added."""
 
     pass
+
+
+class RollupsNotReadyError(Exception):
+    """Raised when the rollups have not been built yet (or are disabled)."""
+
+    pass
+
+
+class TrackNotAvailableError(Exception):
+    """Raised when a flight does not have enough positions to analyze its track."""
+
+    pass
+
+
+class BackendUnavailableError(Exception):
+    """Raised when the storage backend fails, times out or is short-circuited by the circuit breaker."""
+
+    pass
+
+
+class DeadlineExceededError(BackendUnavailableError):
+    """Raised when a backend call does not finish within the request's time budget."""
+
+    pass
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List, Optional
+from typing import Iterator, List, Literal, Optional, Sequence
 
 from api.core.domain.flight import Flight
 
+CountMode = Literal["exact", "planned", "estimated"]
+
 
 class FlightPort(ABC):
     """
@@ -20,6 +22,22 @@ class FlightPort(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def upsert(self, flight: Flight) -> Optional[Flight]:
+        """
+        Inserts a flight record, or replaces the existing record with the same
+        FR24 ID (keeping its database ID). Returns the stored flight.
+        """
+        raise NotImplementedError
+
+    def upsert_many(self, flights: Sequence[Flight]) -> int:
+        """
+        Upserts a batch of flights by FR24 ID, like `upsert`. Returns the
+        number of flights stored. The default upserts them one by one;
+        adapters override it with a single bulk write.
+        """
+        return sum(1 for flight in flights if self.upsert(flight) is not None)
+
     @abstractmethod
     def get_by_id(self, flight_id: int) -> Optional[Flight]:
         """
@@ -36,6 +54,13 @@ class FlightPort(ABC):
         """
         raise NotImplementedError
 
+    def get_current_by_fr24_id(self, fr24_id: str) -> Optional[Flight]:
+        """
+        Like `get_by_fr24_id`, but never answered from a read cache, for
+        read-modify-write paths such as the rollup deltas of an upsert.
+        """
+        return self.get_by_fr24_id(fr24_id)
+
     @abstractmethod
     def find_all(
         self,
@@ -50,10 +75,55 @@ class FlightPort(ABC):
         Retrieves a filtered and paginated list of flight records.
         """
         raise NotImplementedError
-    
+
+    def count(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        """
+        Counts the flights matching the `find_all` filters. `planned` and
+        `estimated` allow an approximate count from the query planner where
+        the backend has one; other backends answer exactly. Returns None on
+        failure. The default pages through `find_all`; adapters override it.
+        """
+        total, offset, page_size = 0, 0, 1000
+        while True:
+            page = self.find_all(
+                search, airport, aircraft_model, flight_date, page_size, offset
+            )
+            total += len(page)
+            if len(page) < page_size:
+                return total
+            offset += page_size
+
     @abstractmethod
     def get_summary_metrics(self) -> Optional[dict]:
         """
         Retrieves the SQL calculation for data metrics.
         """
         raise NotImplementedError
+
+    def iter_flights(
+        self, batch_size: int = 1000, after_id: int = 0
+    ) -> Iterator[List[Flight]]:
+        """
+        Yields every flight record with an ID above `after_id` in batches of
+        up to `batch_size`, ordered by ID. Used by full scans such as the
+        analytics snapshot. The default pages through `find_all`; adapters
+        override it with a cheaper keyset scan. A batch that cannot be read
+        raises (BackendUnavailableError) instead of ending the scan, so callers
+        never swap in or checkpoint the result of a partial scan.
+        """
+        offset = 0
+        while True:
+            page = self.find_all(limit=batch_size, offset=offset)
+            batch = [flight for flight in page if flight.flight_id > after_id]
+            if batch:
+                yield batch
+            if len(page) < batch_size:
+                return
+            offset += batch_size
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 
 from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing
+from api.utils.time_utils import to_utc_naive
 
 
 class FlightPositionPort(ABC):
@@ -18,6 +21,29 @@ class FlightPositionPort(ABC):
         """
         raise NotImplementedError
 
+    def add_new_positions(
+        self, flight_id: int, positions: List[FlightPosition]
+    ) -> Optional[List[FlightPosition]]:
+        """
+        Adds positions like `add_positions` and returns those actually stored,
+        without the ones skipped as already stored, or None on failure.
+        Adapters that cannot tell which were skipped return all of them.
+        """
+        return positions if self.add_positions(flight_id, positions) else None
+
+    def add_position_batches(self, batches: Dict[int, List[FlightPosition]]) -> bool:
+        """
+        Adds the positions of several flights at once, keyed by flight ID.
+        Returns True if every batch was stored. Adapters that can store them
+        in one bulk insert should override this default, which adds them
+        flight by flight.
+        """
+        success = True
+        for flight_id, positions in batches.items():
+            if positions and not self.add_positions(flight_id, positions):
+                success = False
+        return success
+
     @abstractmethod
     def get_positions_by_flight_id(self, flight_id: int) -> List[FlightPosition]:
         """
@@ -25,6 +51,29 @@ class FlightPositionPort(ABC):
         """
         raise NotImplementedError
 
+    def get_positions_between(
+        self,
+        flight_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[FlightPosition]:
+        """
+        Retrieves the positions of a flight with `start <= timestamp < end`,
+        ordered by timestamp. Adapters with a time index should override this
+        default, which filters the whole track.
+        """
+        low = to_utc_naive(start) if start else None
+        high = to_utc_naive(end) if end else None
+        return sorted(
+            (
+                position
+                for position in self.get_positions_by_flight_id(flight_id)
+                if (low is None or to_utc_naive(position.timestamp) >= low)
+                and (high is None or to_utc_naive(position.timestamp) < high)
+            ),
+            key=lambda position: to_utc_naive(position.timestamp),
+        )
+
     @abstractmethod
     def delete_positions_by_flight_id(self, flight_id: int) -> bool:
         """
@@ -32,3 +81,37 @@ class FlightPositionPort(ABC):
         Returns True on success, False otherwise.
         """
         raise NotImplementedError
+
+    @abstractmethod
+    def flight_ids_with_positions_before(
+        self, before: datetime, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        """
+        Up to `limit` IDs of flights, greater than `after_id` and in
+        ascending order, that have positions with `timestamp < before`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_positions_before(
+        self, flight_id: int, before: datetime, limit: Optional[int] = None
+    ) -> int:
+        """
+        Deletes the oldest positions of a flight with `timestamp < before`,
+        at most `limit` of them. Returns the number of positions deleted.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        """
+        Finds the flights with positions inside `area` (a bounding box or a
+        radius around a point) with `start <= timestamp < end`, with the time
+        of their first and last position inside it, ordered by entry time.
+        """
+        raise NotImplementedError
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.position_stream import PositionSubscription
+
+
+class PositionBrokerPort(ABC):
+    """
+    An abstract base class (port) that defines the contract for
+    publishing new flight positions to the clients subscribed to a flight.
+    """
+
+    @abstractmethod
+    def publish(self, flight_id: int, positions: List[FlightPosition]) -> None:
+        """
+        Delivers newly stored positions of a flight to its subscribers,
+        including those connected to other workers.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def subscribe(self, flight_id: int, buffer_size: int) -> PositionSubscription:
+        """
+        Opens a subscription to the positions published for a flight from now on,
+        buffering at most `buffer_size` undelivered events.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def unsubscribe(self, subscription: PositionSubscription) -> None:
+        """
+        Closes a subscription and stops delivering events to it.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Releases the broker's connections. Does nothing by default.
+        """
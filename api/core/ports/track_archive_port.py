@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.track_archive import ArchivedTrack
+
+
+class TrackArchivePort(ABC):
+    """
+    An abstract base class (port) that defines the contract for the cold
+    store of old tracks, kept as one compacted blob per flight.
+    """
+
+    @abstractmethod
+    def save_track(self, flight_id: int, positions: List[FlightPosition]) -> bool:
+        """
+        Stores a flight's archived track, replacing the previous one.
+        Returns True on success, False otherwise.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_track(self, flight_id: int) -> List[FlightPosition]:
+        """
+        Retrieves a flight's archived track ordered by timestamp, or an
+        empty list if nothing was archived for it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def has_track(self, flight_id: int) -> bool:
+        """
+        Whether anything is archived for a flight, without reading it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_track(self, flight_id: int) -> bool:
+        """
+        Deletes a flight's archived track. Returns True on success
+        (including when there was none), False otherwise.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_tracks(self, after_id: int = 0, limit: int = 1000) -> List[ArchivedTrack]:
+        """
+        Summaries of up to `limit` archived tracks with a flight ID greater
+        than `after_id`, ordered by flight ID.
+        """
+        raise NotImplementedError
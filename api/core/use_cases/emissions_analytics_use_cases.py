@@ -0,0 +1,117 @@
+import threading
+import time
+from datetime import date
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from api.core.domain.flight import Flight
+from api.core.ports.flight_port import FlightPort
+from api.utils.cache import TTLCache
+from api.utils.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from api.core.domain.flight_columns import FlightColumns
+
+
+class EmissionsAnalyticsUseCase:
+    """
+    Application logic for the grouped emissions analytics.
+    Aggregates run over a columnar snapshot of the flights that is rebuilt
+    from the FlightPort every `snapshot_ttl_seconds`. A stale snapshot keeps
+    serving while its replacement is built in the background, and results are
+    cached per query signature until the snapshot changes. Concurrent first
+    requests share a single build.
+    """
+
+    def __init__(
+        self,
+        flight_port: FlightPort,
+        snapshot_ttl_seconds: float = 300.0,
+        max_cached_queries: int = 256,
+    ) -> None:
+        """
+        Initializes the use case with a concrete implementation of the FlightPort.
+        The snapshot is built on first use (or by `refresh`).
+        """
+        self.flight_port: FlightPort = flight_port
+        self.snapshot_ttl_seconds = snapshot_ttl_seconds
+        self.results: TTLCache[List[dict]] = TTLCache(
+            snapshot_ttl_seconds, max_cached_queries
+        )
+        self._snapshot: Optional["FlightColumns"] = None
+        self._version = 0
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._first_build = SingleFlight("analytics_snapshot")
+
+    def get_emissions(
+        self,
+        bucket: str = "day",
+        group_by: Optional[str] = None,
+        source: str = "detailed",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[dict]:
+        """
+        Returns fuel, CO2 and efficiency aggregates per time bucket and group.
+        Raises ValueError for an unknown bucket, group or source.
+        """
+        snapshot, version = self.snapshot()
+        key = (version, bucket, group_by, source, start_date, end_date)
+        return self.results.get_or_load(
+            key,
+            lambda: snapshot.aggregate(
+                bucket=bucket,
+                group_by=group_by,
+                source=source,
+                start_date=start_date,
+                end_date=end_date,
+            ),
+        )
+
+    def snapshot(self):
+        """
+        Returns the current (snapshot, version), building it on first use and
+        starting a background rebuild once it is older than the TTL.
+        """
+        with self._lock:
+            snapshot, version = self._snapshot, self._version
+            stale = time.monotonic() - self._built_at > self.snapshot_ttl_seconds
+            start_refresh = snapshot is not None and stale and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+
+        if snapshot is None:
+            return self._first_build.do("snapshot", self._build_if_missing)
+        if start_refresh:
+            threading.Thread(
+                target=self.refresh, name="analytics-snapshot", daemon=True
+            ).start()
+        return snapshot, version
+
+    def _build_if_missing(self):
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot, self._version
+        return self.refresh()
+
+    def refresh(self, flights: Optional[Iterable[Flight]] = None):
+        """
+        Rebuilds the snapshot from `flights`, or from a full scan of the
+        FlightPort, and returns the new (snapshot, version).
+        """
+        from api.core.domain.flight_columns import FlightColumns
+
+        if flights is None:
+            flights = (
+                flight for batch in self.flight_port.iter_flights() for flight in batch
+            )
+        try:
+            snapshot = FlightColumns.from_flights(flights)
+            with self._lock:
+                self._snapshot = snapshot
+                self._version += 1
+                self._built_at = time.monotonic()
+                return snapshot, self._version
+        finally:
+            self._refreshing = False
@@ -0,0 +1,106 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import List, Optional, Tuple
+
+from api.core.domain.flight import Flight
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.track_encoding import (
+    POLYLINE_PRECISION,
+    TrackFormat,
+    encode_polyline,
+    simplify_track,
+    sort_track,
+)
+from api.core.exceptions.flights_exceptions import FlightNotFoundError
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.profiling import bind_to_request, phase
+
+
+class FlightDetailUseCase:
+    """
+    Application logic for the compound flight page: reads the flight record
+    and its track at the same time, so a page costs one parallel backend
+    round instead of two sequential ones, and checks the flight exists once.
+    """
+
+    def __init__(
+        self,
+        flight_port: FlightPort,
+        position_port: FlightPositionPort,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Initializes the use case with the flight and position ports and the
+        executor that runs the track read next to the flight read.
+        """
+        self.flight_port = flight_port
+        self.position_port = position_port
+        self.executor = executor or ThreadPoolExecutor(
+            thread_name_prefix="flight-detail"
+        )
+
+    def get_flight_with_track(
+        self, flight_id: int
+    ) -> Tuple[Flight, List[FlightPosition]]:
+        """
+        Reads a flight and its positions concurrently; the positions are
+        ordered by timestamp. Raises FlightNotFoundError if the flight does
+        not exist (the track read is then discarded). The track read runs in
+        a copy of the caller's context, so it keeps the request deadline.
+        """
+        track = self.executor.submit(
+            copy_context().run,
+            bind_to_request(
+                lambda: self.position_port.get_positions_by_flight_id(flight_id)
+            ),
+        )
+        try:
+            flight = self.flight_port.get_by_id(flight_id)
+        except BaseException:
+            track.cancel()
+            raise
+        if flight is None:
+            track.cancel()
+            raise FlightNotFoundError(f"Flight with id: {flight_id} not found.")
+        return flight, sort_track(track.result())
+
+    def get_flight_detail(
+        self,
+        flight_id: int,
+        include_positions: bool = False,
+        track: TrackFormat = "full",
+        tolerance_m: float = 50.0,
+    ) -> dict:
+        """
+        The flight as a dict. With `include_positions`, its track is added:
+            - "full": every position, under "positions";
+            - "simplified": the positions kept by a Douglas-Peucker pass
+              within `tolerance_m`, under "positions";
+            - "polyline": the simplified path as an encoded polyline, under
+              "track" (with the number of points and the precision).
+        Raises FlightNotFoundError if the flight does not exist.
+        """
+        if not include_positions:
+            flight = self.flight_port.get_by_id(flight_id)
+            if flight is None:
+                raise FlightNotFoundError(f"Flight with id: {flight_id} not found.")
+            with phase("serialize"):
+                return flight.to_dict()
+
+        flight, positions = self.get_flight_with_track(flight_id)
+        with phase("serialize"):
+            detail = flight.to_dict()
+        if track != "full":
+            positions = simplify_track(positions, tolerance_m)
+        if track == "polyline":
+            detail["track"] = {
+                "format": "polyline",
+                "precision": POLYLINE_PRECISION,
+                "points": len(positions),
+                "encoded": encode_polyline(positions),
+            }
+        else:
+            with phase("serialize"):
+                detail["positions"] = [position.to_dict() for position in positions]
+        return detail
@@ -0,0 +1,121 @@
+import heapq
+from datetime import date
+from typing import List, Optional
+
+from api.core.domain.flight_rollups import FlightRollups
+from api.core.exceptions.flights_exceptions import RollupsNotReadyError
+from api.core.use_cases.flight_rollup_use_cases import RollupSnapshot
+from api.utils.cache import TTLCache
+
+# metric -> (RollupTotals sum field, count field, True if lower values rank better)
+LEADERBOARD_METRICS = {
+    "efficiency": ("efficiency_sum", "efficiency_count", True),
+    "efficiency_saving": ("efficiency_saving_sum", "efficiency_saving_count", False),
+}
+
+
+class FlightLeaderboardUseCase:
+    """
+    Application logic for the route and aircraft model efficiency leaderboards.
+    Rankings are read from the incrementally maintained rollups: a request
+    merges per-group totals (per day when a date range is given) and selects
+    the top entries with a bounded heap, without reading any flight. When
+    rollups are disabled, the totals come from the periodically rebuilt
+    RollupSnapshot instead. Results are cached until the totals change.
+    """
+
+    def __init__(
+        self,
+        rollups: Optional[FlightRollups],
+        max_cached_queries: int = 256,
+        snapshot: Optional[RollupSnapshot] = None,
+    ) -> None:
+        """
+        Initializes the use case with the shared rollups (None when disabled)
+        and the snapshot used in their place.
+        """
+        self.rollups = rollups
+        self.snapshot = snapshot
+        self.results: TTLCache[List[dict]] = TTLCache(3600.0, max_cached_queries)
+
+    def get_leaderboard(
+        self,
+        dimension: str,
+        metric: str = "efficiency",
+        order: str = "best",
+        limit: int = 10,
+        min_samples: int = 1,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[dict]:
+        """
+        Returns the `limit` best (or worst) routes or aircraft models by
+        `metric`, among those with at least `min_samples` flights reporting it.
+        `efficiency` is the mean detailed kg/pax/km (lower is better);
+        `efficiency_saving` is the mean kg/pax/km by which the detailed
+        calculation beats the statistical simulation (higher is better).
+        Raises RollupsNotReadyError until the rollups are built and ValueError
+        for an unknown dimension or metric.
+        """
+        rollups = self.rollups
+        if rollups is None and self.snapshot is not None:
+            rollups = self.snapshot.current()
+        if rollups is None or not rollups.ready:
+            raise RollupsNotReadyError("Leaderboards are not available yet.")
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(
+                f"Unknown metric '{metric}', expected one of {tuple(LEADERBOARD_METRICS)}."
+            )
+
+        key = (
+            rollups.version,
+            dimension,
+            metric,
+            order,
+            limit,
+            min_samples,
+            start_date,
+            end_date,
+        )
+        return self.results.get_or_load(
+            key,
+            lambda: self._rank(
+                rollups,
+                dimension,
+                metric,
+                order,
+                limit,
+                min_samples,
+                start_date,
+                end_date,
+            ),
+        )
+
+    @staticmethod
+    def _rank(
+        rollups, dimension, metric, order, limit, min_samples, start_date, end_date
+    ) -> List[dict]:
+        sum_field, count_field, lower_is_better = LEADERBOARD_METRICS[metric]
+        totals = rollups.totals_between(dimension, start_date, end_date)
+
+        candidates = (
+            (getattr(group, sum_field) / samples, name, samples, group.flights)
+            for name, group in totals.items()
+            for samples in (getattr(group, count_field),)
+            if samples >= min_samples and samples > 0
+        )
+        select = (
+            heapq.nsmallest if lower_is_better == (order == "best") else heapq.nlargest
+        )
+        top = select(limit, candidates, key=lambda candidate: candidate[0])
+
+        return [
+            {
+                "rank": rank,
+                "key": name,
+                "value": value,
+                "samples": samples,
+                "flights": flights,
+            }
+            for rank, (value, name, samples, flights) in enumerate(top, start=1)
+        ]
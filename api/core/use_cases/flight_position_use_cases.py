@@ -1,28 +1,46 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import Area, AreaCrossing
+from api.core.domain.position_stream import PositionEvent, PositionStream
 from api.core.ports.flight_position_port import FlightPositionPort
+from api.core.ports.position_broker_port import PositionBrokerPort
+from api.utils.time_utils import to_utc_naive
 
 
 class FlightPositionUseCase:
     """
     Application logic for managing flight position data.
+    Stored positions are published through the optional PositionBrokerPort
+    to the clients streaming that flight.
     """
 
-    def __init__(self, position_port: FlightPositionPort) -> None:
+    def __init__(
+        self,
+        position_port: FlightPositionPort,
+        broker: Optional[PositionBrokerPort] = None,
+        stream_buffer_size: int = 1000,
+    ) -> None:
         """
         Initializes the use case with a concrete implementation of the FlightPositionPort.
         """
         self.position_port: FlightPositionPort = position_port
+        self.broker = broker
+        self.stream_buffer_size = stream_buffer_size
 
     def add_positions_to_flight(
         self, flight_id: int, positions: List[FlightPosition]
     ) -> bool:
         """
-        Adds a batch of position data to a specific flight.
-        Returns True on success, False on failure.
+        Adds a batch of position data to a specific flight and publishes the
+        positions stored, without the duplicates skipped, to the flight's
+        subscribers. Returns True on success, False on failure.
         """
-        return self.position_port.add_positions(flight_id, positions)
+        stored = self.position_port.add_new_positions(flight_id, positions)
+        if stored and self.broker is not None:
+            self.broker.publish(flight_id, stored)
+        return stored is not None
 
     def get_positions_for_flight(self, flight_id: int) -> List[FlightPosition]:
         """
@@ -36,3 +54,51 @@ class FlightPositionUseCase:
         Returns True on success, False on failure.
         """
         return self.position_port.delete_positions_by_flight_id(flight_id)
+
+    def find_flights_in_area(
+        self,
+        area: Area,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AreaCrossing]:
+        """
+        Finds the flights whose tracks entered an area within a time window,
+        with their entry and exit times, ordered by entry time.
+        """
+        if start and end and to_utc_naive(start) >= to_utc_naive(end):
+            raise ValueError("start must be before end.")
+        return self.position_port.find_flights_in_area(area, start, end)
+
+    def open_stream(
+        self, flight_id: int, since: Optional[datetime] = None
+    ) -> PositionStream:
+        """
+        Subscribes to the new positions of a flight. With `since`, the stored
+        positions after it are replayed first, so a client can resume from the
+        last position it saw. Close the stream with `close_stream`.
+        """
+        if self.broker is None:
+            raise RuntimeError("Position streaming is not configured.")
+        subscription = self.broker.subscribe(flight_id, self.stream_buffer_size)
+        backfill = []
+        if since is not None:
+            try:
+                positions = self.position_port.get_positions_between(
+                    flight_id, start=since
+                )
+            except Exception:
+                self.broker.unsubscribe(subscription)
+                raise
+            cutoff = to_utc_naive(since)
+            backfill = [
+                PositionEvent.from_position(position)
+                for position in positions
+                if to_utc_naive(position.timestamp) > cutoff
+            ]
+        return PositionStream(subscription, backfill, since)
+
+    def close_stream(self, stream: PositionStream) -> None:
+        """
+        Ends a stream opened with `open_stream`.
+        """
+        self.broker.unsubscribe(stream.subscription)
@@ -0,0 +1,175 @@
+import threading
+import time
+from typing import Iterable, Optional
+
+from api.core.domain.flight import Flight
+from api.core.domain.flight_rollups import FlightRollups
+from api.core.ports.flight_port import FlightPort
+from api.utils.metrics import metrics
+from api.utils.single_flight import SingleFlight
+
+ROLLUP_DRIFT = metrics.gauge(
+    "rollups_drift",
+    "Rollup summary minus the database aggregate at the last reconciliation, by metric.",
+)
+
+SUMMARY_KEYS = (
+    "total_flights",
+    "avg_distance",
+    "total_fuel_saving",
+    "total_co2_saving",
+)
+
+
+class FlightRollupUseCase:
+    """
+    Application logic for building and reconciling the flight rollups.
+    The rollups are updated by FlightUseCase on every write; this use case
+    builds them from a full scan and periodically checks them against the
+    aggregate computed by the FlightPort, rebuilding them if they drifted
+    (e.g. after writes from another process or a failed write). Drift that a
+    rebuild does not remove comes from the two aggregates disagreeing, not
+    from missed writes; it is reported and no longer triggers rebuilds.
+    """
+
+    def __init__(self, flight_port: FlightPort, rollups: FlightRollups) -> None:
+        """
+        Initializes the use case with the FlightPort and the shared rollups.
+        """
+        self.flight_port: FlightPort = flight_port
+        self.rollups: FlightRollups = rollups
+        # Drift left right after a rebuild; while set, drift is only reported.
+        self.persistent_drift: dict = {}
+
+    def rebuild(self, flights: Optional[Iterable[Flight]] = None) -> FlightRollups:
+        """
+        Recomputes the rollups from `flights`, or from a full scan of the port,
+        and swaps them in. Writes recorded while the scan runs may be missed;
+        the next reconciliation catches them.
+        """
+        if flights is None:
+            flights = (
+                flight for batch in self.flight_port.iter_flights() for flight in batch
+            )
+        self.rollups.replace_with(FlightRollups(flights))
+        return self.rollups
+
+    def reconcile(self, rel_tolerance: float = 1e-6) -> dict:
+        """
+        Compares the rollup summary with the port's full aggregate and rebuilds
+        the rollups when any metric differs by more than `rel_tolerance`.
+        Nothing is compared when the aggregate is unavailable. If drift is
+        left right after a rebuild, later drift is reported without
+        rebuilding. Returns the differences found and whether a rebuild happened.
+        """
+        reference = self.flight_port.get_summary_metrics()
+        if reference is None:
+            print(
+                "Skipping the rollup reconciliation: the full aggregate is unavailable."
+            )
+            return {"drift": {}, "rebuilt": False}
+
+        drift = self._drift(reference, rel_tolerance)
+        for key in SUMMARY_KEYS:
+            ROLLUP_DRIFT.set(drift.get(key, 0.0), metric=key)
+        rebuilt = not self.rollups.ready or (bool(drift) and not self.persistent_drift)
+        if drift:
+            action = (
+                "rebuilding" if rebuilt else "not rebuilding, the aggregates disagree"
+            )
+            print(f"Rollups drifted from the full aggregate ({action}): {drift}")
+        elif self.rollups.ready:
+            self.persistent_drift = {}
+        if rebuilt:
+            self.rebuild()
+            self.persistent_drift = self._drift(reference, rel_tolerance)
+            if self.persistent_drift:
+                print(
+                    "Rollups differ from the full aggregate right after a rebuild: "
+                    f"{self.persistent_drift}"
+                )
+        return {"drift": drift, "rebuilt": rebuilt}
+
+    def _drift(self, reference: dict, rel_tolerance: float) -> dict:
+        current = self.rollups.summary() or {}
+        drift = {}
+        for key in SUMMARY_KEYS:
+            expected = float(reference.get(key) or 0.0)
+            actual = float(current.get(key) or 0.0)
+            if abs(actual - expected) > rel_tolerance * max(abs(expected), 1.0):
+                drift[key] = actual - expected
+        return drift
+
+
+class RollupSnapshot:
+    """
+    Source of rollups for the read paths (breakdowns and leaderboards).
+    Serves the live rollups once they are built; otherwise, e.g. when
+    rollups are disabled, a copy built from a full scan of the FlightPort
+    that is rebuilt every `ttl_seconds`. A stale copy keeps serving while its
+    replacement is built in the background, and concurrent first requests
+    share a single build.
+    """
+
+    def __init__(
+        self,
+        flight_port: FlightPort,
+        rollups: Optional[FlightRollups] = None,
+        ttl_seconds: float = 300.0,
+    ) -> None:
+        """
+        Initializes the snapshot with the FlightPort and the shared rollups
+        (None when disabled). The copy is built on first use (or by `refresh`).
+        """
+        self.flight_port: FlightPort = flight_port
+        self.rollups: Optional[FlightRollups] = rollups
+        self.ttl_seconds = ttl_seconds
+        self.snapshot: FlightRollups = FlightRollups()
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._first_build = SingleFlight("rollup_snapshot")
+
+    def current(self) -> FlightRollups:
+        """
+        Returns the live rollups when they are ready, else the scanned copy,
+        building it on first use and starting a background rebuild once it is
+        older than the TTL.
+        """
+        if self.rollups is not None and self.rollups.ready:
+            return self.rollups
+
+        with self._lock:
+            built = self.snapshot.ready
+            stale = time.monotonic() - self._built_at > self.ttl_seconds
+            start_refresh = built and stale and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+
+        if not built:
+            return self._first_build.do("snapshot", self._build_if_missing)
+        if start_refresh:
+            threading.Thread(
+                target=self.refresh, name="rollup-snapshot", daemon=True
+            ).start()
+        return self.snapshot
+
+    def _build_if_missing(self) -> FlightRollups:
+        if self.snapshot.ready:
+            return self.snapshot
+        return self.refresh()
+
+    def refresh(self) -> FlightRollups:
+        """
+        Rebuilds the copy from a full scan of the FlightPort and returns it.
+        """
+        try:
+            scanned = FlightRollups(
+                flight for batch in self.flight_port.iter_flights() for flight in batch
+            )
+            self.snapshot.replace_with(scanned)
+            with self._lock:
+                self._built_at = time.monotonic()
+            return self.snapshot
+        finally:
+            self._refreshing = False
@@ -1,22 +1,50 @@
-from typing import Optional
+from typing import Dict, Optional
+
+from api.core.domain.flight_rollups import FlightRollups
 from api.core.domain.flight_summary import FlightSummary
 from api.core.ports.flight_port import FlightPort
+from api.core.use_cases.flight_rollup_use_cases import RollupSnapshot
 
 
 class GetFlightSummaryUseCase:
-    def __init__(self, flight_port: FlightPort):
+    def __init__(
+        self,
+        flight_port: FlightPort,
+        rollups: Optional[FlightRollups] = None,
+        snapshot: Optional[RollupSnapshot] = None,
+    ):
         self.flight_port = flight_port
+        self.rollups = rollups
+        self.snapshot = snapshot or RollupSnapshot(flight_port, rollups)
 
     def execute(self) -> Optional[FlightSummary]:
-        summary_data = self.flight_port.get_summary_metrics()
+        if self.rollups is not None and self.rollups.ready:
+            summary_data = self.rollups.summary()
+        else:
+            summary_data = self.flight_port.get_summary_metrics()
 
         if not summary_data:
             return None
 
+        return self._to_summary(summary_data)
+
+    def execute_breakdown(self, dimension: str) -> Dict[str, FlightSummary]:
+        """
+        Summary metrics per airport, aircraft model or route. Read from the
+        rollups when they are built, otherwise from the periodically rebuilt
+        snapshot. Raises ValueError for an unknown dimension.
+        """
+        rollups = self.snapshot.current()
+        return {
+            key: self._to_summary(summary_data)
+            for key, summary_data in rollups.breakdown(dimension).items()
+        }
+
+    @staticmethod
+    def _to_summary(summary_data: dict) -> FlightSummary:
         return FlightSummary(
-            total_flights=int(summary_data.get('total_flights', 0)),
-            avg_distance=float(summary_data.get('avg_distance', 0.0)),
-            total_fuel_saving=float(
-                summary_data.get('total_fuel_saving', 0.0)),
-            total_co2_saving=float(summary_data.get('total_co2_saving', 0.0))
+            total_flights=int(summary_data.get("total_flights", 0)),
+            avg_distance=float(summary_data.get("avg_distance", 0.0)),
+            total_fuel_saving=float(summary_data.get("total_fuel_saving", 0.0)),
+            total_co2_saving=float(summary_data.get("total_co2_saving", 0.0)),
         )
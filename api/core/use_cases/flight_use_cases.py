@@ -2,9 +2,12 @@ from datetime import date
 from typing import List, Optional
 
 from api.core.domain.flight import Flight
-from api.core.exceptions.flights_exceptions import (FlightCannotBeAddedError,
-                                                    FlightNotFoundError)
-from api.core.ports.flight_port import FlightPort
+from api.core.domain.flight_rollups import FlightRollups
+from api.core.exceptions.flights_exceptions import (
+    FlightCannotBeAddedError,
+    FlightNotFoundError,
+)
+from api.core.ports.flight_port import CountMode, FlightPort
 
 
 class FlightUseCase:
@@ -13,12 +16,16 @@ class FlightUseCase:
     This class orchestrates business operations using a FlightPort.
     """
 
-    def __init__(self, flight_port: FlightPort) -> None:
+    def __init__(
+        self, flight_port: FlightPort, rollups: Optional[FlightRollups] = None
+    ) -> None:
         """
         Initializes the use case with a concrete implementation of the FlightPort.
-        This is a form of dependency injection.
+        This is a form of dependency injection. When `rollups` is given, every
+        write is also applied to the running aggregates.
         """
         self.flight_port: FlightPort = flight_port
+        self.rollups: Optional[FlightRollups] = rollups
 
     def add_new_flight(self, new_flight: Flight) -> Flight:
         """
@@ -31,8 +38,30 @@ class FlightUseCase:
             raise FlightCannotBeAddedError(
                 f"Flight {new_flight.flight} cannot be added to the system."
             )
+        if self.rollups is not None:
+            self.rollups.record(flight)
         return flight
 
+    def upsert_flight(self, flight: Flight) -> Flight:
+        """
+        Adds a flight, or replaces the flight with the same FR24 ID.
+        Returns the stored Flight object.
+        """
+        previous = (
+            self.flight_port.get_current_by_fr24_id(flight.fr24_id)
+            if self.rollups is not None
+            else None
+        )
+        stored = self.flight_port.upsert(flight)
+
+        if stored is None:
+            raise FlightCannotBeAddedError(
+                f"Flight {flight.fr24_id} cannot be stored in the system."
+            )
+        if self.rollups is not None:
+            self.rollups.record(stored, previous)
+        return stored
+
     def get_flight_by_id(self, flight_id: int) -> Flight:
         """
         Retrieves a flight record by its internal database ID.
@@ -74,3 +103,22 @@ class FlightUseCase:
             offset=offset,
         )
         return [flight.to_dict() for flight in flights]
+
+    def count_flights(
+        self,
+        search: Optional[str] = None,
+        airport: Optional[str] = None,
+        aircraft_model: Optional[str] = None,
+        flight_date: Optional[date] = None,
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        """
+        Counts the flights matching the listing filters, or None if the count failed.
+        """
+        return self.flight_port.count(
+            search=search,
+            airport=airport,
+            aircraft_model=aircraft_model,
+            flight_date=flight_date,
+            mode=mode,
+        )
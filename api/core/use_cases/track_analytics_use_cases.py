@@ -0,0 +1,74 @@
+from typing import Optional
+
+from api.core.domain.flight import Flight
+from api.core.domain.flight_rollups import FlightRollups
+from api.core.domain.track_analytics import TrackAnalysis, analyze_track
+from api.core.exceptions.flights_exceptions import (
+    FlightCannotBeAddedError,
+    FlightNotFoundError,
+    TrackNotAvailableError,
+)
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+
+
+class TrackAnalyticsUseCase:
+    """
+    Application logic for the track analytics: derives the distance, times
+    and flight phases of a flight from its stored positions and, on request,
+    stores them in the flight record.
+    """
+
+    def __init__(
+        self,
+        flight_port: FlightPort,
+        position_port: FlightPositionPort,
+        rollups: Optional[FlightRollups] = None,
+    ) -> None:
+        """
+        Initializes the use case with the flight and position ports. When
+        `rollups` is given, updated flights are also applied to the aggregates.
+        """
+        self.flight_port = flight_port
+        self.position_port = position_port
+        self.rollups = rollups
+
+    def analyze_flight(self, flight_id: int) -> TrackAnalysis:
+        """
+        Analyzes the track of a flight.
+        Raises FlightNotFoundError if the flight does not exist and
+        TrackNotAvailableError if it has fewer than two positions.
+        """
+        self._get_flight(flight_id)
+        return self._analyze(flight_id)
+
+    def apply_to_flight(self, flight_id: int) -> Flight:
+        """
+        Analyzes the track of a flight and stores the derived distances,
+        times and phase durations in its record. Returns the updated flight.
+        """
+        flight = self._get_flight(flight_id)
+        analysis = self._analyze(flight_id)
+        stored = self.flight_port.upsert(analysis.apply_to(flight))
+        if stored is None:
+            raise FlightCannotBeAddedError(
+                f"Flight {flight.fr24_id} cannot be updated."
+            )
+        if self.rollups is not None:
+            self.rollups.record(stored, flight)
+        return stored
+
+    def _get_flight(self, flight_id: int) -> Flight:
+        flight = self.flight_port.get_by_id(flight_id)
+        if flight is None:
+            raise FlightNotFoundError(f"Flight with id: {flight_id} not found.")
+        return flight
+
+    def _analyze(self, flight_id: int) -> TrackAnalysis:
+        positions = self.position_port.get_positions_by_flight_id(flight_id)
+        analysis = analyze_track(flight_id, positions)
+        if analysis is None:
+            raise TrackNotAvailableError(
+                f"Flight with id: {flight_id} needs at least two positions to analyze its track."
+            )
+        return analysis
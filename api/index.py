@@ -1,22 +1,108 @@
-from fastapi import FastAPI, Response, status
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.adapters.admission import AdmissionControlMiddleware
+from api.adapters.deadline import (
+    RequestDeadlineMiddleware,
+    backend_unavailable_response,
+)
+from api.adapters.lifespan import lifespan, warmup_state
+from api.adapters.profiling import (
+    RequestProfilingMiddleware,
+    authorized,
+    get_profile_store,
+)
+from api.adapters.routes.analytics_routes import analytics_router
 from api.adapters.routes.flight_routes import flights_router
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.utils.metrics import metrics
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(AdmissionControlMiddleware)
+app.add_middleware(RequestDeadlineMiddleware)
+app.add_middleware(RequestProfilingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Total-Count",
+        "Content-Range",
+        "Retry-After",
+        "Server-Timing",
+        "X-Profile-Id",
+    ],
 )
 
 app.include_router(flights_router)
+app.include_router(analytics_router)
+
+
+@app.exception_handler(BackendUnavailableError)
+def handle_backend_unavailable(request: Request, error: BackendUnavailableError):
+    """
+    Backend failures, timeouts and an open circuit breaker answer 503.
+    """
+    return backend_unavailable_response(error)
 
 
 @app.get("/health-check")
-def health_check():
+def health_check(ready: bool = False):
+    """
+    Liveness check. With `?ready=true` it becomes a readiness check that
+    answers 503 until the startup warm-up has finished.
+    """
+    if ready and not warmup_state.ready:
+        return Response(
+            content="WARMING UP",
+            media_type="text/plain",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
     return Response(
         content="OK", media_type="text/plain", status_code=status.HTTP_200_OK
     )
+
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    Application counters in the Prometheus text format.
+    """
+    return Response(
+        content=metrics.render(),
+        media_type="text/plain; version=0.0.4",
+        status_code=status.HTTP_200_OK,
+    )
+
+
+@app.get("/debug/profiles")
+def list_profiles(x_profile: Optional[str] = Header(None)):
+    """
+    Summaries of this worker's stored request profiles, the newest first.
+    Needs the profiling token in `X-Profile`; answers 404 without it.
+    """
+    if not authorized(x_profile):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return [profile.summary() for profile in get_profile_store()]
+
+
+@app.get("/debug/profiles/{profile_id}")
+def get_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    """
+    A stored profile's stack samples as folded stacks, the input of
+    flamegraph.pl, speedscope or inferno.
+    """
+    profile = get_profile_store().get(profile_id) if authorized(x_profile) else None
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found."
+        )
+    return Response(
+        content=profile.folded(),
+        media_type="text/plain",
+        status_code=status.HTTP_200_OK,
+    )
@@ -0,0 +1,331 @@
+"""
+Batch recomputation of the emission estimates of every stored flight, for
+when the fuel/CO2 model changes.
+
+    python -m api.jobs.recompute_emissions --model mypackage.emissions:estimate \
+        --workers 8 --chunk-size 500 --positions
+
+The model is any importable callable `model(flight, positions)` returning the
+flight's new `EmissionComparison` (or None to leave it unchanged); `positions`
+is the flight's track with `--positions` and None otherwise. Flights are read
+in chunks by ID, estimated in a process pool and written back with one bulk
+upsert per chunk. After each chunk is written the last flight ID is saved in
+the checkpoint file, so an interrupted run resumes where it stopped.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+from api.core.domain.flight import EmissionComparison, Flight
+from api.core.domain.flight_position import FlightPosition
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+
+EmissionModel = Callable[
+    [Flight, Optional[List[FlightPosition]]], Optional[EmissionComparison]
+]
+# (flight index in the chunk, new comparison or None, error message or None)
+Estimate = Tuple[int, Optional[EmissionComparison], Optional[str]]
+
+# Failed flight IDs kept in the checkpoint, at most.
+MAX_REPORTED_FAILURES = 100
+
+_worker_model: Optional[EmissionModel] = None
+
+
+def load_model(path: str) -> EmissionModel:
+    """
+    Imports a model given as 'package.module:callable'.
+    """
+    module_name, _, attribute = path.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Expected the model as 'module:callable', got '{path}'.")
+    model = getattr(importlib.import_module(module_name), attribute)
+    if not callable(model):
+        raise ValueError(f"'{path}' is not callable.")
+    return model
+
+
+def _init_worker(model_path: str) -> None:
+    """Loads the model once per pool process."""
+    global _worker_model
+    _worker_model = load_model(model_path)
+
+
+def estimate_chunk(
+    flights: Sequence[Flight],
+    tracks: Optional[Sequence[List[FlightPosition]]] = None,
+    model: Optional[EmissionModel] = None,
+) -> List[Estimate]:
+    """
+    Runs the model over a chunk of flights (in a pool process, the model
+    loaded by the pool initializer). A failing flight is reported with its
+    error instead of failing the chunk.
+    """
+    model = model or _worker_model
+    estimates: List[Estimate] = []
+    for index, flight in enumerate(flights):
+        try:
+            estimates.append(
+                (index, model(flight, tracks[index] if tracks else None), None)
+            )
+        except Exception as e:
+            estimates.append((index, None, f"{type(e).__name__}: {e}"))
+    return estimates
+
+
+@dataclass
+class RecomputeProgress:
+    """
+    State of a recomputation, saved as a checkpoint after each written chunk.
+    """
+
+    model: str
+    last_flight_id: int = 0
+    processed: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    failed_ids: List[int] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    completed: bool = False
+
+    @property
+    def flights_per_second(self) -> float:
+        return self.processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @staticmethod
+    def load(path: str) -> Optional["RecomputeProgress"]:
+        """Reads a checkpoint, or returns None if there is none."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as handle:
+            return RecomputeProgress(**json.load(handle))
+
+    def save(self, path: str) -> None:
+        """Writes the checkpoint atomically (a crash leaves the previous one)."""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(asdict(self), handle)
+        os.replace(temporary, path)
+
+
+def recompute_emissions(
+    flight_port: FlightPort,
+    position_port: Optional[FlightPositionPort],
+    model_path: str,
+    executor: Optional[Executor] = None,
+    checkpoint_path: Optional[str] = None,
+    chunk_size: int = 500,
+    max_pending: int = 4,
+    on_progress: Optional[Callable[[RecomputeProgress], None]] = None,
+) -> RecomputeProgress:
+    """
+    Recomputes the emission comparison of every flight, resuming from the
+    checkpoint at `checkpoint_path` when there is one.
+
+    Chunks are estimated on `executor` (whose workers must have loaded the
+    model with `_init_worker`, see `build_executor`), with up to
+    `max_pending` chunks in flight while earlier ones are written. Results
+    are written in ID order, so the checkpoint always covers a prefix of the
+    flights. Without an executor the chunks are estimated in this process.
+    Positions are read for the model when `position_port` is given.
+    """
+    progress = RecomputeProgress.load(checkpoint_path) if checkpoint_path else None
+    if progress is None:
+        progress = RecomputeProgress(model=model_path)
+    elif progress.model != model_path:
+        raise ValueError(
+            f"The checkpoint was written by model '{progress.model}'; "
+            "remove it to start over with another model."
+        )
+    if progress.completed:
+        return progress
+
+    model = load_model(model_path) if executor is None else None
+    started = time.perf_counter() - progress.elapsed_s
+    pending: Deque[Tuple[List[Flight], Future]] = deque()
+
+    def submit(flights: List[Flight]) -> None:
+        tracks = (
+            [
+                position_port.get_positions_by_flight_id(flight.flight_id)
+                for flight in flights
+            ]
+            if position_port is not None
+            else None
+        )
+        if executor is None:
+            future: Future = Future()
+            future.set_result(estimate_chunk(flights, tracks, model))
+        else:
+            future = executor.submit(estimate_chunk, flights, tracks)
+        pending.append((flights, future))
+
+    def write_oldest() -> None:
+        flights, future = pending.popleft()
+        _store_chunk(flight_port, flights, future.result(), progress)
+        progress.elapsed_s = time.perf_counter() - started
+        if checkpoint_path:
+            progress.save(checkpoint_path)
+        if on_progress is not None:
+            on_progress(progress)
+
+    try:
+        for flights in flight_port.iter_flights(
+            chunk_size, after_id=progress.last_flight_id
+        ):
+            submit(flights)
+            if len(pending) >= max_pending:
+                write_oldest()
+    except Exception:
+        # The scan failed: store the chunks already read, so a rerun resumes
+        # after them, and leave the run incomplete.
+        while pending:
+            write_oldest()
+        raise
+    while pending:
+        write_oldest()
+
+    progress.completed = True
+    progress.elapsed_s = time.perf_counter() - started
+    if checkpoint_path:
+        progress.save(checkpoint_path)
+    return progress
+
+
+def _store_chunk(
+    flight_port: FlightPort,
+    flights: List[Flight],
+    estimates: List[Estimate],
+    progress: RecomputeProgress,
+) -> None:
+    """
+    Upserts the flights of a chunk whose estimate changed and advances the progress.
+    """
+    now = datetime.now(timezone.utc)
+    changed: List[Flight] = []
+    for index, comparison, error in estimates:
+        flight = flights[index]
+        if error is not None:
+            progress.failed += 1
+            if len(progress.failed_ids) < MAX_REPORTED_FAILURES:
+                progress.failed_ids.append(flight.flight_id)
+            print(f"Flight {flight.flight_id} failed: {error}")
+        elif comparison is None:
+            progress.skipped += 1
+        else:
+            changed.append(
+                replace(flight, emission_comparison=comparison, last_updated=now)
+            )
+
+    if changed and flight_port.upsert_many(changed) != len(changed):
+        raise RuntimeError(
+            f"Failed to store the chunk of flights {flights[0].flight_id}-{flights[-1].flight_id}."
+        )
+    progress.updated += len(changed)
+    progress.processed += len(flights)
+    progress.last_flight_id = flights[-1].flight_id
+
+
+def build_executor(model_path: str, workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers load the model once at startup.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(model_path,)
+    )
+
+
+def _report(total: Optional[int]) -> Callable[[RecomputeProgress], None]:
+    def report(progress: RecomputeProgress) -> None:
+        done = f"{progress.processed}/{total}" if total else str(progress.processed)
+        print(
+            f"{done} flights ({progress.flights_per_second:,.0f} flights/s), "
+            f"{progress.updated} updated, {progress.skipped} unchanged, {progress.failed} failed, "
+            f"last ID {progress.last_flight_id}",
+            flush=True,
+        )
+
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute the emission estimates of every flight."
+    )
+    parser.add_argument(
+        "--model", required=True, help="Emission model as 'module:callable'."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Pool processes (0 runs the model in this process).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="Flights read, estimated and written together.",
+    )
+    parser.add_argument(
+        "--positions",
+        action="store_true",
+        help="Pass each flight's positions to the model.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="recompute_emissions.checkpoint.json",
+        help="Checkpoint file.",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore the checkpoint and start over."
+    )
+    args = parser.parse_args(argv)
+
+    from api.adapters.repositories.factory import build_repositories
+    from api.utils.env_manager import get_settings
+
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    load_model(args.model)  # fail fast, before starting the pool
+    flight_port, position_port = build_repositories(
+        get_settings().model_copy(update={"write_behind_enabled": False})
+    )
+    summary = flight_port.get_summary_metrics()
+    total = summary["total_flights"] if summary else None
+
+    executor = build_executor(args.model, args.workers) if args.workers > 0 else None
+    try:
+        progress = recompute_emissions(
+            flight_port,
+            position_port if args.positions else None,
+            args.model,
+            executor=executor,
+            checkpoint_path=args.checkpoint,
+            chunk_size=args.chunk_size,
+            max_pending=2 * max(args.workers, 1),
+            on_progress=_report(total),
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    print(
+        f"Done: {progress.processed} flights in {progress.elapsed_s:.1f}s "
+        f"({progress.flights_per_second:,.0f} flights/s), {progress.updated} updated, "
+        f"{progress.failed} failed{f' (e.g. IDs {progress.failed_ids[:10]})' if progress.failed else ''}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+Retention of old position data, meant to run periodically (e.g. nightly):
+
+    python -m api.jobs.retention --archive-after-days 30 --prune-after-days 365
+
+Positions older than the archive age are compacted into one compressed,
+delta-encoded blob per flight in the track archive (TRACK_ARCHIVE_PATH) and
+then deleted from the positions table; track reads merge both tiers, so the
+API does not notice. Positions older than the prune age are deleted for
+good, from the table and the archive. Deletes run in batches of
+`--batch-size` positions with a pause of `--batch-interval` seconds between
+them, so the job never holds long locks nor competes with live traffic.
+Defaults come from the RETENTION_* settings; a run can be repeated or
+interrupted at any point, since a flight's positions are only deleted after
+its archive blob was written, and only up to the last archived one, and
+archiving them twice is harmless. With the supabase backend the archive
+must be on storage every API host mounts (TRACK_ARCHIVE_SHARED), or the
+archived positions would disappear from the other hosts' reads.
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Sequence
+
+from api.core.domain.track_archive import merge_tracks
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.core.ports.track_archive_port import TrackArchivePort
+from api.utils.env_manager import Settings
+from api.utils.time_utils import to_utc_naive
+
+# Failed flight IDs kept in the report, at most.
+MAX_REPORTED_FAILURES = 100
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Ages after which positions are archived and deleted, and the pace of the deletes.
+    """
+
+    archive_after: Optional[timedelta] = None
+    prune_after: Optional[timedelta] = None
+    batch_size: int = 1000
+    batch_interval_s: float = 0.5
+
+    @staticmethod
+    def from_settings(settings: Settings) -> "RetentionPolicy":
+        return RetentionPolicy(
+            archive_after=_days(settings.retention_archive_after_days),
+            prune_after=_days(settings.retention_prune_after_days),
+            batch_size=settings.retention_batch_size,
+            batch_interval_s=settings.retention_batch_interval_seconds,
+        )
+
+
+@dataclass
+class RetentionReport:
+    """
+    Outcome of a retention pass.
+    """
+
+    archived_flights: int = 0
+    archived_positions: int = 0
+    deleted_positions: int = 0
+    pruned_tracks: int = 0
+    trimmed_tracks: int = 0
+    failed: int = 0
+    failed_ids: List[int] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    def fail(self, flight_id: int) -> None:
+        self.failed += 1
+        if len(self.failed_ids) < MAX_REPORTED_FAILURES:
+            self.failed_ids.append(flight_id)
+
+
+class BatchThrottle:
+    """
+    Spaces successive batches at least `interval_s` apart.
+    """
+
+    def __init__(self, interval_s: float, sleep: Callable[[float], None] = time.sleep):
+        self.interval_s = interval_s
+        self.sleep = sleep
+        self._last: Optional[float] = None
+
+    def wait(self) -> None:
+        if self._last is not None:
+            delay = self._last + self.interval_s - time.monotonic()
+            if delay > 0:
+                self.sleep(delay)
+        self._last = time.monotonic()
+
+
+def run_retention(
+    position_port: FlightPositionPort,
+    archive: Optional[TrackArchivePort],
+    policy: RetentionPolicy,
+    now: Optional[datetime] = None,
+    dry_run: bool = False,
+    sleep: Callable[[float], None] = time.sleep,
+) -> RetentionReport:
+    """
+    Applies `policy` to the positions in `position_port` (the hot store,
+    not wrapped with the archive) and to `archive`. With `dry_run` nothing
+    is written or deleted; the report counts what would be.
+    """
+    if policy.archive_after is not None and archive is None:
+        raise ValueError("Archiving positions needs a track archive.")
+    if (
+        policy.archive_after
+        and policy.prune_after
+        and policy.prune_after <= policy.archive_after
+    ):
+        raise ValueError("Positions must be archived before they are pruned.")
+    started = time.perf_counter()
+    now = now or datetime.now(timezone.utc)
+    archive_cutoff = (
+        now - policy.archive_after if policy.archive_after is not None else None
+    )
+    prune_cutoff = now - policy.prune_after if policy.prune_after is not None else None
+    throttle = BatchThrottle(policy.batch_interval_s, sleep)
+    report = RetentionReport()
+
+    if archive_cutoff is not None:
+        _archive_positions(
+            position_port,
+            archive,
+            archive_cutoff,
+            prune_cutoff,
+            policy,
+            throttle,
+            dry_run,
+            report,
+        )
+    if prune_cutoff is not None:
+        if archive_cutoff is None:
+            # Otherwise archiving already deleted everything older than the archive age.
+            _prune_positions(
+                position_port, prune_cutoff, policy, throttle, dry_run, report
+            )
+        if archive is not None:
+            _prune_archive(archive, prune_cutoff, policy, dry_run, report)
+
+    report.elapsed_s = time.perf_counter() - started
+    return report
+
+
+def _archive_positions(
+    position_port: FlightPositionPort,
+    archive: TrackArchivePort,
+    cutoff: datetime,
+    prune_cutoff: Optional[datetime],
+    policy: RetentionPolicy,
+    throttle: BatchThrottle,
+    dry_run: bool,
+    report: RetentionReport,
+) -> None:
+    """
+    Moves the positions older than `cutoff` of every flight into its
+    archived track, leaving out those due to be pruned anyway. Only the
+    positions up to the last one archived are deleted, so a read that comes
+    back short leaves the rest for the next run; a flight whose read or
+    archive fails is skipped and reported.
+    """
+    after_id = 0
+    while True:
+        flight_ids = position_port.flight_ids_with_positions_before(
+            cutoff, after_id, policy.batch_size
+        )
+        if not flight_ids:
+            return
+        for flight_id in flight_ids:
+            try:
+                _archive_flight(
+                    position_port,
+                    archive,
+                    flight_id,
+                    cutoff,
+                    prune_cutoff,
+                    policy,
+                    throttle,
+                    dry_run,
+                    report,
+                )
+            except Exception as e:
+                print(f"Retention of flight {flight_id} failed: {e}")
+                report.fail(flight_id)
+        after_id = flight_ids[-1]
+
+
+def _archive_flight(
+    position_port: FlightPositionPort,
+    archive: TrackArchivePort,
+    flight_id: int,
+    cutoff: datetime,
+    prune_cutoff: Optional[datetime],
+    policy: RetentionPolicy,
+    throttle: BatchThrottle,
+    dry_run: bool,
+    report: RetentionReport,
+) -> None:
+    old = position_port.get_positions_between(flight_id, prune_cutoff, cutoff)
+    if dry_run:
+        report.archived_flights += bool(old)
+        report.archived_positions += len(old)
+        report.deleted_positions += len(
+            position_port.get_positions_between(flight_id, None, cutoff)
+        )
+        return
+    if old:
+        if not archive.save_track(
+            flight_id, merge_tracks(archive.get_track(flight_id), old)
+        ):
+            report.fail(flight_id)
+            return
+        report.archived_flights += 1
+        report.archived_positions += len(old)
+        # Just past the last archived position; positions the read missed stay.
+        last = old[-1].timestamp
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)
+        delete_before = min(cutoff, last + timedelta(microseconds=1))
+    elif prune_cutoff is not None:
+        delete_before = prune_cutoff
+    else:
+        return
+    report.deleted_positions += _delete_before(
+        position_port, flight_id, delete_before, policy, throttle
+    )
+
+
+def _prune_positions(
+    position_port: FlightPositionPort,
+    cutoff: datetime,
+    policy: RetentionPolicy,
+    throttle: BatchThrottle,
+    dry_run: bool,
+    report: RetentionReport,
+) -> None:
+    """
+    Deletes the positions older than `cutoff` still in the hot store.
+    """
+    after_id = 0
+    while True:
+        flight_ids = position_port.flight_ids_with_positions_before(
+            cutoff, after_id, policy.batch_size
+        )
+        if not flight_ids:
+            return
+        for flight_id in flight_ids:
+            if dry_run:
+                report.deleted_positions += len(
+                    position_port.get_positions_between(flight_id, None, cutoff)
+                )
+            else:
+                report.deleted_positions += _delete_before(
+                    position_port, flight_id, cutoff, policy, throttle
+                )
+        after_id = flight_ids[-1]
+
+
+def _prune_archive(
+    archive: TrackArchivePort,
+    cutoff: datetime,
+    policy: RetentionPolicy,
+    dry_run: bool,
+    report: RetentionReport,
+) -> None:
+    """
+    Deletes the archived tracks that ended before `cutoff` and trims the
+    ones that started before it.
+    """
+    after_id = 0
+    while True:
+        tracks = archive.list_tracks(after_id, policy.batch_size)
+        if not tracks:
+            return
+        for track in tracks:
+            if to_utc_naive(track.last_timestamp) < to_utc_naive(cutoff):
+                if dry_run or archive.delete_track(track.flight_id):
+                    report.pruned_tracks += 1
+                else:
+                    report.fail(track.flight_id)
+            elif to_utc_naive(track.first_timestamp) < to_utc_naive(cutoff):
+                if not dry_run:
+                    kept = [
+                        position
+                        for position in archive.get_track(track.flight_id)
+                        if to_utc_naive(position.timestamp) >= to_utc_naive(cutoff)
+                    ]
+                    if not archive.save_track(track.flight_id, kept):
+                        report.fail(track.flight_id)
+                        continue
+                report.trimmed_tracks += 1
+        after_id = tracks[-1].flight_id
+
+
+def _delete_before(
+    position_port: FlightPositionPort,
+    flight_id: int,
+    cutoff: datetime,
+    policy: RetentionPolicy,
+    throttle: BatchThrottle,
+) -> int:
+    """
+    Deletes a flight's positions older than `cutoff`, one throttled batch at a time.
+    """
+    deleted = 0
+    while True:
+        throttle.wait()
+        batch = position_port.delete_positions_before(
+            flight_id, cutoff, policy.batch_size
+        )
+        deleted += batch
+        if batch < policy.batch_size:
+            return deleted
+
+
+def _days(value: Optional[float]) -> Optional[timedelta]:
+    return timedelta(days=value) if value is not None else None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from api.adapters.repositories.factory import (
+        build_repositories,
+        build_track_archive,
+    )
+    from api.utils.env_manager import get_settings
+
+    settings = get_settings()
+    defaults = RetentionPolicy.from_settings(settings)
+    parser = argparse.ArgumentParser(description="Archive and prune old position data.")
+    parser.add_argument(
+        "--archive-after-days",
+        type=float,
+        default=settings.retention_archive_after_days,
+        help="Move positions older than this into the track archive.",
+    )
+    parser.add_argument(
+        "--prune-after-days",
+        type=float,
+        default=settings.retention_prune_after_days,
+        help="Delete positions older than this, archived or not.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=defaults.batch_size,
+        help="Positions deleted per batch.",
+    )
+    parser.add_argument(
+        "--batch-interval",
+        type=float,
+        default=defaults.batch_interval_s,
+        help="Seconds between delete batches.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be archived and deleted.",
+    )
+    args = parser.parse_args(argv)
+
+    policy = RetentionPolicy(
+        archive_after=_days(args.archive_after_days),
+        prune_after=_days(args.prune_after_days),
+        batch_size=args.batch_size,
+        batch_interval_s=args.batch_interval,
+    )
+    if policy.archive_after is None and policy.prune_after is None:
+        parser.error(
+            "nothing to do: set --archive-after-days and/or --prune-after-days"
+        )
+    if (
+        policy.archive_after
+        and policy.prune_after
+        and policy.prune_after <= policy.archive_after
+    ):
+        parser.error("--prune-after-days must be longer than --archive-after-days")
+
+    archive = build_track_archive(settings)
+    if policy.archive_after is not None and archive is None:
+        parser.error("archiving positions needs TRACK_ARCHIVE_PATH")
+    if (
+        policy.archive_after is not None
+        and not args.dry_run
+        and settings.repository_backend == "supabase"
+        and not settings.track_archive_shared
+    ):
+        parser.error(
+            "archiving Supabase positions into a local TRACK_ARCHIVE_PATH would hide "
+            "them from the API on other hosts; put the archive on storage they all "
+            "mount and set TRACK_ARCHIVE_SHARED=true"
+        )
+    # The job works on the hot store directly, not through the archive-merging
+    # reads or the API's write-behind buffer.
+    _, position_port = build_repositories(
+        settings.model_copy(
+            update={"track_archive_path": None, "write_behind_enabled": False}
+        )
+    )
+    report = run_retention(position_port, archive, policy, dry_run=args.dry_run)
+
+    print(
+        f"{'Would archive' if args.dry_run else 'Archived'} {report.archived_positions} positions "
+        f"of {report.archived_flights} flights; "
+        f"{'would delete' if args.dry_run else 'deleted'} {report.deleted_positions} positions, "
+        f"{report.pruned_tracks} archived tracks and trimmed {report.trimmed_tracks} in "
+        f"{report.elapsed_s:.1f}s; {report.failed} failed"
+        f"{f' (e.g. IDs {report.failed_ids[:10]})' if report.failed else ''}."
+    )
+
+
+if __name__ == "__main__":
+    main()
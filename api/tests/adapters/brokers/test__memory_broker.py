@@ -0,0 +1,70 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+from api.adapters.brokers.memory_broker import InMemoryPositionBroker
+from api.core.domain.flight_position import FlightPosition
+
+START = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def positions(flight_id, seconds):
+    return [
+        FlightPosition(
+            flight_id=flight_id,
+            timestamp=START + timedelta(seconds=s),
+            latitude=1.0,
+            longitude=2.0,
+        )
+        for s in seconds
+    ]
+
+
+def test_publish_fans_out_to_the_flight_subscribers_only():
+    """Test que cada publicación llega a todos los suscriptores del vuelo y solo a ellos."""
+    broker = InMemoryPositionBroker()
+    first, second = broker.subscribe(7, 10), broker.subscribe(7, 10)
+    other = broker.subscribe(8, 10)
+
+    async def scenario():
+        threading.Thread(target=broker.publish, args=(7, positions(7, [0, 1]))).start()
+        return (
+            await first.next_batch(1.0),
+            await second.next_batch(1.0),
+            await other.next_batch(0.01),
+        )
+
+    (events, dropped), (copies, _), (unrelated, _) = asyncio.run(scenario())
+    assert [json.loads(e.data)["timestamp"] for e in events] == [
+        START.isoformat(),
+        (START + timedelta(seconds=1)).isoformat(),
+    ]
+    assert dropped == 0
+    assert copies == events
+    assert unrelated == []
+
+
+def test_slow_subscriber_drops_oldest_events():
+    """Test que un suscriptor lento conserva las posiciones más recientes y cuenta las descartadas."""
+    broker = InMemoryPositionBroker()
+    subscription = broker.subscribe(7, 3)
+
+    broker.publish(7, positions(7, range(5)))
+    events, dropped = asyncio.run(subscription.next_batch(0.01))
+
+    assert [e.timestamp.second for e in events] == [2, 3, 4]
+    assert dropped == 2
+
+
+def test_unsubscribe_closes_and_forgets_the_subscription():
+    """Test que al cancelar la suscripción deja de recibir posiciones."""
+    broker = InMemoryPositionBroker()
+    subscription = broker.subscribe(7, 3)
+
+    broker.unsubscribe(subscription)
+    broker.publish(7, positions(7, [0]))
+
+    assert subscription.closed
+    assert broker.subscriber_count() == 0
+    assert asyncio.run(subscription.next_batch(1.0)) == ([], 0)
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from api.adapters.dtos.batch_validation import (
+    BatchValidationError,
+    validate_flights,
+    validate_positions,
+)
+from api.adapters.dtos.flight_dtos import FlightPostRequest
+from api.adapters.dtos.flight_position_dtos import FlightPositionPostRequest
+
+POSITIONS = [
+    {
+        "timestamp": "2025-03-10T12:00:00Z",
+        "latitude": 40.5,
+        "longitude": -3.5,
+        "altitude": "9000",
+    },
+    {
+        "timestamp": "2025-03-10T12:00:05+01:00",
+        "latitude": 40.6,
+        "longitude": -3.4,
+        "extra": 1,
+    },
+]
+
+FLIGHT = {
+    "fr24_id": "3b9c0a1f",
+    "flight": "UA123",
+    "departure_icao": "KLAX",
+    "arrival_icao": "KJFK",
+    "departure_time_utc": "2025-03-10T08:00:00Z",
+    "flight_duration_s": 18000,
+    "phase_durations_s": {
+        "takeoff": 60,
+        "climb": 1200,
+        "cruise": 15240,
+        "descent": 1200,
+        "landing": 300,
+    },
+    "emission_comparison": {
+        "detailed_calculation": {"total_fuel_kg": 10200.0, "co2_total_kg": 32232.0},
+        "statistical_simulation": {"total_fuel_kg": 11000.0},
+    },
+}
+
+
+def test_validate_positions_matches_the_dto_path():
+    """Test que el lote produce las mismas posiciones que validar cada DTO por separado."""
+    expected = [
+        FlightPositionPostRequest.model_validate(row).to_domain_model(7)
+        for row in POSITIONS
+    ]
+
+    assert validate_positions(7, POSITIONS) == expected
+    assert validate_positions(7, json.dumps(POSITIONS).encode()) == expected
+
+
+def test_validate_positions_reports_row_errors():
+    """Test que los errores se informan por fila y campo."""
+    rows = POSITIONS + [
+        {"timestamp": "2025-03-10T12:00:10Z", "latitude": 91, "longitude": -3.3},
+        {},
+    ]
+
+    with pytest.raises(BatchValidationError) as error:
+        validate_positions(7, rows)
+
+    assert [(e.row, e.field) for e in error.value.errors] == [
+        (2, "latitude"),
+        (3, "timestamp"),
+        (3, "latitude"),
+        (3, "longitude"),
+    ]
+    assert error.value.error_count == 4
+
+
+def test_validate_flights_matches_the_dto_path():
+    """Test que los vuelos validados en lote equivalen a los del DTO, incluidos los objetos anidados."""
+    expected = FlightPostRequest.model_validate(FLIGHT).to_domain_model()
+
+    flight = validate_flights([FLIGHT])[0]
+
+    assert flight.phase_durations_s == expected.phase_durations_s
+    assert flight.emission_comparison == expected.emission_comparison
+    assert flight.departure_time_utc == expected.departure_time_utc
+    with pytest.raises(BatchValidationError) as error:
+        validate_flights([FLIGHT, {"flight": "UA1"}])
+    assert [(e.row, e.field) for e in error.value.errors] == [(1, "fr24_id")]
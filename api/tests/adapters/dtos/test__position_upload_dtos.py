@@ -0,0 +1,139 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.adapters.dtos.position_upload_dtos import (
+    LineSplitter,
+    PositionUploadError,
+    parse_csv_header,
+    positions_from_lines,
+)
+from api.adapters.routes import flight_routes
+from api.adapters.routes.dependencies import build_position_service
+from api.index import app
+from api.utils.env_manager import get_settings
+
+
+def test_line_splitter_keeps_partial_lines():
+    """Test que las líneas partidas entre trozos del cuerpo se reconstruyen."""
+    splitter = LineSplitter()
+
+    assert splitter.feed(b'{"a": 1}\n{"a"') == [b'{"a": 1}']
+    assert splitter.feed(b": 2}\n\n{") == [b'{"a": 2}', b""]
+    assert splitter.feed(b'"a": 3}') == []
+    assert splitter.finish() == [b'{"a": 3}']
+
+
+def test_positions_from_csv_and_ndjson_lines():
+    """Test que las filas CSV y NDJSON se validan como posiciones del vuelo."""
+    header = parse_csv_header(b"timestamp,latitude,longitude,altitude\r")
+    csv_positions = positions_from_lines(
+        7,
+        [
+            b"2025-03-10T12:00:00Z,40.1,-3.5,\r",
+            b"",
+            b"2025-03-10T12:00:05Z,40.2,-3.4,9000",
+        ],
+        2,
+        "csv",
+        header,
+    )
+    ndjson_positions = positions_from_lines(
+        7,
+        [b'{"timestamp": "2025-03-10T12:00:00Z", "latitude": 40.1, "longitude": -3.5}'],
+        1,
+        "ndjson",
+    )
+
+    assert [(p.flight_id, p.latitude, p.altitude) for p in csv_positions] == [
+        (7, 40.1, None),
+        (7, 40.2, 9000),
+    ]
+    assert ndjson_positions[0].timestamp == csv_positions[0].timestamp
+
+    with pytest.raises(PositionUploadError) as error:
+        positions_from_lines(7, [b"", b'{"timestamp": "bad"}'], 10, "ndjson")
+    assert error.value.line == 11
+
+
+def test_upload_stores_rows_in_chunks(memory_backend, monkeypatch):
+    """Test que la subida en streaming guarda las posiciones por trozos e informa de la fila inválida."""
+    monkeypatch.setenv("UPLOAD_CHUNK_ROWS", "2")
+    get_settings.cache_clear()
+    flight_port, position_port = memory_backend
+    client = TestClient(app)
+    client.post(
+        "/flights",
+        json={"fr24_id": "up1", "departure_time_utc": "2025-03-10T10:00:00Z"},
+    )
+    flight_id = flight_port.get_by_fr24_id("up1").flight_id
+    rows = "\n".join(
+        f'{{"timestamp": "2025-03-10T12:00:0{i}Z", "latitude": 1, "longitude": 2}}'
+        for i in range(5)
+    )
+
+    response = client.post(
+        f"/flights/{flight_id}/positions/upload",
+        content=rows,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 201
+    assert response.json()["rows"] == 5
+    assert len(position_port.get_positions_by_flight_id(flight_id)) == 5
+
+    response = client.post(
+        f"/flights/{flight_id}/positions/upload",
+        content=rows + '\n{"latitude": 1}',
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"]["line"] == 6
+    assert response.json()["detail"]["stored_rows"] == 4
+
+    response = client.post(f"/flights/{flight_id}/positions/upload", json=[])
+    assert response.status_code == 415
+
+
+def test_upload_error_waits_for_the_chunk_being_written(memory_backend, monkeypatch):
+    """Test que un error a mitad de subida espera al trozo en escritura y lo cuenta en stored_rows."""
+    monkeypatch.setenv("UPLOAD_CHUNK_ROWS", "2")
+    get_settings.cache_clear()
+    flight_port, position_port = memory_backend
+    client = TestClient(app)
+    client.post(
+        "/flights",
+        json={"fr24_id": "up2", "departure_time_utc": "2025-03-10T10:00:00Z"},
+    )
+    flight_id = flight_port.get_by_fr24_id("up2").flight_id
+
+    position_service = build_position_service()
+    add_positions = position_service.add_positions_to_flight
+
+    def slow_add(*args):
+        time.sleep(0.2)
+        return add_positions(*args)
+
+    async def broken_body(chunks):
+        async for chunk in chunks:
+            yield chunk
+        await asyncio.sleep(0)
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(position_service, "add_positions_to_flight", slow_add)
+    monkeypatch.setattr(flight_routes, "_with_end", broken_body)
+    rows = "".join(
+        f'{{"timestamp": "2025-03-10T12:00:0{i}Z", "latitude": 1, "longitude": 2}}\n'
+        for i in range(4)
+    )
+
+    response = client.post(
+        f"/flights/{flight_id}/positions/upload",
+        content=rows,
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 500
+    assert response.json()["detail"]["stored_rows"] == 4
+    assert len(position_port.get_positions_by_flight_id(flight_id)) == 4
@@ -0,0 +1,158 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from api.adapters.repositories.buffered.flight_position_repository import (
+    BUFFER_DEPTH,
+    FLUSHED,
+    BufferedFlightPositionRepository,
+)
+from api.adapters.repositories.buffered.spool import PositionSpool
+from api.adapters.repositories.memory.flight_position_repository import (
+    InMemoryFlightPositionRepository,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import BoundingBox
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+
+START = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def track(flight_id, minutes, offset=0):
+    """Crea `minutes` posiciones consecutivas de un vuelo."""
+    return [
+        FlightPosition(
+            flight_id,
+            START + timedelta(minutes=offset + minute),
+            40.0 + minute * 0.01,
+            -3.0,
+            30000,
+        )
+        for minute in range(minutes)
+    ]
+
+
+def buffered(tmp_path, inner=None, **kwargs):
+    """Crea un repositorio con buffer sin hilo de volcado, sobre un spool en `tmp_path`."""
+    inner = inner if inner is not None else InMemoryFlightPositionRepository()
+    kwargs.setdefault("start", False)
+    return BufferedFlightPositionRepository(
+        inner, PositionSpool(str(tmp_path), fsync=False), **kwargs
+    )
+
+
+def test_flush_stores_every_flight_with_one_bulk_insert(tmp_path):
+    """Test que un volcado guarda las posiciones de todos los vuelos en una sola llamada."""
+    inner = InMemoryFlightPositionRepository()
+    repository = buffered(tmp_path, inner)
+    for flight_id in (1, 2, 3):
+        assert repository.add_positions(flight_id, track(flight_id, 5))
+    assert inner.get_positions_by_flight_id(1) == []
+
+    with patch.object(
+        inner, "add_position_batches", wraps=inner.add_position_batches
+    ) as bulk:
+        assert repository.flush()
+
+    bulk.assert_called_once()
+    assert sorted(bulk.call_args.args[0]) == [1, 2, 3]
+    assert len(inner.get_positions_by_flight_id(2)) == 5
+    assert repository.depth == 0
+    assert BUFFER_DEPTH.value() == 0
+
+
+def test_track_reads_include_pending_positions(tmp_path):
+    """Test que las lecturas de trayectoria incluyen las posiciones aún no volcadas."""
+    repository = buffered(tmp_path)
+    repository.add_positions(1, track(1, 3))
+    repository.flush()
+    repository.add_positions(1, track(1, 2, offset=3))
+
+    assert len(repository.get_positions_by_flight_id(1)) == 5
+    between = repository.get_positions_between(
+        1, START + timedelta(minutes=2), START + timedelta(minutes=4)
+    )
+    assert [position.timestamp for position in between] == [
+        START + timedelta(minutes=2),
+        START + timedelta(minutes=3),
+    ]
+    # Las búsquedas por área solo ven lo ya guardado.
+    box = BoundingBox(39.0, -4.0, 41.0, -2.0)
+    assert [
+        crossing.flight_id for crossing in repository.find_flights_in_area(box)
+    ] == [1]
+
+
+def test_spooled_positions_are_replayed_after_a_crash(tmp_path):
+    """Test que las posiciones aceptadas y no volcadas se recuperan del spool tras una caída."""
+    inner = InMemoryFlightPositionRepository()
+    crashed = buffered(tmp_path, inner)
+    crashed.add_positions(1, track(1, 4))
+    crashed.add_positions(2, track(2, 2))
+    crashed.add_positions(3, track(3, 2))
+    crashed.delete_positions_by_flight_id(3)
+    crashed.spool._slot_lock.close()  # el proceso muere sin volcar
+
+    recovered = buffered(tmp_path, inner)
+    assert recovered.depth == 6
+    assert recovered.flush()
+
+    assert len(inner.get_positions_by_flight_id(1)) == 4
+    assert len(inner.get_positions_by_flight_id(2)) == 2
+    assert inner.get_positions_by_flight_id(3) == []
+    # Lo volcado ya no está en el spool.
+    assert list(recovered.spool.records()) == []
+
+
+def test_failed_flush_keeps_positions_pending(tmp_path):
+    """Test que un volcado fallido deja las posiciones pendientes para reintentarlo."""
+    inner = InMemoryFlightPositionRepository()
+    repository = buffered(tmp_path, inner)
+    repository.add_positions(1, track(1, 3))
+    failed_before = FLUSHED.value(outcome="failed")
+
+    with patch.object(inner, "add_position_batches", side_effect=RuntimeError("down")):
+        assert not repository.flush()
+    assert repository.depth == 3
+    assert len(repository.get_positions_by_flight_id(1)) == 3
+    assert FLUSHED.value(outcome="failed") == failed_before + 3
+
+    assert repository.flush()
+    assert len(inner.get_positions_by_flight_id(1)) == 3
+
+
+def test_full_buffer_refuses_writes(tmp_path):
+    """Test que con el buffer lleno las escrituras se rechazan con BackendUnavailableError."""
+    repository = buffered(tmp_path, max_pending=3)
+    repository.add_positions(1, track(1, 3))
+
+    with pytest.raises(BackendUnavailableError):
+        repository.add_positions(2, track(2, 1))
+
+
+def test_close_drains_and_writes_through(tmp_path):
+    """Test que al cerrar se vuelca el buffer y las escrituras posteriores van directas."""
+    inner = InMemoryFlightPositionRepository()
+    repository = buffered(tmp_path, inner, flush_interval_s=60, start=True)
+    repository.add_positions(1, track(1, 3))
+
+    assert repository.close()
+    assert len(inner.get_positions_by_flight_id(1)) == 3
+    repository.add_positions(1, track(1, 1, offset=3))
+    assert len(inner.get_positions_by_flight_id(1)) == 4
+
+
+def test_flusher_stores_positions_after_the_interval(tmp_path):
+    """Test que el hilo de volcado guarda las posiciones cuando vence el intervalo."""
+    inner = InMemoryFlightPositionRepository()
+    repository = buffered(tmp_path, inner, flush_interval_s=0.05, start=True)
+    repository.add_positions(1, track(1, 2))
+
+    for _ in range(200):
+        if inner.get_positions_by_flight_id(1):
+            break
+        threading.Event().wait(0.01)
+    assert len(inner.get_positions_by_flight_id(1)) == 2
+    repository.close()
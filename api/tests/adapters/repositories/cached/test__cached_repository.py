@@ -0,0 +1,184 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.adapters.repositories.cached.flight_position_repository import (
+    CachedFlightPositionRepository,
+)
+from api.adapters.repositories.cached.flight_repository import CachedFlightRepository
+from api.core.domain.flight import Flight
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.shared_cache import SharedCache
+
+
+@pytest.fixture
+def cached_flights():
+    inner = MagicMock(spec=FlightPort)
+    inner.get_by_id.return_value = Flight(flight_id=1, fr24_id="abc")
+    inner.find_all.return_value = [Flight(flight_id=2, fr24_id="def")]
+    inner.get_summary_metrics.return_value = {"total_flights": 2}
+    return CachedFlightRepository(inner, ttl_seconds=60)
+
+
+def test_reads_are_served_from_cache(cached_flights):
+    """Test que las lecturas repetidas solo llegan una vez al puerto envuelto."""
+    for _ in range(3):
+        assert cached_flights.get_by_id(1).fr24_id == "abc"
+        assert cached_flights.find_all(airport="KJFK")[0].fr24_id == "def"
+        assert cached_flights.get_summary_metrics() == {"total_flights": 2}
+
+    assert cached_flights.inner.get_by_id.call_count == 1
+    assert cached_flights.inner.find_all.call_count == 1
+    assert cached_flights.inner.get_summary_metrics.call_count == 1
+
+
+def test_listing_populates_lookup_cache(cached_flights):
+    """Test que los vuelos de un listado quedan disponibles por ID y FR24 ID."""
+    cached_flights.find_all()
+
+    assert cached_flights.get_by_id(2).fr24_id == "def"
+    assert cached_flights.get_by_fr24_id("def").flight_id == 2
+    cached_flights.inner.get_by_id.assert_not_called()
+    cached_flights.inner.get_by_fr24_id.assert_not_called()
+
+
+def test_add_invalidates_listings_and_summary(cached_flights):
+    """Test que añadir un vuelo invalida los listados y el resumen."""
+    cached_flights.find_all()
+    cached_flights.get_summary_metrics()
+    cached_flights.inner.add.return_value = Flight(flight_id=3, fr24_id="ghi")
+
+    cached_flights.add(Flight(fr24_id="ghi"))
+    cached_flights.find_all()
+    cached_flights.get_summary_metrics()
+
+    assert cached_flights.inner.find_all.call_count == 2
+    assert cached_flights.inner.get_summary_metrics.call_count == 2
+
+
+def test_counts_are_cached_per_normalised_filters(cached_flights):
+    """Test que los totales se cachean por filtros normalizados y modo, y se invalidan al escribir."""
+    cached_flights.inner.count.return_value = 42
+
+    assert cached_flights.count(airport="KJFK", mode="planned") == 42
+    assert cached_flights.count(airport="kjfk", mode="planned") == 42
+    assert cached_flights.count(airport="kjfk", mode="exact") == 42
+    assert cached_flights.inner.count.call_count == 2
+
+    cached_flights.inner.upsert.return_value = Flight(flight_id=3, fr24_id="ghi")
+    cached_flights.upsert(Flight(fr24_id="ghi"))
+    cached_flights.count(airport="KJFK", mode="planned")
+
+    assert cached_flights.inner.count.call_count == 3
+
+
+def test_missing_flights_are_not_cached(cached_flights):
+    """Test que un vuelo inexistente no se guarda en caché."""
+    cached_flights.inner.get_by_fr24_id.return_value = None
+
+    assert cached_flights.get_by_fr24_id("nope") is None
+    assert cached_flights.get_by_fr24_id("nope") is None
+    assert cached_flights.inner.get_by_fr24_id.call_count == 2
+
+
+def test_current_lookup_bypasses_cache(cached_flights):
+    """Test que la lectura para read-modify-write no se sirve desde la caché."""
+    cached_flights.inner.get_by_fr24_id.return_value = Flight(
+        flight_id=1, fr24_id="abc"
+    )
+    cached_flights.inner.get_current_by_fr24_id.return_value = Flight(
+        flight_id=1, fr24_id="abc", aircraft_model="A320"
+    )
+    cached_flights.get_by_fr24_id("abc")
+
+    current = cached_flights.get_current_by_fr24_id("abc")
+
+    assert current.aircraft_model == "A320"
+    assert cached_flights.inner.get_current_by_fr24_id.call_count == 1
+
+
+def test_position_writes_drop_cached_track(sample_positions):
+    """Test que escribir o borrar posiciones invalida la trayectoria cacheada."""
+    inner = MagicMock(spec=FlightPositionPort)
+    inner.get_positions_by_flight_id.return_value = sample_positions
+    repository = CachedFlightPositionRepository(inner, ttl_seconds=60)
+
+    repository.get_positions_by_flight_id(1)
+    repository.get_positions_by_flight_id(1)
+    repository.add_positions(1, sample_positions)
+    repository.get_positions_by_flight_id(1)
+    repository.delete_positions_by_flight_id(1)
+    repository.get_positions_by_flight_id(1)
+
+    assert inner.get_positions_by_flight_id.call_count == 3
+
+
+def worker_flights(path, local_ttl_seconds=60):
+    """Crea el repositorio cacheado de un worker, con su propio backend simulado."""
+    inner = MagicMock(spec=FlightPort)
+    inner.get_by_id.return_value = Flight(flight_id=1, fr24_id="abc")
+    inner.get_summary_metrics.return_value = {"total_flights": 2}
+    inner.add.return_value = Flight(flight_id=3, fr24_id="ghi")
+    return CachedFlightRepository(
+        inner,
+        ttl_seconds=60,
+        shared=SharedCache(path),
+        local_ttl_seconds=local_ttl_seconds,
+    )
+
+
+def test_workers_share_reads_through_the_shared_cache(tmp_path):
+    """Test que lo que carga un worker lo sirven los demás sin ir al backend."""
+    path = str(tmp_path / "cache.db")
+    first, second = worker_flights(path), worker_flights(path)
+
+    assert first.get_by_id(1).fr24_id == "abc"
+    assert second.get_by_id(1).fr24_id == "abc"
+    assert (
+        first.get_summary_metrics()
+        == second.get_summary_metrics()
+        == {"total_flights": 2}
+    )
+
+    assert first.inner.get_by_id.call_count == 1
+    assert second.inner.get_by_id.call_count == 0
+    assert second.inner.get_summary_metrics.call_count == 0
+
+
+def test_invalidations_reach_other_workers_after_the_local_ttl(tmp_path):
+    """Test que una escritura en un worker invalida la caché compartida para todos."""
+    path = str(tmp_path / "cache.db")
+    first, second = worker_flights(path, 0.01), worker_flights(path, 0.01)
+    second.get_summary_metrics()
+
+    first.add(Flight(fr24_id="ghi"))
+    threading.Event().wait(0.02)
+    second.get_summary_metrics()
+
+    assert second.inner.get_summary_metrics.call_count == 2
+
+
+def test_unusable_shared_cache_falls_back_to_the_backend(tmp_path, sample_positions):
+    """Test que si la caché compartida no se puede abrir las lecturas siguen funcionando."""
+    inner = MagicMock(spec=FlightPositionPort)
+    inner.get_positions_by_flight_id.return_value = sample_positions
+    shared = SharedCache(str(tmp_path / "missing" / "cache.db"))
+    repository = CachedFlightPositionRepository(inner, ttl_seconds=60, shared=shared)
+
+    assert repository.get_positions_by_flight_id(1) == sample_positions
+    assert repository.get_positions_by_flight_id(1) == sample_positions
+    assert inner.get_positions_by_flight_id.call_count == 1
+
+
+def test_unusable_shared_cache_does_not_fail_writes(sample_positions):
+    """Test que una caché compartida inutilizable no hace fallar la invalidación tras una escritura."""
+    inner = MagicMock(spec=FlightPositionPort)
+    inner.add_positions.return_value = True
+    # A NUL byte makes sqlite3.connect raise ValueError, not sqlite3.Error.
+    shared = SharedCache("shared\0cache.db")
+    repository = CachedFlightPositionRepository(inner, ttl_seconds=60, shared=shared)
+
+    assert repository.add_positions(1, sample_positions)
+    inner.add_positions.assert_called_once_with(1, sample_positions)
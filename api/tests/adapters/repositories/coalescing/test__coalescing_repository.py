@@ -0,0 +1,115 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.adapters.repositories.coalescing.flight_position_repository import (
+    CoalescingFlightPositionRepository,
+)
+from api.adapters.repositories.coalescing.flight_repository import (
+    CoalescingFlightRepository,
+)
+from api.core.domain.flight import Flight
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.utils.single_flight import COALESCED
+
+CALLERS = 8
+
+
+def blocking(result, release):
+    """Devuelve una función que espera a `release` antes de devolver `result`."""
+
+    def call(*args, **kwargs):
+        release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return call
+
+
+def run_concurrently(function, calls=CALLERS):
+    """Lanza `calls` llamadas concurrentes y espera a que todas estén en curso."""
+    pool = ThreadPoolExecutor(calls)
+    futures = [pool.submit(function, index) for index in range(calls)]
+    pool.shutdown(wait=False)
+    return futures
+
+
+def wait_for_waiters(repository, expected_shared):
+    """Espera a que las llamadas repetidas se hayan unido a la que está en curso."""
+    for _ in range(500):
+        if COALESCED.value(source=repository.calls.name) >= expected_shared:
+            return
+        threading.Event().wait(0.01)
+
+
+def test_identical_concurrent_listings_share_one_backend_call():
+    """Test que listados idénticos y concurrentes hacen una sola llamada al backend."""
+    inner = MagicMock(spec=FlightPort)
+    release = threading.Event()
+    inner.find_all.side_effect = blocking([Flight(flight_id=1, fr24_id="abc")], release)
+    repository = CoalescingFlightRepository(inner)
+    shared_before = COALESCED.value(source="flights")
+
+    # Mismos filtros normalizados: distinto uso de mayúsculas.
+    futures = run_concurrently(
+        lambda index: repository.find_all(
+            airport="kjfk" if index % 2 else "KJFK", limit=10
+        )
+    )
+    wait_for_waiters(repository, shared_before + CALLERS - 1)
+    release.set()
+
+    assert all(future.result(5)[0].fr24_id == "abc" for future in futures)
+    assert inner.find_all.call_count == 1
+    assert COALESCED.value(source="flights") - shared_before == CALLERS - 1
+    assert repository.calls.in_flight() == 0
+
+    repository.find_all(airport="KJFK", limit=10)
+    assert inner.find_all.call_count == 2
+
+
+def test_errors_reach_every_coalesced_caller():
+    """Test que un error del backend llega a todas las llamadas que lo compartían."""
+    inner = MagicMock(spec=FlightPositionPort)
+    release = threading.Event()
+    inner.get_positions_by_flight_id.side_effect = blocking(
+        RuntimeError("backend down"), release
+    )
+    repository = CoalescingFlightPositionRepository(inner)
+    shared_before = COALESCED.value(source="positions")
+
+    futures = run_concurrently(lambda index: repository.get_positions_by_flight_id(7))
+    wait_for_waiters(repository, shared_before + CALLERS - 1)
+    release.set()
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="backend down"):
+            future.result(5)
+    assert inner.get_positions_by_flight_id.call_count == 1
+
+
+def test_reads_after_a_write_do_not_join_an_older_call():
+    """Test que una lectura posterior a una escritura no comparte una llamada anterior a ella."""
+    inner = MagicMock(spec=FlightPositionPort)
+    release = threading.Event()
+    inner.get_positions_by_flight_id.side_effect = blocking([], release)
+    inner.add_positions.return_value = True
+    repository = CoalescingFlightPositionRepository(inner)
+
+    before_write = run_concurrently(
+        lambda index: repository.get_positions_by_flight_id(7), calls=1
+    )
+    while repository.calls.in_flight() == 0:
+        threading.Event().wait(0.01)
+    repository.add_positions(7, [])
+    after_write = run_concurrently(
+        lambda index: repository.get_positions_by_flight_id(7), calls=1
+    )
+    release.set()
+
+    assert before_write[0].result(5) == [] and after_write[0].result(5) == []
+    assert inner.get_positions_by_flight_id.call_count == 2
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from api.adapters.repositories.deduplicating.flight_position_repository import (
+    INGESTED,
+    DeduplicatingFlightPositionRepository,
+)
+from api.adapters.repositories.memory.flight_position_repository import (
+    InMemoryFlightPositionRepository,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.utils.watermarks import TimestampWatermarks
+
+START = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def positions(flight_id, seconds):
+    """Crea una posición por cada segundo de `seconds` desde START."""
+    return [
+        FlightPosition(flight_id, START + timedelta(seconds=second), 40.0, -3.0)
+        for second in seconds
+    ]
+
+
+def test_replayed_positions_never_reach_the_backend():
+    """Test que un reenvío del mismo lote se descarta sin llamar al backend."""
+    inner = InMemoryFlightPositionRepository()
+    repository = DeduplicatingFlightPositionRepository(inner)
+    duplicates_before = INGESTED.value(outcome="duplicate")
+    repository.add_positions(1, positions(1, range(0, 50, 10)))
+
+    with patch.object(inner, "add_positions", wraps=inner.add_positions) as add:
+        assert repository.add_positions(1, positions(1, range(0, 50, 10)))
+        add.assert_not_called()
+        # Un lote solapado solo envía los puntos nuevos.
+        assert repository.add_positions(1, positions(1, [30, 40, 50, 50]))
+        assert [p.timestamp.second for p in add.call_args.args[1]] == [50]
+
+    assert INGESTED.value(outcome="duplicate") == duplicates_before + 8
+    assert len(inner.get_positions_by_flight_id(1)) == 6
+
+
+def test_batches_only_forward_new_positions():
+    """Test que los lotes de varios vuelos solo envían las posiciones nuevas."""
+    inner = InMemoryFlightPositionRepository()
+    repository = DeduplicatingFlightPositionRepository(inner)
+    repository.add_position_batches({1: positions(1, [0, 10]), 2: positions(2, [0])})
+
+    with patch.object(
+        inner, "add_position_batches", wraps=inner.add_position_batches
+    ) as bulk:
+        assert repository.add_position_batches(
+            {1: positions(1, [10, 20]), 2: positions(2, [0])}
+        )
+
+    assert {
+        flight_id: len(batch) for flight_id, batch in bulk.call_args.args[0].items()
+    } == {1: 1}
+
+
+def test_failed_writes_are_not_remembered():
+    """Test que si el backend falla los puntos no se marcan como vistos y el reintento llega."""
+    inner = InMemoryFlightPositionRepository()
+    repository = DeduplicatingFlightPositionRepository(inner)
+
+    with patch.object(inner, "add_positions", return_value=False):
+        assert not repository.add_positions(1, positions(1, [0, 10]))
+    assert repository.add_positions(1, positions(1, [0, 10]))
+    assert len(inner.get_positions_by_flight_id(1)) == 2
+
+
+def test_old_and_deleted_positions_are_forwarded():
+    """Test que los puntos fuera de la ventana o de vuelos borrados se envían al backend."""
+    inner = InMemoryFlightPositionRepository()
+    repository = DeduplicatingFlightPositionRepository(inner, window_s=60)
+    repository.add_positions(1, positions(1, [0, 600]))
+
+    with patch.object(inner, "add_positions", wraps=inner.add_positions) as add:
+        repository.add_positions(1, positions(1, [0]))
+        assert add.call_count == 1
+        repository.delete_positions_by_flight_id(1)
+        repository.add_positions(1, positions(1, [600]))
+        assert add.call_count == 2
+
+    # La base de datos descarta igualmente el punto repetido.
+    assert [p.timestamp.second for p in inner.get_positions_by_flight_id(1)] == [0]
+
+
+def test_watermarks_keep_only_the_recent_window():
+    """Test que solo se recuerdan los timestamps recientes y los vuelos usados últimamente."""
+    watermarks = TimestampWatermarks(window_us=100, max_keys=2)
+    watermarks.add("a", [500, 50, 450, 420])
+
+    assert watermarks.unseen("a", [50, 420, 450, 460, 500, 600, 600]) == [0, 3, 5]
+    watermarks.add("b", [1])
+    watermarks.add("c", [1])
+    assert watermarks.unseen("a", [500]) == [0]
+    assert watermarks.unseen("c", [1]) == []
@@ -0,0 +1,251 @@
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.adapters.repositories.memory.flight_position_repository import (
+    InMemoryFlightPositionRepository,
+)
+from api.adapters.repositories.memory.flight_repository import InMemoryFlightRepository
+from api.core.domain.flight import (
+    DetailedCalculation,
+    EmissionComparison,
+    Flight,
+    StatisticalSimulation,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import BoundingBox, Circle
+from api.core.ports.flight_port import FlightPort
+
+
+def make_flight(
+    flight_id, fr24_id, departure_icao, arrival_icao, model, departure_time, **kwargs
+):
+    return Flight(
+        flight_id=flight_id,
+        fr24_id=fr24_id,
+        flight=f"UA{flight_id}",
+        callsign=f"UAL{flight_id}",
+        departure_icao=departure_icao,
+        arrival_icao=arrival_icao,
+        aircraft_model=model,
+        departure_time_utc=departure_time,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def memory_flights():
+    day = datetime(2025, 3, 10, tzinfo=timezone.utc)
+    return [
+        make_flight(1, "aaa1", "KLAX", "KJFK", "B738", day + timedelta(hours=2)),
+        make_flight(2, "bbb2", "KJFK", "EGLL", "B77W", day + timedelta(hours=23)),
+        make_flight(
+            3, "ccc3", "SCEL", "SAEZ", "A320", day + timedelta(days=1, hours=1)
+        ),
+        make_flight(4, "ddd4", "KSFO", "KLAX", "A321", day - timedelta(hours=1)),
+    ]
+
+
+@pytest.fixture
+def memory_repository(memory_flights):
+    return InMemoryFlightRepository(memory_flights)
+
+
+def test_lookups_by_id_and_fr24_id(memory_repository):
+    """Test que las búsquedas por ID y por FR24 ID usan los índices hash."""
+    assert memory_repository.get_by_id(2).fr24_id == "bbb2"
+    assert memory_repository.get_by_fr24_id("ccc3").flight_id == 3
+    assert memory_repository.get_by_id(99) is None
+    assert memory_repository.get_by_fr24_id("nope") is None
+
+
+@pytest.mark.parametrize(
+    "filters, expected_ids",
+    [
+        ({}, [1, 2, 3, 4]),
+        ({"airport": "klax"}, [1, 4]),
+        ({"airport": "K"}, [1, 2, 4]),
+        ({"aircraft_model": "b7"}, [1, 2]),
+        ({"search": "ual3"}, [3]),
+        ({"flight_date": date(2025, 3, 10)}, [1, 2]),
+        (
+            {
+                "airport": "KJFK",
+                "flight_date": date(2025, 3, 10),
+                "aircraft_model": "77",
+            },
+            [2],
+        ),
+        ({"limit": 2, "offset": 1}, [2, 3]),
+    ],
+)
+def test_find_all_filters(memory_repository, filters, expected_ids):
+    """Test que find_all aplica los mismos filtros que el adaptador de Supabase."""
+    result = memory_repository.find_all(**filters)
+
+    assert [flight.flight_id for flight in result] == expected_ids
+    if "limit" not in filters:
+        assert memory_repository.count(**filters) == len(expected_ids)
+
+
+def test_add_assigns_id_and_rejects_duplicates(memory_repository):
+    """Test que add asigna un ID nuevo y rechaza FR24 IDs repetidos."""
+    created = memory_repository.add(Flight(fr24_id="eee5", departure_icao="LFPG"))
+
+    assert created.flight_id == 5
+    assert memory_repository.add(Flight(fr24_id="eee5")) is None
+    assert [f.flight_id for f in memory_repository.find_all(airport="lfpg")] == [5]
+
+
+def test_summary_metrics_are_incremental():
+    """Test que las métricas de resumen se actualizan al añadir vuelos."""
+    repository = InMemoryFlightRepository()
+    assert repository.get_summary_metrics() is None
+
+    comparison = EmissionComparison(
+        detailed_calculation=DetailedCalculation(
+            total_fuel_kg=900.0, co2_per_passenger_kg=10.0
+        ),
+        statistical_simulation=StatisticalSimulation(
+            total_fuel_kg=1000.0, co2_per_passenger_kg=12.5
+        ),
+    )
+    repository.add(
+        Flight(
+            fr24_id="a", distance_calculated_km=1000.0, emission_comparison=comparison
+        )
+    )
+    repository.add(Flight(fr24_id="b", distance_calculated_km=3000.0))
+
+    assert repository.get_summary_metrics() == {
+        "total_flights": 2,
+        "avg_distance": 2000.0,
+        "total_fuel_saving": 100.0,
+        "total_co2_saving": 2.5,
+    }
+
+
+def test_hydrate_from_pages_through_source(memory_flights):
+    """Test que la hidratación recorre el puerto de origen por páginas."""
+    source = MagicMock(spec=FlightPort)
+    source.find_all.side_effect = [memory_flights[:2], memory_flights[2:3]]
+    repository = InMemoryFlightRepository()
+
+    loaded = repository.hydrate_from(source, page_size=2)
+
+    assert loaded == 3
+    assert source.find_all.call_count == 2
+    assert [f.flight_id for f in repository.find_all()] == [1, 2, 3]
+
+
+def test_upsert_replaces_flight_and_indexes(memory_repository, memory_flights):
+    """Test que el upsert reemplaza el vuelo con el mismo FR24 ID y sus índices."""
+    replacement = make_flight(
+        None, "bbb2", "LEMD", "EGLL", "A320", memory_flights[1].departure_time_utc
+    )
+
+    stored = memory_repository.upsert(replacement)
+
+    assert stored.flight_id == 2
+    assert memory_repository.get_by_id(2).departure_icao == "LEMD"
+    assert [f.flight_id for f in memory_repository.find_all(airport="KJFK")] == [1]
+    assert memory_repository.get_summary_metrics()["total_flights"] == 4
+
+
+def test_iter_flights_yields_batches_in_id_order(memory_repository):
+    """Test que el recorrido completo devuelve lotes ordenados por ID."""
+    batches = list(memory_repository.iter_flights(batch_size=3))
+
+    assert [[f.flight_id for f in batch] for batch in batches] == [[1, 2, 3], [4]]
+
+
+def test_positions_are_kept_ordered_by_timestamp():
+    """Test que las posiciones se guardan ordenadas aunque lleguen desordenadas."""
+    repository = InMemoryFlightPositionRepository()
+    start = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+    def position(seconds):
+        return FlightPosition(
+            flight_id=0,
+            timestamp=start + timedelta(seconds=seconds),
+            latitude=0.0,
+            longitude=0.0,
+        )
+
+    repository.add_positions(7, [position(0), position(10)])
+    repository.add_positions(7, [position(20), position(5)])
+
+    track = repository.get_positions_by_flight_id(7)
+    assert [p.timestamp.second for p in track] == [0, 5, 10, 20]
+    assert all(p.flight_id == 7 and p.position_id for p in track)
+
+    window = repository.get_positions_between(
+        7, start + timedelta(seconds=5), start + timedelta(seconds=20)
+    )
+    assert [p.timestamp.second for p in window] == [5, 10]
+
+    assert repository.delete_positions_by_flight_id(7)
+    assert repository.get_positions_by_flight_id(7) == []
+
+
+def test_replayed_positions_are_skipped():
+    """Test que las posiciones con un timestamp ya guardado no se duplican."""
+    repository = InMemoryFlightPositionRepository()
+    start = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+    def position(seconds):
+        return FlightPosition(
+            flight_id=0,
+            timestamp=start + timedelta(seconds=seconds),
+            latitude=0.0,
+            longitude=0.0,
+        )
+
+    repository.add_positions(7, [position(0), position(10)])
+    assert repository.add_positions(7, [position(10), position(0)])
+    assert repository.add_positions(7, [position(10), position(20), position(20)])
+
+    assert [p.timestamp.second for p in repository.get_positions_by_flight_id(7)] == [
+        0,
+        10,
+        20,
+    ]
+
+
+def test_find_flights_in_area():
+    """Test que se encuentran los vuelos que cruzan un área, con sus horas de entrada y salida."""
+    repository = InMemoryFlightPositionRepository()
+    start = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+    def track(longitudes, latitude=40.0):
+        return [
+            FlightPosition(
+                flight_id=0,
+                timestamp=start + timedelta(minutes=10 * i),
+                latitude=latitude,
+                longitude=longitude,
+            )
+            for i, longitude in enumerate(longitudes)
+        ]
+
+    # El vuelo 1 cruza el área entre los minutos 10 y 20; el 2 pasa al norte.
+    repository.add_positions(1, track([-5.0, -3.6, -3.5, -2.0]))
+    repository.add_positions(2, track([-5.0, -3.6, -3.5], latitude=45.0))
+    box = BoundingBox(min_lat=39.5, min_lon=-4.0, max_lat=40.5, max_lon=-3.0)
+
+    crossings = repository.find_flights_in_area(box)
+    assert [(c.flight_id, c.entry_time, c.exit_time, c.points) for c in crossings] == [
+        (1, start + timedelta(minutes=10), start + timedelta(minutes=20), 2)
+    ]
+    assert [
+        c.flight_id for c in repository.find_flights_in_area(Circle(45.0, -3.55, 10.0))
+    ] == [2]
+    assert repository.find_flights_in_area(box, end=start + timedelta(minutes=10)) == []
+    later = repository.find_flights_in_area(box, start=start + timedelta(minutes=15))
+    assert [(c.entry_time, c.points) for c in later] == [
+        (start + timedelta(minutes=20), 1)
+    ]
+
+    repository.delete_positions_by_flight_id(1)
+    assert repository.find_flights_in_area(box) == []
@@ -0,0 +1,155 @@
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from api.adapters.repositories.cached.flight_repository import CachedFlightRepository
+from api.adapters.repositories.resilient.flight_position_repository import (
+    ResilientFlightPositionRepository,
+)
+from api.adapters.repositories.resilient.flight_repository import (
+    ResilientFlightRepository,
+)
+from api.adapters.repositories.supabase.errors import is_backend_failure
+from api.adapters.routes.dependencies import get_detail_service
+from api.core.domain.flight import Flight
+from api.core.domain.flight_position import FlightPosition
+from api.core.exceptions.flights_exceptions import (
+    BackendUnavailableError,
+    DeadlineExceededError,
+)
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.index import app
+from api.utils.resilience import (
+    HEDGED,
+    CircuitBreaker,
+    ResiliencePolicy,
+    deadline_scope,
+)
+
+
+def build_policy(**kwargs):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_s=0.05)
+    return ResiliencePolicy("test", breaker=breaker, max_workers=4, **kwargs)
+
+
+def test_calls_stop_waiting_at_the_request_deadline():
+    """Test que una llamada lenta se abandona al agotarse el presupuesto de la petición."""
+    inner = MagicMock(spec=FlightPort)
+    release = threading.Event()
+    inner.find_all.side_effect = lambda **kwargs: release.wait(5) and []
+    repository = ResilientFlightRepository(inner, build_policy(timeout_s=5.0))
+
+    started = time.monotonic()
+    with deadline_scope(0.05), pytest.raises(DeadlineExceededError):
+        repository.find_all()
+    release.set()
+
+    assert time.monotonic() - started < 1.0
+    with deadline_scope(0.0), pytest.raises(DeadlineExceededError):
+        repository.find_all()
+    assert inner.find_all.call_count == 1
+
+
+def test_slow_lookups_are_hedged_after_the_p95():
+    """Test que una lectura más lenta que el p95 reciente se duplica y gana la más rápida."""
+    inner = MagicMock(spec=FlightPositionPort)
+    track = [FlightPosition(7, datetime(2025, 3, 10, 8, 0), 40.0, -3.0)]
+    inner.get_positions_by_flight_id.return_value = track
+    policy = build_policy(hedge_min_delay_s=0.01)
+    repository = ResilientFlightPositionRepository(inner, policy)
+    for _ in range(20):
+        repository.get_positions_by_flight_id(7)
+
+    release = threading.Event()
+    calls = []
+
+    def slow_first(flight_id):
+        calls.append(flight_id)
+        if len(calls) == 1:
+            release.wait(5)
+        return track
+
+    inner.get_positions_by_flight_id.side_effect = slow_first
+    hedged = HEDGED.value(source="test", winner="hedge")
+    started = time.monotonic()
+
+    assert repository.get_positions_by_flight_id(7) == track
+    assert time.monotonic() - started < 1.0
+    assert len(calls) == 2
+    assert HEDGED.value(source="test", winner="hedge") == hedged + 1
+    release.set()
+
+
+def test_circuit_breaker_fails_fast_and_recovers():
+    """Test que el circuito se abre tras varios fallos, no llama al backend y se cierra al recuperarse."""
+    inner = MagicMock(spec=FlightPort)
+    inner.get_by_id.side_effect = BackendUnavailableError("down")
+    policy = build_policy(hedge_quantile=None)
+    repository = ResilientFlightRepository(inner, policy)
+
+    for _ in range(2):
+        with pytest.raises(BackendUnavailableError):
+            repository.get_by_id(1)
+    assert policy.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(BackendUnavailableError, match="open"):
+        repository.get_by_id(1)
+    assert inner.get_by_id.call_count == 2
+
+    time.sleep(0.06)
+    inner.get_by_id.side_effect = None
+    inner.get_by_id.return_value = Flight(flight_id=1, fr24_id="abc")
+
+    assert repository.get_by_id(1).fr24_id == "abc"
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cache_serves_stale_reads_while_the_backend_is_unavailable():
+    """Test que la caché responde con datos caducados mientras el backend no está disponible."""
+    inner = MagicMock(spec=FlightPort)
+    inner.get_by_id.return_value = Flight(flight_id=1, fr24_id="abc")
+    inner.find_all.return_value = [Flight(flight_id=1, fr24_id="abc")]
+    repository = CachedFlightRepository(inner, ttl_seconds=0.01, stale_ttl_seconds=60)
+    repository.get_by_id(1)
+    repository.find_all(limit=5)
+    time.sleep(0.02)
+
+    inner.get_by_id.side_effect = BackendUnavailableError("open")
+    inner.find_all.side_effect = BackendUnavailableError("open")
+
+    assert repository.get_by_id(1).fr24_id == "abc"
+    assert [flight.fr24_id for flight in repository.find_all(limit=5)] == ["abc"]
+    with pytest.raises(BackendUnavailableError):
+        repository.get_by_id(2)
+
+
+def test_only_backend_failures_are_reported_as_unavailable():
+    """Test que sólo los errores de red, timeouts y 5xx cuentan como fallos del backend."""
+    assert is_backend_failure(httpx.ConnectTimeout("timed out"))
+    assert is_backend_failure(
+        APIError({"message": "JSON could not be generated", "code": 502})
+    )
+    assert is_backend_failure(APIError({"message": "pool timeout", "code": "PGRST003"}))
+    assert not is_backend_failure(APIError({"message": "no rows", "code": "PGRST116"}))
+    assert not is_backend_failure(APIError({"message": "bad request", "code": 400}))
+
+
+def test_api_answers_503_when_the_backend_is_unavailable(memory_backend, client):
+    """Test que la API responde 503 con Retry-After si el backend no está disponible."""
+    detail_service = MagicMock()
+    detail_service.get_flight_detail.side_effect = BackendUnavailableError(
+        "Circuit breaker is open."
+    )
+    app.dependency_overrides[get_detail_service] = lambda: detail_service
+    try:
+        response = client.get("/flights/1")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
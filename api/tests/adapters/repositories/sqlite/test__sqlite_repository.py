@@ -0,0 +1,363 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from api.adapters.repositories.sqlite.database import SQLiteDatabase
+from api.adapters.repositories.sqlite.flight_position_repository import (
+    SQLiteFlightPositionRepository,
+)
+from api.adapters.repositories.sqlite.flight_repository import SQLiteFlightRepository
+from api.adapters.repositories.sqlite.loader import (
+    iter_ndjson,
+    load_flights,
+    load_positions,
+)
+from api.core.domain.flight import (
+    DetailedCalculation,
+    EmissionComparison,
+    Flight,
+    PhaseDurations,
+    StatisticalSimulation,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import BoundingBox, Circle
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+
+DAY = datetime(2025, 3, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def database():
+    database = SQLiteDatabase(":memory:")
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def sqlite_flights(database):
+    repository = SQLiteFlightRepository(database)
+    comparison = EmissionComparison(
+        detailed_calculation=DetailedCalculation(
+            total_fuel_kg=900.0, co2_per_passenger_kg=10.0
+        ),
+        statistical_simulation=StatisticalSimulation(
+            total_fuel_kg=1000.0, co2_per_passenger_kg=12.5
+        ),
+    )
+    repository.add(
+        Flight(
+            fr24_id="aaa1",
+            flight="UA1",
+            departure_icao="KLAX",
+            arrival_icao="KJFK",
+            aircraft_model="B738",
+            departure_time_utc=DAY + timedelta(hours=2),
+            distance_calculated_km=1000.0,
+            emission_comparison=comparison,
+            phase_durations_s=PhaseDurations(cruise=3600),
+        )
+    )
+    repository.add(
+        Flight(
+            fr24_id="bbb2",
+            flight="LA2",
+            departure_icao="SCEL",
+            arrival_icao="SAEZ",
+            aircraft_model="A320",
+            departure_time_utc=DAY + timedelta(days=1),
+            distance_calculated_km=3000.0,
+        )
+    )
+    return repository
+
+
+def test_add_and_get_round_trip(sqlite_flights):
+    """Test que un vuelo guardado se recupera con sus objetos anidados y fechas."""
+    flight = sqlite_flights.get_by_fr24_id("aaa1")
+
+    assert flight.flight_id == 1
+    assert flight.departure_time_utc == DAY + timedelta(hours=2)
+    assert flight.phase_durations_s.cruise == 3600
+    assert flight.emission_comparison.detailed_calculation.total_fuel_kg == 900.0
+    assert sqlite_flights.get_by_id(2).fr24_id == "bbb2"
+    assert sqlite_flights.get_by_id(3) is None
+    assert sqlite_flights.add(Flight(fr24_id="aaa1")) is None
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ({}, ["aaa1", "bbb2"]),
+        ({"search": "la2"}, ["bbb2"]),
+        ({"airport": "kjfk"}, ["aaa1"]),
+        ({"aircraft_model": "a3"}, ["bbb2"]),
+        ({"flight_date": date(2025, 3, 11)}, ["bbb2"]),
+        ({"limit": 1, "offset": 1}, ["bbb2"]),
+    ],
+)
+def test_find_all_filters(sqlite_flights, filters, expected):
+    """Test que find_all y count traducen cada filtro a SQL."""
+    assert [f.fr24_id for f in sqlite_flights.find_all(**filters)] == expected
+    if "limit" not in filters:
+        assert sqlite_flights.count(**filters, mode="planned") == len(expected)
+
+
+def test_summary_metrics(sqlite_flights):
+    """Test que la agregación del resumen usa los ahorros precalculados."""
+    assert sqlite_flights.get_summary_metrics() == {
+        "total_flights": 2,
+        "avg_distance": 2000.0,
+        "total_fuel_saving": 100.0,
+        "total_co2_saving": 2.5,
+    }
+
+
+def test_upsert_updates_in_place(sqlite_flights):
+    """Test que el upsert actualiza la fila con el mismo FR24 ID sin cambiar su ID."""
+    existing = sqlite_flights.get_by_fr24_id("aaa1")
+    existing.flight_id = None
+    existing.aircraft_model = "A20N"
+
+    stored = sqlite_flights.upsert(existing)
+
+    assert stored.aircraft_model == "A20N"
+    assert stored.flight_id == sqlite_flights.get_by_fr24_id("aaa1").flight_id
+    assert sqlite_flights.get_summary_metrics()["total_flights"] == 2
+
+
+def test_iter_flights_uses_keyset_batches(sqlite_flights):
+    """Test que el recorrido completo pagina por clave primaria."""
+    batches = list(sqlite_flights.iter_flights(batch_size=1))
+
+    assert [[f.fr24_id for f in batch] for batch in batches] == [["aaa1"], ["bbb2"]]
+
+
+def test_iter_flights_raises_when_a_batch_fails(sqlite_flights, database):
+    """Test que un fallo a mitad del recorrido se propaga en lugar de terminarlo antes de tiempo."""
+    batches = sqlite_flights.iter_flights(batch_size=1)
+    assert [f.fr24_id for f in next(batches)] == ["aaa1"]
+    database.connection.execute("ALTER TABLE flights RENAME TO flights_gone")
+
+    with pytest.raises(BackendUnavailableError):
+        next(batches)
+
+
+def test_positions_range_scan(database):
+    """Test que las posiciones se devuelven ordenadas y filtradas por rango de tiempo."""
+    repository = SQLiteFlightPositionRepository(database)
+    positions = [
+        FlightPosition(
+            flight_id=1,
+            timestamp=DAY + timedelta(seconds=s),
+            latitude=1.0,
+            longitude=2.0,
+        )
+        for s in (20, 0, 10)
+    ]
+
+    assert repository.add_positions(1, positions)
+    assert [p.timestamp.second for p in repository.get_positions_by_flight_id(1)] == [
+        0,
+        10,
+        20,
+    ]
+    window = repository.get_positions_between(
+        1, DAY + timedelta(seconds=5), DAY + timedelta(seconds=20)
+    )
+    assert [p.timestamp.second for p in window] == [10]
+    assert repository.delete_positions_by_flight_id(1)
+    assert repository.get_positions_by_flight_id(1) == []
+
+
+def test_find_flights_in_area(database):
+    """Test que el índice R-tree encuentra los vuelos que cruzan un área, también sobre el antimeridiano."""
+    repository = SQLiteFlightPositionRepository(database)
+
+    def track(flight_id, longitudes, latitude=10.0):
+        return [
+            FlightPosition(
+                flight_id=flight_id,
+                timestamp=DAY + timedelta(minutes=30 * i),
+                latitude=latitude,
+                longitude=longitude,
+            )
+            for i, longitude in enumerate(longitudes)
+        ]
+
+    assert repository.add_positions(1, track(1, [178.0, 179.5, -179.5, -178.0]))
+    # A later batch of the same flight gets its own boxes.
+    assert repository.add_positions(
+        1,
+        [
+            FlightPosition(
+                flight_id=1,
+                timestamp=DAY + timedelta(hours=3),
+                latitude=10.0,
+                longitude=-179.8,
+            )
+        ],
+    )
+    assert repository.add_positions(2, track(2, [0.0, 0.1, 0.2]))
+
+    crossings = repository.find_flights_in_area(BoundingBox(9.0, 179.0, 11.0, -179.0))
+    assert [(c.flight_id, c.entry_time, c.exit_time, c.points) for c in crossings] == [
+        (1, DAY + timedelta(minutes=30), DAY + timedelta(hours=3), 3)
+    ]
+    circle = repository.find_flights_in_area(
+        Circle(10.0, 0.1, 5.0), start=DAY + timedelta(minutes=20)
+    )
+    assert [(c.flight_id, c.entry_time, c.points) for c in circle] == [
+        (2, DAY + timedelta(minutes=30), 1)
+    ]
+
+    assert repository.delete_positions_by_flight_id(1)
+    assert repository.find_flights_in_area(BoundingBox(9.0, 179.0, 11.0, -179.0)) == []
+    assert (
+        database.connection.execute("SELECT COUNT(*) FROM position_cells").fetchone()[0]
+        == 2
+    )
+
+
+def test_bulk_load_from_ndjson(database, tmp_path):
+    """Test que la carga masiva lee exportaciones NDJSON de vuelos y posiciones."""
+    flights_file = tmp_path / "flights.ndjson"
+    flights_file.write_text(
+        json.dumps(
+            {"flight_id": 7, "fr24_id": "x7", "departure_time_utc": DAY.isoformat()}
+        )
+        + "\n"
+    )
+    positions_file = tmp_path / "positions.ndjson"
+    positions_file.write_text(
+        "\n".join(
+            json.dumps(
+                {
+                    "flight_id": 7,
+                    "timestamp": (DAY + timedelta(seconds=i)).isoformat(),
+                    "latitude": 1.0,
+                    "longitude": 2.0,
+                }
+            )
+            for i in range(5)
+        )
+    )
+
+    assert load_flights(database, iter_ndjson(str(flights_file))) == 1
+    assert load_positions(database, iter_ndjson(str(positions_file))) == 5
+    assert SQLiteFlightRepository(database).get_by_id(7).fr24_id == "x7"
+    assert (
+        len(SQLiteFlightPositionRepository(database).get_positions_by_flight_id(7)) == 5
+    )
+    crossings = SQLiteFlightPositionRepository(database).find_flights_in_area(
+        BoundingBox(0.5, 1.5, 1.5, 2.5)
+    )
+    assert [(c.flight_id, c.points) for c in crossings] == [(7, 5)]
+
+
+def test_delete_positions_before_in_batches(database):
+    """Test que las posiciones antiguas se borran por lotes junto con sus cajas del R-tree."""
+    repository = SQLiteFlightPositionRepository(database)
+    for flight_id in (1, 2):
+        repository.add_positions(
+            flight_id,
+            [
+                FlightPosition(
+                    flight_id, DAY + timedelta(hours=hour), 10.0, float(hour)
+                )
+                for hour in range(6)
+            ],
+        )
+    cutoff = DAY + timedelta(hours=4)
+
+    assert repository.flight_ids_with_positions_before(DAY + timedelta(minutes=1)) == [
+        1,
+        2,
+    ]
+    assert repository.flight_ids_with_positions_before(cutoff, after_id=1, limit=5) == [
+        2
+    ]
+    assert repository.delete_positions_before(1, cutoff, limit=3) == 3
+    assert repository.delete_positions_before(1, cutoff, limit=3) == 1
+    assert repository.delete_positions_before(1, cutoff, limit=3) == 0
+    assert [p.timestamp.hour for p in repository.get_positions_by_flight_id(1)] == [
+        4,
+        5,
+    ]
+    crossings = repository.find_flights_in_area(BoundingBox(9.0, 0.5, 11.0, 3.5))
+    assert [crossing.flight_id for crossing in crossings] == [2]
+    cells = database.connection.execute(
+        "SELECT COUNT(*) FROM position_cells WHERE id >> 24 = 1"
+    ).fetchone()[0]
+    assert cells == 2
+    assert repository.delete_positions_before(1, DAY + timedelta(days=1)) == 2
+    assert repository.flight_ids_with_positions_before(DAY + timedelta(days=1)) == [2]
+
+
+def test_add_position_batches_in_one_transaction(database):
+    """Test que las posiciones de varios vuelos se guardan juntas y quedan indexadas por área."""
+    repository = SQLiteFlightPositionRepository(database)
+    batches = {
+        flight_id: [
+            FlightPosition(
+                flight_id, DAY + timedelta(minutes=minute), 10.0 * flight_id, 1.0
+            )
+            for minute in range(3)
+        ]
+        for flight_id in (1, 2)
+    }
+
+    assert repository.add_position_batches(batches)
+    assert len(repository.get_positions_by_flight_id(1)) == 3
+    assert len(repository.get_positions_by_flight_id(2)) == 3
+    crossings = repository.find_flights_in_area(BoundingBox(19.0, 0.0, 21.0, 2.0))
+    assert [crossing.flight_id for crossing in crossings] == [2]
+
+
+def test_replayed_positions_are_skipped(database):
+    """Test que las posiciones repetidas no se insertan ni añaden cajas al R-tree."""
+    repository = SQLiteFlightPositionRepository(database)
+    track = [
+        FlightPosition(1, DAY + timedelta(minutes=minute), 10.0, 1.0)
+        for minute in range(3)
+    ]
+    repository.add_positions(1, track)
+    boxes = database.connection.execute(
+        "SELECT COUNT(*) FROM position_cells"
+    ).fetchone()[0]
+
+    assert repository.add_positions(
+        1, track[1:] + [FlightPosition(1, DAY + timedelta(minutes=3), 10.0, 1.0)]
+    )
+    assert repository.add_position_batches({1: track})
+    assert len(repository.get_positions_by_flight_id(1)) == 4
+    assert (
+        database.connection.execute("SELECT COUNT(*) FROM position_cells").fetchone()[0]
+        == boxes + 1
+    )
+
+
+def test_duplicate_positions_are_removed_when_the_index_becomes_unique(tmp_path):
+    """Test que al abrir una base antigua se borran los duplicados y el índice pasa a ser único."""
+    path = str(tmp_path / "old.db")
+    database = SQLiteDatabase(path)
+    database.connection.execute("DROP INDEX flight_positions_flight_time_idx")
+    database.connection.execute(
+        "CREATE INDEX flight_positions_flight_time_idx ON flight_positions (flight_id, timestamp)"
+    )
+    database.connection.executemany(
+        "INSERT INTO flight_positions (flight_id, timestamp, latitude, longitude) VALUES (?, ?, 0, 0)",
+        [(1, 100.0), (1, 100.0), (1, 200.0), (2, 100.0)],
+    )
+    database.close()
+
+    database = SQLiteDatabase(path)
+    rows = database.connection.execute(
+        "SELECT position_id, flight_id, timestamp FROM flight_positions ORDER BY position_id"
+    ).fetchall()
+    assert rows == [(1, 1, 100.0), (3, 1, 200.0), (4, 2, 100.0)]
+    sql = database.connection.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'flight_positions_flight_time_idx'"
+    ).fetchone()[0]
+    assert sql.startswith("CREATE UNIQUE INDEX")
+    database.close()
@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from postgrest.exceptions import APIError
+
+from api.adapters.repositories.supabase.flight_position_repository import (
+    SupabaseFlightPositionRepository,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import BoundingBox, Circle
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.tests.fixtures.supabase_fixtures import MockResponse
+
+START = datetime(2025, 3, 10, 8, 0, tzinfo=timezone.utc)
+
+
+def test_find_flights_in_area_calls_the_database_function():
+    """Test que la búsqueda por área delega en la función SQL y sólo recibe una fila por vuelo."""
+    client = MagicMock()
+    client.rpc.return_value.execute.return_value = MockResponse(
+        [
+            {
+                "flight_id": 2,
+                "entry_time": "2025-03-10T08:20:00+00:00",
+                "exit_time": "2025-03-10T08:25:00+00:00",
+                "points": 6,
+            },
+            {
+                "flight_id": 1,
+                "entry_time": "2025-03-10T08:05:00+00:00",
+                "exit_time": "2025-03-10T08:10:00+00:00",
+                "points": 3,
+            },
+        ]
+    )
+    repository = SupabaseFlightPositionRepository(client)
+
+    crossings = repository.find_flights_in_area(Circle(40.47, -3.56, 25.0), start=START)
+
+    name, params = client.rpc.call_args.args
+    box = Circle(40.47, -3.56, 25.0).bounding_box()
+    assert name == "find_flights_in_area"
+    assert params == {
+        "min_lat": box.min_lat,
+        "max_lat": box.max_lat,
+        "min_lon": box.min_lon,
+        "max_lon": box.max_lon,
+        "center_lat": 40.47,
+        "center_lon": -3.56,
+        "radius_km": 25.0,
+        "start_time": START.isoformat(),
+        "end_time": None,
+    }
+    client.table.assert_not_called()
+    assert [crossing.flight_id for crossing in crossings] == [1, 2]
+    assert crossings[0].entry_time == datetime(2025, 3, 10, 8, 5, tzinfo=timezone.utc)
+    assert crossings[1].points == 6
+
+
+def test_find_flights_in_area_errors():
+    """Test que un fallo de la función SQL devuelve una lista vacía o se propaga con raise_errors."""
+    client = MagicMock()
+    client.rpc.return_value.execute.side_effect = ConnectionError("down")
+    box = BoundingBox(9.0, 179.0, 11.0, -179.0)
+
+    assert SupabaseFlightPositionRepository(client).find_flights_in_area(box) == []
+    with pytest.raises(BackendUnavailableError):
+        SupabaseFlightPositionRepository(
+            client, raise_errors=True
+        ).find_flights_in_area(box)
+    assert client.rpc.call_args.args[1]["center_lat"] is None
+
+
+def test_get_positions_between_reads_every_page():
+    """Test que la lectura por rango pagina ordenada por timestamp hasta la última página."""
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.eq.return_value
+    ordered = query.gte.return_value.lt.return_value.order.return_value
+    ranged = ordered.order.return_value
+
+    def row():
+        return {
+            "flight_id": 1,
+            "timestamp": "2025-03-10T08:00:00+00:00",
+            "latitude": 40.0,
+            "longitude": -3.0,
+        }
+
+    ranged.range.return_value.execute.side_effect = [
+        MockResponse([row(), row()]),
+        MockResponse([row()]),
+    ]
+    repository = SupabaseFlightPositionRepository(client)
+    repository.PAGE_SIZE = 2
+
+    positions = repository.get_positions_between(1, START, START)
+
+    assert len(positions) == 3
+    assert [call.args for call in ranged.range.call_args_list] == [(0, 1), (2, 3)]
+    assert query.gte.call_args.args == ("timestamp", START.isoformat())
+    assert ordered.order.call_args.args == ("position_id",)
+
+    ranged.range.return_value.execute.side_effect = [
+        MockResponse([row(), row()]),
+        ConnectionError("down"),
+    ]
+    assert repository.get_positions_between(1, START, START) == []
+
+
+def test_positions_are_inserted_without_the_unique_constraint():
+    """Test que sin la restricción única se insertan las posiciones sin volver a intentar el upsert."""
+    client = MagicMock()
+    table = client.table.return_value
+    table.upsert.return_value.execute.side_effect = APIError(
+        {"code": "42P10", "message": "no unique or exclusion constraint"}
+    )
+    repository = SupabaseFlightPositionRepository(client)
+    track = [FlightPosition(1, START, 40.0, -3.0)]
+
+    assert repository.add_positions(1, track)
+    assert repository.add_positions(1, track)
+
+    assert table.upsert.call_count == 1
+    assert table.insert.call_count == 2
+    assert table.insert.call_args.args[0][0]["flight_id"] == 1
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from api.core.domain.flight import Flight
+from api.index import app
+
+
+def test_listing_returns_total_count_headers(memory_backend):
+    """Test que con count el listado devuelve el total en X-Total-Count y Content-Range."""
+    flights, _ = memory_backend
+    for index in range(5):
+        flights.add(
+            Flight(
+                fr24_id=f"f{index}",
+                departure_icao="LEMD" if index % 2 == 0 else "EGLL",
+                departure_time_utc=datetime(2025, 3, 10, 8, index, tzinfo=timezone.utc),
+            )
+        )
+    client = TestClient(app)
+
+    response = client.get("/flights?airport=lemd&limit=2&offset=1&count=estimated")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["x-total-count"] == "3"
+    assert response.headers["content-range"] == "1-2/3"
+    assert "x-total-count" not in client.get("/flights").headers
+    assert client.get("/flights?count=everything").status_code == 422
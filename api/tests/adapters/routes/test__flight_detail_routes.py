@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from api.core.domain.flight import Flight
+from api.core.domain.flight_position import FlightPosition
+from api.index import app
+
+START = datetime(2025, 3, 10, 8, 0, tzinfo=timezone.utc)
+
+
+def test_flight_detail_includes_the_track_on_request(memory_backend):
+    """Test que include=positions devuelve el vuelo con su track completo, simplificado o codificado."""
+    flights, positions = memory_backend
+    flight = flights.add(Flight(fr24_id="abc", departure_icao="LEMD"))
+    track = [
+        FlightPosition(
+            flight.flight_id,
+            START + timedelta(minutes=minute),
+            40.0,
+            -3.0 + minute * 0.1,
+            36000,
+        )
+        for minute in range(10)
+    ]
+    positions.add_positions(flight.flight_id, list(reversed(track)))
+    client = TestClient(app)
+
+    plain = client.get(f"/flights/{flight.flight_id}").json()
+    full = client.get(f"/flights/{flight.flight_id}?include=positions").json()
+    simplified = client.get(
+        f"/flights/{flight.flight_id}?include=positions&track=simplified"
+    ).json()
+    polyline = client.get(
+        f"/flights/{flight.flight_id}?include=positions&track=polyline"
+    ).json()
+
+    assert plain["fr24_id"] == "abc" and "positions" not in plain
+    assert [p["longitude"] for p in full["positions"]] == [p.longitude for p in track]
+    assert len(simplified["positions"]) == 2
+    assert polyline["track"]["points"] == 2
+    assert polyline["track"]["precision"] == 5
+    assert client.get("/flights/999?include=positions").status_code == 404
+    assert (
+        client.get(f"/flights/{flight.flight_id}?include=everything").status_code == 422
+    )
+    assert (
+        client.get(f"/flights/{flight.flight_id}/positions").json() == full["positions"]
+    )
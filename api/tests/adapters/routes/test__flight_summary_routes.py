@@ -0,0 +1,19 @@
+from fastapi.testclient import TestClient
+
+from api.core.domain.flight import Flight
+from api.index import app
+
+
+def test_summary_is_a_single_object(memory_backend):
+    """Test que el resumen global se devuelve como un objeto con las métricas."""
+    flights, _ = memory_backend
+    flights.add(Flight(fr24_id="a", distance_calculated_km=1000.0))
+    flights.add(Flight(fr24_id="b", distance_calculated_km=3000.0))
+
+    response = TestClient(app).get("/flights/summary")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert isinstance(body, dict)
+    assert body["total_flights"] == 2
+    assert body["avg_distance"] == 2000.0
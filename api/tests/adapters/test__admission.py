@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.adapters.admission import classify_request, get_admission_controller
+from api.index import app
+from api.utils.admission import (
+    ADMITTED,
+    QUEUED,
+    SHED,
+    AdmissionClass,
+    AdmissionController,
+    OverloadedError,
+)
+from api.utils.env_manager import get_settings
+
+
+def build_controller(max_concurrency=1, queue_size=10, timeout_s=1.0):
+    return AdmissionController(
+        max_concurrency=max_concurrency,
+        classes=[
+            AdmissionClass("read", 0, 10, queue_size, timeout_s),
+            AdmissionClass("heavy", 2, 1, queue_size, timeout_s),
+        ],
+    )
+
+
+def test_classify_request():
+    """Test que cada ruta se asigna a su clase de admisión."""
+    assert classify_request("GET", "/flights/12") == "read"
+    assert classify_request("GET", "/flights/12/positions") == "read"
+    assert classify_request("GET", "/flights/12/track") == "heavy"
+    assert classify_request("GET", "/analytics/emissions") == "heavy"
+    assert classify_request("GET", "/flights/crossing") == "heavy"
+    assert classify_request("POST", "/flights") == "write"
+    assert classify_request("DELETE", "/flights/12") == "write"
+    assert classify_request("POST", "/flights/12/positions") == "heavy"
+    assert classify_request("POST", "/flights/12/positions/upload") == "heavy"
+    assert classify_request("GET", "/flights/12/positions/stream") is None
+    assert classify_request("GET", "/health-check") is None
+    assert classify_request("GET", "/metrics") is None
+    assert classify_request("GET", "/debug/profiles") is None
+
+
+def test_waiting_requests_are_admitted_by_priority():
+    """Test que al liberarse un hueco entra primero la petición de mayor prioridad."""
+
+    async def scenario():
+        controller = build_controller()
+        order = []
+
+        async def request(name):
+            await controller.acquire(name)
+            order.append(name)
+            controller.release(name)
+
+        await controller.acquire("read")
+        heavy = asyncio.ensure_future(request("heavy"))
+        await asyncio.sleep(0)
+        read = asyncio.ensure_future(request("read"))
+        await asyncio.sleep(0)
+        assert controller.queued == {"read": 1, "heavy": 1}
+
+        controller.release("read")
+        await asyncio.gather(heavy, read)
+        return order, controller
+
+    queued = QUEUED.value(**{"class": "heavy"})
+    order, controller = asyncio.run(scenario())
+
+    assert order == ["read", "heavy"]
+    assert controller.active == {"read": 0, "heavy": 0}
+    assert QUEUED.value(**{"class": "heavy"}) == queued + 1
+
+
+def test_requests_are_shed_when_the_queue_is_full_or_too_slow():
+    """Test que se rechazan peticiones con la cola llena o tras esperar demasiado."""
+
+    async def scenario():
+        controller = build_controller(queue_size=1, timeout_s=0.05)
+        await controller.acquire("heavy")
+        waiting = asyncio.ensure_future(controller.acquire("heavy"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(OverloadedError) as full:
+            await controller.acquire("heavy")
+        with pytest.raises(OverloadedError) as slow:
+            await waiting
+        return controller, full.value, slow.value
+
+    full_before = SHED.value(**{"class": "heavy", "reason": "queue_full"})
+    timeout_before = SHED.value(**{"class": "heavy", "reason": "queue_timeout"})
+    controller, full, slow = asyncio.run(scenario())
+
+    assert (full.reason, slow.reason) == ("queue_full", "queue_timeout")
+    assert controller.queued["heavy"] == 0
+    assert controller.active["heavy"] == 1
+    assert SHED.value(**{"class": "heavy", "reason": "queue_full"}) == full_before + 1
+    assert (
+        SHED.value(**{"class": "heavy", "reason": "queue_timeout"})
+        == timeout_before + 1
+    )
+
+
+def test_overloaded_api_answers_503_with_retry_after(memory_backend, monkeypatch):
+    """Test que la API responde 503 con Retry-After cuando no hay hueco."""
+    monkeypatch.setenv("ADMISSION_HEAVY_LIMIT", "1")
+    monkeypatch.setenv("ADMISSION_QUEUE_SIZE", "0")
+    monkeypatch.setenv("ADMISSION_RETRY_AFTER_SECONDS", "3")
+    get_settings.cache_clear()
+    get_admission_controller.cache_clear()
+    admitted = ADMITTED.value(**{"class": "read"})
+    client = TestClient(app)
+
+    assert client.get("/flights").status_code == 200
+    asyncio.run(get_admission_controller().acquire("heavy"))
+    response = client.get("/flights/crossing?min_lat=0&max_lat=1&min_lon=0&max_lon=1")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+    assert response.json()["reason"] == "queue_full"
+    assert ADMITTED.value(**{"class": "read"}) == admitted + 1
+    assert "admission_shed_total" in client.get("/metrics").text
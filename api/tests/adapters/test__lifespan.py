@@ -0,0 +1,63 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.adapters.lifespan import warmup_state
+from api.index import app
+from api.utils.env_manager import get_settings
+
+
+def wait_until_ready(client, timeout_s=5.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        response = client.get("/health-check?ready=true")
+        if response.status_code == 200:
+            return response
+        time.sleep(0.01)
+    raise AssertionError("warm-up did not finish")
+
+
+def test_readiness_reports_warmup(memory_backend):
+    """Test que el chequeo de readiness devuelve 200 cuando termina el warm-up."""
+    with TestClient(app) as client:
+        assert client.get("/health-check").status_code == 200
+        response = wait_until_ready(client)
+
+        assert response.text == "OK"
+        assert warmup_state.errors == []
+        assert warmup_state.duration_s is not None
+
+    assert not warmup_state.ready
+
+
+def test_readiness_is_503_before_warmup(memory_backend):
+    """Test que el chequeo de readiness devuelve 503 mientras no haya warm-up."""
+    warmup_state.finished = False
+    client = TestClient(app)
+
+    assert client.get("/health-check?ready=true").status_code == 503
+    assert client.get("/health-check").status_code == 200
+
+
+@pytest.mark.parametrize("rollups_enabled, scans", [("false", 0), ("true", 1)])
+def test_warmup_scans_the_flights_only_for_rollups(
+    memory_backend, monkeypatch, rollups_enabled, scans
+):
+    """Test que el warm-up sólo recorre la tabla de vuelos si los rollups están activos."""
+    flights, _ = memory_backend
+    calls = []
+    iter_flights = flights.iter_flights
+    monkeypatch.setattr(
+        flights,
+        "iter_flights",
+        lambda *args, **kwargs: calls.append(1) or iter_flights(*args, **kwargs),
+    )
+    monkeypatch.setenv("ROLLUPS_ENABLED", rollups_enabled)
+    get_settings.cache_clear()
+
+    with TestClient(app) as client:
+        wait_until_ready(client)
+
+    assert warmup_state.errors == []
+    assert len(calls) == scans
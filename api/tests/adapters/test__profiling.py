@@ -0,0 +1,145 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from api.index import app
+from api.utils.env_manager import get_settings
+from api.utils.profiling import (
+    RequestProfile,
+    StackSampler,
+    activate,
+    bind_to_request,
+    current_profile,
+    deactivate,
+    phase,
+)
+
+
+def test_phases_exclude_the_time_of_nested_phases():
+    """Test que cada fase descuenta el tiempo de las fases anidadas, también en otros hilos."""
+    profile = RequestProfile("p1", "GET", "/flights/1")
+    token = activate(profile)
+    try:
+        with phase("backend"):
+            time.sleep(0.02)
+            with ThreadPoolExecutor(1) as executor:
+                executor.submit(
+                    bind_to_request(lambda: _sleep_in_phase("decode", 0.03))
+                ).result()
+    finally:
+        deactivate(token)
+
+    assert 0.03 <= profile.phases["decode"] < 0.05
+    assert 0.02 <= profile.phases["backend"] < 0.03
+    assert profile.server_timing().startswith("backend;dur=")
+    assert current_profile() is None
+
+
+def test_helpers_do_nothing_outside_a_profiled_request():
+    """Test que fuera de una petición perfilada las utilidades no hacen nada."""
+    function = lambda: 1
+
+    assert bind_to_request(function) is function
+    with phase("backend"):
+        assert current_profile() is None
+
+
+def test_bound_function_can_run_concurrently():
+    """Test que una función ligada a la petición puede ejecutarse varias veces a la vez (lecturas cubiertas)."""
+    profile = RequestProfile("p3", "GET", "/flights/1")
+    barrier = threading.Barrier(2, timeout=1)
+    token = activate(profile)
+    try:
+        bound = bind_to_request(
+            lambda: barrier.wait() is not None and current_profile()
+        )
+        with ThreadPoolExecutor(2) as executor:
+            results = [
+                future.result()
+                for future in [executor.submit(bound), executor.submit(bound)]
+            ]
+    finally:
+        deactivate(token)
+
+    assert results == [profile, profile]
+
+
+def test_sampler_records_the_threads_working_for_the_request():
+    """Test que el muestreador registra las pilas de los hilos que trabajan para la petición."""
+    profile = RequestProfile("p2", "GET", "/flights/1", sample=True)
+    sampler = StackSampler(interval_s=0.001)
+    token = activate(profile)
+    sampler.attach(profile)
+    try:
+        worker = threading.Thread(target=bind_to_request(lambda: _busy(0.05)))
+        worker.start()
+        worker.join()
+    finally:
+        sampler.detach(profile)
+        deactivate(token)
+
+    assert profile.samples > 0
+    assert "test__profiling:_busy" in profile.folded()
+
+
+def test_profiled_request_returns_server_timing_and_stores_the_profile(
+    memory_backend, monkeypatch
+):
+    """Test que una petición con el token devuelve Server-Timing y guarda su perfil."""
+    monkeypatch.setenv("PROFILING_TOKEN", "secret")
+    get_settings.cache_clear()
+    client = TestClient(app)
+    assert (
+        client.post(
+            "/flights", json={"fr24_id": "abc123", "flight": "IB3456"}
+        ).status_code
+        == 201
+    )
+    flight_id = 1
+
+    plain = client.get(f"/flights/{flight_id}", headers={"X-Profile": "wrong"})
+    profiled = client.get(f"/flights/{flight_id}", headers={"X-Profile": "secret"})
+
+    assert plain.status_code == profiled.status_code == 200
+    assert "server-timing" not in plain.headers
+    timings = dict(
+        entry.split(";dur=") for entry in profiled.headers["server-timing"].split(", ")
+    )
+    assert {"validate", "serialize", "total"} <= set(timings)
+    profile_id = profiled.headers["x-profile-id"]
+
+    assert client.get("/debug/profiles").status_code == 404
+    listed = client.get("/debug/profiles", headers={"X-Profile": "secret"}).json()
+    assert [profile["id"] for profile in listed] == [profile_id]
+    assert listed[0]["path"] == f"/flights/{flight_id}"
+    folded = client.get(
+        f"/debug/profiles/{profile_id}", headers={"X-Profile": "secret"}
+    )
+    assert folded.status_code == 200
+    assert folded.headers["content-type"].startswith("text/plain")
+
+
+def test_server_timing_can_be_sent_with_every_response(memory_backend, monkeypatch):
+    """Test que con SERVER_TIMING_ENABLED todas las respuestas llevan Server-Timing sin perfil."""
+    monkeypatch.setenv("SERVER_TIMING_ENABLED", "true")
+    get_settings.cache_clear()
+    client = TestClient(app)
+
+    response = client.get("/flights")
+
+    assert response.status_code == 200
+    assert "total;dur=" in response.headers["server-timing"]
+    assert "x-profile-id" not in response.headers
+
+
+def _sleep_in_phase(name, seconds):
+    with phase(name):
+        time.sleep(seconds)
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
@@ -1,3 +1,4 @@
+from .fixtures.app_fixtures import *
 from .fixtures.flight_fixtures import *
 from .fixtures.routes_fixtures import *
 from .fixtures.supabase_fixtures import *
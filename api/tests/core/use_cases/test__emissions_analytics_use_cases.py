@@ -0,0 +1,182 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+
+import pytest
+
+from api.adapters.repositories.memory.flight_repository import InMemoryFlightRepository
+from api.core.domain.flight import (
+    DetailedCalculation,
+    EmissionComparison,
+    Flight,
+    StatisticalSimulation,
+)
+from api.core.use_cases.emissions_analytics_use_cases import EmissionsAnalyticsUseCase
+
+
+def make_flight(
+    fr24_id, departure, origin, destination, fuel, simulated_fuel, model="A320"
+):
+    return Flight(
+        fr24_id=fr24_id,
+        aircraft_model=model,
+        departure_icao=origin,
+        arrival_icao=destination,
+        departure_time_utc=departure,
+        emission_comparison=EmissionComparison(
+            detailed_calculation=DetailedCalculation(
+                total_fuel_kg=fuel,
+                co2_total_kg=fuel * 3.16,
+                co2_per_passenger_kg=fuel / 100,
+                efficiency_kg_pax_km=0.02,
+            ),
+            statistical_simulation=StatisticalSimulation(total_fuel_kg=simulated_fuel),
+        ),
+    )
+
+
+@pytest.fixture
+def analytics_flights():
+    """Fixture con vuelos repartidos en dos semanas y dos rutas."""
+    return InMemoryFlightRepository(
+        [
+            make_flight(
+                "a",
+                datetime(2025, 1, 6, 8, tzinfo=timezone.utc),
+                "LEMD",
+                "EGLL",
+                1000.0,
+                1100.0,
+            ),
+            make_flight(
+                "b",
+                datetime(2025, 1, 7, 9, tzinfo=timezone.utc),
+                "LEMD",
+                "EGLL",
+                3000.0,
+                3200.0,
+            ),
+            make_flight(
+                "c",
+                datetime(2025, 1, 7, 23, tzinfo=timezone.utc),
+                "egll",
+                "KJFK",
+                2000.0,
+                1900.0,
+                "B77W",
+            ),
+            make_flight(
+                "d",
+                datetime(2025, 1, 14, tzinfo=timezone.utc),
+                "LEMD",
+                None,
+                500.0,
+                500.0,
+            ),
+            Flight(fr24_id="no-departure", departure_icao="LEMD"),
+        ]
+    )
+
+
+def test_daily_totals(analytics_flights):
+    """Test que los totales diarios agregan combustible, CO2 y medias."""
+    use_case = EmissionsAnalyticsUseCase(flight_port=analytics_flights)
+
+    rows = use_case.get_emissions(bucket="day")
+
+    assert [row["bucket_start"] for row in rows] == [
+        "2025-01-06",
+        "2025-01-07",
+        "2025-01-14",
+    ]
+    second_day = rows[1]
+    assert second_day["group"] is None
+    assert second_day["flights"] == 2
+    assert second_day["total_fuel_kg"] == pytest.approx(5000.0)
+    assert second_day["total_co2_kg"] == pytest.approx(5000.0 * 3.16)
+    assert second_day["avg_co2_per_passenger_kg"] == pytest.approx(25.0)
+    assert second_day["avg_efficiency_kg_pax_km"] == pytest.approx(0.02)
+    assert second_day["total_fuel_saving_kg"] == pytest.approx(100.0)
+
+
+def test_weekly_totals_by_route(analytics_flights):
+    """Test que las semanas empiezan en lunes y las rutas usan códigos en mayúsculas."""
+    use_case = EmissionsAnalyticsUseCase(flight_port=analytics_flights)
+
+    rows = use_case.get_emissions(bucket="week", group_by="route")
+
+    assert [(row["bucket_start"], row["group"], row["flights"]) for row in rows] == [
+        ("2025-01-06", "EGLL-KJFK", 1),
+        ("2025-01-06", "LEMD-EGLL", 2),
+        ("2025-01-13", None, 1),
+    ]
+
+
+def test_statistical_source_and_date_range(analytics_flights):
+    """Test del cálculo estadístico filtrado por fechas (sin CO2 total disponible)."""
+    use_case = EmissionsAnalyticsUseCase(flight_port=analytics_flights)
+
+    rows = use_case.get_emissions(
+        bucket="month",
+        group_by="aircraft_model",
+        source="statistical",
+        start_date=date(2025, 1, 7),
+        end_date=date(2025, 1, 7),
+    )
+
+    assert [(row["group"], row["total_fuel_kg"]) for row in rows] == [
+        ("A320", 3200.0),
+        ("B77W", 1900.0),
+    ]
+    assert rows[0]["bucket_start"] == "2025-01-01"
+    assert rows[0]["total_co2_kg"] is None
+
+
+def test_results_are_cached_until_refresh(analytics_flights):
+    """Test que el resultado se cachea y la instantánea se reconstruye con refresh."""
+    use_case = EmissionsAnalyticsUseCase(flight_port=analytics_flights)
+    first = use_case.get_emissions(bucket="month")
+
+    analytics_flights.add(
+        make_flight(
+            "e", datetime(2025, 1, 20, tzinfo=timezone.utc), "LEMD", "EGLL", 10.0, 10.0
+        )
+    )
+    assert use_case.get_emissions(bucket="month") is first
+
+    use_case.refresh()
+    assert use_case.get_emissions(bucket="month")[0]["flights"] == 5
+
+
+def test_concurrent_first_requests_share_one_scan(analytics_flights, monkeypatch):
+    """Test que las primeras peticiones concurrentes comparten una sola lectura completa."""
+    scans = []
+    iter_flights = analytics_flights.iter_flights
+
+    def slow_iter_flights(*args, **kwargs):
+        scans.append(1)
+        time.sleep(0.05)
+        return iter_flights(*args, **kwargs)
+
+    monkeypatch.setattr(analytics_flights, "iter_flights", slow_iter_flights)
+    use_case = EmissionsAnalyticsUseCase(flight_port=analytics_flights)
+    barrier = threading.Barrier(8)
+
+    def request(_):
+        barrier.wait()
+        return use_case.get_emissions(bucket="month")
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(request, range(8)))
+
+    assert len(scans) == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_unknown_group_raises(analytics_flights):
+    """Test que una agrupación desconocida lanza ValueError."""
+    use_case = EmissionsAnalyticsUseCase(flight_port=analytics_flights)
+
+    with pytest.raises(ValueError):
+        use_case.get_emissions(group_by="airline")
@@ -0,0 +1,137 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.core.domain.flight import Flight
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.track_encoding import encode_polyline, simplify_track
+from api.core.exceptions.flights_exceptions import FlightNotFoundError
+from api.core.ports.flight_port import FlightPort
+from api.core.ports.flight_position_port import FlightPositionPort
+from api.core.use_cases.flight_detail_use_cases import FlightDetailUseCase
+
+START = datetime(2025, 3, 10, 8, 0)
+
+
+def straight_track(flight_id, points=10):
+    """Track en línea recta hacia el este, un punto por minuto a altitud constante."""
+    return [
+        FlightPosition(
+            flight_id=flight_id,
+            timestamp=START + timedelta(minutes=minute),
+            latitude=40.0,
+            longitude=-3.0 + minute * 0.1,
+            altitude=36000,
+        )
+        for minute in range(points)
+    ]
+
+
+@pytest.fixture
+def detail_setup():
+    """Fixture con puertos simulados y el caso de uso con su propio executor."""
+    flight_port = MagicMock(spec=FlightPort)
+    position_port = MagicMock(spec=FlightPositionPort)
+    use_case = FlightDetailUseCase(
+        flight_port, position_port, ThreadPoolExecutor(max_workers=2)
+    )
+    return flight_port, position_port, use_case
+
+
+def test_flight_and_track_are_read_concurrently(detail_setup):
+    """Test que el vuelo y su track se leen a la vez y el track sale ordenado."""
+    flight_port, position_port, use_case = detail_setup
+    both_running = threading.Barrier(2, timeout=2)
+    track = straight_track(1, points=3)
+
+    def read_flight(flight_id):
+        both_running.wait()
+        return Flight(flight_id=flight_id, fr24_id="abc")
+
+    def read_track(flight_id):
+        both_running.wait()
+        return list(reversed(track))
+
+    flight_port.get_by_id.side_effect = read_flight
+    position_port.get_positions_by_flight_id.side_effect = read_track
+
+    flight, positions = use_case.get_flight_with_track(1)
+
+    assert flight.fr24_id == "abc"
+    assert positions == track
+
+
+def test_missing_flight_raises_without_waiting_for_the_track(detail_setup):
+    """Test que un vuelo inexistente lanza FlightNotFoundError sin esperar al track."""
+    flight_port, position_port, use_case = detail_setup
+    release = threading.Event()
+    flight_port.get_by_id.return_value = None
+    position_port.get_positions_by_flight_id.side_effect = (
+        lambda flight_id: release.wait(5) and []
+    )
+
+    started = time.monotonic()
+    with pytest.raises(FlightNotFoundError):
+        use_case.get_flight_detail(99, include_positions=True)
+    release.set()
+
+    assert time.monotonic() - started < 1.0
+
+
+def test_flight_detail_without_positions_skips_the_track(detail_setup):
+    """Test que sin include_positions no se consulta el track."""
+    flight_port, position_port, use_case = detail_setup
+    flight_port.get_by_id.return_value = Flight(flight_id=1, fr24_id="abc")
+
+    detail = use_case.get_flight_detail(1)
+
+    assert detail["fr24_id"] == "abc"
+    assert "positions" not in detail
+    position_port.get_positions_by_flight_id.assert_not_called()
+
+
+def test_simplified_and_polyline_tracks(detail_setup):
+    """Test que el track simplificado conserva los extremos y el giro, y el polyline lo codifica."""
+    flight_port, position_port, use_case = detail_setup
+    track = straight_track(1)
+    turn = [
+        FlightPosition(
+            1,
+            START + timedelta(minutes=10 + minute),
+            40.0 + (minute + 1) * 0.1,
+            -2.1,
+            36000,
+        )
+        for minute in range(5)
+    ]
+    flight_port.get_by_id.return_value = Flight(flight_id=1, fr24_id="abc")
+    position_port.get_positions_by_flight_id.return_value = track + turn
+
+    simplified = use_case.get_flight_detail(
+        1, include_positions=True, track="simplified"
+    )
+    polyline = use_case.get_flight_detail(1, include_positions=True, track="polyline")
+
+    assert [p["longitude"] for p in simplified["positions"]] == pytest.approx(
+        [-3.0, -2.1, -2.1]
+    )
+    assert [p["latitude"] for p in simplified["positions"]] == pytest.approx(
+        [40.0, 40.0, 40.5]
+    )
+    assert polyline["track"]["points"] == 3
+    assert polyline["track"]["encoded"] == encode_polyline(
+        simplify_track(track + turn, 50.0)
+    )
+    assert "positions" not in polyline
+
+
+def test_encode_polyline_matches_the_reference_encoding():
+    """Test que el polyline coincide con el ejemplo de referencia del algoritmo."""
+    points = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    positions = [FlightPosition(1, START, lat, lon) for lat, lon in points]
+
+    assert encode_polyline(positions) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
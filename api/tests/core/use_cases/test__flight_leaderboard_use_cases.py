@@ -0,0 +1,126 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from api.adapters.repositories.memory.flight_repository import InMemoryFlightRepository
+from api.core.domain.flight import (
+    DetailedCalculation,
+    EmissionComparison,
+    Flight,
+    StatisticalSimulation,
+)
+from api.core.domain.flight_rollups import FlightRollups
+from api.core.exceptions.flights_exceptions import RollupsNotReadyError
+from api.core.use_cases.flight_leaderboard_use_cases import FlightLeaderboardUseCase
+from api.core.use_cases.flight_rollup_use_cases import RollupSnapshot
+
+
+def make_flight(fr24_id, route, model, day, efficiency, simulated_efficiency):
+    origin, destination = route.split("-")
+    return Flight(
+        fr24_id=fr24_id,
+        aircraft_model=model,
+        departure_icao=origin,
+        arrival_icao=destination,
+        departure_time_utc=datetime(2025, 1, day, 12, tzinfo=timezone.utc),
+        emission_comparison=EmissionComparison(
+            detailed_calculation=DetailedCalculation(efficiency_kg_pax_km=efficiency),
+            statistical_simulation=StatisticalSimulation(
+                efficiency_kg_pax_km=simulated_efficiency
+            ),
+        ),
+    )
+
+
+@pytest.fixture
+def leaderboard_rollups():
+    """Fixture con rollups construidos a partir de vuelos de tres rutas."""
+    rollups = FlightRollups()
+    rollups.replace_with(
+        FlightRollups(
+            [
+                make_flight("a", "LEMD-EGLL", "A320", 1, 0.030, 0.035),
+                make_flight("b", "LEMD-EGLL", "A320", 2, 0.034, 0.035),
+                make_flight("c", "EGLL-KJFK", "B77W", 1, 0.025, 0.024),
+                make_flight("d", "EGLL-KJFK", "B77W", 9, 0.027, 0.030),
+                make_flight("e", "LEMD-LFPG", "A320", 9, 0.050, 0.040),
+            ]
+        )
+    )
+    return rollups
+
+
+def test_routes_ranked_by_efficiency(leaderboard_rollups):
+    """Test que las rutas se ordenan por eficiencia media (menor es mejor)."""
+    use_case = FlightLeaderboardUseCase(rollups=leaderboard_rollups)
+
+    best = use_case.get_leaderboard("route", limit=2)
+    worst = use_case.get_leaderboard("route", order="worst", limit=1)
+
+    assert [(entry["rank"], entry["key"]) for entry in best] == [
+        (1, "EGLL-KJFK"),
+        (2, "LEMD-EGLL"),
+    ]
+    assert best[0]["value"] == pytest.approx(0.026)
+    assert best[0]["samples"] == 2
+    assert worst[0]["key"] == "LEMD-LFPG"
+
+
+def test_min_samples_and_date_range(leaderboard_rollups):
+    """Test que se aplican el mínimo de muestras y el rango de fechas."""
+    use_case = FlightLeaderboardUseCase(rollups=leaderboard_rollups)
+
+    assert [
+        entry["key"] for entry in use_case.get_leaderboard("route", min_samples=2)
+    ] == [
+        "EGLL-KJFK",
+        "LEMD-EGLL",
+    ]
+    ranked = use_case.get_leaderboard(
+        "aircraft_model", start_date=date(2025, 1, 1), end_date=date(2025, 1, 2)
+    )
+    assert [(entry["key"], entry["flights"]) for entry in ranked] == [
+        ("B77W", 1),
+        ("A320", 2),
+    ]
+
+
+def test_ranked_by_saving_and_updated_incrementally(leaderboard_rollups):
+    """Test del ranking por ahorro frente a la simulación tras una nueva ingesta."""
+    use_case = FlightLeaderboardUseCase(rollups=leaderboard_rollups)
+    assert (
+        use_case.get_leaderboard("route", metric="efficiency_saving", limit=1)[0]["key"]
+        == "LEMD-EGLL"
+    )
+
+    leaderboard_rollups.record(make_flight("f", "EGLL-KJFK", "B77W", 10, 0.020, 0.040))
+
+    top = use_case.get_leaderboard("route", metric="efficiency_saving", limit=1)[0]
+    assert top["key"] == "EGLL-KJFK"
+    assert top["value"] == pytest.approx((-0.001 + 0.003 + 0.020) / 3)
+
+
+def test_not_ready_rollups_raise():
+    """Test que sin rollups construidos se lanza RollupsNotReadyError."""
+    with pytest.raises(RollupsNotReadyError):
+        FlightLeaderboardUseCase(rollups=FlightRollups()).get_leaderboard("route")
+    with pytest.raises(RollupsNotReadyError):
+        FlightLeaderboardUseCase(rollups=None).get_leaderboard("route")
+
+
+def test_ranked_from_the_snapshot_without_rollups():
+    """Test que sin rollups el ranking se calcula sobre la instantánea del repositorio."""
+    repository = InMemoryFlightRepository(
+        [
+            make_flight("a", "LEMD-EGLL", "A320", 1, 0.030, 0.035),
+            make_flight("c", "EGLL-KJFK", "B77W", 1, 0.025, 0.024),
+        ]
+    )
+    use_case = FlightLeaderboardUseCase(
+        rollups=None, snapshot=RollupSnapshot(flight_port=repository)
+    )
+
+    assert [entry["key"] for entry in use_case.get_leaderboard("route")] == [
+        "EGLL-KJFK",
+        "LEMD-EGLL",
+    ]
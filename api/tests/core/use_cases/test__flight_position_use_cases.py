@@ -1,14 +1,30 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.adapters.brokers.memory_broker import InMemoryPositionBroker
+from api.adapters.dtos.filter_dtos import AreaQueryFilters
+from api.adapters.repositories.deduplicating.flight_position_repository import (
+    DeduplicatingFlightPositionRepository,
+)
+from api.adapters.repositories.memory.flight_position_repository import (
+    InMemoryFlightPositionRepository,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.geo import BoundingBox, Circle
 from api.core.use_cases.flight_position_use_cases import FlightPositionUseCase
 
 
 def test_add_positions_to_flight_success(position_port_mock, sample_positions):
     """Test adding flight positions successfully."""
-    position_port_mock.add_positions.return_value = True
+    position_port_mock.add_new_positions.return_value = sample_positions
     use_case = FlightPositionUseCase(position_port=position_port_mock)
 
     result = use_case.add_positions_to_flight(1, sample_positions)
 
-    position_port_mock.add_positions.assert_called_once_with(1, sample_positions)
+    position_port_mock.add_new_positions.assert_called_once_with(1, sample_positions)
     assert result is True
 
 
@@ -21,3 +37,102 @@ def test_get_positions_for_flight(position_port_mock, sample_positions):
 
     position_port_mock.get_positions_by_flight_id.assert_called_once_with(1)
     assert result == sample_positions
+
+
+def test_find_flights_in_area(position_port_mock):
+    """Test finding the flights that crossed an area, and rejecting an empty time window."""
+    position_port_mock.find_flights_in_area.return_value = []
+    use_case = FlightPositionUseCase(position_port=position_port_mock)
+    area = Circle(latitude=40.47, longitude=-3.56, radius_km=25.0)
+    start = datetime(2025, 3, 10, tzinfo=timezone.utc)
+    end = datetime(2025, 3, 11)
+
+    assert use_case.find_flights_in_area(area, start, end) == []
+    position_port_mock.find_flights_in_area.assert_called_once_with(area, start, end)
+    with pytest.raises(ValueError):
+        use_case.find_flights_in_area(area, end, start)
+
+
+def test_area_query_filters_build_box_or_circle():
+    """Test that the area filters accept a full bounding box or a full circle, but not both."""
+    box = AreaQueryFilters(
+        min_lat=40.0, min_lon=170.0, max_lat=41.0, max_lon=-170.0
+    ).to_area()
+    assert box == BoundingBox(40.0, 170.0, 41.0, -170.0)
+    assert box.contains(40.5, 179.9) and not box.contains(40.5, 0.0)
+    assert AreaQueryFilters(lat=40.0, lon=-3.0, radius_km=5.0).to_area() == Circle(
+        40.0, -3.0, 5.0
+    )
+    with pytest.raises(ValueError):
+        AreaQueryFilters(lat=40.0, lon=-3.0).to_area()
+    with pytest.raises(ValueError):
+        AreaQueryFilters(
+            min_lat=40.0,
+            min_lon=0.0,
+            max_lat=41.0,
+            max_lon=1.0,
+            radius_km=5.0,
+            lat=40.0,
+            lon=0.0,
+        ).to_area()
+
+
+def test_stream_resumes_from_last_seen_and_skips_replayed_positions():
+    """Test that a stream replays stored positions after `since`, then only newer live ones."""
+    broker = InMemoryPositionBroker()
+    use_case = FlightPositionUseCase(InMemoryFlightPositionRepository(), broker=broker)
+    start = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+    def at(*seconds):
+        return [
+            FlightPosition(
+                flight_id=7,
+                timestamp=start + timedelta(seconds=s),
+                latitude=1.0,
+                longitude=2.0,
+            )
+            for s in seconds
+        ]
+
+    use_case.add_positions_to_flight(7, at(0, 10))
+    stream = use_case.open_stream(7, since=start)
+    # Published between the subscription and the client's first read: 10 was replayed already.
+    broker.publish(7, at(10))
+    use_case.add_positions_to_flight(7, at(20))
+
+    live, dropped = asyncio.run(stream.next_batch(1.0))
+    assert [event.timestamp.second for event in stream.backfill] == [10]
+    assert [event.timestamp.second for event in live] == [20]
+    assert dropped == 0
+
+    use_case.close_stream(stream)
+    assert broker.subscriber_count(7) == 0
+
+
+def test_only_stored_positions_are_published():
+    """Test que las posiciones duplicadas descartadas no se publican a los suscriptores."""
+    broker = MagicMock()
+    use_case = FlightPositionUseCase(
+        position_port=DeduplicatingFlightPositionRepository(
+            InMemoryFlightPositionRepository(), window_s=60
+        ),
+        broker=broker,
+    )
+    start = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+    def at(*seconds):
+        return [
+            FlightPosition(7, start + timedelta(seconds=s), 1.0, 2.0) for s in seconds
+        ]
+
+    assert use_case.add_positions_to_flight(7, at(0, 10))
+    assert use_case.add_positions_to_flight(7, at(10, 20, 90))
+    # Outside the 60 s window: forwarded, then skipped by the backend.
+    assert use_case.add_positions_to_flight(7, at(0, 20))
+    assert use_case.add_positions_to_flight(7, at(100))
+
+    published = [
+        [int((p.timestamp - start).total_seconds()) for p in call.args[1]]
+        for call in broker.publish.call_args_list
+    ]
+    assert published == [[0, 10], [20, 90], [100]]
@@ -0,0 +1,224 @@
+import pytest
+
+from api.adapters.repositories.memory.flight_repository import InMemoryFlightRepository
+from api.core.domain.flight import (
+    DetailedCalculation,
+    EmissionComparison,
+    Flight,
+    StatisticalSimulation,
+)
+from api.core.domain.flight_rollups import FlightRollups
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.core.use_cases.flight_rollup_use_cases import (
+    ROLLUP_DRIFT,
+    FlightRollupUseCase,
+    RollupSnapshot,
+)
+from api.core.use_cases.flight_summary_use_cases import GetFlightSummaryUseCase
+from api.core.use_cases.flight_use_cases import FlightUseCase
+
+
+def make_flight(
+    fr24_id, origin, destination, distance, fuel, simulated_fuel, model="A320"
+):
+    return Flight(
+        fr24_id=fr24_id,
+        aircraft_model=model,
+        departure_icao=origin,
+        arrival_icao=destination,
+        distance_calculated_km=distance,
+        emission_comparison=EmissionComparison(
+            detailed_calculation=DetailedCalculation(
+                total_fuel_kg=fuel, co2_per_passenger_kg=10.0
+            ),
+            statistical_simulation=StatisticalSimulation(
+                total_fuel_kg=simulated_fuel, co2_per_passenger_kg=12.0
+            ),
+        ),
+    )
+
+
+@pytest.fixture
+def rollup_setup():
+    """Fixture con el repositorio en memoria, los rollups y los casos de uso."""
+    repository = InMemoryFlightRepository()
+    rollups = FlightRollups()
+    rollup_service = FlightRollupUseCase(flight_port=repository, rollups=rollups)
+    rollup_service.rebuild()
+    return (
+        repository,
+        rollup_service,
+        FlightUseCase(flight_port=repository, rollups=rollups),
+        GetFlightSummaryUseCase(flight_port=repository, rollups=rollups),
+    )
+
+
+def test_adds_update_summary_and_groups(rollup_setup):
+    """Test que cada alta actualiza el resumen global y el de cada grupo."""
+    _, _, flight_service, summary_service = rollup_setup
+
+    flight_service.add_new_flight(
+        make_flight("a", "LEMD", "EGLL", 1000.0, 900.0, 1000.0)
+    )
+    flight_service.add_new_flight(
+        make_flight("b", "egll", "KJFK", 3000.0, 1800.0, 2000.0, "B77W")
+    )
+
+    summary = summary_service.execute()
+    assert summary.total_flights == 2
+    assert summary.avg_distance == pytest.approx(2000.0)
+    assert summary.total_fuel_saving == pytest.approx(300.0)
+    assert summary.total_co2_saving == pytest.approx(4.0)
+
+    by_airport = summary_service.execute_breakdown("airport")
+    assert sorted(by_airport) == ["EGLL", "KJFK", "LEMD"]
+    assert by_airport["EGLL"].total_flights == 2
+    assert summary_service.execute_breakdown("route")[
+        "LEMD-EGLL"
+    ].total_fuel_saving == pytest.approx(100.0)
+
+
+def test_upsert_replaces_previous_contribution(rollup_setup):
+    """Test que un upsert resta la versión anterior del vuelo y suma la nueva."""
+    _, _, flight_service, summary_service = rollup_setup
+    flight_service.add_new_flight(
+        make_flight("a", "LEMD", "EGLL", 1000.0, 900.0, 1000.0)
+    )
+
+    flight_service.upsert_flight(
+        make_flight("a", "LEMD", "LFPG", 1050.0, 950.0, 1200.0)
+    )
+
+    summary = summary_service.execute()
+    assert summary.total_flights == 1
+    assert summary.avg_distance == pytest.approx(1050.0)
+    assert summary.total_fuel_saving == pytest.approx(250.0)
+    routes = summary_service.execute_breakdown("route")
+    assert list(routes) == ["LEMD-LFPG"]
+
+
+def test_reconcile_rebuilds_after_drift(rollup_setup):
+    """Test que la reconciliación detecta escrituras que no pasaron por los rollups."""
+    repository, rollup_service, flight_service, summary_service = rollup_setup
+    flight_service.add_new_flight(
+        make_flight("a", "LEMD", "EGLL", 1000.0, 900.0, 1000.0)
+    )
+    repository.add(make_flight("b", "EGLL", "KJFK", 3000.0, 1800.0, 2000.0))
+
+    assert rollup_service.reconcile() == {
+        "drift": {
+            "total_flights": -1.0,
+            "avg_distance": -1000.0,
+            "total_fuel_saving": -200.0,
+            "total_co2_saving": -2.0,
+        },
+        "rebuilt": True,
+    }
+    assert summary_service.execute().total_flights == 2
+    assert rollup_service.reconcile() == {"drift": {}, "rebuilt": False}
+
+
+def test_summary_falls_back_to_port_until_ready():
+    """Test que el resumen usa el puerto mientras los rollups no están construidos."""
+    repository = InMemoryFlightRepository(
+        [make_flight("a", "LEMD", "EGLL", 1000.0, 900.0, 1000.0)]
+    )
+    summary_service = GetFlightSummaryUseCase(
+        flight_port=repository, rollups=FlightRollups()
+    )
+
+    assert summary_service.execute().total_flights == 1
+    assert (
+        summary_service.execute_breakdown("aircraft_model")["A320"].total_flights == 1
+    )
+
+
+def test_breakdown_without_rollups_reuses_the_snapshot(monkeypatch):
+    """Test que sin rollups las agregaciones por grupo reutilizan un único recorrido completo."""
+    repository = InMemoryFlightRepository(
+        [make_flight("a", "LEMD", "EGLL", 1000.0, 900.0, 1000.0)]
+    )
+    scans = []
+    iter_flights = repository.iter_flights
+    monkeypatch.setattr(
+        repository, "iter_flights", lambda: scans.append(1) or iter_flights()
+    )
+    summary_service = GetFlightSummaryUseCase(flight_port=repository)
+
+    for _ in range(3):
+        assert (
+            summary_service.execute_breakdown("route")["LEMD-EGLL"].total_flights == 1
+        )
+    assert len(scans) == 1
+
+    repository.add(make_flight("b", "LEMD", "EGLL", 1000.0, 900.0, 1000.0))
+    summary_service.snapshot.refresh()
+    assert summary_service.execute_breakdown("route")["LEMD-EGLL"].total_flights == 2
+
+
+def test_snapshot_serves_live_rollups_once_ready(rollup_setup):
+    """Test que la instantánea sirve los rollups en vivo cuando están construidos."""
+    repository, rollup_service, _, _ = rollup_setup
+
+    snapshot = RollupSnapshot(flight_port=repository, rollups=rollup_service.rollups)
+
+    assert snapshot.current() is rollup_service.rollups
+    assert not snapshot.snapshot.ready
+
+
+def test_failed_scan_keeps_the_previous_rollups(rollup_setup, monkeypatch):
+    """Test que un recorrido completo que falla no sustituye los rollups por totales parciales."""
+    repository, rollup_service, flight_service, summary_service = rollup_setup
+    flight_service.add_new_flight(
+        make_flight("a", "LEMD", "EGLL", 1000.0, 900.0, 1000.0)
+    )
+    flight_service.add_new_flight(
+        make_flight("b", "EGLL", "KJFK", 3000.0, 1800.0, 2000.0)
+    )
+
+    def failing_scan(batch_size=1000, after_id=0):
+        yield repository.find_all(limit=1)
+        raise BackendUnavailableError("connection lost")
+
+    monkeypatch.setattr(repository, "iter_flights", failing_scan)
+    with pytest.raises(BackendUnavailableError):
+        rollup_service.rebuild()
+
+    assert summary_service.execute().total_flights == 2
+
+
+def test_reconcile_is_skipped_without_the_aggregate(rollup_setup, monkeypatch):
+    """Test que sin el agregado de referencia no se compara ni se reconstruye."""
+    repository, rollup_service, flight_service, _ = rollup_setup
+    flight_service.add_new_flight(
+        make_flight("a", "LEMD", "EGLL", 1000.0, 900.0, 1000.0)
+    )
+    monkeypatch.setattr(repository, "get_summary_metrics", lambda: None)
+    monkeypatch.setattr(
+        rollup_service, "rebuild", lambda flights=None: pytest.fail("rebuilt")
+    )
+
+    assert rollup_service.reconcile() == {"drift": {}, "rebuilt": False}
+
+
+def test_drift_a_rebuild_does_not_remove_is_only_reported(rollup_setup, monkeypatch):
+    """Test que si la deriva persiste tras reconstruir, solo se informa en las siguientes pasadas."""
+    repository, rollup_service, flight_service, _ = rollup_setup
+    flight_service.add_new_flight(
+        make_flight("a", "LEMD", "EGLL", 1000.0, 900.0, 1000.0)
+    )
+    different = {
+        "total_flights": 1,
+        "avg_distance": 1000.0,
+        "total_fuel_saving": 90.0,
+        "total_co2_saving": 2.0,
+    }
+    monkeypatch.setattr(repository, "get_summary_metrics", lambda: different)
+
+    assert rollup_service.reconcile()["rebuilt"] is True
+    assert rollup_service.persistent_drift == {"total_fuel_saving": 10.0}
+    assert rollup_service.reconcile() == {
+        "drift": {"total_fuel_saving": 10.0},
+        "rebuilt": False,
+    }
+    assert ROLLUP_DRIFT.value(metric="total_fuel_saving") == 10.0
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from api.adapters.repositories.memory.flight_position_repository import (
+    InMemoryFlightPositionRepository,
+)
+from api.adapters.repositories.memory.flight_repository import InMemoryFlightRepository
+from api.core.domain.flight import Flight
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.flight_rollups import FlightRollups
+from api.core.domain.geo import haversine_km
+from api.core.domain.track_analytics import (
+    CLIMB,
+    CRUISE,
+    analyze_track,
+    classify_phases,
+)
+from api.core.exceptions.flights_exceptions import (
+    FlightNotFoundError,
+    TrackNotAvailableError,
+)
+from api.core.use_cases.track_analytics_use_cases import TrackAnalyticsUseCase
+
+START = datetime(2025, 3, 10, 8, 0, tzinfo=timezone.utc)
+
+
+def make_track(flight_id):
+    """
+    Track sintético a intervalos de un minuto, en metros y m/s: 2 min en
+    tierra, despegue a 10 m/s hasta 11000 m, 60 min de crucero, descenso a
+    unos 8.3 m/s y 2 min en tierra, avanzando 0.1° de longitud por minuto
+    sobre el ecuador.
+    """
+    altitudes = [0, 0]
+    altitudes += list(range(600, 11000, 600)) + [11000] * 60
+    altitudes += list(range(10500, 0, -500)) + [0, 0]
+    rates = [0] + [(b - a) / 60 for a, b in zip(altitudes, altitudes[1:])]
+    return [
+        FlightPosition(
+            flight_id=flight_id,
+            timestamp=START + timedelta(minutes=minute),
+            latitude=0.0,
+            longitude=round(minute * 0.1, 6),
+            altitude=altitude,
+            vertical_rate=rate,
+        )
+        for minute, (altitude, rate) in enumerate(zip(altitudes, rates))
+    ]
+
+
+@pytest.fixture
+def track_setup():
+    """Fixture con un vuelo y su track en los repositorios en memoria."""
+    flights = InMemoryFlightRepository()
+    positions = InMemoryFlightPositionRepository()
+    flight = flights.add(
+        Flight(fr24_id="abc", departure_icao="LEMD", arrival_icao="EGLL")
+    )
+    track = make_track(flight.flight_id)
+    positions.add_positions(flight.flight_id, list(reversed(track)))
+    rollups = FlightRollups([flight])
+    return flights, positions, rollups, flight, track
+
+
+def test_analyze_flight_derives_distance_times_and_phases(track_setup):
+    """Test que el análisis calcula distancias, horas y fases a partir del track."""
+    flights, positions, _, flight, track = track_setup
+    use_case = TrackAnalyticsUseCase(flight_port=flights, position_port=positions)
+
+    analysis = use_case.analyze_flight(flight.flight_id)
+
+    last = track[-1]
+    assert analysis.points == len(track)
+    assert analysis.distance_calculated_km == pytest.approx(
+        haversine_km(0, 0, 0, last.longitude), rel=1e-6
+    )
+    assert analysis.great_circle_distance_km == pytest.approx(
+        analysis.distance_calculated_km
+    )
+    assert analysis.departure_time_utc == START + timedelta(minutes=2)
+    assert analysis.arrival_time_utc == last.timestamp - timedelta(minutes=1)
+    phases = analysis.phase_durations_s
+    assert analysis.flight_duration_s == sum(
+        [phases.takeoff, phases.climb, phases.cruise, phases.descent, phases.landing]
+    )
+    assert phases.takeoff == 60
+    assert phases.landing == 60
+    # La media móvil de la tasa vertical adelanta o retrasa unos minutos los límites del crucero.
+    assert phases.cruise == pytest.approx(60 * 60, abs=5 * 60)
+    assert phases.climb > 15 * 60 and phases.descent > 19 * 60
+
+
+def test_metric_track_with_missing_vertical_rates():
+    """
+    Test que un track realista en metros y m/s, muestreado cada 10 s y sin tasa
+    vertical en el descenso, se reparte en las fases esperadas: despegue en los
+    primeros 450 m, ascenso a 10 m/s hasta 11000 m, escalón de 600 m a 5 m/s en
+    crucero y descenso a 8 m/s calculado a partir de las altitudes.
+    """
+    segments = [
+        (6, 0.0, True),  # 1 min en tierra
+        (110, 10.0, True),  # ascenso hasta 11000 m
+        (240, 0.0, True),  # 40 min de crucero
+        (12, 5.0, True),  # escalón hasta 11600 m
+        (180, 0.0, True),  # 30 min de crucero
+        (145, -8.0, False),  # descenso sin tasa vertical
+        (6, 0.0, True),  # 1 min en tierra
+    ]
+    altitude, positions = 0.0, []
+    for samples, rate, reported in segments:
+        for _ in range(samples):
+            altitude = max(altitude + rate * 10, 0.0)
+            positions.append(
+                FlightPosition(
+                    flight_id=1,
+                    timestamp=START + timedelta(seconds=10 * len(positions)),
+                    latitude=40.0,
+                    longitude=-3.0 + len(positions) * 0.01,
+                    altitude=altitude,
+                    vertical_rate=rate if reported else None,
+                )
+            )
+
+    phases = analyze_track(1, positions).phase_durations_s
+
+    assert phases.takeoff == pytest.approx(45, abs=10)
+    assert phases.landing == pytest.approx(56, abs=10)
+    # Ascenso de 450 m a 11000 m más el escalón, que la media móvil alarga unos 20 s.
+    assert phases.climb == pytest.approx(1055 + 120, abs=30)
+    assert phases.cruise == pytest.approx(2400 + 1800, abs=60)
+    assert phases.descent == pytest.approx(11600 / 8 - 56, abs=30)
+
+
+def test_level_off_below_cruise_is_not_cruise():
+    """Test que un tramo nivelado durante el ascenso cuenta como ascenso."""
+    altitudes = np.array([1500, 3000, 3000, 3000, 6000, 9000, 9000, 9000], dtype=float)
+    rates = np.array([15, 15, 0, 0, 15, 15, 0, 0], dtype=float)
+
+    phases = classify_phases(altitudes, rates)
+
+    assert list(phases[1:5]) == [CLIMB] * 4
+    assert phases[-1] == CRUISE
+
+
+def test_apply_to_flight_updates_record_and_rollups(track_setup):
+    """Test que aplicar el análisis guarda los campos derivados y actualiza los rollups."""
+    flights, positions, rollups, flight, _ = track_setup
+    use_case = TrackAnalyticsUseCase(
+        flight_port=flights, position_port=positions, rollups=rollups
+    )
+
+    updated = use_case.apply_to_flight(flight.flight_id)
+
+    stored = flights.get_by_id(flight.flight_id)
+    assert stored.distance_calculated_km == updated.distance_calculated_km > 0
+    assert stored.phase_durations_s == updated.phase_durations_s
+    assert stored.departure_icao == "LEMD"
+    assert rollups.summary()["total_flights"] == 1
+    assert rollups.summary()["avg_distance"] == pytest.approx(
+        updated.distance_calculated_km
+    )
+
+
+def test_analyze_flight_errors(track_setup):
+    """Test que se rechazan los vuelos inexistentes y los que no tienen track suficiente."""
+    flights, positions, _, _, _ = track_setup
+    use_case = TrackAnalyticsUseCase(flight_port=flights, position_port=positions)
+    empty = flights.add(Flight(fr24_id="empty"))
+
+    with pytest.raises(FlightNotFoundError):
+        use_case.analyze_flight(999)
+    with pytest.raises(TrackNotAvailableError):
+        use_case.apply_to_flight(empty.flight_id)
@@ -0,0 +1,34 @@
+import pytest
+
+from api.adapters import admission, profiling
+from api.adapters.routes import dependencies
+from api.utils.env_manager import get_settings
+
+
+def reset_wiring():
+    """Drops the cached settings, repositories and use cases."""
+    get_settings.cache_clear()
+    dependencies.get_repositories.cache_clear()
+    dependencies.build_flight_service.cache_clear()
+    dependencies.build_position_service.cache_clear()
+    dependencies.build_summary_service.cache_clear()
+    dependencies.build_analytics_service.cache_clear()
+    dependencies.build_rollup_service.cache_clear()
+    dependencies.build_leaderboard_service.cache_clear()
+    dependencies.build_track_service.cache_clear()
+    dependencies.build_detail_service.cache_clear()
+    dependencies.get_rollups.cache_clear()
+    dependencies.get_rollup_snapshot.cache_clear()
+    dependencies.get_position_broker.cache_clear()
+    admission.get_admission_controller.cache_clear()
+    profiling.get_profile_store.cache_clear()
+
+
+@pytest.fixture
+def memory_backend(monkeypatch):
+    """Fixture that wires the app to a fresh in-memory backend."""
+    monkeypatch.setenv("REPOSITORY_BACKEND", "memory")
+    monkeypatch.setenv("MEMORY_HYDRATE_FROM_SUPABASE", "false")
+    reset_wiring()
+    yield dependencies.get_repositories()
+    reset_wiring()
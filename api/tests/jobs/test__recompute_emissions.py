@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.adapters.repositories.memory.flight_position_repository import (
+    InMemoryFlightPositionRepository,
+)
+from api.adapters.repositories.sqlite.database import SQLiteDatabase
+from api.adapters.repositories.sqlite.flight_repository import SQLiteFlightRepository
+from api.core.domain.flight import (
+    DetailedCalculation,
+    EmissionComparison,
+    Flight,
+    StatisticalSimulation,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.core.exceptions.flights_exceptions import BackendUnavailableError
+from api.jobs.recompute_emissions import (
+    RecomputeProgress,
+    build_executor,
+    recompute_emissions,
+)
+
+MODEL = "api.tests.jobs.test__recompute_emissions:distance_model"
+TRACK_MODEL = "api.tests.jobs.test__recompute_emissions:track_model"
+START = datetime(2025, 3, 10, 8, 0, tzinfo=timezone.utc)
+
+
+def distance_model(flight, positions):
+    """Modelo de prueba: 3 kg de combustible por km; falla con el vuelo 'bad'."""
+    if flight.fr24_id == "bad":
+        raise ValueError("no distance")
+    if flight.distance_calculated_km is None:
+        return None
+    fuel = 3.0 * flight.distance_calculated_km
+    return EmissionComparison(
+        detailed_calculation=DetailedCalculation(
+            total_fuel_kg=fuel, co2_total_kg=fuel * 3.16
+        ),
+        statistical_simulation=StatisticalSimulation(total_fuel_kg=fuel * 1.1),
+    )
+
+
+def track_model(flight, positions):
+    """Modelo de prueba que usa el número de posiciones del track."""
+    return EmissionComparison(
+        detailed_calculation=DetailedCalculation(total_fuel_kg=float(len(positions))),
+    )
+
+
+@pytest.fixture
+def sqlite_flights():
+    database = SQLiteDatabase(":memory:")
+    repository = SQLiteFlightRepository(database)
+    for index in range(10):
+        repository.add(
+            Flight(fr24_id=f"f{index}", distance_calculated_km=100.0 * (index + 1))
+        )
+    repository.add(Flight(fr24_id="bad", distance_calculated_km=1.0))
+    repository.add(Flight(fr24_id="empty"))
+    yield repository
+    database.close()
+
+
+def test_recompute_updates_every_flight_in_a_process_pool(sqlite_flights):
+    """Test que el job recalcula los vuelos en un pool de procesos y los guarda en bloque."""
+    reports = []
+    with build_executor(MODEL, workers=2) as executor:
+        progress = recompute_emissions(
+            sqlite_flights,
+            None,
+            MODEL,
+            executor=executor,
+            chunk_size=3,
+            on_progress=reports.append,
+        )
+
+    assert progress.completed
+    assert (
+        progress.processed,
+        progress.updated,
+        progress.skipped,
+        progress.failed,
+    ) == (12, 10, 1, 1)
+    assert progress.failed_ids == [sqlite_flights.get_by_fr24_id("bad").flight_id]
+    assert len(reports) == 4
+    flight = sqlite_flights.get_by_fr24_id("f4")
+    assert (
+        flight.emission_comparison.detailed_calculation.total_fuel_kg
+        == pytest.approx(1500.0)
+    )
+    assert flight.emission_comparison.fuel_saving_kg() == pytest.approx(150.0)
+    assert sqlite_flights.get_by_fr24_id("empty").emission_comparison is None
+
+
+def test_recompute_resumes_from_the_checkpoint(sqlite_flights, tmp_path):
+    """Test que una ejecución interrumpida continúa desde el último bloque guardado."""
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    def interrupt(progress):
+        if progress.processed >= 6:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        recompute_emissions(
+            sqlite_flights,
+            None,
+            MODEL,
+            checkpoint_path=checkpoint,
+            chunk_size=3,
+            max_pending=1,
+            on_progress=interrupt,
+        )
+    saved = RecomputeProgress.load(checkpoint)
+    assert (saved.processed, saved.completed) == (6, False)
+
+    seen = []
+    progress = recompute_emissions(
+        sqlite_flights,
+        None,
+        MODEL,
+        checkpoint_path=checkpoint,
+        chunk_size=3,
+        on_progress=lambda p: seen.append(p.processed),
+    )
+
+    assert seen == [9, 12]
+    assert (progress.processed, progress.updated, progress.completed) == (12, 10, True)
+    with pytest.raises(ValueError):
+        recompute_emissions(
+            sqlite_flights, None, TRACK_MODEL, checkpoint_path=checkpoint
+        )
+
+
+def test_failed_scan_is_not_checkpointed_as_complete(
+    sqlite_flights, tmp_path, monkeypatch
+):
+    """Test que si el recorrido falla se guardan los bloques leídos y la ejecución queda incompleta."""
+    checkpoint = str(tmp_path / "checkpoint.json")
+    scan = sqlite_flights.iter_flights
+
+    def failing_scan(batch_size=1000, after_id=0):
+        batches = scan(batch_size, after_id)
+        yield next(batches)
+        yield next(batches)
+        raise BackendUnavailableError("connection lost")
+
+    monkeypatch.setattr(sqlite_flights, "iter_flights", failing_scan)
+    with pytest.raises(BackendUnavailableError):
+        recompute_emissions(
+            sqlite_flights, None, MODEL, checkpoint_path=checkpoint, chunk_size=3
+        )
+    saved = RecomputeProgress.load(checkpoint)
+    assert (saved.processed, saved.completed) == (6, False)
+
+    monkeypatch.setattr(sqlite_flights, "iter_flights", scan)
+    progress = recompute_emissions(
+        sqlite_flights, None, MODEL, checkpoint_path=checkpoint, chunk_size=3
+    )
+    assert (progress.processed, progress.completed) == (12, True)
+
+
+def test_recompute_passes_positions_to_the_model(sqlite_flights):
+    """Test que con un puerto de posiciones el modelo recibe el track de cada vuelo."""
+    positions = InMemoryFlightPositionRepository()
+    flight = sqlite_flights.get_by_fr24_id("f0")
+    positions.add_positions(
+        flight.flight_id,
+        [
+            FlightPosition(
+                flight.flight_id, START + timedelta(minutes=minute), 40.0, -3.0
+            )
+            for minute in range(5)
+        ],
+    )
+
+    recompute_emissions(sqlite_flights, positions, TRACK_MODEL, chunk_size=5)
+
+    updated = sqlite_flights.get_by_fr24_id(
+        "f0"
+    ).emission_comparison.detailed_calculation
+    assert updated.total_fuel_kg == 5.0
+    assert (
+        sqlite_flights.get_by_fr24_id(
+            "f1"
+        ).emission_comparison.detailed_calculation.total_fuel_kg
+        == 0.0
+    )
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.adapters.repositories.archived.flight_position_repository import (
+    ArchivedFlightPositionRepository,
+)
+from api.adapters.repositories.filesystem.track_archive import FilesystemTrackArchive
+from api.adapters.repositories.memory.flight_position_repository import (
+    InMemoryFlightPositionRepository,
+)
+from api.adapters.repositories.sqlite.database import SQLiteDatabase
+from api.adapters.repositories.sqlite.flight_position_repository import (
+    SQLiteFlightPositionRepository,
+)
+from api.core.domain.flight_position import FlightPosition
+from api.core.domain.track_archive import decode_track, encode_track
+from api.jobs.retention import RetentionPolicy, main, run_retention
+from api.utils.env_manager import get_settings
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def make_track(flight_id, days_ago, points=5):
+    """Track de `points` posiciones a intervalos de un minuto, empezando hace `days_ago` días."""
+    start = NOW - timedelta(days=days_ago)
+    return [
+        FlightPosition(
+            flight_id=flight_id,
+            timestamp=start + timedelta(minutes=minute),
+            latitude=40.4 + minute * 0.0123457,
+            longitude=-3.7 - minute * 0.0098765,
+            altitude=None if minute == 0 else 1000 * minute,
+            ground_speed=420,
+            vertical_rate=None,
+        )
+        for minute in range(points)
+    ]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def hot_store(request):
+    """Fixture con el almacén de posiciones de cada backend."""
+    if request.param == "memory":
+        yield InMemoryFlightPositionRepository()
+        return
+    database = SQLiteDatabase(":memory:")
+    yield SQLiteFlightPositionRepository(database)
+    database.close()
+
+
+def test_track_codec_round_trip():
+    """Test que el codec de tracks conserva las posiciones, incluidos los valores ausentes."""
+    track = make_track(7, days_ago=3, points=50)
+    blob = encode_track(list(reversed(track)))
+
+    decoded = decode_track(7, blob)
+
+    assert [p.timestamp for p in decoded] == [p.timestamp for p in track]
+    assert [p.latitude for p in decoded] == pytest.approx(
+        [p.latitude for p in track], abs=1e-7
+    )
+    assert [p.longitude for p in decoded] == pytest.approx(
+        [p.longitude for p in track], abs=1e-7
+    )
+    assert [(p.altitude, p.ground_speed, p.vertical_rate) for p in decoded] == [
+        (p.altitude, p.ground_speed, p.vertical_rate) for p in track
+    ]
+    assert decode_track(7, encode_track([])) == []
+
+
+def test_retention_archives_and_prunes_with_transparent_reads(hot_store, tmp_path):
+    """Test que el job archiva y poda por lotes y las lecturas siguen viendo el track completo."""
+    archive = FilesystemTrackArchive(str(tmp_path / "archive"))
+    hot_store.add_positions(1, make_track(1, days_ago=40))
+    hot_store.add_positions(2, make_track(2, days_ago=400))
+    hot_store.add_positions(3, make_track(3, days_ago=1))
+    hot_store.add_positions(4, make_track(4, days_ago=400))
+    archive.save_track(4, make_track(4, days_ago=400))
+    reads = ArchivedFlightPositionRepository(hot_store, archive)
+    before = reads.get_positions_by_flight_id(1)
+    sleeps = []
+    policy = RetentionPolicy(
+        archive_after=timedelta(days=30),
+        prune_after=timedelta(days=365),
+        batch_size=2,
+        batch_interval_s=60.0,
+    )
+
+    dry = run_retention(
+        hot_store, archive, policy, now=NOW, dry_run=True, sleep=sleeps.append
+    )
+    report = run_retention(hot_store, archive, policy, now=NOW, sleep=sleeps.append)
+
+    assert (dry.archived_positions, dry.deleted_positions) == (5, 15)
+    assert (report.archived_flights, report.archived_positions) == (1, 5)
+    assert (report.deleted_positions, report.pruned_tracks, report.failed) == (15, 1, 0)
+    assert hot_store.flight_ids_with_positions_before(NOW - timedelta(days=30)) == []
+    assert hot_store.get_positions_by_flight_id(1) == []
+    assert [track.flight_id for track in archive.list_tracks()] == [1]
+    assert [p.timestamp for p in reads.get_positions_by_flight_id(1)] == [
+        p.timestamp for p in before
+    ]
+    window = reads.get_positions_between(1, before[1].timestamp, before[3].timestamp)
+    assert [p.timestamp for p in window] == [before[1].timestamp, before[2].timestamp]
+    assert len(reads.get_positions_by_flight_id(3)) == 5
+    assert reads.get_positions_by_flight_id(2) == []
+    # 9 throttled batches of at most 2 positions, spaced by the interval.
+    assert len(sleeps) == 8 and all(0 < delay <= 60.0 for delay in sleeps)
+
+    again = run_retention(hot_store, archive, policy, now=NOW, sleep=sleeps.append)
+    assert (again.archived_positions, again.deleted_positions) == (0, 0)
+    assert reads.delete_positions_by_flight_id(1)
+    assert archive.list_tracks() == []
+
+
+def test_retention_deletes_only_what_was_archived(tmp_path):
+    """Test que sólo se borran las posiciones archivadas y un fallo de lectura salta el vuelo."""
+    hot_store = InMemoryFlightPositionRepository()
+    archive = FilesystemTrackArchive(str(tmp_path / "archive"))
+    hot_store.add_positions(1, make_track(1, days_ago=40))
+    hot_store.add_positions(2, make_track(2, days_ago=40))
+    read = hot_store.get_positions_between
+
+    def short_or_failed_read(flight_id, start=None, end=None):
+        if flight_id == 2:
+            raise ConnectionError("timeout")
+        return read(flight_id, start, end)[:3]
+
+    hot_store.get_positions_between = short_or_failed_read
+    policy = RetentionPolicy(archive_after=timedelta(days=30), batch_interval_s=0)
+
+    report = run_retention(hot_store, archive, policy, now=NOW)
+
+    assert (report.archived_positions, report.deleted_positions) == (3, 3)
+    assert (report.failed, report.failed_ids) == (1, [2])
+    assert len(read(1)) == 2 and len(archive.get_track(1)) == 3
+    assert len(read(2)) == 5 and not archive.has_track(2)
+
+
+def test_retention_refuses_a_local_archive_for_supabase(tmp_path, monkeypatch):
+    """Test que con Supabase el job no archiva en un directorio que sólo ve este host."""
+    monkeypatch.setenv("REPOSITORY_BACKEND", "supabase")
+    monkeypatch.setenv("TRACK_ARCHIVE_PATH", str(tmp_path / "archive"))
+    get_settings.cache_clear()
+
+    with pytest.raises(SystemExit):
+        main(["--archive-after-days", "30"])
+    get_settings.cache_clear()
@@ -0,0 +1,156 @@
+import asyncio
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from api.utils.metrics import metrics
+
+ADMITTED = metrics.counter("admission_admitted_total", "Requests admitted, by class.")
+QUEUED = metrics.counter(
+    "admission_queued_total", "Requests that waited in a queue, by class."
+)
+SHED = metrics.counter(
+    "admission_shed_total",
+    "Requests rejected with 503, by class and reason (queue_full, queue_timeout).",
+)
+
+
+@dataclass(frozen=True)
+class AdmissionClass:
+    """
+    A class of requests: at most `limit` run at once, at most `queue_size`
+    wait for a slot, each for at most `queue_timeout_s`. When slots free up,
+    waiting requests with a lower `priority` are admitted first.
+    """
+
+    name: str
+    priority: int
+    limit: int
+    queue_size: int
+    queue_timeout_s: float
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed because its queue is full or it waited too long."""
+
+    def __init__(self, admission_class: str, reason: str):
+        super().__init__(f"Too many '{admission_class}' requests ({reason}).")
+        self.admission_class = admission_class
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ("admission_class", "future", "admitted", "abandoned")
+
+    def __init__(self, admission_class: AdmissionClass, future: asyncio.Future):
+        self.admission_class = admission_class
+        self.future = future
+        self.admitted = False
+        self.abandoned = False
+
+
+class AdmissionController:
+    """
+    Caps the requests running at once, overall (`max_concurrency`) and per
+    class, with a bounded priority queue in front. A request that cannot run
+    waits in its class's queue until a slot frees up; when the queue is full
+    or the wait exceeds the class's deadline it is shed, so under overload
+    requests fail fast instead of all slowing down together.
+    """
+
+    def __init__(self, max_concurrency: int, classes: Iterable[AdmissionClass]):
+        self.max_concurrency = max_concurrency
+        self.classes: Dict[str, AdmissionClass] = {c.name: c for c in classes}
+        self.active: Dict[str, int] = {name: 0 for name in self.classes}
+        self.queued: Dict[str, int] = {name: 0 for name in self.classes}
+        self._total = 0
+        self._waiters: List[Tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    async def acquire(self, name: str) -> None:
+        """
+        Waits for a slot of class `name`. Raises OverloadedError when shed.
+        Every successful acquire must be paired with `release`.
+        """
+        admission_class = self.classes[name]
+        with self._lock:
+            # Requests already queued for this class go first.
+            if not self.queued[name] and self._has_room(admission_class):
+                self._start(admission_class)
+                ADMITTED.inc(**{"class": name})
+                return
+            if self.queued[name] >= admission_class.queue_size:
+                SHED.inc(**{"class": name, "reason": "queue_full"})
+                raise OverloadedError(name, "queue_full")
+            waiter = _Waiter(
+                admission_class, asyncio.get_running_loop().create_future()
+            )
+            heapq.heappush(
+                self._waiters, (admission_class.priority, next(self._sequence), waiter)
+            )
+            self.queued[name] += 1
+        QUEUED.inc(**{"class": name})
+
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter.future), admission_class.queue_timeout_s
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                admitted = waiter.admitted
+                if not admitted:
+                    waiter.abandoned = True
+                    self.queued[name] -= 1
+            if isinstance(e, asyncio.CancelledError):
+                if admitted:
+                    self.release(name)
+                raise
+            if not admitted:
+                SHED.inc(**{"class": name, "reason": "queue_timeout"})
+                raise OverloadedError(name, "queue_timeout") from None
+        ADMITTED.inc(**{"class": name})
+
+    def release(self, name: str) -> None:
+        """
+        Frees a slot of class `name` and admits the next waiting requests.
+        """
+        with self._lock:
+            self.active[name] -= 1
+            self._total -= 1
+            self._dispatch()
+
+    def _has_room(self, admission_class: AdmissionClass) -> bool:
+        return (
+            self._total < self.max_concurrency
+            and self.active[admission_class.name] < admission_class.limit
+        )
+
+    def _start(self, admission_class: AdmissionClass) -> None:
+        self.active[admission_class.name] += 1
+        self._total += 1
+
+    def _dispatch(self) -> None:
+        """Admits waiters in priority order while there is room (called with the lock held)."""
+        blocked: List[Tuple[int, int, _Waiter]] = []
+        while self._waiters and self._total < self.max_concurrency:
+            entry = heapq.heappop(self._waiters)
+            waiter = entry[2]
+            if waiter.abandoned:
+                continue
+            if not self._has_room(waiter.admission_class):
+                blocked.append(entry)
+                continue
+            waiter.admitted = True
+            self.queued[waiter.admission_class.name] -= 1
+            self._start(waiter.admission_class)
+            waiter.future.get_loop().call_soon_threadsafe(_wake, waiter.future)
+        for entry in blocked:
+            heapq.heappush(self._waiters, entry)
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
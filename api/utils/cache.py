@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, Tuple, Type, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    A thread-safe, size-bounded cache whose entries expire `ttl_seconds` after
+    they are written. When full, the least recently used entry is evicted.
+    Expired entries are kept `stale_ttl_seconds` longer for `get_stale`, so
+    callers can fall back to them when the source is unavailable.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        stale_ttl_seconds: float = 0.0,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        """
+        Returns the cached value for `key`, or `default` if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            now = time.monotonic()
+            if expires_at < now:
+                if expires_at + self.stale_ttl_seconds < now:
+                    del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Optional[V]:
+        """
+        Returns the value for `key` even if expired, as long as it is within
+        the stale window, or `default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] + self.stale_ttl_seconds < time.monotonic():
+                return default
+            return entry[1]
+
+    def set(self, key: Hashable, value: V) -> None:
+        """
+        Stores `value` under `key`, evicting the least recently used entry if full.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], V],
+        stale_on: Tuple[Type[BaseException], ...] = (),
+    ) -> V:
+        """
+        Returns the cached value for `key`, calling `loader` and caching its
+        result on a miss. None results are not cached. If `loader` raises one
+        of `stale_on`, a stale value is returned instead when there is one.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        try:
+            value = loader()
+        except stale_on:
+            value = self.get_stale(key, _MISSING)
+            if value is _MISSING:
+                raise
+            return value
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Removes `key` from the cache if present.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -1,4 +1,7 @@
-from pydantic import Field
+from functools import lru_cache
+from typing import Literal, Optional
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +15,93 @@ class Settings(BaseSettings):
         supabase_key (str): The public (anon) API key for the Supabase project.
         uvicorn_host (str): The host for the Uvicorn server.
         uvicorn_port (int): The port for the Uvicorn server.
+        uvicorn_workers (int): Worker processes of the production server (0 for one per CPU).
+        uvicorn_graceful_timeout_seconds (float): Longest wait for in-flight requests when
+            a worker stops or is replaced.
+        repository_backend (str): Storage backend for the repositories
+            ("supabase", "memory" or "sqlite").
+        memory_hydrate_from_supabase (bool): Load all flights from Supabase into the
+            in-memory backend at startup, using it as a read replica.
+        sqlite_path (str): Database file used by the sqlite backend.
+        cache_ttl_seconds (float): Lifetime of cached backend reads. 0, the default,
+            disables the cache: writes only invalidate it in the writing process
+            (and its host's shared tier), so other instances serve stale reads.
+        cache_max_entries (int): Maximum number of cached flights and listings.
+        count_cache_ttl_seconds (float): Lifetime of cached flight counts.
+        cache_stale_ttl_seconds (float): How long expired cache entries are kept to be
+            served while the backend is unavailable.
+        shared_cache_path (str): SQLite file, ideally on a tmpfs, of the cache tier shared
+            by the workers of a host (unset keeps caches per process).
+        shared_cache_max_entries (int): Entries kept in the shared cache tier.
+        shared_cache_local_ttl_seconds (float): Longest time a worker serves a shared cache
+            entry from its own memory.
+        coalesce_reads (bool): Share one backend call between identical concurrent reads.
+        request_timeout_seconds (float): Time budget of a request; backend calls get what is left.
+        backend_resilience_enabled (bool): Run Supabase calls with deadlines, hedging and
+            a circuit breaker.
+        backend_timeout_seconds (float): Longest single backend call.
+        backend_hedging_enabled (bool): Send a duplicate lookup when the first one is slower
+            than the recent p95.
+        backend_hedge_min_delay_seconds (float): Shortest wait before a hedged lookup.
+        backend_max_workers (int): Threads running backend calls.
+        circuit_breaker_failure_threshold (int): Consecutive failures that open the breaker.
+        circuit_breaker_reset_seconds (float): Time the breaker stays open before a trial call.
+        warmup_enabled (bool): Warm up connections and caches when the app starts.
+        warmup_recent_flights (int): Number of recent flights prefetched by the warm-up.
+        analytics_snapshot_ttl_seconds (float): Age after which the analytics snapshot,
+            and the breakdown snapshot used without rollups, is rebuilt in the background.
+        rollups_enabled (bool): Maintain incremental summary rollups, per process (off by
+            default; the summary then comes from the database function).
+        rollups_reconcile_interval_seconds (float): Interval between rollup reconciliations
+            against the full aggregate (0 disables them).
+        position_broker (str): Broker that delivers new positions to stream
+            subscribers ("memory" for a single worker, or "redis").
+        redis_url (str): Redis URL, required by the redis position broker.
+        stream_buffer_size (int): Undelivered positions kept per stream client
+            before the oldest ones are dropped.
+        stream_heartbeat_seconds (float): Idle time after which a stream sends a keep-alive.
+        upload_chunk_rows (int): Rows validated and stored together by streaming uploads.
+        track_archive_path (str): Directory of the archive of old tracks (unset disables it).
+        track_archive_shared (bool): The archive directory is on storage every API host
+            mounts; required to archive positions of the supabase backend.
+        retention_archive_after_days (float): Age after which positions are moved from the
+            positions table into the track archive (unset disables archival).
+        retention_prune_after_days (float): Age after which positions are deleted, from the
+            positions table and the archive (unset keeps them forever).
+        retention_batch_size (int): Positions deleted per statement by the retention job.
+        retention_batch_interval_seconds (float): Pause between the retention job's delete
+            batches, to bound its load on the database.
+        write_behind_enabled (bool): Acknowledge position posts once they are in a local
+            spool and store them with periodic bulk inserts.
+        write_behind_spool_path (str): Directory of the write-behind spool.
+        write_behind_max_batch (int): Buffered positions that trigger a flush.
+        write_behind_flush_interval_seconds (float): Longest time a position stays buffered
+            before a flush.
+        write_behind_max_pending (int): Buffered positions past which position posts are
+            refused with 503.
+        write_behind_fsync (bool): Sync the spool to disk before acknowledging a post.
+        position_dedup_enabled (bool): Drop posted positions already stored before they
+            reach the backend.
+        position_dedup_window_seconds (float): How far below a flight's newest position
+            timestamps are remembered for deduplication.
+        position_dedup_max_flights (int): Flights whose recent timestamps are remembered.
+        admission_enabled (bool): Limit the requests running at once and shed the excess.
+        admission_max_concurrency (int): Requests running at once per worker, all classes.
+        admission_read_limit (int): Cheap reads running at once.
+        admission_write_limit (int): Single flight writes running at once.
+        admission_heavy_limit (int): Analytics, area queries and position batches running at once.
+        admission_queue_size (int): Requests of each class waiting for a slot before new
+            ones are shed.
+        admission_queue_timeout_seconds (float): Longest wait for a slot before a request is shed.
+        admission_retry_after_seconds (int): `Retry-After` sent with shed requests.
+        server_timing_enabled (bool): Send the phase timings of every request in a
+            `Server-Timing` header.
+        profiling_token (str): Secret that profiles a request sent with it in `X-Profile`
+            and guards the stored profiles (unset disables on-demand profiling).
+        profiling_sample_rate (float): Fraction of requests profiled and stored at random.
+        profiling_interval_ms (float): Interval between the stack samples of a profiled request.
+        profiling_max_stored (int): Profiles kept in memory per worker.
+        profiling_dir (str): Directory the profiles are also written to as folded stacks.
     """
 
     def __init__(self):
@@ -19,10 +109,243 @@ class Settings(BaseSettings):
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
-    supabase_url: str = Field(..., description="Supabase project URL is required")
-    supabase_key: str = Field(..., description="Supabase project API key is required")
+    supabase_url: Optional[str] = Field(
+        None, description="Supabase project URL, required by the supabase backend"
+    )
+    supabase_key: Optional[str] = Field(
+        None, description="Supabase project API key, required by the supabase backend"
+    )
     uvicorn_host: str = Field("0.0.0.0", description="Uvicorn server host")
     uvicorn_port: int = Field(8000, description="Uvicorn server port")
+    uvicorn_workers: int = Field(
+        1,
+        ge=0,
+        description="Worker processes of the production server (0: one per CPU)",
+    )
+    uvicorn_graceful_timeout_seconds: float = Field(
+        30.0,
+        gt=0,
+        description="Longest wait for in-flight requests on shutdown in seconds",
+    )
+    repository_backend: Literal["supabase", "memory", "sqlite"] = Field(
+        "supabase", description="Storage backend used by the repositories"
+    )
+    memory_hydrate_from_supabase: bool = Field(
+        False, description="Hydrate the memory backend from Supabase at startup"
+    )
+    sqlite_path: str = Field("flights.db", description="SQLite database file")
+    cache_ttl_seconds: float = Field(
+        0.0, ge=0, description="Lifetime of cached backend reads in seconds"
+    )
+    cache_max_entries: int = Field(
+        1024, ge=1, description="Maximum number of cached flights and listings"
+    )
+    count_cache_ttl_seconds: float = Field(
+        60.0, gt=0, description="Lifetime of cached flight counts in seconds"
+    )
+    cache_stale_ttl_seconds: float = Field(
+        300.0,
+        ge=0,
+        description="Extra lifetime of cache entries served while the backend is down",
+    )
+    shared_cache_path: Optional[str] = Field(
+        None, description="SQLite file of the cache tier shared by the workers"
+    )
+    shared_cache_max_entries: int = Field(
+        10_000, ge=1, description="Entries kept in the shared cache tier"
+    )
+    shared_cache_local_ttl_seconds: float = Field(
+        1.0,
+        gt=0,
+        description="Longest time a shared cache entry is served from local memory",
+    )
+    coalesce_reads: bool = Field(
+        True, description="Coalesce identical concurrent backend reads"
+    )
+    request_timeout_seconds: float = Field(
+        10.0, gt=0, description="Time budget of a request in seconds"
+    )
+    backend_resilience_enabled: bool = Field(
+        True, description="Deadlines, hedging and circuit breaking for Supabase calls"
+    )
+    backend_timeout_seconds: float = Field(
+        5.0, gt=0, description="Longest single backend call in seconds"
+    )
+    backend_hedging_enabled: bool = Field(
+        True, description="Hedge slow idempotent lookups"
+    )
+    backend_hedge_min_delay_seconds: float = Field(
+        0.01, ge=0, description="Shortest wait before a hedged lookup in seconds"
+    )
+    backend_max_workers: int = Field(
+        32, ge=1, description="Threads running backend calls"
+    )
+    circuit_breaker_failure_threshold: int = Field(
+        5,
+        ge=1,
+        description="Consecutive backend failures that open the circuit breaker",
+    )
+    circuit_breaker_reset_seconds: float = Field(
+        10.0, gt=0, description="Time the circuit breaker stays open in seconds"
+    )
+    warmup_enabled: bool = Field(True, description="Warm up the app on startup")
+    warmup_recent_flights: int = Field(
+        100, ge=1, le=1000, description="Recent flights prefetched on startup"
+    )
+    analytics_snapshot_ttl_seconds: float = Field(
+        300.0, gt=0, description="Lifetime of the analytics snapshot in seconds"
+    )
+    rollups_enabled: bool = Field(False, description="Maintain incremental rollups")
+    rollups_reconcile_interval_seconds: float = Field(
+        900.0, ge=0, description="Interval between rollup reconciliations in seconds"
+    )
+    position_broker: Literal["memory", "redis"] = Field(
+        "memory", description="Broker that fans new positions out to stream subscribers"
+    )
+    redis_url: Optional[str] = Field(None, description="Redis URL for the redis broker")
+    stream_buffer_size: int = Field(
+        1000, ge=1, description="Undelivered positions buffered per stream client"
+    )
+    stream_heartbeat_seconds: float = Field(
+        15.0,
+        gt=0,
+        description="Keep-alive interval of idle position streams in seconds",
+    )
+    upload_chunk_rows: int = Field(
+        5000, ge=1, description="Rows per chunk of streaming position uploads"
+    )
+    track_archive_path: Optional[str] = Field(
+        None, description="Directory of the archive of old tracks"
+    )
+    track_archive_shared: bool = Field(
+        False, description="Whether every API host mounts the track archive"
+    )
+    retention_archive_after_days: Optional[float] = Field(
+        None, gt=0, description="Age in days after which positions are archived"
+    )
+    retention_prune_after_days: Optional[float] = Field(
+        None, gt=0, description="Age in days after which positions are deleted"
+    )
+    retention_batch_size: int = Field(
+        1000, ge=1, description="Positions deleted per statement by the retention job"
+    )
+    retention_batch_interval_seconds: float = Field(
+        0.5, ge=0, description="Pause between retention delete batches in seconds"
+    )
+    write_behind_enabled: bool = Field(
+        False, description="Buffer position posts and store them in bulk"
+    )
+    write_behind_spool_path: str = Field(
+        "position_spool", description="Directory of the write-behind spool"
+    )
+    write_behind_max_batch: int = Field(
+        5000, ge=1, description="Buffered positions that trigger a flush"
+    )
+    write_behind_flush_interval_seconds: float = Field(
+        1.0, gt=0, description="Longest time a position stays buffered in seconds"
+    )
+    write_behind_max_pending: int = Field(
+        100_000, ge=1, description="Buffered positions past which posts are refused"
+    )
+    write_behind_fsync: bool = Field(
+        True, description="Sync the spool to disk before acknowledging a post"
+    )
+    position_dedup_enabled: bool = Field(
+        True, description="Drop duplicate positions before they reach the backend"
+    )
+    position_dedup_window_seconds: float = Field(
+        300.0,
+        gt=0,
+        description="Timestamps remembered below a flight's newest position",
+    )
+    position_dedup_max_flights: int = Field(
+        10_000, ge=1, description="Flights whose recent timestamps are remembered"
+    )
+    admission_enabled: bool = Field(True, description="Enable admission control")
+    admission_max_concurrency: int = Field(
+        64, ge=1, description="Requests running at once per worker"
+    )
+    admission_read_limit: int = Field(64, ge=1, description="Reads running at once")
+    admission_write_limit: int = Field(16, ge=1, description="Writes running at once")
+    admission_heavy_limit: int = Field(
+        4, ge=1, description="Heavy requests running at once"
+    )
+    admission_queue_size: int = Field(
+        100, ge=0, description="Requests of each class waiting for a slot"
+    )
+    admission_queue_timeout_seconds: float = Field(
+        2.0, gt=0, description="Longest wait for a slot in seconds"
+    )
+    admission_retry_after_seconds: int = Field(
+        1, ge=0, description="Retry-After of shed requests in seconds"
+    )
+    server_timing_enabled: bool = Field(
+        False, description="Send the phase timings of every request in Server-Timing"
+    )
+    profiling_token: Optional[str] = Field(
+        None, description="Secret that enables on-demand profiling with X-Profile"
+    )
+    profiling_sample_rate: float = Field(
+        0.0, ge=0, le=1, description="Fraction of requests profiled at random"
+    )
+    profiling_interval_ms: float = Field(
+        5.0, gt=0, description="Interval between stack samples in milliseconds"
+    )
+    profiling_max_stored: int = Field(
+        50, ge=1, description="Profiles kept in memory per worker"
+    )
+    profiling_dir: Optional[str] = Field(
+        None, description="Directory the profiles are written to as folded stacks"
+    )
+
+    @model_validator(mode="after")
+    def check_supabase_credentials(self) -> "Settings":
+        needs_supabase = (
+            self.repository_backend == "supabase" or self.memory_hydrate_from_supabase
+        )
+        if needs_supabase and not (self.supabase_url and self.supabase_key):
+            raise ValueError(
+                "SUPABASE_URL and SUPABASE_KEY are required by the supabase backend"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_retention(self) -> "Settings":
+        if (
+            self.retention_archive_after_days is not None
+            and not self.track_archive_path
+        ):
+            raise ValueError("TRACK_ARCHIVE_PATH is required to archive positions")
+        if (
+            self.retention_archive_after_days is not None
+            and self.retention_prune_after_days is not None
+            and self.retention_prune_after_days <= self.retention_archive_after_days
+        ):
+            raise ValueError(
+                "RETENTION_PRUNE_AFTER_DAYS must be longer than RETENTION_ARCHIVE_AFTER_DAYS"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_redis_url(self) -> "Settings":
+        if self.position_broker == "redis" and not self.redis_url:
+            raise ValueError("REDIS_URL is required by the redis position broker")
+        return self
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Returns the application settings, reading the environment and `.env` on first use.
+    """
+    return Settings()
 
 
-settings = Settings()
+def __getattr__(name: str):
+    """
+    Keeps `from api.utils.env_manager import settings` working while deferring
+    the `.env` read until the settings are actually needed.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
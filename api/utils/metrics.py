@@ -0,0 +1,194 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple, Union
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Default histogram buckets, in seconds.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Counter:
+    """
+    A monotonically increasing, thread-safe counter with optional labels.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Adds `amount` to the series identified by `labels`.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """
+        Current value of the series identified by `labels`.
+        """
+        with self._lock:
+            return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        with self._lock:
+            return [
+                (self.name, labels, value)
+                for labels, value in sorted(self._values.items())
+            ]
+
+
+class Gauge(Counter):
+    """
+    A thread-safe value that can go up and down, with optional labels.
+    """
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        """
+        Sets the series identified by `labels` to `value`.
+        """
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+
+class Histogram:
+    """
+    A thread-safe distribution of observed values (e.g. latencies) over
+    cumulative buckets, with their sum and count.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, description: str, buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Records `value` in the series identified by `labels`.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        """
+        Number of values observed in the series identified by `labels`.
+        """
+        with self._lock:
+            return sum(self._counts.get(tuple(sorted(labels.items())), ()))
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        samples = []
+        with self._lock:
+            for labels, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    samples.append(
+                        (f"{self.name}_bucket", labels + (("le", le),), cumulative)
+                    )
+                samples.append((f"{self.name}_sum", labels, self._sums[labels]))
+                samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """
+    Process-wide registry of the application metrics, rendered in the
+    Prometheus text format by `GET /metrics`.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str) -> Counter:
+        """
+        Returns the counter called `name`, registering it on first use.
+        """
+        return self._register(Counter, name, description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        """
+        Returns the gauge called `name`, registering it on first use.
+        """
+        return self._register(Gauge, name, description)
+
+    def histogram(
+        self, name: str, description: str, buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """
+        Returns the histogram called `name`, registering it on first use.
+        """
+        return self._register(Histogram, name, description, buckets)
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            registered = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: List[str] = []
+        for metric in registered:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                rendered = ",".join(
+                    f'{key}="{_escape(label)}"' for key, label in labels
+                )
+                series = f"{name}{{{rendered}}}" if rendered else name
+                lines.append(f"{series} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, kind, name: str, description: str, *args) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = kind(name, description, *args)
+            elif type(metric) is not kind:
+                raise ValueError(
+                    f"Metric '{name}' is already registered as a {metric.kind}."
+                )
+            return metric
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,296 @@
+"""
+Per-request profiling. A profiled request gets two things:
+
+- phase timings: the time spent in `phase(name)` blocks (minus the phases
+  nested in them) is added up per phase name, for a `Server-Timing` header;
+- optionally, stack samples: a background thread records the stacks of the
+  threads working for the request every few milliseconds, as folded stacks
+  ("a;b;c 12" lines) that flame graph tools read directly.
+
+The request's RequestProfile lives in a ContextVar, so outside a profiled
+request every helper costs one ContextVar lookup. Work handed to another
+thread is attributed to the request when it is submitted through
+`bind_to_request`.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+from contextvars import ContextVar, copy_context
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+V = TypeVar("V")
+
+# Innermost frame of an event loop waiting for work; its samples are dropped.
+IDLE_FRAMES = {("selectors", "select")}
+
+_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "request_profile", default=None
+)
+_open_phase: ContextVar[Optional["_Phase"]] = ContextVar("open_phase", default=None)
+_NO_PHASE = nullcontext()
+
+
+class RequestProfile:
+    """
+    Phase timings and stack samples of one request.
+    """
+
+    def __init__(self, profile_id: str, method: str, path: str, sample: bool = False):
+        self.profile_id = profile_id
+        self.method = method
+        self.path = path
+        self.sample = sample
+        self.started = time.perf_counter()
+        self.duration_s: Optional[float] = None
+        # Set by the route handler, to time FastAPI's work around the endpoint.
+        self.handler_started: Optional[float] = None
+        self.endpoint_finished: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Adds `seconds` to the phase `name`.
+        """
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + max(seconds, 0.0)
+
+    def enter_thread(self) -> None:
+        """
+        Marks the current thread as working for the request, so it is sampled.
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def exit_thread(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._threads.get(ident, 0) - 1
+            if depth > 0:
+                self._threads[ident] = depth
+            else:
+                self._threads.pop(ident, None)
+
+    def threads(self) -> List[int]:
+        with self._lock:
+            return list(self._threads)
+
+    def record(self, stack: str) -> None:
+        with self._lock:
+            self.stacks[stack] += 1
+            self.samples += 1
+
+    def server_timing(self) -> str:
+        """
+        The phase timings in the `Server-Timing` header syntax, in milliseconds,
+        followed by the time elapsed since the request started as `total`.
+        """
+        with self._lock:
+            phases = sorted(self.phases.items())
+        total = (time.perf_counter() - self.started) * 1000
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases]
+        entries.append(f"total;dur={total:.2f}")
+        return ", ".join(entries)
+
+    def folded(self) -> str:
+        """
+        The stack samples as folded stacks, the most frequent first.
+        """
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = {
+                name: round(seconds * 1000, 2) for name, seconds in self.phases.items()
+            }
+        return {
+            "id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "duration_ms": round((self.duration_s or 0.0) * 1000, 2),
+            "samples": self.samples,
+            "phases_ms": phases,
+        }
+
+
+class _Phase:
+    """
+    A running `phase` block. Its own time excludes the phases opened inside
+    it, including those of work bound to the request in other threads.
+    """
+
+    __slots__ = ("profile", "name", "nested", "started", "parent", "token")
+
+    def __init__(self, profile: RequestProfile, name: str):
+        self.profile = profile
+        self.name = name
+        self.nested = 0.0
+
+    def __enter__(self) -> "_Phase":
+        self.parent = _open_phase.get()
+        self.token = _open_phase.set(self)
+        self.profile.enter_thread()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self.started
+        self.profile.exit_thread()
+        _open_phase.reset(self.token)
+        self.profile.add(self.name, elapsed - self.nested)
+        if self.parent is not None:
+            self.parent.nested += elapsed
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """
+    The profile of the request being handled, or None when it is not profiled.
+    """
+    return _profile.get()
+
+
+def phase(name: str) -> ContextManager[Any]:
+    """
+    Times the block as phase `name` of the current request, if it is profiled.
+    """
+    profile = _profile.get()
+    if profile is None:
+        return _NO_PHASE
+    return _Phase(profile, name)
+
+
+def bind_to_request(function: Callable[[], V]) -> Callable[[], V]:
+    """
+    Returns `function` unchanged outside a profiled request. Inside one, the
+    result runs `function` in a copy of the caller's context with its thread
+    sampled for the request, for work submitted to an executor. Each call gets
+    its own copy, so the result can run several times at once (hedged reads).
+    """
+    profile = _profile.get()
+    if profile is None:
+        return function
+    context = copy_context()
+
+    def bound() -> V:
+        profile.enter_thread()
+        try:
+            return context.copy().run(function)
+        finally:
+            profile.exit_thread()
+
+    return bound
+
+
+def activate(profile: RequestProfile) -> Any:
+    """
+    Makes `profile` the current request's profile; returns the token for `deactivate`.
+    """
+    return _profile.set(profile)
+
+
+def deactivate(token: Any) -> None:
+    _profile.reset(token)
+
+
+def fold_stack(frame: Any, max_depth: int = 128) -> Optional[str]:
+    """
+    The stack ending at `frame` as "module:function" names joined by ";",
+    outermost first, or None when the thread is idle.
+    """
+    code = frame.f_code
+    if (frame.f_globals.get("__name__"), code.co_name) in IDLE_FRAMES:
+        return None
+    names: List[str] = []
+    while frame is not None and len(names) < max_depth:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+class StackSampler:
+    """
+    One background thread that samples the threads of every profiled request
+    each `interval_s`. It runs only while some request is being sampled.
+    """
+
+    def __init__(self, interval_s: float = 0.005):
+        self.interval_s = interval_s
+        self._profiles: List[RequestProfile] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="stack-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def detach(self, profile: RequestProfile) -> None:
+        with self._lock:
+            if profile in self._profiles:
+                self._profiles.remove(profile)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                profiles = list(self._profiles)
+            frames = sys._current_frames()
+            for profile in profiles:
+                for ident in profile.threads():
+                    frame = frames.get(ident)
+                    stack = fold_stack(frame) if frame is not None else None
+                    if stack is not None:
+                        profile.record(stack)
+            del frames
+            time.sleep(self.interval_s)
+
+
+class ProfileStore:
+    """
+    The last `max_profiles` finished profiles, by ID.
+    """
+
+    def __init__(self, max_profiles: int = 50):
+        self._profiles: Deque[RequestProfile] = deque(maxlen=max_profiles)
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile.profile_id == profile_id:
+                    return profile
+        return None
+
+    def __iter__(self) -> Iterator[RequestProfile]:
+        with self._lock:
+            return iter(list(reversed(self._profiles)))
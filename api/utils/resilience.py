@@ -0,0 +1,271 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from api.core.exceptions.flights_exceptions import (
+    BackendUnavailableError,
+    DeadlineExceededError,
+)
+from api.utils.metrics import metrics
+from api.utils.profiling import bind_to_request, phase
+
+V = TypeVar("V")
+
+BACKEND_CALLS = metrics.counter(
+    "backend_calls_total",
+    "Backend calls by source and outcome (ok, failed, timeout, short_circuited).",
+)
+HEDGED = metrics.counter(
+    "backend_hedged_calls_total",
+    "Duplicate reads sent after the hedging delay, by source and winner.",
+)
+BREAKER_TRANSITIONS = metrics.counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state changes, by source and new state.",
+)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(budget_s: float) -> Iterator[None]:
+    """
+    Gives the code inside at most `budget_s` seconds, or what is left of an
+    enclosing budget if that is shorter. Backend calls made inside get a
+    timeout derived from it.
+    """
+    deadline = time.monotonic() + budget_s
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget(default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before the current deadline, or `default` outside a deadline scope.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    return deadline - time.monotonic()
+
+
+class LatencyWindow:
+    """
+    The last `size` latencies of a call, to estimate its percentiles.
+    """
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = 20) -> Optional[float]:
+        """
+        The `q` quantile (0-1) of the window, or None until `min_samples` were recorded.
+        """
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing backend. After `failure_threshold` consecutive
+    failures the breaker opens and calls fail immediately; after
+    `reset_timeout_s` one trial call is let through (half-open), which closes
+    the breaker on success or opens it again on failure.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout_s: float = 10.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        Raises BackendUnavailableError if the call must not reach the backend.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout_s:
+                    raise BackendUnavailableError(
+                        f"Circuit breaker for '{self.name}' is open."
+                    )
+                self._transition(self.HALF_OPEN)
+            if self._trial_running:
+                raise BackendUnavailableError(
+                    f"Circuit breaker for '{self.name}' is half-open."
+                )
+            self._trial_running = True
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_running = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self.state != self.OPEN:
+                    self._transition(self.OPEN)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        BREAKER_TRANSITIONS.inc(source=self.name, state=state)
+
+
+class ResiliencePolicy:
+    """
+    Runs backend calls on a bounded thread pool so the caller can stop
+    waiting at its deadline: the remaining request budget, capped at
+    `timeout_s`. Calls go through a circuit breaker, and idempotent reads can
+    be hedged: when the first attempt is slower than the operation's recent
+    p95 (at least `hedge_min_delay_s`), a duplicate is sent and the first
+    answer wins.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout_s: float = 5.0,
+        hedge_quantile: Optional[float] = 0.95,
+        hedge_min_delay_s: float = 0.01,
+        breaker: Optional[CircuitBreaker] = None,
+        executor: Optional[Executor] = None,
+        max_workers: int = 32,
+    ):
+        self.name = name
+        self.timeout_s = timeout_s
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay_s = hedge_min_delay_s
+        self.breaker = breaker or CircuitBreaker(name)
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-backend"
+        )
+        self.latencies: Dict[str, LatencyWindow] = {}
+        self._lock = threading.Lock()
+
+    def call(self, operation: str, function: Callable[[], V], hedge: bool = False) -> V:
+        """
+        Calls `function` within the deadline. Raises BackendUnavailableError
+        when the breaker is open, DeadlineExceededError on timeout, and
+        re-raises the failure of the call otherwise.
+        """
+        timeout = min(self.timeout_s, remaining_budget(self.timeout_s))
+        if timeout <= 0:
+            BACKEND_CALLS.inc(source=self.name, outcome="timeout")
+            raise DeadlineExceededError(f"No time left to call '{self.name}'.")
+        try:
+            self.breaker.before_call()
+        except BackendUnavailableError:
+            BACKEND_CALLS.inc(source=self.name, outcome="short_circuited")
+            raise
+
+        started = time.monotonic()
+        latencies = self._latencies(operation)
+        # The attempts run in the executor's threads, on behalf of the profiled request if any.
+        function = bind_to_request(function)
+        with phase("backend"):
+            attempts = [self.executor.submit(function)]
+            try:
+                delay = self._hedge_delay(latencies) if hedge else None
+                if delay is not None and delay < timeout:
+                    done, _ = wait(attempts, timeout=delay)
+                    if not done:
+                        attempts.append(self.executor.submit(function))
+                result, winner = self._first_result(attempts, started + timeout)
+            except DeadlineExceededError:
+                self.breaker.on_failure()
+                BACKEND_CALLS.inc(source=self.name, outcome="timeout")
+                raise
+            except Exception:
+                self.breaker.on_failure()
+                BACKEND_CALLS.inc(source=self.name, outcome="failed")
+                raise
+
+        if len(attempts) > 1:
+            HEDGED.inc(
+                source=self.name, winner="hedge" if winner is attempts[1] else "first"
+            )
+        latencies.record(time.monotonic() - started)
+        self.breaker.on_success()
+        BACKEND_CALLS.inc(source=self.name, outcome="ok")
+        return result
+
+    def _latencies(self, operation: str) -> LatencyWindow:
+        with self._lock:
+            window = self.latencies.get(operation)
+            if window is None:
+                window = self.latencies[operation] = LatencyWindow()
+            return window
+
+    def _hedge_delay(self, latencies: LatencyWindow) -> Optional[float]:
+        if self.hedge_quantile is None:
+            return None
+        quantile = latencies.percentile(self.hedge_quantile)
+        if quantile is None:
+            return None
+        return max(quantile, self.hedge_min_delay_s)
+
+    @staticmethod
+    def _first_result(attempts: List[Future], deadline: float) -> Tuple[Any, Future]:
+        """
+        The result of the first attempt that succeeds, with its future. The
+        error of the last attempt is raised if all of them fail.
+        """
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=deadline - time.monotonic(),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                for attempt in pending:
+                    attempt.cancel()
+                raise DeadlineExceededError("Backend call exceeded its deadline.")
+            for attempt in done:
+                if attempt.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return attempt.result(), attempt
+                error = attempt.exception()
+        raise error
@@ -0,0 +1,233 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Hashable, Optional, Tuple, TypeVar
+
+from api.utils.cache import TTLCache
+
+V = TypeVar("V")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    evict_at REAL NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_evict_at_idx ON entries (evict_at);
+"""
+# Larger values (e.g. very long tracks) stay in the local tier only.
+MAX_VALUE_BYTES = 8 * 1024 * 1024
+PURGE_EVERY_WRITES = 256
+
+_MISSING = object()
+
+
+class SharedCache:
+    """
+    Cache tier shared by the worker processes of a host: a SQLite database
+    that every worker opens, meant to live on a tmpfs such as /dev/shm.
+    Entries are grouped in namespaces, expire on wall-clock time and are
+    pickled, like Django's file-based cache, so the file must only be
+    writable by the app's user. Durability is off: losing the file only
+    costs cache misses. Failures are logged and answered as misses, so a
+    broken tier never fails a request. Every `PURGE_EVERY_WRITES` writes, a
+    worker evicts the entries past their stale window and, beyond
+    `max_entries`, the ones closest to it.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10_000):
+        """
+        Opens (creating it if needed) the shared cache at `path`. The
+        connection is opened lazily, once per process.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """
+        Returns `(expires_at, value)` for `key`, expired or not, or None.
+        """
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute(
+                        "SELECT expires_at, value FROM entries WHERE namespace = ? AND key = ?",
+                        (namespace, repr(key)),
+                    )
+                    .fetchone()
+                )
+            if row is None:
+                return None
+            return row[0], pickle.loads(row[1])
+        except Exception as e:
+            print(f"Error reading the shared cache at '{self.path}': {e}")
+            return None
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: float,
+        stale_ttl_seconds: float = 0.0,
+    ) -> None:
+        """
+        Stores `value` under `key` for `ttl_seconds`, kept `stale_ttl_seconds` longer.
+        """
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(blob) > MAX_VALUE_BYTES:
+                return
+            now = time.time()
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, expires_at, evict_at, value) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        namespace,
+                        repr(key),
+                        now + ttl_seconds,
+                        now + ttl_seconds + stale_ttl_seconds,
+                        blob,
+                    ),
+                )
+                self._writes += 1
+                if self._writes % PURGE_EVERY_WRITES == 0:
+                    self._purge(connection, now)
+        except Exception as e:
+            print(f"Error writing the shared cache at '{self.path}': {e}")
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        """
+        Removes `key`, for every worker.
+        """
+        self._execute(
+            "DELETE FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, repr(key)),
+        )
+
+    def clear(self, namespace: str) -> None:
+        """
+        Removes every entry of `namespace`, for every worker.
+        """
+        self._execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def _execute(self, sql: str, params: Tuple[Any, ...]) -> None:
+        try:
+            with self._lock:
+                self._connect().execute(sql, params)
+        except Exception as e:
+            print(f"Error writing the shared cache at '{self.path}': {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        # A forked worker must not reuse its parent's connection.
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=0.2, check_same_thread=False, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.executescript(SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def _purge(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM entries WHERE evict_at < ?", (now,))
+        connection.execute(
+            "DELETE FROM entries WHERE evict_at <= (SELECT evict_at FROM entries "
+            "ORDER BY evict_at DESC LIMIT 1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+
+class TieredCache(TTLCache[V]):
+    """
+    A TTLCache in front of a SharedCache namespace. Local entries live at
+    most `local_ttl_seconds`; local misses are looked up in the shared tier,
+    and writes and invalidations go to both. Workers thus share what any of
+    them loaded, and see another worker's invalidations within
+    `local_ttl_seconds`.
+    """
+
+    def __init__(
+        self,
+        shared: SharedCache,
+        namespace: str,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        stale_ttl_seconds: float = 0.0,
+        local_ttl_seconds: float = 1.0,
+    ):
+        super().__init__(min(ttl_seconds, local_ttl_seconds), max_entries)
+        self.shared = shared
+        self.namespace = namespace
+        self.shared_ttl_seconds = ttl_seconds
+        self.shared_stale_ttl_seconds = stale_ttl_seconds
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        value = super().get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        entry = self.shared.get(self.namespace, key)
+        if entry is None or entry[0] < time.time():
+            return default
+        super().set(key, entry[1])
+        return entry[1]
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Optional[V]:
+        entry = self.shared.get(self.namespace, key)
+        if entry is None or entry[0] + self.shared_stale_ttl_seconds < time.time():
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: V) -> None:
+        super().set(key, value)
+        self.shared.set(
+            self.namespace,
+            key,
+            value,
+            self.shared_ttl_seconds,
+            self.shared_stale_ttl_seconds,
+        )
+
+    def delete(self, key: Hashable) -> None:
+        super().delete(key)
+        self.shared.delete(self.namespace, key)
+
+    def clear(self) -> None:
+        super().clear()
+        self.shared.clear(self.namespace)
+
+
+def build_cache(
+    ttl_seconds: float,
+    max_entries: int = 1024,
+    stale_ttl_seconds: float = 0.0,
+    shared: Optional[SharedCache] = None,
+    namespace: str = "",
+    local_ttl_seconds: float = 1.0,
+) -> TTLCache:
+    """
+    A TieredCache over `shared` when there is one, otherwise a process-local TTLCache.
+    """
+    if shared is None:
+        return TTLCache(ttl_seconds, max_entries, stale_ttl_seconds)
+    return TieredCache(
+        shared,
+        namespace,
+        ttl_seconds,
+        max_entries,
+        stale_ttl_seconds,
+        local_ttl_seconds,
+    )
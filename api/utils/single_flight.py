@@ -0,0 +1,80 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from api.utils.metrics import metrics
+
+V = TypeVar("V")
+
+CALLS = metrics.counter(
+    "coalesced_reads_calls_total", "Backend reads requested through request coalescing."
+)
+COALESCED = metrics.counter(
+    "coalesced_reads_shared_total",
+    "Backend reads answered by an identical call already in flight.",
+)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is running,
+    later callers with the same key wait for it and get its result (or its
+    exception) instead of calling again. Nothing is kept once the call ends,
+    so it is not a cache: the next call after it runs again.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], V]) -> V:
+        """
+        Runs `function` for `key`, or joins the call for `key` already in flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        CALLS.inc(source=self.name)
+
+        if not leader:
+            COALESCED.inc(source=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def forget_all(self) -> None:
+        """
+        Detaches the calls in flight, so later callers start new ones (e.g.
+        after a write that their results would miss). Current waiters still
+        get the detached call's result.
+        """
+        with self._lock:
+            self._calls.clear()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """
+    Normalizes a datetime to naive UTC so aware and naive values can be compared.
+    Naive datetimes are assumed to already be in UTC, as the database does.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_epoch(value: Optional[datetime]) -> Optional[float]:
+    """
+    Converts a datetime to UTC epoch seconds; naive values are taken as UTC.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def from_epoch(value: Optional[float]) -> Optional[datetime]:
+    """
+    Converts epoch seconds back into an aware UTC datetime.
+    """
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc)
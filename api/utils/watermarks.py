@@ -0,0 +1,79 @@
+import bisect
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Hashable, List, Sequence
+
+
+class TimestampWatermarks:
+    """
+    A thread-safe, size-bounded record of the timestamps (integer epoch
+    microseconds) seen per key, to recognize replayed points without a
+    backend lookup. Each key keeps its highest timestamp, the watermark, and
+    the timestamps less than `window_us` below it, as a sorted array: 8 bytes
+    per timestamp. Timestamps above the watermark are new, those in the
+    window are looked up, and older ones are unknown (treated as unseen).
+    When more than `max_keys` keys are tracked, the least recently used is
+    forgotten.
+    """
+
+    def __init__(self, window_us: int, max_keys: int = 10_000):
+        self.window_us = window_us
+        self.max_keys = max_keys
+        self._seen: "OrderedDict[Hashable, array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def unseen(self, key: Hashable, timestamps: Sequence[int]) -> List[int]:
+        """
+        Indexes of the `timestamps` not seen for `key`, keeping only the first
+        of each repeated value.
+        """
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None:
+                self._seen.move_to_end(key)
+                watermark = seen[-1]
+                low = watermark - self.window_us
+            fresh = []
+            batch = set()
+            for index, timestamp in enumerate(timestamps):
+                if timestamp in batch:
+                    continue
+                batch.add(timestamp)
+                if seen is not None and low < timestamp <= watermark:
+                    position = bisect.bisect_left(seen, timestamp)
+                    if position < len(seen) and seen[position] == timestamp:
+                        continue
+                fresh.append(index)
+            return fresh
+
+    def add(self, key: Hashable, timestamps: Sequence[int]) -> None:
+        """
+        Records `timestamps` as seen for `key`, e.g. once they are stored.
+        """
+        if not timestamps:
+            return
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is None:
+                seen = self._seen[key] = array("q")
+            self._seen.move_to_end(key)
+            for timestamp in sorted(timestamps):
+                if not seen or timestamp > seen[-1]:
+                    seen.append(timestamp)
+                    continue
+                position = bisect.bisect_left(seen, timestamp)
+                if position == len(seen) or seen[position] != timestamp:
+                    seen.insert(position, timestamp)
+            expired = bisect.bisect_right(seen, seen[-1] - self.window_us)
+            if expired:
+                del seen[:expired]
+            while len(self._seen) > self.max_keys:
+                self._seen.popitem(last=False)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Drops everything recorded for `key`.
+        """
+        with self._lock:
+            self._seen.pop(key, None)
@@ -0,0 +1,89 @@
+"""
+Runs the benchmark suite: `python -m benchmarks [--quick] [--save-baseline] [--import-profile]`.
+Exits with status 1 when a benchmark regresses beyond the threshold.
+"""
+
+import argparse
+import sys
+
+from benchmarks import (  # noqa: F401 (registers benchmarks)
+    bench_analytics,
+    bench_api,
+    bench_domain,
+    bench_ingest,
+    bench_startup,
+)
+from benchmarks.harness import (
+    REGISTRY,
+    find_regressions,
+    format_report,
+    load_baseline,
+    run_benchmark,
+    save_baseline,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Flights backend benchmark suite.")
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="Only run benchmarks whose name contains this text.",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Skip the slow, large-payload benchmarks."
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the new baseline.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown of the median that counts as a regression (default: 0.25).",
+    )
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="Also print the slowest top-level imports of api.index (python -X importtime).",
+    )
+    args = parser.parse_args()
+
+    selected = [
+        bench
+        for bench in REGISTRY
+        if args.filter.lower() in bench.name.lower() and (bench.quick or not args.quick)
+    ]
+
+    results = []
+    for bench in selected:
+        print(f"running {bench.name} ...", file=sys.stderr)
+        results.append(run_benchmark(bench))
+
+    baseline = load_baseline()
+    print(format_report(results, baseline))
+
+    if args.import_profile:
+        print("\nSlowest imports of api.index (cumulative):")
+        for module, micros in bench_startup.import_profile():
+            print(f"  {module:<40} {micros / 1000:>8.1f} ms")
+
+    if args.save_baseline:
+        save_baseline(results)
+        print(f"\nBaseline updated with {len(results)} results.")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        for name, change in regressions.items():
+            print(f"  {name}: {change:+.1%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
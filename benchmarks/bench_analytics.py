@@ -0,0 +1,101 @@
+"""
+Benchmarks of the grouped emissions analytics: snapshot construction and the
+vectorized aggregation over a synthetic one-million-flight snapshot.
+"""
+
+from benchmarks.datagen import AIRCRAFT_MODELS, AIRPORTS, EPOCH, make_flight_rows
+from benchmarks.harness import benchmark
+
+SNAPSHOT_FLIGHTS = 1_000_000
+
+
+def make_flight_columns(count: int = SNAPSHOT_FLIGHTS, days: int = 730, seed: int = 42):
+    """
+    Builds a FlightColumns snapshot of `count` synthetic flights directly from
+    NumPy arrays (building a million Flight objects first would take minutes).
+    """
+    import numpy as np
+
+    from api.core.domain.flight_columns import (
+        EPOCH_ORDINAL,
+        METRICS,
+        SOURCES,
+        FlightColumns,
+    )
+
+    rng = np.random.default_rng(seed)
+    first_day = EPOCH.date().toordinal() - EPOCH_ORDINAL
+    departures = rng.integers(0, len(AIRPORTS), count)
+    arrivals = (departures + rng.integers(1, len(AIRPORTS), count)) % len(AIRPORTS)
+    airports = sorted(AIRPORTS)
+    routes = [f"{a}-{b}" for a in airports for b in airports]
+    metrics = {
+        (source, metric): rng.gamma(2.0, 500.0, count)
+        for source in SOURCES
+        for metric in METRICS
+    }
+    metrics[("statistical", "co2_kg")][:] = np.nan
+
+    return FlightColumns(
+        departure_day=first_day + rng.integers(0, days, count),
+        groups={
+            "departure_airport": (departures, airports),
+            "arrival_airport": (arrivals, airports),
+            "aircraft_model": (
+                rng.integers(0, len(AIRCRAFT_MODELS), count),
+                sorted(AIRCRAFT_MODELS),
+            ),
+            "route": (departures * len(airports) + arrivals, routes),
+        },
+        metrics=metrics,
+    )
+
+
+@benchmark("FlightColumns.from_flights (x5000)", min_runs=3)
+def bench_build_snapshot():
+    from api.core.domain.flight import Flight
+    from api.core.domain.flight_columns import FlightColumns
+
+    flights = [Flight.from_db_row(row) for row in make_flight_rows(5_000)]
+    return lambda: FlightColumns.from_flights(flights)
+
+
+def _register_aggregate_benchmark(label: str, **query) -> None:
+    @benchmark(
+        f"FlightColumns.aggregate 1M ({label})", quick=False, min_runs=3, max_runs=20
+    )
+    def bench_aggregate():
+        columns = make_flight_columns()
+        return lambda: columns.aggregate(**query)
+
+
+_register_aggregate_benchmark("day")
+_register_aggregate_benchmark(
+    "month x aircraft_model", bucket="month", group_by="aircraft_model"
+)
+_register_aggregate_benchmark("week x route", bucket="week", group_by="route")
+
+
+@benchmark("GET /analytics/emissions (cached, 5k flights)")
+def bench_analytics_route():
+    from fastapi.testclient import TestClient
+
+    from api.adapters.repositories.memory.flight_repository import (
+        InMemoryFlightRepository,
+    )
+    from api.adapters.routes import dependencies
+    from api.core.domain.flight import Flight
+    from api.core.use_cases.emissions_analytics_use_cases import (
+        EmissionsAnalyticsUseCase,
+    )
+    from api.index import app
+
+    flights = InMemoryFlightRepository(
+        Flight.from_db_row(row) for row in make_flight_rows(5_000)
+    )
+    analytics_service = EmissionsAnalyticsUseCase(flight_port=flights)
+    app.dependency_overrides[dependencies.get_analytics_service] = (
+        lambda: analytics_service
+    )
+    client = TestClient(app)
+    return lambda: client.get("/analytics/emissions?bucket=week&group_by=route")
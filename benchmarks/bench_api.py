@@ -0,0 +1,114 @@
+"""
+End-to-end benchmarks of the HTTP routes through FastAPI's TestClient, with the
+indexed in-memory repositories as the backend.
+"""
+
+import json
+from itertools import count
+
+from benchmarks.datagen import make_flight_rows, make_position_payloads
+from benchmarks.harness import benchmark
+
+FLIGHT_COUNT = 5_000
+
+
+def build_client(flight_count: int = FLIGHT_COUNT):
+    """
+    Returns a TestClient for the app wired to fresh in-memory repositories,
+    plus the repositories themselves.
+    """
+    from fastapi.testclient import TestClient
+
+    from api.adapters.repositories.memory.flight_position_repository import (
+        InMemoryFlightPositionRepository,
+    )
+    from api.adapters.repositories.memory.flight_repository import (
+        InMemoryFlightRepository,
+    )
+    from api.adapters.routes import dependencies
+    from api.core.domain.flight import Flight
+    from api.core.use_cases.flight_position_use_cases import FlightPositionUseCase
+    from api.core.use_cases.flight_summary_use_cases import GetFlightSummaryUseCase
+    from api.core.use_cases.flight_use_cases import FlightUseCase
+    from api.index import app
+
+    flights = InMemoryFlightRepository(
+        Flight.from_db_row(row) for row in make_flight_rows(flight_count)
+    )
+    positions = InMemoryFlightPositionRepository()
+    flight_service = FlightUseCase(flight_port=flights)
+    position_service = FlightPositionUseCase(position_port=positions)
+    summary_service = GetFlightSummaryUseCase(flight_port=flights)
+    app.dependency_overrides.update(
+        {
+            dependencies.get_flight_service: lambda: flight_service,
+            dependencies.get_position_service: lambda: position_service,
+            dependencies.get_summary_service: lambda: summary_service,
+        }
+    )
+
+    return TestClient(app), flights, positions
+
+
+@benchmark("GET /flights (no filters, limit=100)")
+def bench_list_flights():
+    client, _, _ = build_client()
+    return lambda: client.get("/flights?limit=100")
+
+
+@benchmark("GET /flights (airport + model filters)")
+def bench_list_flights_filtered():
+    client, _, _ = build_client()
+    return lambda: client.get("/flights?airport=KJFK&aircraft_model=B7&limit=100")
+
+
+@benchmark("GET /flights (search + date)")
+def bench_list_flights_search():
+    client, _, _ = build_client()
+    return lambda: client.get("/flights?search=xx1&flight_date=2025-02-01")
+
+
+@benchmark("GET /flights/{id}")
+def bench_get_by_id():
+    client, _, _ = build_client()
+    ids = count(1)
+    return lambda: client.get(f"/flights/{next(ids) % FLIGHT_COUNT + 1}")
+
+
+@benchmark("GET /flights/{fr24_id}/fr24")
+def bench_get_by_fr24_id():
+    client, _, _ = build_client()
+    ids = count(1)
+    return lambda: client.get(f"/flights/{next(ids) % FLIGHT_COUNT + 1:08x}/fr24")
+
+
+@benchmark("GET /flights/summary")
+def bench_summary():
+    client, _, _ = build_client()
+    return lambda: client.get("/flights/summary")
+
+
+def _register_position_benchmarks(size: int, quick: bool) -> None:
+    label = f"{size // 1000}k"
+
+    @benchmark(f"POST /flights/{{id}}/positions ({label})", quick=quick, min_runs=3)
+    def bench_post_positions():
+        client, _, positions = build_client(flight_count=10)
+        body = json.dumps(make_position_payloads(size))
+        headers = {"Content-Type": "application/json"}
+
+        def post():
+            positions.delete_positions_by_flight_id(1)
+            client.post("/flights/1/positions", content=body, headers=headers)
+
+        return post
+
+    @benchmark(f"GET /flights/{{id}}/positions ({label})", quick=quick, min_runs=3)
+    def bench_get_positions():
+        client, _, _ = build_client(flight_count=10)
+        client.post("/flights/1/positions", json=make_position_payloads(size))
+        return lambda: client.get("/flights/1/positions")
+
+
+for _size, _quick in ((1_000, True), (10_000, True), (100_000, False)):
+    _register_position_benchmarks(_size, _quick)
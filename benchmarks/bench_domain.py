@@ -0,0 +1,81 @@
+"""
+Micro-benchmarks of the domain conversions and DTO validation on the hot paths.
+"""
+
+from benchmarks.datagen import make_flight_rows, make_position_payloads
+from benchmarks.harness import benchmark
+
+BATCH = 1_000
+
+
+@benchmark("Flight.from_db_row (x1000)")
+def bench_from_db_row():
+    from api.core.domain.flight import Flight
+
+    rows = make_flight_rows(BATCH)
+    return lambda: [Flight.from_db_row(dict(row)) for row in rows]
+
+
+@benchmark("Flight.to_dict (x1000)")
+def bench_to_dict():
+    from api.core.domain.flight import Flight
+
+    flights = [Flight.from_db_row(row) for row in make_flight_rows(BATCH)]
+    return lambda: [flight.to_dict() for flight in flights]
+
+
+@benchmark("FlightPostRequest validate + to_domain_model (x1000)")
+def bench_flight_dto():
+    from api.adapters.dtos.flight_dtos import FlightPostRequest
+
+    payloads = make_flight_rows(BATCH)
+    for payload in payloads:
+        for key in ("flight_id", "created_at", "last_updated"):
+            payload.pop(key)
+    return lambda: [
+        FlightPostRequest.model_validate(payload).to_domain_model()
+        for payload in payloads
+    ]
+
+
+@benchmark("validate_flights batch (x1000)")
+def bench_flight_batch():
+    from api.adapters.dtos.batch_validation import validate_flights
+
+    payloads = make_flight_rows(BATCH)
+    for payload in payloads:
+        for key in ("flight_id", "created_at", "last_updated"):
+            payload.pop(key)
+    return lambda: validate_flights(payloads)
+
+
+@benchmark("FlightPositionPostRequest json + validate + to_domain_model (x10000)")
+def bench_position_dto():
+    import json
+
+    from api.adapters.dtos.flight_position_dtos import FlightPositionPostRequest
+
+    body = json.dumps(make_position_payloads(10 * BATCH)).encode()
+    return lambda: [
+        FlightPositionPostRequest.model_validate(payload).to_domain_model(1)
+        for payload in json.loads(body)
+    ]
+
+
+@benchmark("validate_positions batch from JSON (x10000)")
+def bench_position_batch():
+    import json
+
+    from api.adapters.dtos.batch_validation import validate_positions
+
+    body = json.dumps(make_position_payloads(10 * BATCH)).encode()
+    return lambda: validate_positions(1, body)
+
+
+@benchmark("analyze_track (10000 positions)")
+def bench_analyze_track():
+    from api.adapters.dtos.batch_validation import validate_positions
+    from api.core.domain.track_analytics import analyze_track
+
+    positions = validate_positions(1, make_position_payloads(10 * BATCH))
+    return lambda: analyze_track(1, positions)
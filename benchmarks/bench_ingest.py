@@ -0,0 +1,86 @@
+"""
+Benchmarks of position ingestion from a tracker feed in which 30% of the posts
+replay an earlier one (client retries and overlapping uploads), stored in a
+fresh SQLite database on every run, with and without deduplication in front.
+"""
+
+import random
+from datetime import timedelta
+from typing import List, Tuple
+
+from benchmarks.datagen import EPOCH
+from benchmarks.harness import benchmark
+
+FLIGHTS = 200
+POSTS_PER_FLIGHT = 50
+POINTS_PER_POST = 5
+REPLAY_FRACTION = 0.3
+
+
+def make_replayed_feed(
+    flights: int = FLIGHTS,
+    posts_per_flight: int = POSTS_PER_FLIGHT,
+    points_per_post: int = POINTS_PER_POST,
+    replay_fraction: float = REPLAY_FRACTION,
+    seed: int = 42,
+) -> List[Tuple[int, list]]:
+    """
+    Builds (flight_id, positions) posts interleaved across flights. Each post
+    is, with probability `replay_fraction`, a copy of one of the flight's last
+    three posts, and otherwise its next `points_per_post` points, 5 s apart.
+    """
+    from api.core.domain.flight_position import FlightPosition
+
+    rng = random.Random(seed)
+    sent = {flight_id: [] for flight_id in range(1, flights + 1)}
+    feed = []
+    for _ in range(posts_per_flight):
+        for flight_id, history in sent.items():
+            if history and rng.random() < replay_fraction:
+                feed.append((flight_id, rng.choice(history[-3:])))
+                continue
+            first = len(history) * points_per_post
+            post = [
+                FlightPosition(
+                    flight_id,
+                    EPOCH + timedelta(seconds=5 * (first + i)),
+                    40.0 + (first + i) * 0.001,
+                    -3.0 + flight_id * 0.01,
+                    11000,
+                )
+                for i in range(points_per_post)
+            ]
+            history.append(post)
+            feed.append((flight_id, post))
+    return feed
+
+
+def _register_ingest_benchmark(deduplicate: bool) -> None:
+    label = "sqlite + dedup" if deduplicate else "sqlite"
+
+    @benchmark(f"Position ingest, 30% replayed ({label})", min_runs=3)
+    def bench_ingest():
+        from api.adapters.repositories.deduplicating.flight_position_repository import (
+            DeduplicatingFlightPositionRepository,
+        )
+        from api.adapters.repositories.sqlite.database import SQLiteDatabase
+        from api.adapters.repositories.sqlite.flight_position_repository import (
+            SQLiteFlightPositionRepository,
+        )
+
+        feed = make_replayed_feed()
+
+        def ingest():
+            database = SQLiteDatabase(":memory:")
+            repository = SQLiteFlightPositionRepository(database)
+            if deduplicate:
+                repository = DeduplicatingFlightPositionRepository(repository)
+            for flight_id, positions in feed:
+                repository.add_positions(flight_id, positions)
+            database.close()
+
+        return ingest
+
+
+for _deduplicate in (False, True):
+    _register_ingest_benchmark(_deduplicate)
@@ -0,0 +1,66 @@
+"""
+Cold-start benchmarks. Each run spawns a fresh interpreter, as a serverless
+invocation would, with the default Supabase backend configured (pointed at an
+unreachable address, so nothing here may touch the network before a request
+that needs the backend).
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.harness import benchmark
+
+ROOT = Path(__file__).resolve().parent.parent
+COLD_ENV = {
+    "REPOSITORY_BACKEND": "supabase",
+    "SUPABASE_URL": "http://127.0.0.1:9",
+    "SUPABASE_KEY": "cold-start-key",
+}
+
+FIRST_RESPONSE = (
+    "from fastapi.testclient import TestClient\n"
+    "from api.index import app\n"
+    "assert TestClient(app).get('/health-check').status_code == 200\n"
+)
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT,
+        env={**os.environ, **COLD_ENV},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+@benchmark("cold start: import api.index", min_runs=5, max_runs=20)
+def bench_import_app():
+    return lambda: _run("import api.index")
+
+
+@benchmark("cold start: first response (/health-check)", min_runs=5, max_runs=20)
+def bench_first_response():
+    return lambda: _run(FIRST_RESPONSE)
+
+
+def import_profile(module: str = "api.index", top: int = 15) -> List[Tuple[str, int]]:
+    """
+    Returns the `top` modules by cumulative import time (microseconds) when
+    importing `module` in a fresh interpreter, from `python -X importtime`.
+    """
+    stderr = _run(f"import {module}", "-X", "importtime").stderr
+    cumulative: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = (
+            part.strip() for part in line[len("import time:") :].split("|")
+        )
+        if name.strip() and not name.startswith(" "):
+            cumulative[name.strip()] = int(cumulative_us)
+    return sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:top]
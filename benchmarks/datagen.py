@@ -0,0 +1,131 @@
+"""
+Deterministic synthetic data used by the benchmark suite and load tests.
+Rows mimic what Supabase returns for the 'flights' and 'flight_positions' tables.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+AIRPORTS = [
+    "KLAX",
+    "KJFK",
+    "KSFO",
+    "KORD",
+    "KATL",
+    "KDFW",
+    "KDEN",
+    "KSEA",
+    "EGLL",
+    "LFPG",
+    "EDDF",
+    "EHAM",
+    "LEMD",
+    "LIRF",
+    "SCEL",
+    "SAEZ",
+    "SBGR",
+    "MMMX",
+    "SKBO",
+    "SPJC",
+    "RJTT",
+    "VHHH",
+    "WSSS",
+    "OMDB",
+]
+AIRCRAFT_MODELS = ["B738", "A320", "A321", "B77W", "B789", "A359", "E190", "A20N"]
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def make_flight_row(
+    rng: random.Random, flight_id: int, days: int = 90
+) -> Dict[str, Any]:
+    """
+    Builds one 'flights' row as returned by PostgREST (ISO strings and JSONB dicts).
+    """
+    departure, arrival = rng.sample(AIRPORTS, 2)
+    departure_time = EPOCH + timedelta(seconds=rng.randrange(days * 86400))
+    duration_s = rng.randrange(3600, 14 * 3600)
+    distance = duration_s / 3600 * rng.uniform(650, 850)
+    detailed_fuel = distance * rng.uniform(2.5, 12.0)
+    simulated_fuel = detailed_fuel * rng.uniform(0.9, 1.2)
+    pax = rng.randrange(80, 350)
+    now = (EPOCH + timedelta(days=days)).isoformat()
+
+    return {
+        "flight_id": flight_id,
+        "fr24_id": f"{flight_id:08x}",
+        "flight": f"XX{flight_id % 10000}",
+        "callsign": f"XXX{flight_id % 10000}",
+        "aircraft_model": rng.choice(AIRCRAFT_MODELS),
+        "aircraft_reg": f"N{flight_id % 100000}X",
+        "departure_icao": departure,
+        "arrival_icao": arrival,
+        "distance_calculated_km": round(distance, 1),
+        "great_circle_distance_km": round(distance * 0.97, 1),
+        "departure_time_utc": departure_time.isoformat(),
+        "arrival_time_utc": (
+            departure_time + timedelta(seconds=duration_s)
+        ).isoformat(),
+        "flight_duration_s": duration_s,
+        "phase_durations_s": {
+            "takeoff": 60,
+            "climb": 1200,
+            "cruise": max(duration_s - 2760, 0),
+            "descent": 1200,
+            "landing": 300,
+        },
+        "emission_comparison": {
+            "detailed_calculation": {
+                "total_fuel_kg": round(detailed_fuel, 1),
+                "co2_total_kg": round(detailed_fuel * 3.16, 1),
+                "co2_per_passenger_kg": round(detailed_fuel * 3.16 / pax, 2),
+                "total_climate_impact_co2e_per_pax_kg": round(
+                    detailed_fuel * 5.1 / pax, 2
+                ),
+                "efficiency_kg_pax_km": round(detailed_fuel / pax / distance, 4),
+            },
+            "statistical_simulation": {
+                "total_fuel_kg": round(simulated_fuel, 1),
+                "co2_per_passenger_kg": round(simulated_fuel * 3.16 / pax, 2),
+                "total_climate_impact_co2e_per_pax_kg": round(
+                    simulated_fuel * 5.1 / pax, 2
+                ),
+                "efficiency_kg_pax_km": round(simulated_fuel / pax / distance, 4),
+            },
+        },
+        "created_at": now,
+        "last_updated": now,
+    }
+
+
+def make_flight_rows(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Builds `count` flight rows with ids 1..count.
+    """
+    rng = random.Random(seed)
+    return [make_flight_row(rng, flight_id) for flight_id in range(1, count + 1)]
+
+
+def make_position_payloads(
+    count: int, seed: int = 42, start: datetime = EPOCH
+) -> List[Dict[str, Any]]:
+    """
+    Builds `count` position payloads (the JSON body of POST /flights/{id}/positions)
+    following a straight track sampled every 5 seconds.
+    """
+    rng = random.Random(seed)
+    lat, lon = rng.uniform(-40, 40), rng.uniform(-120, 120)
+    payloads = []
+    for i in range(count):
+        payloads.append(
+            {
+                "timestamp": (start + timedelta(seconds=5 * i)).isoformat(),
+                "latitude": round(lat + i * 0.0004, 6),
+                "longitude": round(lon + i * 0.0006, 6),
+                "altitude": min(i * 15, 11000),
+                "ground_speed": 820,
+                "vertical_rate": 0,
+            }
+        )
+    return payloads
@@ -0,0 +1,569 @@
+"""
+A local stand-in for the Supabase PostgREST API, used to load-test the real HTTP
+path of the backend without a live Supabase project.
+
+It serves the 'flights' and 'flight_positions' tables from memory, understands
+the filters the repositories emit (`eq`, `neq`, `gt`, `gte`, `lt`, `lte`,
+`ilike`, `like`, `in`, `or=(...)`, `offset`/`limit`, `order`, single-object
+responses and `Prefer: count=...`) and the `get_flight_summary_metrics` and
+`find_flights_in_area` RPCs.
+Latency, jitter and errors can be injected to simulate a degraded backend
+(`/__admin/faults`), and `/__admin/stats` counts the requests served.
+
+Run it with:
+    python -m benchmarks.fake_postgrest --port 54321 --flights 10000 --latency-ms 20
+and point the backend at it with SUPABASE_URL=http://127.0.0.1:54321.
+"""
+
+import argparse
+import asyncio
+import functools
+import itertools
+import random
+import re
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from api.core.domain.geo import BoundingBox, Circle
+from benchmarks.datagen import make_flight_rows, make_position_payloads
+
+SINGLE_OBJECT = "application/vnd.pgrst.object+json"
+PRIMARY_KEYS = {"flights": "flight_id", "flight_positions": "position_id"}
+RESERVED_PARAMS = {
+    "select",
+    "offset",
+    "limit",
+    "order",
+    "or",
+    "and",
+    "on_conflict",
+    "columns",
+}
+
+
+@dataclass
+class FaultConfig:
+    """
+    Fault injection settings, applied to every PostgREST request.
+
+    Attributes:
+        latency_ms (float): Base latency added to each response.
+        jitter_ms (float): Uniform jitter (+/-) around the base latency.
+        error_rate (float): Probability [0, 1] of answering with `error_status`.
+        error_status (int): HTTP status used for injected errors.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+    def delay_s(self, rng: random.Random) -> float:
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000
+
+
+class Table:
+    """An in-memory table with an auto-incrementing primary key."""
+
+    def __init__(self, primary_key: str):
+        self.primary_key = primary_key
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def insert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        if row.get(self.primary_key) is None:
+            row[self.primary_key] = next(self._ids)
+        else:
+            self._ids = itertools.count(max(next(self._ids), row[self.primary_key] + 1))
+        self.rows[row[self.primary_key]] = row
+        return row
+
+
+def _parse_literal(row_value: Any, literal: str) -> Any:
+    """Coerces a filter literal to the type of the column value it is compared with."""
+    if literal == "null":
+        return None
+    if isinstance(row_value, bool):
+        return literal == "true"
+    if isinstance(row_value, (int, float)):
+        return float(literal)
+    return literal
+
+
+def _as_comparable(value: Any) -> Any:
+    """Turns ISO timestamps into datetimes so ranges compare chronologically."""
+    if isinstance(value, str) and re.match(r"^\d{4}-\d{2}-\d{2}", value):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _compare(row_value: Any, literal: str, op: Callable[[Any, Any], bool]) -> bool:
+    if row_value is None:
+        return False
+    left, right = _as_comparable(row_value), _as_comparable(
+        _parse_literal(row_value, literal)
+    )
+    if isinstance(left, datetime) and isinstance(right, datetime):
+        if (left.tzinfo is None) != (right.tzinfo is None):
+            left, right = left.replace(tzinfo=None), right.replace(tzinfo=None)
+    try:
+        return op(left, right)
+    except TypeError:
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _like(pattern: str, case_insensitive: bool) -> "re.Pattern[str]":
+    regex = "".join(
+        ".*" if char in "%*" else "." if char == "_" else re.escape(char)
+        for char in pattern
+    )
+    return re.compile(
+        f"^{regex}$", re.IGNORECASE | re.DOTALL if case_insensitive else re.DOTALL
+    )
+
+
+OPERATORS: Dict[str, Callable[[Any, str], bool]] = {
+    "eq": lambda v, lit: _compare(v, lit, lambda a, b: a == b),
+    "neq": lambda v, lit: _compare(v, lit, lambda a, b: a != b),
+    "gt": lambda v, lit: _compare(v, lit, lambda a, b: a > b),
+    "gte": lambda v, lit: _compare(v, lit, lambda a, b: a >= b),
+    "lt": lambda v, lit: _compare(v, lit, lambda a, b: a < b),
+    "lte": lambda v, lit: _compare(v, lit, lambda a, b: a <= b),
+    "like": lambda v, lit: v is not None and bool(_like(lit, False).match(str(v))),
+    "ilike": lambda v, lit: v is not None and bool(_like(lit, True).match(str(v))),
+    "is": lambda v, lit: (v is None) if lit == "null" else v == (lit == "true"),
+    "in": lambda v, lit: any(
+        _compare(v, item.strip('"'), lambda a, b: a == b)
+        for item in lit.strip("()").split(",")
+    ),
+}
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _condition(column: str, expression: str) -> Predicate:
+    """Builds a predicate from `column` and a PostgREST expression such as `gte.10`."""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op_name, _, literal = expression.partition(".")
+    operator = OPERATORS.get(op_name)
+    if operator is None:
+        raise ValueError(f"Unsupported operator '{op_name}'")
+    if negate:
+        return lambda row: not operator(row.get(column), literal)
+    return lambda row: operator(row.get(column), literal)
+
+
+def _split_top_level(expression: str) -> List[str]:
+    """Splits `a.eq.1,b.in.(1,2)` on the commas that are not inside parentheses."""
+    parts, depth, current = [], 0, []
+    for char in expression:
+        if char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current.append(char)
+    parts.append("".join(current))
+    return [part for part in parts if part]
+
+
+def _or_condition(expression: str) -> Predicate:
+    """Builds a predicate from an `or=(col.op.value,...)` parameter."""
+    predicates = []
+    for part in _split_top_level(expression.strip()[1:-1]):
+        column, _, rest = part.partition(".")
+        predicates.append(_condition(column, rest))
+    return lambda row: any(predicate(row) for predicate in predicates)
+
+
+def parse_filters(params: List[Tuple[str, str]]) -> List[Predicate]:
+    """Turns the query string of a PostgREST request into a list of predicates (AND)."""
+    predicates = []
+    for key, value in params:
+        if key == "or":
+            predicates.append(_or_condition(value))
+        elif key not in RESERVED_PARAMS:
+            predicates.append(_condition(key, value))
+    return predicates
+
+
+def _order(rows: List[Dict[str, Any]], order: Optional[str]) -> List[Dict[str, Any]]:
+    if not order:
+        return rows
+    for term in reversed(order.split(",")):
+        column, _, direction = term.partition(".")
+        descending = direction.startswith("desc")
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key=lambda row: _as_comparable(row[column]), reverse=descending)
+        rows = present + missing
+    return rows
+
+
+def summary_metrics(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Mirrors the `get_flight_summary_metrics` SQL function over raw flight rows."""
+    distances = [
+        row["distance_calculated_km"]
+        for row in rows
+        if row.get("distance_calculated_km") is not None
+    ]
+    fuel_saving = co2_saving = 0.0
+    for row in rows:
+        comparison = row.get("emission_comparison") or {}
+        detailed = comparison.get("detailed_calculation") or {}
+        simulated = comparison.get("statistical_simulation") or {}
+        if (
+            detailed.get("total_fuel_kg") is not None
+            and simulated.get("total_fuel_kg") is not None
+        ):
+            fuel_saving += simulated["total_fuel_kg"] - detailed["total_fuel_kg"]
+        if (
+            detailed.get("co2_per_passenger_kg") is not None
+            and simulated.get("co2_per_passenger_kg") is not None
+        ):
+            co2_saving += (
+                simulated["co2_per_passenger_kg"] - detailed["co2_per_passenger_kg"]
+            )
+    return {
+        "total_flights": len(rows),
+        "avg_distance": sum(distances) / len(distances) if distances else 0.0,
+        "total_fuel_saving": fuel_saving,
+        "total_co2_saving": co2_saving,
+    }
+
+
+def _as_utc(value: Optional[str]) -> Optional[datetime]:
+    """Parses an ISO timestamp, taking naive ones as UTC like a timestamptz column."""
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def area_crossings(
+    rows: List[Dict[str, Any]], params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Mirrors the `find_flights_in_area` SQL function over raw position rows."""
+    if params.get("radius_km") is not None:
+        area = Circle(params["center_lat"], params["center_lon"], params["radius_km"])
+    else:
+        area = BoundingBox(
+            params["min_lat"], params["min_lon"], params["max_lat"], params["max_lon"]
+        )
+    start = _as_utc(params.get("start_time"))
+    end = _as_utc(params.get("end_time"))
+    crossings: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        timestamp = _as_utc(row["timestamp"])
+        if (
+            start is not None
+            and timestamp < start
+            or end is not None
+            and timestamp >= end
+        ):
+            continue
+        if not area.contains(row["latitude"], row["longitude"]):
+            continue
+        crossing = crossings.setdefault(
+            row["flight_id"],
+            {
+                "flight_id": row["flight_id"],
+                "entry_time": timestamp,
+                "exit_time": timestamp,
+                "points": 0,
+            },
+        )
+        crossing["entry_time"] = min(crossing["entry_time"], timestamp)
+        crossing["exit_time"] = max(crossing["exit_time"], timestamp)
+        crossing["points"] += 1
+    return [
+        {
+            **crossing,
+            "entry_time": crossing["entry_time"].isoformat(),
+            "exit_time": crossing["exit_time"].isoformat(),
+        }
+        for crossing in sorted(
+            crossings.values(), key=lambda crossing: crossing["entry_time"]
+        )
+    ]
+
+
+def create_app(
+    flights: int = 1_000,
+    positions_per_flight: int = 0,
+    faults: Optional[FaultConfig] = None,
+    seed: int = 42,
+) -> FastAPI:
+    """
+    Builds the stand-in application seeded with `flights` synthetic flights and
+    `positions_per_flight` positions for each of them.
+    """
+    app = FastAPI(title="Fake PostgREST")
+    app.state.faults = faults or FaultConfig()
+    rng = random.Random(seed)
+    tables = {name: Table(pk) for name, pk in PRIMARY_KEYS.items()}
+
+    for row in make_flight_rows(flights, seed=seed):
+        tables["flights"].insert(row)
+        for payload in make_position_payloads(
+            positions_per_flight, seed=row["flight_id"]
+        ):
+            tables["flight_positions"].insert(
+                {**payload, "flight_id": row["flight_id"]}
+            )
+
+    stats = {"requests": 0}
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path.startswith("/__admin"):
+            return await call_next(request)
+        stats["requests"] += 1
+        config: FaultConfig = app.state.faults
+        delay = config.delay_s(rng)
+        if delay:
+            await asyncio.sleep(delay)
+        if config.error_rate and rng.random() < config.error_rate:
+            return JSONResponse(
+                {
+                    "code": "PGRST000",
+                    "message": "Injected failure",
+                    "details": None,
+                    "hint": None,
+                },
+                status_code=config.error_status,
+            )
+        return await call_next(request)
+
+    @app.get("/__admin/faults")
+    def get_faults() -> dict:
+        return asdict(app.state.faults)
+
+    @app.get("/__admin/stats")
+    def get_stats() -> dict:
+        return stats
+
+    @app.put("/__admin/faults")
+    def set_faults(config: dict) -> dict:
+        app.state.faults = FaultConfig(**{**asdict(app.state.faults), **config})
+        return asdict(app.state.faults)
+
+    def _table(name: str) -> Table:
+        if name not in tables:
+            raise KeyError(name)
+        return tables[name]
+
+    def _not_found(name: str) -> JSONResponse:
+        return JSONResponse(
+            {"code": "42P01", "message": f'relation "public.{name}" does not exist'},
+            status_code=404,
+        )
+
+    def _select(request: Request, table: Table) -> List[Dict[str, Any]]:
+        params = list(request.query_params.multi_items())
+        predicates = parse_filters(params)
+        with table.lock:
+            rows = [
+                row for row in table.rows.values() if all(p(row) for p in predicates)
+            ]
+        return rows
+
+    def _prefer(request: Request) -> Dict[str, str]:
+        prefs = {}
+        for item in request.headers.get("prefer", "").split(","):
+            key, _, value = item.strip().partition("=")
+            if key:
+                prefs[key] = value
+        return prefs
+
+    def _respond(
+        request: Request,
+        rows: List[Dict[str, Any]],
+        status: int = 200,
+        total: Optional[int] = None,
+        offset: int = 0,
+    ) -> Response:
+        select = request.query_params.get("select", "*")
+        if select != "*":
+            columns = [column.strip() for column in select.split(",")]
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+
+        headers = {}
+        if total is not None or rows:
+            end = offset + len(rows) - 1
+            span = f"{offset}-{end}" if rows else "*"
+            headers["Content-Range"] = f"{span}/{total if total is not None else '*'}"
+
+        if request.headers.get("accept") == SINGLE_OBJECT:
+            if len(rows) != 1:
+                return JSONResponse(
+                    {
+                        "code": "PGRST116",
+                        "message": "JSON object requested, multiple (or no) rows returned",
+                        "details": f"The result contains {len(rows)} rows",
+                        "hint": None,
+                    },
+                    status_code=406,
+                )
+            return JSONResponse(rows[0], status_code=status, headers=headers)
+        return JSONResponse(rows, status_code=status, headers=headers)
+
+    @app.get("/rest/v1/{name}")
+    def select_rows(name: str, request: Request) -> Response:
+        try:
+            table = _table(name)
+        except KeyError:
+            return _not_found(name)
+        rows = _order(_select(request, table), request.query_params.get("order"))
+        total = len(rows) if "count" in _prefer(request) else None
+        offset = int(request.query_params.get("offset", 0))
+        limit = request.query_params.get("limit")
+        rows = (
+            rows[offset : offset + int(limit)] if limit is not None else rows[offset:]
+        )
+        return _respond(request, rows, total=total, offset=offset)
+
+    @app.head("/rest/v1/{name}")
+    def count_rows(name: str, request: Request) -> Response:
+        try:
+            table = _table(name)
+        except KeyError:
+            return _not_found(name)
+        total = len(_select(request, table))
+        return Response(status_code=200, headers={"Content-Range": f"*/{total}"})
+
+    @app.post("/rest/v1/{name}")
+    async def insert_rows(name: str, request: Request) -> Response:
+        try:
+            table = _table(name)
+        except KeyError:
+            return _not_found(name)
+        payload = await request.json()
+        payload = payload if isinstance(payload, list) else [payload]
+        prefs = _prefer(request)
+        resolution = prefs.get("resolution")
+        conflict_columns = [
+            column
+            for column in request.query_params.get(
+                "on_conflict", table.primary_key
+            ).split(",")
+            if column
+        ]
+
+        written = []
+        with table.lock:
+            index = (
+                {
+                    tuple(row.get(c) for c in conflict_columns): row
+                    for row in table.rows.values()
+                }
+                if resolution
+                else {}
+            )
+            for item in payload:
+                key = tuple(item.get(c) for c in conflict_columns)
+                existing = index.get(key) if resolution else None
+                if existing is not None:
+                    if resolution == "merge-duplicates":
+                        existing.update(item)
+                        written.append(existing)
+                    continue
+                row = table.insert(item)
+                index[key] = row
+                written.append(row)
+
+        if prefs.get("return") == "representation":
+            return _respond(request, written, status=201)
+        return Response(status_code=201)
+
+    @app.patch("/rest/v1/{name}")
+    async def update_rows(name: str, request: Request) -> Response:
+        try:
+            table = _table(name)
+        except KeyError:
+            return _not_found(name)
+        changes = await request.json()
+        rows = _select(request, table)
+        with table.lock:
+            for row in rows:
+                row.update(changes)
+        if _prefer(request).get("return") == "representation":
+            return _respond(request, rows)
+        return Response(status_code=204)
+
+    @app.delete("/rest/v1/{name}")
+    def delete_rows(name: str, request: Request) -> Response:
+        try:
+            table = _table(name)
+        except KeyError:
+            return _not_found(name)
+        rows = _select(request, table)
+        with table.lock:
+            for row in rows:
+                table.rows.pop(row[table.primary_key], None)
+        if _prefer(request).get("return") == "representation":
+            return _respond(request, rows)
+        return Response(status_code=204)
+
+    @app.post("/rest/v1/rpc/get_flight_summary_metrics")
+    def get_flight_summary_metrics() -> List[Dict[str, Any]]:
+        with tables["flights"].lock:
+            rows = list(tables["flights"].rows.values())
+        return [summary_metrics(rows)]
+
+    @app.post("/rest/v1/rpc/find_flights_in_area")
+    async def find_flights_in_area(request: Request) -> List[Dict[str, Any]]:
+        params = await request.json()
+        with tables["flight_positions"].lock:
+            rows = list(tables["flight_positions"].rows.values())
+        return area_crossings(rows, params)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Local PostgREST stand-in with fault injection."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--flights", type=int, default=10_000)
+    parser.add_argument("--positions-per-flight", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(
+        flights=args.flights,
+        positions_per_flight=args.positions_per_flight,
+        faults=FaultConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+        ),
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+A small timing harness: benchmarks register a setup function that returns the
+callable to time, results are compared against a stored JSON baseline.
+"""
+
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark: `setup()` prepares state and returns the timed callable."""
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    quick: bool = True
+    min_runs: int = 5
+    max_runs: int = 200
+    min_time_s: float = 0.5
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing statistics for one benchmark, in seconds per call."""
+
+    name: str
+    runs: int
+    median_s: float
+    p95_s: float
+    min_s: float
+    ops_per_s: float = field(init=False)
+
+    def __post_init__(self):
+        self.ops_per_s = 1.0 / self.median_s if self.median_s else 0.0
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(name: str, *, quick: bool = True, min_runs: int = 5, max_runs: int = 200):
+    """
+    Registers a benchmark setup function. Benchmarks with `quick=False` are
+    skipped when the suite runs with `--quick`.
+    """
+
+    def decorator(setup: Callable[[], Callable[[], object]]):
+        REGISTRY.append(
+            Benchmark(
+                name=name,
+                setup=setup,
+                quick=quick,
+                min_runs=min_runs,
+                max_runs=max_runs,
+            )
+        )
+        return setup
+
+    return decorator
+
+
+def run_benchmark(bench: Benchmark) -> BenchmarkResult:
+    """
+    Runs one warm-up call, then times calls until both `min_runs` and
+    `min_time_s` are reached (capped at `max_runs`).
+    """
+    func = bench.setup()
+    func()
+
+    durations: List[float] = []
+    started = time.perf_counter()
+    while len(durations) < bench.max_runs:
+        t0 = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - t0)
+        if (
+            len(durations) >= bench.min_runs
+            and time.perf_counter() - started >= bench.min_time_s
+        ):
+            break
+
+    durations.sort()
+    p95_index = min(len(durations) - 1, int(round(0.95 * (len(durations) - 1))))
+    return BenchmarkResult(
+        name=bench.name,
+        runs=len(durations),
+        median_s=statistics.median(durations),
+        p95_s=durations[p95_index],
+        min_s=durations[0],
+    )
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, dict]:
+    """Loads the stored baseline, keyed by benchmark name."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(results: List[BenchmarkResult], path: Path = BASELINE_PATH) -> None:
+    """Merges `results` into the stored baseline file."""
+    baseline = load_baseline(path)
+    baseline.update({result.name: asdict(result) for result in results})
+    path.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+
+
+def find_regressions(
+    results: List[BenchmarkResult], baseline: Dict[str, dict], threshold: float
+) -> Dict[str, float]:
+    """
+    Returns the relative slowdown of every benchmark whose median is more than
+    `threshold` (e.g. 0.25 for 25%) slower than its baseline median.
+    """
+    regressions = {}
+    for result in results:
+        reference: Optional[dict] = baseline.get(result.name)
+        if not reference or not reference.get("median_s"):
+            continue
+        change = result.median_s / reference["median_s"] - 1.0
+        if change > threshold:
+            regressions[result.name] = change
+    return regressions
+
+
+def format_report(results: List[BenchmarkResult], baseline: Dict[str, dict]) -> str:
+    """Renders the results as a fixed-width table with the change against baseline."""
+    lines = [
+        f"{'benchmark':<44} {'runs':>5} {'median':>11} {'p95':>11} {'ops/s':>10} {'vs base':>8}"
+    ]
+    for result in results:
+        reference = baseline.get(result.name)
+        change = (
+            f"{(result.median_s / reference['median_s'] - 1.0) * 100:+.1f}%"
+            if reference and reference.get("median_s")
+            else "new"
+        )
+        lines.append(
+            f"{result.name:<44} {result.runs:>5} {_fmt(result.median_s):>11} "
+            f"{_fmt(result.p95_s):>11} {result.ops_per_s:>10.1f} {change:>8}"
+        )
+    return "\n".join(lines)
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.1f} us"
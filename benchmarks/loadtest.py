@@ -0,0 +1,250 @@
+"""
+Closed-loop HTTP load driver. Each concurrency level runs for a fixed time with
+N worker threads issuing requests back to back, and reports throughput and
+p50/p95/p99 latency.
+
+Against an already running backend:
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000
+
+Or let the driver start the fake PostgREST and the API itself:
+    python -m benchmarks.loadtest --spawn --latency-ms 20 --jitter-ms 10 --error-rate 0.01
+
+With `--workers`, the API runs in production mode (`runner.py --prod`) once
+per worker count, to measure how throughput scales with the workers; the
+backend requests per API request show how much the shared cache saves.
+"""
+
+import argparse
+import contextlib
+import itertools
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/flights?limit=50",
+    "/flights?airport=KJFK&limit=50",
+    "/flights/1",
+    "/flights/00000002/fr24",
+    "/flights/summary",
+]
+
+
+@dataclass
+class LevelResult:
+    """Latency distribution for one concurrency level (latencies in milliseconds)."""
+
+    concurrency: int
+    requests: int
+    errors: int
+    duration_s: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration_s if self.duration_s else 0.0
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_level(
+    base_url: str, paths: List[str], concurrency: int, duration_s: float
+) -> LevelResult:
+    """Runs `concurrency` closed-loop workers against `paths` for `duration_s` seconds."""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration_s
+
+    def worker(offset: int) -> None:
+        nonlocal errors
+        local_latencies, local_errors = [], 0
+        cycle = itertools.islice(itertools.cycle(paths), offset, None)
+        with httpx.Client(base_url=base_url, timeout=30.0) as client:
+            while time.perf_counter() < deadline:
+                path = next(cycle)
+                started = time.perf_counter()
+                try:
+                    response = client.get(path)
+                    if response.status_code >= 500:
+                        local_errors += 1
+                except httpx.HTTPError:
+                    local_errors += 1
+                local_latencies.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return LevelResult(
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        duration_s=elapsed,
+        p50_ms=_percentile(latencies, 0.50),
+        p95_ms=_percentile(latencies, 0.95),
+        p99_ms=_percentile(latencies, 0.99),
+    )
+
+
+def _wait_until_up(url: str, timeout_s: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        with contextlib.suppress(httpx.HTTPError):
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout_s:.0f}s")
+
+
+@contextlib.contextmanager
+def spawn_stack(
+    args: argparse.Namespace, workers: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Starts the fake PostgREST and the API (pointed at it) as subprocesses and
+    yields the API base URL. With `workers`, the API runs in production mode.
+    """
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+    api_url = f"http://127.0.0.1:{args.api_port}"
+    stub = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.fake_postgrest",
+            "--port",
+            str(args.stub_port),
+            "--flights",
+            str(args.flights),
+            "--latency-ms",
+            str(args.latency_ms),
+            "--jitter-ms",
+            str(args.jitter_ms),
+            "--error-rate",
+            str(args.error_rate),
+        ]
+    )
+    env = {**os.environ, "SUPABASE_URL": stub_url, "SUPABASE_KEY": "loadtest-key"}
+    if workers is None:
+        command = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api.index:app",
+            "--port",
+            str(args.api_port),
+            "--log-level",
+            "warning",
+        ]
+    else:
+        command = [
+            sys.executable,
+            "runner.py",
+            "--prod",
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ]
+        env.update(UVICORN_HOST="127.0.0.1", UVICORN_PORT=str(args.api_port))
+    api = subprocess.Popen(command, env=env)
+    try:
+        _wait_until_up(f"{stub_url}/__admin/faults")
+        _wait_until_up(f"{api_url}/health-check?ready=true")
+        yield api_url
+    finally:
+        for process in (api, stub):
+            process.terminate()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Closed-loop load test with latency percentiles."
+    )
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    parser.add_argument(
+        "--concurrency", nargs="+", type=int, default=[1, 2, 4, 8, 16, 32]
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds per concurrency level."
+    )
+    parser.add_argument(
+        "--spawn", action="store_true", help="Start the fake PostgREST and the API."
+    )
+    parser.add_argument("--stub-port", type=int, default=54321)
+    parser.add_argument("--api-port", type=int, default=8765)
+    parser.add_argument("--flights", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=int,
+        help="Worker counts of the spawned API (production mode).",
+    )
+    args = parser.parse_args()
+    if args.workers and not args.spawn:
+        parser.error("--workers needs --spawn")
+
+    for workers in args.workers or [None]:
+        stack = (
+            spawn_stack(args, workers)
+            if args.spawn
+            else contextlib.nullcontext(args.base_url)
+        )
+        with stack as base_url:
+            if workers is not None:
+                print(f"workers={workers}")
+            print(
+                f"{'conc':>5} {'reqs':>8} {'err':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+                f"{'p99 ms':>9} {'backend/req':>12}"
+            )
+            for concurrency in args.concurrency:
+                backend_before = _backend_requests(args) if args.spawn else None
+                result = run_level(base_url, args.paths, concurrency, args.duration)
+                backend = (
+                    f"{(_backend_requests(args) - backend_before) / max(result.requests, 1):>12.2f}"
+                    if args.spawn
+                    else f"{'-':>12}"
+                )
+                print(
+                    f"{result.concurrency:>5} {result.requests:>8} {result.errors:>6} "
+                    f"{result.throughput:>9.1f} {result.p50_ms:>9.2f} {result.p95_ms:>9.2f} "
+                    f"{result.p99_ms:>9.2f} {backend}",
+                    flush=True,
+                )
+
+
+def _backend_requests(args: argparse.Namespace) -> int:
+    return httpx.get(f"http://127.0.0.1:{args.stub_port}/__admin/stats").json()[
+        "requests"
+    ]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+-- Area queries of the supabase backend: the find_flights_in_area function
+-- and the indexes it relies on. Safe to run more than once.
+
+CREATE INDEX IF NOT EXISTS flight_positions_point_idx
+    ON flight_positions USING gist (point(longitude, latitude));
+CREATE INDEX IF NOT EXISTS flight_positions_timestamp_brin
+    ON flight_positions USING brin (timestamp);
+
+CREATE OR REPLACE FUNCTION find_flights_in_area(
+    min_lat double precision, max_lat double precision,
+    min_lon double precision, max_lon double precision,
+    center_lat double precision DEFAULT NULL, center_lon double precision DEFAULT NULL,
+    radius_km double precision DEFAULT NULL,
+    start_time timestamptz DEFAULT NULL, end_time timestamptz DEFAULT NULL
+) RETURNS TABLE (flight_id bigint, entry_time timestamptz, exit_time timestamptz, points bigint)
+LANGUAGE sql STABLE AS $$
+    SELECT p.flight_id::bigint, min(p.timestamp), max(p.timestamp), count(*)
+    FROM flight_positions p
+    WHERE (
+            (min_lon <= max_lon
+                AND point(p.longitude, p.latitude) <@ box(point(min_lon, min_lat), point(max_lon, max_lat)))
+            -- a box across the antimeridian is split in two
+            OR (min_lon > max_lon
+                AND point(p.longitude, p.latitude) <@ box(point(min_lon, min_lat), point(180, max_lat)))
+            OR (min_lon > max_lon
+                AND point(p.longitude, p.latitude) <@ box(point(-180, min_lat), point(max_lon, max_lat)))
+        )
+        AND (start_time IS NULL OR p.timestamp >= start_time)
+        AND (end_time IS NULL OR p.timestamp < end_time)
+        AND (radius_km IS NULL OR 2 * 6371.0088 * asin(sqrt(least(1,
+            sin(radians(p.latitude - center_lat) / 2) ^ 2
+            + cos(radians(center_lat)) * cos(radians(p.latitude))
+            * sin(radians(p.longitude - center_lon) / 2) ^ 2))) <= radius_km)
+    GROUP BY p.flight_id
+    ORDER BY 2;
+$$;
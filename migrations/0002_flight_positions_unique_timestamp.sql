@@ -0,0 +1,18 @@
+-- One position per flight and timestamp, which the supabase backend's
+-- ON CONFLICT (flight_id, timestamp) DO NOTHING inserts rely on. Duplicates
+-- already stored are removed first, keeping the first row. Safe to run more
+-- than once.
+
+DELETE FROM flight_positions a USING flight_positions b
+WHERE a.flight_id = b.flight_id AND a.timestamp = b.timestamp AND a.position_id > b.position_id;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'flight_positions_flight_time_key'
+    ) THEN
+        ALTER TABLE flight_positions
+            ADD CONSTRAINT flight_positions_flight_time_key UNIQUE (flight_id, timestamp);
+    END IF;
+END
+$$;
@@ -1,11 +1,96 @@
+"""
+Starts the API with uvicorn.
+
+    python runner.py                          # development: one process, reloads on changes
+    python runner.py --prod [--workers N]     # production: N worker processes
+
+In production mode uvicorn uses uvloop and httptools when they are installed
+(`pip install uvicorn[standard]`). Sending SIGHUP to the main process
+replaces the workers one by one, each new one serving before the old one
+stops; SIGTTIN and SIGTTOU add and remove a worker. With several workers and
+no SHARED_CACHE_PATH, the workers share a cache tier in /dev/shm.
+"""
+
+import argparse
+import importlib.util
+import os
+import tempfile
+
 from uvicorn import run
 
 from api.utils.env_manager import settings
 
-if __name__ == "__main__":
+
+def shared_cache_path(port: int) -> str:
+    """
+    Default location of the workers' shared cache, on a tmpfs when there is one.
+    """
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"flights-api-{port}-cache.db")
+
+
+def prepare_shared_cache(path: str) -> None:
+    """
+    Starts the shared cache empty, so no entry outlives the code that wrote it.
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    # The cache holds pickled objects: only the app's user may write it.
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the flights API.")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="Production mode: several workers, no reload.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.uvicorn_workers,
+        help="Worker processes in production mode (0: one per CPU).",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    if not args.prod:
+        run(
+            "api.index:app",
+            host=settings.uvicorn_host,
+            port=settings.uvicorn_port,
+            reload=True,
+            log_level=args.log_level,
+        )
+        return
+
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1 and settings.cache_ttl_seconds > 0:
+        path = settings.shared_cache_path or shared_cache_path(settings.uvicorn_port)
+        prepare_shared_cache(path)
+        os.environ["SHARED_CACHE_PATH"] = path
+    if workers > 1 and settings.rollups_enabled:
+        print(
+            "Warning: rollups are kept per worker; the other workers only see a write "
+            "at their next reconciliation (ROLLUPS_RECONCILE_INTERVAL_SECONDS)."
+        )
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    print(f"Starting {workers} workers ({loop} event loop, {http} HTTP parser).")
+
     run(
         "api.index:app",
         host=settings.uvicorn_host,
         port=settings.uvicorn_port,
-        reload=True,
+        workers=workers,
+        loop=loop,
+        http=http,
+        timeout_graceful_shutdown=settings.uvicorn_graceful_timeout_seconds,
+        log_level=args.log_level,
     )
+
+
+if __name__ == "__main__":
+    main()